@@ -2,16 +2,16 @@
 AEO Rank Tracker — Automated Scan Scheduler
 
 Runs citation scans automatically every N hours for configured brands.
-Runs as a background thread inside the Flask app.
+Each brand is a job on the shared leader-elected scheduler (job_scheduler.py).
 
 Configuration via DynamoDB table or environment variables.
 """
 
+import functools
 import logging
 import os
-import threading
-import time
-from datetime import datetime, timezone
+
+from job_scheduler import get_job_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -30,58 +30,43 @@ DEFAULT_QUERIES = [
     "best content optimization tools",
 ]
 
-_scheduler_thread = None
+SYNC_INTERVAL = 600  # pick up newly tracked brands
+JOB_GROUP = "aeo-scan"
+
 _scheduler_running = False
 
 
-def _run_scheduled_scan():
-    """Execute a single round of scheduled scans for all tracked brands."""
+def _scan_brand(brand_info: dict):
+    """Run one scheduled scan for a single tracked brand."""
     from aeo_rank_tracker.tracker import run_aeo_scan, detect_available_llms
 
     # Check if any LLM providers are available
     detection = detect_available_llms()
     if not detection["active"]:
         logger.warning("Scheduled scan skipped — no LLM providers available")
-        return 0
-
-    brands = _get_tracked_brands()
-    if not brands:
-        logger.info("Scheduled scan skipped — no brands configured")
-        return 0
-
-    total_scans = 0
-    for brand_info in brands:
-        try:
-            logger.info(
-                "Scheduled scan: %s (%s)",
-                brand_info["brand_name"],
-                brand_info["target_domain"],
-            )
-            result = run_aeo_scan(
-                {
-                    "brand_name": brand_info["brand_name"],
-                    "target_domain": brand_info["target_domain"],
-                    "queries": brand_info.get("queries", DEFAULT_QUERIES),
-                },
-                store=True,
-            )
-            cited = result.get("summary", {}).get("total_cited", 0)
-            total = result.get("summary", {}).get("total_scanned", 0)
-            logger.info(
-                "Scheduled scan complete: %s — %d/%d cited",
-                brand_info["brand_name"],
-                cited,
-                total,
-            )
-            total_scans += 1
-        except Exception as e:
-            logger.error(
-                "Scheduled scan failed for %s: %s",
-                brand_info["brand_name"],
-                str(e)[:200],
-            )
-
-    return total_scans
+        return
+
+    logger.info(
+        "Scheduled scan: %s (%s)",
+        brand_info["brand_name"],
+        brand_info["target_domain"],
+    )
+    result = run_aeo_scan(
+        {
+            "brand_name": brand_info["brand_name"],
+            "target_domain": brand_info["target_domain"],
+            "queries": brand_info.get("queries", DEFAULT_QUERIES),
+        },
+        store=True,
+    )
+    cited = result.get("summary", {}).get("total_cited", 0)
+    total = result.get("summary", {}).get("total_scanned", 0)
+    logger.info(
+        "Scheduled scan complete: %s — %d/%d cited",
+        brand_info["brand_name"],
+        cited,
+        total,
+    )
 
 
 def _get_tracked_brands():
@@ -103,44 +88,40 @@ def _get_tracked_brands():
     return DEFAULT_TRACKED_BRANDS
 
 
-def _scheduler_loop():
-    """Background loop that runs scans at the configured interval."""
-    global _scheduler_running
-    logger.info(
-        "AEO scheduler started — scanning every %d hours",
-        SCAN_INTERVAL // 3600,
-    )
-
-    # Wait 60 seconds on startup before first scan (let the app fully initialize)
-    time.sleep(60)
+def _sync_brand_jobs():
+    """Reconcile one scan job per tracked brand on the shared scheduler.
 
-    while _scheduler_running:
-        try:
-            now = datetime.now(timezone.utc).isoformat()
-            logger.info("Scheduled scan starting at %s", now)
-            count = _run_scheduled_scan()
-            logger.info("Scheduled scan complete — %d brands scanned", count)
-        except Exception as e:
-            logger.error("Scheduler error: %s", str(e)[:300])
-
-        # Sleep for the interval, checking every 30s if we should stop
-        elapsed = 0
-        while elapsed < SCAN_INTERVAL and _scheduler_running:
-            time.sleep(30)
-            elapsed += 30
+    Phases are spread across the whole scan interval so brands don't all hit
+    the LLM providers at the same moment.
+    """
+    if not _scheduler_running:
+        return
+    scheduler = get_job_scheduler()
+    names = []
+    for brand_info in _get_tracked_brands():
+        name = f"{JOB_GROUP}:{brand_info['brand_name']}"
+        names.append(name)
+        scheduler.register(name, functools.partial(_scan_brand, brand_info),
+                           SCAN_INTERVAL, jitter=1.0, initial_delay=0, group=JOB_GROUP)
+    scheduler.unregister_group(JOB_GROUP, keep=names)
 
 
 def start_scheduler():
-    """Start the background scan scheduler."""
-    global _scheduler_thread, _scheduler_running
+    """Start the background scan scheduler.
+
+    Scans run as per-brand jobs on the shared leader-elected JobScheduler, so
+    calling this from every gunicorn worker still scans each brand once.
+    """
+    global _scheduler_running
 
     if _scheduler_running:
         logger.info("Scheduler already running")
         return
 
     _scheduler_running = True
-    _scheduler_thread = threading.Thread(target=_scheduler_loop, daemon=True)
-    _scheduler_thread.start()
+    scheduler = get_job_scheduler()
+    scheduler.register(f"{JOB_GROUP}-sync", _sync_brand_jobs, SYNC_INTERVAL)
+    scheduler.start()
     logger.info("AEO scan scheduler started (interval: %dh)", SCAN_INTERVAL // 3600)
 
 
@@ -148,14 +129,20 @@ def stop_scheduler():
     """Stop the background scan scheduler."""
     global _scheduler_running
     _scheduler_running = False
+    scheduler = get_job_scheduler()
+    scheduler.unregister(f"{JOB_GROUP}-sync")
+    scheduler.unregister_group(JOB_GROUP)
     logger.info("AEO scan scheduler stopped")
 
 
 def get_scheduler_status():
     """Return current scheduler status."""
+    status = get_job_scheduler().status(group=JOB_GROUP)
     return {
         "running": _scheduler_running,
+        "leader": status["leader"],
         "interval_hours": SCAN_INTERVAL // 3600,
         "tracked_brands": len(_get_tracked_brands()),
         "default_queries": DEFAULT_QUERIES,
+        "jobs": status["jobs"],
     }
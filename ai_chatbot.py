@@ -4,19 +4,46 @@ AI SEO Chatbot — conversational interface for SEO insights.
 
 Maintains per-session conversation history and routes queries
 through Bedrock Nova / Ollama directly. No EC2 dependency.
+
+Sessions live in a SQLite store (WAL) so every gunicorn worker on the host
+sees the same conversations; a small per-process LRU keeps hot sessions in
+memory and is revalidated against the row version on each request. Idle
+sessions expire after CHATBOT_SESSION_TTL seconds and the least recently
+used ones are evicted beyond MAX_SESSIONS.
+
+Prompts are token-budgeted: the newest turns that fit in
+CHATBOT_PROMPT_TOKENS are sent verbatim and everything older is folded into
+a rolling summary stored with the session, so prompt size stays flat no
+matter how long the conversation runs. A summary pass compacts down to half
+the budget, so the extra model call only happens every few turns, and it
+runs off the request thread outside Lambda, one pass per session at a time.
+If summaries keep failing, history is still capped at MAX_HISTORY_HARD.
 """
 
 import logging
 import os
+import sqlite3
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
-# In-memory session store (session_id → message history)
-_sessions: dict[str, list[dict]] = {}
-MAX_HISTORY = 20
-MAX_SESSIONS = 100
+IS_LAMBDA = os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
+DB_DIR = "/tmp" if IS_LAMBDA else os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CHATBOT_DB_PATH = os.environ.get("CHATBOT_DB_PATH", os.path.join(DB_DIR, "chatbot_sessions.db"))
+
+MAX_HISTORY = 200                 # stored messages per session (already-summarized ones are dropped first)
+MAX_HISTORY_HARD = 2 * MAX_HISTORY  # dropped even if unsummarized, so failing summaries can't grow it forever
+MAX_SESSIONS = int(os.environ.get("CHATBOT_MAX_SESSIONS", "1000"))
+SESSION_TTL = int(os.environ.get("CHATBOT_SESSION_TTL", str(24 * 3600)))
+LOCAL_CACHE_SIZE = 64
+
+PROMPT_TOKEN_BUDGET = int(os.environ.get("CHATBOT_PROMPT_TOKENS", "2500"))
+SUMMARY_TOKEN_BUDGET = 400        # target size of the rolling summary
+RECENT_TOKEN_BUDGET = PROMPT_TOKEN_BUDGET // 2   # verbatim turns kept after a summary pass
 
 SYSTEM_PROMPT = (
     "You are an expert AI SEO consultant specializing in AEO (Answer Engine Optimization) "
@@ -33,6 +60,13 @@ SYSTEM_PROMPT = (
     "If asked about a specific URL or brand, provide tailored recommendations."
 )
 
+SUMMARY_PROMPT = (
+    "Summarize the conversation below between a user and an AI SEO consultant in at most "
+    "{words} words. Keep the user's brand, URLs, goals, constraints and any recommendations "
+    "already given. Write plain prose, no preamble.\n\n"
+    "{previous}{transcript}\n\nSummary:"
+)
+
 
 def _call_generate(prompt: str) -> str:
     """Call AI provider directly for chat responses."""
@@ -44,28 +78,300 @@ def _now():
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def _build_chat_prompt(history: list[dict], user_message: str) -> str:
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) — good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _format_turn(msg: dict) -> str:
+    role = "User" if msg["role"] == "user" else "Assistant"
+    return f"{role}: {msg['content']}"
+
+
+# ── Session store ───────────────────────────────────────────────────────── #
+
+class ChatSessionStore:
+    """SQLite-backed session store shared by all workers on the host."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or CHATBOT_DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.init_database()
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        conn = self.get_connection()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    last_activity TEXT,
+                    last_activity_ts REAL NOT NULL,
+                    version INTEGER DEFAULT 0,
+                    message_count INTEGER DEFAULT 0,
+                    summary TEXT DEFAULT '',
+                    summarized_seq INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    timestamp TEXT,
+                    PRIMARY KEY (session_id, seq)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_activity "
+                         "ON chat_sessions(last_activity_ts)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ── local LRU ──
+
+    def _cache_put(self, session: dict):
+        with self._lock:
+            self._cache[session["session_id"]] = session
+            self._cache.move_to_end(session["session_id"])
+            while len(self._cache) > LOCAL_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _cache_drop(self, session_ids):
+        with self._lock:
+            for sid in session_ids:
+                self._cache.pop(sid, None)
+
+    # ── reads ──
+
+    def get(self, session_id: str) -> dict | None:
+        """Session dict (with messages), served from the local LRU when its version is current."""
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT * FROM chat_sessions WHERE session_id = ?",
+                               (session_id,)).fetchone()
+            if not row:
+                self._cache_drop([session_id])
+                return None
+            if time.time() - row["last_activity_ts"] > SESSION_TTL:
+                self._delete(conn, [session_id])
+                conn.commit()
+                return None
+            with self._lock:
+                cached = self._cache.get(session_id)
+                if cached and cached["version"] == row["version"]:
+                    self._cache.move_to_end(session_id)
+                    return cached
+            messages = [
+                {"seq": m["seq"], "role": m["role"], "content": m["content"], "timestamp": m["timestamp"]}
+                for m in conn.execute(
+                    "SELECT seq, role, content, timestamp FROM chat_messages "
+                    "WHERE session_id = ? ORDER BY seq", (session_id,))
+            ]
+        finally:
+            conn.close()
+        session = {
+            "session_id": session_id,
+            "created_at": row["created_at"],
+            "last_activity": row["last_activity"],
+            "version": row["version"],
+            "summary": row["summary"] or "",
+            "summarized_seq": row["summarized_seq"],
+            "messages": messages,
+        }
+        self._cache_put(session)
+        return session
+
+    def list_sessions(self) -> list[dict]:
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT session_id, message_count, last_activity FROM chat_sessions "
+                "WHERE last_activity_ts >= ? ORDER BY last_activity_ts DESC",
+                (time.time() - SESSION_TTL,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    # ── writes ──
+
+    def create(self, session_id: str) -> dict:
+        now = _now()
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO chat_sessions (session_id, created_at, last_activity, last_activity_ts) "
+                "VALUES (?, ?, ?, ?)", (session_id, now, now, time.time()))
+            conn.commit()
+            self._maybe_evict(conn)
+        finally:
+            conn.close()
+        return {"session_id": session_id, "created_at": now}
+
+    def append(self, session_id: str, messages: list[dict]) -> list[dict]:
+        """Append messages, bump the version and trim already-summarized overflow.
+
+        Returns the messages with their assigned ``seq``.
+        """
+        conn = self.get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM chat_messages WHERE session_id = ?",
+                               (session_id,)).fetchone()
+            seq = row[0]
+            conn.executemany(
+                "INSERT INTO chat_messages (session_id, seq, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                [(session_id, seq + i + 1, m["role"], m["content"], m["timestamp"])
+                 for i, m in enumerate(messages)])
+            conn.execute(
+                "UPDATE chat_sessions SET last_activity = ?, last_activity_ts = ?, version = version + 1, "
+                "message_count = message_count + ? WHERE session_id = ?",
+                (_now(), time.time(), len(messages), session_id))
+            # Drop the oldest messages beyond MAX_HISTORY, but only ones the summary already covers
+            conn.execute(
+                "DELETE FROM chat_messages WHERE session_id = ? AND seq <= ? AND seq <= "
+                "(SELECT summarized_seq FROM chat_sessions WHERE session_id = ?)",
+                (session_id, seq + len(messages) - MAX_HISTORY, session_id))
+            conn.execute("DELETE FROM chat_messages WHERE session_id = ? AND seq <= ?",
+                         (session_id, seq + len(messages) - MAX_HISTORY_HARD))
+            conn.commit()
+            self._maybe_evict(conn)
+        finally:
+            conn.close()
+        return [{**m, "seq": seq + i + 1} for i, m in enumerate(messages)]
+
+    def set_summary(self, session_id: str, summary: str, summarized_seq: int):
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                "UPDATE chat_sessions SET summary = ?, summarized_seq = ?, version = version + 1 "
+                "WHERE session_id = ? AND summarized_seq < ?",
+                (summary, summarized_seq, session_id, summarized_seq))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ── eviction ──
+
+    def _delete(self, conn, session_ids: list[str]):
+        if not session_ids:
+            return
+        marks = ",".join("?" * len(session_ids))
+        conn.execute(f"DELETE FROM chat_messages WHERE session_id IN ({marks})", session_ids)
+        conn.execute(f"DELETE FROM chat_sessions WHERE session_id IN ({marks})", session_ids)
+        self._cache_drop(session_ids)
+
+    def _maybe_evict(self, conn):
+        """TTL expiry plus LRU eviction beyond MAX_SESSIONS, at most once a minute per process."""
+        if time.time() - self._last_sweep < 60:
+            return
+        self._last_sweep = time.time()
+        expired = [r[0] for r in conn.execute(
+            "SELECT session_id FROM chat_sessions WHERE last_activity_ts < ?",
+            (time.time() - SESSION_TTL,))]
+        overflow = [r[0] for r in conn.execute(
+            "SELECT session_id FROM chat_sessions WHERE last_activity_ts >= ? "
+            "ORDER BY last_activity_ts DESC LIMIT -1 OFFSET ?",
+            (time.time() - SESSION_TTL, MAX_SESSIONS))]
+        if expired or overflow:
+            self._delete(conn, expired + overflow)
+            conn.commit()
+            logger.info("Chatbot sessions evicted: %d expired, %d over capacity", len(expired), len(overflow))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> ChatSessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ChatSessionStore()
+    return _store
+
+
+# ── Prompt assembly ─────────────────────────────────────────────────────── #
+
+def _select_window(messages: list[dict], summary: str, summarized_seq: int,
+                   user_message: str = "", budget: int = PROMPT_TOKEN_BUDGET) -> tuple[list[dict], list[dict]]:
+    """Split unsummarized messages into (overflow, window) under ``budget``.
+
+    The window is the newest run of turns that fits alongside the system prompt,
+    the rolling summary and the new user message; the overflow is what the next
+    summary pass has to absorb.
+    """
+    budget -= (_estimate_tokens(SYSTEM_PROMPT) + _estimate_tokens(summary)
+               + _estimate_tokens(user_message))
+    pending = [m for m in messages if m["seq"] > summarized_seq]
+    window = []
+    for msg in reversed(pending):
+        cost = _estimate_tokens(msg["content"]) + 2
+        if cost > budget:
+            break
+        window.append(msg)
+        budget -= cost
+    window.reverse()
+    return pending[:len(pending) - len(window)], window
+
+
+def _build_chat_prompt(history: list[dict], user_message: str, summary: str = "") -> str:
     """Build a prompt with conversation context."""
     parts = [f"System: {SYSTEM_PROMPT}\n"]
-    # Include last 6 messages for context
-    for msg in history[-6:]:
-        role = "User" if msg["role"] == "user" else "Assistant"
-        parts.append(f"{role}: {msg['content']}")
+    if summary:
+        parts.append(f"Summary of the earlier conversation: {summary}")
+    for msg in history:
+        parts.append(_format_turn(msg))
     parts.append(f"User: {user_message}")
     parts.append("Assistant:")
     return "\n\n".join(parts)
 
 
+_summarizing = set()  # sessions with a summary pass in flight in this process
+_summarizing_lock = threading.Lock()
+
+
+def _summarize_once(session_id: str, summary: str, overflow: list[dict]):
+    try:
+        _summarize(session_id, summary, overflow)
+    finally:
+        with _summarizing_lock:
+            _summarizing.discard(session_id)
+
+
+def _summarize(session_id: str, summary: str, overflow: list[dict]):
+    """Fold ``overflow`` into the session's rolling summary."""
+    previous = f"Earlier summary: {summary}\n\n" if summary else ""
+    transcript = "\n\n".join(_format_turn(m) for m in overflow)
+    prompt = SUMMARY_PROMPT.format(words=SUMMARY_TOKEN_BUDGET * 3 // 4,
+                                   previous=previous, transcript=transcript)
+    try:
+        summary = _call_generate(prompt).strip()
+    except Exception as e:
+        logger.warning("Chatbot summary for %s failed: %s", session_id, str(e)[:200])
+        return
+    # Hard cap so a verbose model can't blow the budget
+    summary = summary[:SUMMARY_TOKEN_BUDGET * 4]
+    _get_store().set_summary(session_id, summary, overflow[-1]["seq"])
+
+
+# ── Public API ──────────────────────────────────────────────────────────── #
+
 def create_session() -> dict:
     """Create a new chat session."""
-    # Evict oldest sessions if at capacity
-    if len(_sessions) >= MAX_SESSIONS:
-        oldest = list(_sessions.keys())[0]
-        del _sessions[oldest]
-
     session_id = str(uuid.uuid4())[:12]
-    _sessions[session_id] = []
-    return {"session_id": session_id, "created_at": _now()}
+    return _get_store().create(session_id)
 
 
 def chat(session_id: str, message: str) -> dict:
@@ -74,53 +380,65 @@ def chat(session_id: str, message: str) -> dict:
 
     Auto-creates session if session_id is new.
     """
-    if session_id not in _sessions:
-        _sessions[session_id] = []
-
-    history = _sessions[session_id]
+    store = _get_store()
+    session = store.get(session_id)
+    if session is None:
+        store.create(session_id)
+        session = store.get(session_id)
 
-    # Build prompt with history context
-    prompt = _build_chat_prompt(history, message)
+    # Build prompt from the rolling summary plus the newest turns that fit the budget
+    summary, summarized_seq = session["summary"], session["summarized_seq"]
+    overflow, window = _select_window(session["messages"], summary, summarized_seq, message)
+    prompt = _build_chat_prompt(window, message, summary)
 
     # Get AI response
     response_text = _call_generate(prompt)
 
     # Store in history
-    history.append({"role": "user", "content": message, "timestamp": _now()})
-    history.append({"role": "assistant", "content": response_text, "timestamp": _now()})
+    added = store.append(session_id, [
+        {"role": "user", "content": message, "timestamp": _now()},
+        {"role": "assistant", "content": response_text, "timestamp": _now()},
+    ])
 
-    # Trim history
-    if len(history) > MAX_HISTORY:
-        _sessions[session_id] = history[-MAX_HISTORY:]
+    # Once turns start falling out of the window, compact down to RECENT_TOKEN_BUDGET
+    # so the next several turns fit again before another summary pass is needed
+    if overflow:
+        to_fold, _ = _select_window(session["messages"] + added, summary, summarized_seq,
+                                    budget=RECENT_TOKEN_BUDGET)
+        if IS_LAMBDA:
+            _summarize(session_id, summary, to_fold)
+        else:
+            # One pass per session at a time; the next turn picks up whatever it missed
+            with _summarizing_lock:
+                start = session_id not in _summarizing
+                _summarizing.add(session_id)
+            if start:
+                threading.Thread(target=_summarize_once, args=(session_id, summary, to_fold),
+                                 name="chatbot-summary", daemon=True).start()
 
     return {
         "session_id": session_id,
         "message": message,
         "response": response_text,
         "timestamp": _now(),
-        "history_length": len(_sessions[session_id]),
+        "history_length": len(session["messages"]) + 2,
+        "prompt_tokens": _estimate_tokens(prompt),
     }
 
 
 def get_session_history(session_id: str) -> dict:
     """Get conversation history for a session."""
-    if session_id not in _sessions:
+    session = _get_store().get(session_id)
+    if session is None:
         return {"session_id": session_id, "messages": [], "exists": False}
     return {
         "session_id": session_id,
-        "messages": _sessions[session_id],
+        "messages": [{k: m[k] for k in ("role", "content", "timestamp")} for m in session["messages"]],
+        "summary": session["summary"],
         "exists": True,
     }
 
 
 def list_sessions() -> list[dict]:
     """List active chat sessions."""
-    result = []
-    for sid, msgs in _sessions.items():
-        last_msg = msgs[-1]["timestamp"] if msgs else None
-        result.append({
-            "session_id": sid,
-            "message_count": len(msgs),
-            "last_activity": last_msg,
-        })
-    return result
+    return _get_store().list_sessions()
@@ -5,10 +5,9 @@ Based on SEMrush, Moz, Ahrefs, and industry best practices
 """
 
 from flask import Flask, jsonify, request, send_from_directory, redirect, render_template
-from flask.json.provider import DefaultJSONProvider
+from fast_json import FastJSONProvider, compress_response
 from flask_cors import CORS
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
 import re
 import time
@@ -21,16 +20,17 @@ from collections import Counter
 import json
 import os
 
-import boto3
 import hmac
 import base64
 
+
 # Detect Lambda environment
 IS_LAMBDA = bool(os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
 
 
 # ΓöÇΓöÇ Custom JSON provider to handle Decimal, date, UUID from PostgreSQL ΓöÇΓöÇΓöÇΓöÇΓöÇΓöÇΓöÇΓöÇ
-class SafeJSONProvider(DefaultJSONProvider):
+# (encoded with orjson when installed, ?fields= projection — see fast_json.py)
+class SafeJSONProvider(FastJSONProvider):
     def default(self, o):
         if isinstance(o, Decimal):
             return float(o)
@@ -42,6 +42,7 @@ class SafeJSONProvider(DefaultJSONProvider):
 app = Flask(__name__, static_folder='assets', static_url_path='/assets')
 app.json_provider_class = SafeJSONProvider
 app.json = SafeJSONProvider(app)
+app.after_request(compress_response)
 CORS(app, origins=[
     'https://ai1stseo.com',
     'https://www.ai1stseo.com',
@@ -97,82 +98,39 @@ try:
 except Exception:
     pass
 
-# --- AI Business Directory routes (isolated module) ---
-try:
-    from directory.routes import register_directory_routes
-    register_directory_routes(app)
-except Exception:
-    pass
-
-# --- Generic Directory Module (Sports, Tools, Brands, etc.) ---
-try:
-    from directory.directory_api import register_directory_module
-    register_directory_module(app)
-except Exception as e:
-    print(f"⚠ Directory module: {e}")
-
-# --- Sports Module (matches, scores, rankings, news, teams) ---
-try:
-    from directory.sports_api import register_sports_module
-    register_sports_module(app)
-except Exception as e:
-    print(f"⚠ Sports module: {e}")
-
-# --- Month 3 Intelligence Systems API ---
-try:
-    from month3_systems.api import m3_bp
-    app.register_blueprint(m3_bp)
-except Exception as e:
-    print(f"ΓÜá Month 3 systems: {e}")
-
-# --- Deepthi Intelligence Layer API ---
-try:
-    from deepthi_intelligence.api import deepthi_bp
-    app.register_blueprint(deepthi_bp)
-except Exception as e:
-    print(f"ΓÜá Deepthi Intelligence: {e}")
-
-try:
-    from deepthi_intelligence.benchmark_api import benchmark_bp
-    app.register_blueprint(benchmark_bp)
-except Exception as e:
-    print(f"ΓÜá Deepthi Benchmark API: {e}")
-
-try:
-    from deepthi_intelligence.deepthi_prod_api import deepthi_prod_bp
-    app.register_blueprint(deepthi_prod_bp)
-except Exception as e:
-    print(f"ΓÜá Deepthi Production API: {e}")
-
-try:
-    from deepthi_intelligence.public_stats_api import public_stats_bp
-    app.register_blueprint(public_stats_bp)
-except Exception as e:
-    print(f"ΓÜá Public Stats API: {e}")
-
-try:
-    from deepthi_intelligence.intelligence_summary_api import scanner_intel_bp
-    app.register_blueprint(scanner_intel_bp)
-except Exception as e:
-    print(f"ΓÜá Scanner Intelligence API: {e}")
-
-try:
-    from deepthi_intelligence.month3_completion import month3_bp
-    app.register_blueprint(month3_bp)
-except Exception as e:
-    print(f"ΓÜá Month 3 Completion API: {e}")
-
-try:
-    from deepthi_intelligence.month4_systems import month4_bp
-    app.register_blueprint(month4_bp)
-except Exception as e:
-    print(f"ΓÜá Month 4 Systems API: {e}")
-
-try:
-    from deepthi_intelligence.month5_systems import month5_bp
-    app.register_blueprint(month5_bp)
-except Exception as e:
-    print(f"ΓÜá Month 5 Systems API: {e}")
+# --- Feature modules, registered on the first request under their prefixes ---
+# (see lazy_blueprints.py; LAZY_BLUEPRINTS=0 registers them at boot)
+from lazy_blueprints import LazyBlueprints
+from response_cache import cached, response_cache_stats
+lazy_blueprints = LazyBlueprints(app)
+
+# AI Business Directory routes (isolated module)
+lazy_blueprints.add('Directory routes', ['/api/directory'], 'directory.routes',
+                    register='register_directory_routes')
+# Generic Directory Module (Sports, Tools, Brands, etc.)
+lazy_blueprints.add('Directory module', ['/api/dir'], 'directory.directory_api',
+                    register='register_directory_module')
+# Sports Module (matches, scores, rankings, news, teams)
+lazy_blueprints.add('Sports module', ['/api/sports'], 'directory.sports_api',
+                    register='register_sports_module')
+# Month 3 Intelligence Systems API
+lazy_blueprints.add('Month 3 systems', ['/api/m3'], 'month3_systems.api', 'm3_bp')
+# Deepthi Intelligence Layer API
+lazy_blueprints.add('Deepthi Intelligence', ['/api/deepthi'], 'deepthi_intelligence.api', 'deepthi_bp')
+lazy_blueprints.add('Deepthi Benchmark API', ['/api/m3/benchmark'],
+                    'deepthi_intelligence.benchmark_api', 'benchmark_bp')
+lazy_blueprints.add('Deepthi Production API', ['/api/m3/deepthi'],
+                    'deepthi_intelligence.deepthi_prod_api', 'deepthi_prod_bp')
+lazy_blueprints.add('Public Stats API', ['/api/public'],
+                    'deepthi_intelligence.public_stats_api', 'public_stats_bp')
+lazy_blueprints.add('Scanner Intelligence API', ['/api/m3/deepthi/scanner'],
+                    'deepthi_intelligence.intelligence_summary_api', 'scanner_intel_bp')
+lazy_blueprints.add('Month 3 Completion API', ['/api/m3/deepthi/completion'],
+                    'deepthi_intelligence.month3_completion', 'month3_bp')
+lazy_blueprints.add('Month 4 Systems API', ['/api/m3/deepthi/month4'],
+                    'deepthi_intelligence.month4_systems', 'month4_bp')
+lazy_blueprints.add('Month 5 Systems API', ['/api/m5'],
+                    'deepthi_intelligence.month5_systems', 'month5_bp')
 
 # ΓöÇΓöÇ Global JSON error handlers (prevent HTML error pages for API routes) ΓöÇΓöÇΓöÇΓöÇΓöÇΓöÇ
 
@@ -280,12 +238,13 @@ AWS_REGION = 'us-east-1'
 SES_SENDER = 'no-reply@ai1stseo.com'
 COGNITO_ENDPOINT = f'https://cognito-idp.{AWS_REGION}.amazonaws.com/'
 
-# SES client - only works if AWS credentials are available (App Runner instance role)
-ses_client = None
-try:
-    ses_client = boto3.client('ses', region_name=AWS_REGION)
-except Exception:
-    print("SES client not available - welcome emails will be skipped")
+def _ses_client():
+    """Shared SES client, created on first use (None without AWS credentials)."""
+    try:
+        from aws_clients import get_client
+        return get_client('ses', AWS_REGION)
+    except Exception:
+        return None
 
 def get_secret_hash(username):
     """Compute Cognito SECRET_HASH for client with secret"""
@@ -308,6 +267,7 @@ def cognito_request(action, payload):
 
 def send_welcome_email(email, name):
     """Send welcome email via SES"""
+    ses_client = _ses_client()
     if not ses_client:
         print(f"SES not available - skipping welcome email for {email}")
         return False
@@ -365,6 +325,7 @@ def send_welcome_email(email, name):
 
 def fetch_website(url):
     """Fetch website content with timing"""
+    from bs4 import BeautifulSoup
     headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
     start_time = time.time()
     response = requests.get(url, headers=headers, timeout=15)
@@ -374,7 +335,18 @@ def fetch_website(url):
     return response, soup, load_time
 
 def safe_get(url, timeout=5):
-    """Safe GET request"""
+    """Safe GET request.
+
+    Inside a site crawl job the result is shared across every page of the job,
+    so robots.txt / sitemap.xml / llms.txt are fetched once per crawl.
+    """
+    from site_crawler import active_fetch_cache
+    cache = active_fetch_cache()
+    if cache is not None:
+        return cache.get(url, lambda: _safe_get_uncached(url, timeout))
+    return _safe_get_uncached(url, timeout)
+
+def _safe_get_uncached(url, timeout=5):
     try:
         return requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout)
     except:
@@ -1955,7 +1927,7 @@ def require_auth(f):
     from functools import wraps
     @wraps(f)
     def decorated(*args, **kwargs):
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         token = data.get('token', '')
         if not token:
             auth_header = request.headers.get('Authorization', '')
@@ -2082,6 +2054,40 @@ def reset_password():
         return jsonify({'status': 'error', 'message': 'Password reset failed'}), 500
 
 
+SEO_ANALYZERS = {
+    'technical': ('Technical SEO', analyze_technical_seo),
+    'onpage': ('On-Page SEO', analyze_onpage_seo),
+    'content': ('Content SEO', analyze_content_seo),
+    'mobile': ('Mobile SEO', analyze_mobile_seo),
+    'performance': ('Performance', analyze_performance_seo),
+    'security': ('Security', analyze_security_seo),
+    'social': ('Social SEO', analyze_social_seo),
+    'local': ('Local SEO', analyze_local_seo),
+    'geo': ('GEO/AEO', analyze_geo_aeo),
+    'citationgap': ('Citation Gap', analyze_citation_gap),
+}
+
+
+def run_seo_audit(url, soup, response, load_time, categories=None):
+    """Run the selected category analyzers over an already-fetched page."""
+    results = {'url': url, 'status': 'success', 'categories': {}, 'totalChecks': 0, 'totalPassed': 0}
+    for cat_key in categories or list(SEO_ANALYZERS):
+        if cat_key in SEO_ANALYZERS:
+            name, analyzer_func = SEO_ANALYZERS[cat_key]
+            result = analyzer_func(url, soup, response, load_time)
+            results['categories'][cat_key] = result
+            results['totalChecks'] += result['total']
+            results['totalPassed'] += result['passed']
+
+    # Calculate overall score
+    if results['categories']:
+        scores = [cat['score'] for cat in results['categories'].values()]
+        results['overallScore'] = round(sum(scores) / len(scores), 1)
+    else:
+        results['overallScore'] = 0
+    return results
+
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_url():
     """Main SEO analysis endpoint - 170 checks across 9 categories"""
@@ -2090,7 +2096,7 @@ def analyze_url():
         if not data:
             return jsonify({'error': 'Invalid or missing JSON body'}), 400
         url = data.get('url', '')
-        categories = data.get('categories', ['technical', 'onpage', 'content', 'mobile', 'performance', 'security', 'social', 'local', 'geo', 'citationgap'])
+        categories = data.get('categories', list(SEO_ANALYZERS))
         if isinstance(categories, str):
             categories = [c.strip() for c in categories.split(',') if c.strip()]
     except Exception:
@@ -2104,45 +2110,129 @@ def analyze_url():
     
     try:
         response, soup, load_time = fetch_website(url)
-        
-        results = {'url': url, 'status': 'success', 'categories': {}, 'totalChecks': 0, 'totalPassed': 0}
-        
-        # Run selected category analyzers
-        analyzers = {
-            'technical': ('Technical SEO', analyze_technical_seo),
-            'onpage': ('On-Page SEO', analyze_onpage_seo),
-            'content': ('Content SEO', analyze_content_seo),
-            'mobile': ('Mobile SEO', analyze_mobile_seo),
-            'performance': ('Performance', analyze_performance_seo),
-            'security': ('Security', analyze_security_seo),
-            'social': ('Social SEO', analyze_social_seo),
-            'local': ('Local SEO', analyze_local_seo),
-            'geo': ('GEO/AEO', analyze_geo_aeo),
-            'citationgap': ('Citation Gap', analyze_citation_gap)
-        }
-        
-        for cat_key in categories:
-            if cat_key in analyzers:
-                name, analyzer_func = analyzers[cat_key]
-                result = analyzer_func(url, soup, response, load_time)
-                results['categories'][cat_key] = result
-                results['totalChecks'] += result['total']
-                results['totalPassed'] += result['passed']
-        
-        # Calculate overall score
-        if results['categories']:
-            scores = [cat['score'] for cat in results['categories'].values()]
-            results['overallScore'] = round(sum(scores) / len(scores), 1)
-        else:
-            results['overallScore'] = 0
-        
-        return jsonify(results)
+        return jsonify(run_seo_audit(url, soup, response, load_time, categories))
     
     except requests.exceptions.RequestException as e:
         return jsonify({'error': f'Failed to fetch URL: {str(e)}', 'url': url}), 400
     except Exception as e:
         return jsonify({'error': f'Analysis failed: {str(e)}', 'url': url}), 500
 
+
+# ============== BULK SITE CRAWL ==============
+
+def _crawl_project():
+    """Project a crawl request is scoped to: X-Project-Id, or project_id in the query/body ('' if none)."""
+    return (request.headers.get('X-Project-Id') or request.args.get('project_id')
+            or (request.get_json(silent=True) or {}).get('project_id') or '')
+
+
+@app.route('/api/crawl', methods=['POST'])
+@require_auth
+def crawl_start():
+    """Start a full-site audit job.
+
+    Body JSON:
+        {
+            "url": "https://example.com",        (required — start page / site root)
+            "max_pages": 500,                    (optional, capped by CRAWL_MAX_PAGES_LIMIT)
+            "categories": ["technical", ...],    (optional — same as /api/analyze)
+            "force": false,                      (optional — re-audit unchanged pages too)
+            "use_sitemap": true,                 (optional — seed frontier from sitemap.xml)
+            "workers": 8, "per_host": 4,         (optional concurrency limits)
+            "delay": 0.2                         (optional politeness delay, clamped to 0.1-10s)
+        }
+    Returns 202 with the job record; poll /api/crawl/<job_id> for progress.
+    429 when this worker already runs CRAWL_MAX_CONCURRENT jobs.
+    """
+    from site_crawler import (start_crawl, CrawlCapacityError, DEFAULT_MAX_PAGES, DEFAULT_WORKERS,
+                              DEFAULT_PER_HOST, DEFAULT_DELAY)
+    data = request.get_json(silent=True) or {}
+    url = (data.get('url') or '').strip()
+    if not url:
+        return jsonify({'error': 'url is required'}), 400
+    categories = data.get('categories') or list(SEO_ANALYZERS)
+    if isinstance(categories, str):
+        categories = [c.strip() for c in categories.split(',') if c.strip()]
+
+    def _audit(page_url, soup, response, load_time):
+        return run_seo_audit(page_url, soup, response, load_time, categories)
+
+    try:
+        max_pages = int(data.get('max_pages', DEFAULT_MAX_PAGES))
+        workers = int(data.get('workers', DEFAULT_WORKERS))
+        per_host = int(data.get('per_host', DEFAULT_PER_HOST))
+        delay = float(data.get('delay', DEFAULT_DELAY))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'max_pages, workers, per_host and delay must be numbers'}), 400
+
+    try:
+        job = start_crawl(
+            url, _audit,
+            max_pages=max_pages, max_workers=workers, per_host=per_host, delay=delay,
+            force=bool(data.get('force', False)),
+            use_sitemap=bool(data.get('use_sitemap', True)),
+            project_id=_crawl_project(),
+        )
+        return jsonify({'status': 'accepted', 'job': job}), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except CrawlCapacityError as e:
+        return jsonify({'error': str(e)}), 429
+    except Exception as e:
+        return jsonify({'error': f'Could not start crawl: {str(e)}'}), 500
+
+
+@app.route('/api/crawl/jobs', methods=['GET'])
+@require_auth
+def crawl_list():
+    """Crawl jobs of the caller's project, newest first."""
+    from site_crawler import list_crawls
+    site = request.args.get('site')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    return jsonify({'status': 'success',
+                    'jobs': list_crawls(site=site, limit=limit, project_id=_crawl_project())})
+
+
+@app.route('/api/crawl/<job_id>', methods=['GET'])
+@require_auth
+def crawl_status(job_id):
+    """Progress counters while running; site-level aggregates once complete."""
+    from site_crawler import get_crawl
+    job = get_crawl(job_id, project_id=_crawl_project())
+    if not job:
+        return jsonify({'error': 'Crawl job not found'}), 404
+    return jsonify({'status': 'success', 'job': job})
+
+
+@app.route('/api/crawl/<job_id>/pages', methods=['GET'])
+@require_auth
+def crawl_pages(job_id):
+    """Per-page summaries for a job. ?order=score (weakest first) or url, ?limit, ?offset."""
+    from site_crawler import get_crawl_pages
+    try:
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    order = request.args.get('order', 'score')
+    pages = get_crawl_pages(job_id, limit=limit, offset=offset, order=order, project_id=_crawl_project())
+    if pages is None:
+        return jsonify({'error': 'Crawl job not found'}), 404
+    return jsonify({'status': 'success', 'job_id': job_id, 'pages': pages,
+                    'count': len(pages), 'offset': offset})
+
+
+@app.route('/api/crawl/<job_id>/cancel', methods=['POST'])
+@require_auth
+def crawl_cancel(job_id):
+    from site_crawler import cancel_crawl
+    if cancel_crawl(job_id, project_id=_crawl_project()):
+        return jsonify({'status': 'cancelling', 'job_id': job_id})
+    return jsonify({'error': 'Crawl job is not running on this worker'}), 409
+
 @app.route('/api/health')
 def health_check():
     return jsonify({
@@ -2282,6 +2372,7 @@ def call_llm(prompt, model='qwen3:30b-a3b', timeout=120):
 
 def scrape_serp_results(keyword, num_results=5):
     """Scrape Google search results for a keyword and extract page data"""
+    from bs4 import BeautifulSoup
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept-Language': 'en-US,en;q=0.9'
@@ -2577,6 +2668,7 @@ def generate_content_brief():
 
 
 @app.route('/api/content-briefs', methods=['GET'])
+@cached('content-briefs')
 def list_content_briefs():
     """Retrieve past content briefs, optionally filtered by keyword."""
     try:
@@ -2601,6 +2693,7 @@ def list_content_briefs():
 # ============== CONTENT SCORING ENGINE (Phase 2) ==============
 
 @app.route('/api/content-briefs/<brief_id>', methods=['GET'])
+@cached('content-briefs')
 def get_content_brief_detail(brief_id):
     """Get a single content brief with full details."""
     try:
@@ -2728,6 +2821,7 @@ def compute_aeo_score(soup, text):
 @app.route('/api/content-score', methods=['POST'])
 def content_score():
     """Content Scoring Engine ΓÇö computes SEO score, AEO score, and readability for any URL."""
+    from bs4 import BeautifulSoup
     data = request.get_json()
     url = (data or {}).get('url', '').strip()
     if not url:
@@ -3451,103 +3545,14 @@ Return as JSON with this structure:
 
 # ============== PREDICTIVE SEARCH INTELLIGENCE ENGINE — PSIE (Dev 2) ==============
 
-def psie_analyze_page(url, soup, text, keyword):
-    """Core PSIE analysis — combines scoring signals into a ranking prediction."""
-    parsed = urlparse(url)
-    signals = {}
-
-    # Signal 1: Title keyword alignment
-    title = soup.find('title')
-    title_text = (title.string.strip() if title and title.string else '').lower()
-    kw_lower = keyword.lower()
-    signals['title_keyword_match'] = 1.0 if kw_lower in title_text else (0.5 if any(w in title_text for w in kw_lower.split()) else 0.0)
-
-    # Signal 2: Meta description keyword presence
-    meta = soup.find('meta', attrs={'name': 'description'})
-    desc = (meta.get('content', '').strip().lower() if meta else '')
-    signals['meta_keyword_match'] = 1.0 if kw_lower in desc else (0.5 if any(w in desc for w in kw_lower.split()) else 0.0)
-
-    # Signal 3: H1 keyword alignment
-    h1s = soup.find_all('h1')
-    h1_text = ' '.join(h.get_text().lower() for h in h1s)
-    signals['h1_keyword_match'] = 1.0 if kw_lower in h1_text else (0.5 if any(w in h1_text for w in kw_lower.split()) else 0.0)
-
-    # Signal 4: Content depth
-    word_count = len(text.split())
-    signals['content_depth'] = min(1.0, word_count / 2000)
-
-    # Signal 5: Heading structure quality
-    h2s = soup.find_all('h2')
-    h3s = soup.find_all('h3')
-    signals['heading_structure'] = min(1.0, (len(h2s) * 0.15 + len(h3s) * 0.1))
-
-    # Signal 6: Schema markup presence
-    json_ld = soup.find_all('script', {'type': 'application/ld+json'})
-    schema_text = ' '.join(s.string or '' for s in json_ld).lower()
-    schema_types = len(re.findall(r'"@type"\s*:\s*"(\w+)"', schema_text))
-    signals['schema_richness'] = min(1.0, schema_types * 0.25)
-
-    # Signal 7: FAQ/Q&A density (AEO signal)
-    questions = text.count('?')
-    has_faq_schema = 'faqpage' in schema_text
-    signals['faq_density'] = min(1.0, (questions * 0.1) + (0.3 if has_faq_schema else 0.0))
-
-    # Signal 8: Direct answer formatting (AEO signal)
-    has_definitions = bool(re.search(r'\b(is a|refers to|is defined as|means that)\b', text.lower()))
-    lists = soup.find_all(['ul', 'ol'])
-    tables = soup.find_all('table')
-    signals['answer_formatting'] = min(1.0, (0.3 if has_definitions else 0.0) + len(lists) * 0.08 + len(tables) * 0.15)
-
-    # Signal 9: E-E-A-T signals
-    has_author = bool(re.search(r'(author|written by|posted by|dr\.|phd)', text.lower()))
-    has_date = bool(re.search(r'(202[4-6]|updated|as of|last modified)', text.lower()))
-    has_citations = bool(re.search(r'(according to|source:|study|research shows|data from)', text.lower()))
-    signals['eeat_signals'] = (0.35 if has_author else 0.0) + (0.35 if has_date else 0.0) + (0.3 if has_citations else 0.0)
-
-    # Signal 10: Internal linking
-    all_links = soup.find_all('a', href=True)
-    internal = [l for l in all_links if parsed.netloc in urljoin(url, l.get('href', ''))]
-    signals['internal_linking'] = min(1.0, len(internal) * 0.1)
-
-    # Signal 11: Keyword density (not too low, not too high)
-    kw_count = text.lower().count(kw_lower)
-    kw_density = kw_count / max(word_count, 1) * 100
-    signals['keyword_density'] = 1.0 if 0.5 <= kw_density <= 2.5 else (0.5 if kw_density < 0.5 else 0.3)
-
-    # Signal 12: External authority links
-    external = [l for l in all_links if l.get('href', '').startswith('http') and parsed.netloc not in l.get('href', '')]
-    signals['external_authority'] = min(1.0, len(external) * 0.15)
-
-    # Weighted composite score (0-100)
-    weights = {
-        'title_keyword_match': 12, 'meta_keyword_match': 8, 'h1_keyword_match': 10,
-        'content_depth': 12, 'heading_structure': 8, 'schema_richness': 10,
-        'faq_density': 8, 'answer_formatting': 8, 'eeat_signals': 10,
-        'internal_linking': 5, 'keyword_density': 5, 'external_authority': 4
-    }
-    composite = sum(signals[k] * weights[k] for k in signals) / sum(weights.values()) * 100
-
-    # Predict SERP position (inverse of composite — higher score = lower position number = better rank)
-    if composite >= 85: predicted_position = max(1, round(11 - composite / 10))
-    elif composite >= 70: predicted_position = round(15 - composite / 8)
-    elif composite >= 50: predicted_position = round(30 - composite / 5)
-    elif composite >= 30: predicted_position = round(50 - composite / 3)
-    else: predicted_position = round(80 - composite / 2)
-    predicted_position = max(1, min(100, predicted_position))
-
-    # Confidence based on signal consistency
-    signal_values = list(signals.values())
-    avg_signal = sum(signal_values) / len(signal_values)
-    variance = sum((s - avg_signal) ** 2 for s in signal_values) / len(signal_values)
-    confidence = max(30, min(95, round(85 - variance * 100)))
+def psie_analyze_page(url, soup, text, keyword, html=None):
+    """Core PSIE analysis — combines scoring signals into a ranking prediction.
 
-    return {
-        'signals': {k: round(v, 3) for k, v in signals.items()},
-        'composite_score': round(composite, 1),
-        'predicted_position': predicted_position,
-        'confidence': confidence,
-        'word_count': word_count,
-    }
+    Keyword-independent features come from psie_engine (cached by content hash
+    when ``html`` is given); see psie_engine for the signal definitions.
+    """
+    from psie_engine import extract_page_features, analyze
+    return analyze(extract_page_features(url, soup, text, html=html), keyword)
 
 
 def psie_generate_optimizations(signals, keyword, composite, predicted_position):
@@ -3604,7 +3609,7 @@ def psie_predict():
 
         resp, soup, load_time = fetch_website(url)
         text = soup.get_text(separator=' ', strip=True)
-        analysis = psie_analyze_page(url, soup, text, keyword)
+        analysis = psie_analyze_page(url, soup, text, keyword, html=resp.content)
 
         return jsonify({
             'status': 'success',
@@ -3622,6 +3627,81 @@ def psie_predict():
         return jsonify({'error': f'PSIE prediction failed: {str(e)}'}), 500
 
 
+PSIE_BATCH_MAX_URLS = 50
+PSIE_BATCH_MAX_KEYWORDS = 500
+
+
+def _psie_page_features(url):
+    """Fetch a page and return its PSIE features, skipping the HTML parse on a cache hit."""
+    from bs4 import BeautifulSoup
+    from psie_engine import cached_features, extract_page_features
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    resp = requests.get(url, headers=headers, timeout=15)
+    resp.raise_for_status()
+    features = cached_features(url, resp.content)
+    if features is None:
+        soup = BeautifulSoup(resp.content, 'html.parser')
+        text = soup.get_text(separator=' ', strip=True)
+        features = extract_page_features(url, soup, text, html=resp.content)
+    return features
+
+
+@app.route('/api/psie/batch', methods=['POST'])
+def psie_batch():
+    """PSIE — rank a whole keyword list against a set of URLs in one call.
+
+    Body JSON:
+        {
+            "urls": ["https://example.com/a", ...],      (max 50)
+            "keywords": ["keyword one", ...],            (max 500)
+            "include_signals": false                     (optional per-pair signal breakdown)
+        }
+    Pages are fetched concurrently and analysed once each; every page × keyword
+    pair is then scored in a single matrix pass.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from psie_engine import batch_predict, cache_stats
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid JSON'}), 400
+        urls = [u.strip() for u in (data.get('urls') or []) if isinstance(u, str) and u.strip()]
+        keywords = [k.strip() for k in (data.get('keywords') or []) if isinstance(k, str) and k.strip()]
+        urls = [u if u.startswith('http') else 'https://' + u for u in dict.fromkeys(urls)]
+        keywords = list(dict.fromkeys(keywords))
+        if not urls or not keywords:
+            return jsonify({'error': 'Both urls and keywords are required'}), 400
+        if len(urls) > PSIE_BATCH_MAX_URLS or len(keywords) > PSIE_BATCH_MAX_KEYWORDS:
+            return jsonify({'error': f'Limit is {PSIE_BATCH_MAX_URLS} urls and {PSIE_BATCH_MAX_KEYWORDS} keywords per request'}), 400
+
+        t0 = time.time()
+        pages, errors = [], []
+        with ThreadPoolExecutor(max_workers=min(len(urls), 8)) as pool:
+            for url, fut in [(u, pool.submit(_psie_page_features, u)) for u in urls]:
+                try:
+                    pages.append(fut.result())
+                except Exception as e:
+                    errors.append({'url': url, 'error': str(e)[:200]})
+        fetch_time = time.time() - t0
+
+        result = batch_predict(pages, keywords, include_signals=bool(data.get('include_signals')))
+        return jsonify({
+            'status': 'success',
+            'url_count': len(pages),
+            'keyword_count': len(keywords),
+            'pair_count': len(result['results']),
+            'results': result['results'],
+            'best_by_keyword': result['best_by_keyword'],
+            'errors': errors,
+            'feature_cache': cache_stats(),
+            'fetch_time': round(fetch_time, 2),
+            'score_time': round(time.time() - t0 - fetch_time, 3),
+            'analyzed_at': datetime.utcnow().isoformat()
+        })
+    except Exception as e:
+        return jsonify({'error': f'PSIE batch prediction failed: {str(e)}'}), 500
+
+
 @app.route('/api/psie/optimize', methods=['POST'])
 def psie_optimize():
     """PSIE — Predict ranking AND return ranked optimization recommendations."""
@@ -3638,7 +3718,7 @@ def psie_optimize():
 
         resp, soup, load_time = fetch_website(url)
         text = soup.get_text(separator=' ', strip=True)
-        analysis = psie_analyze_page(url, soup, text, keyword)
+        analysis = psie_analyze_page(url, soup, text, keyword, html=resp.content)
         optimizations = psie_generate_optimizations(
             analysis['signals'], keyword, analysis['composite_score'], analysis['predicted_position']
         )
@@ -3911,6 +3991,72 @@ def _build_council_context(url, soup, text, keyword):
     }
 
 
+# Weighted overall score: AEO 30%, SEO 25%, Content 20%, Competitor 15%, GEO 10%
+COUNCIL_WEIGHTS = {'aeo': 0.30, 'seo': 0.25, 'content': 0.20, 'competitor': 0.15, 'geo': 0.10}
+
+
+def _council_request_args(data):
+    """Normalise url/keyword/use_llm from a council request body or query string."""
+    url = (data.get('url') or '').strip()
+    keyword = (data.get('keyword') or '').strip()
+    use_llm = data.get('use_llm', True)  # Allow forcing rule-based for testing
+    if isinstance(use_llm, str):
+        use_llm = use_llm.lower() not in ('0', 'false', 'no')
+    if url and not url.startswith('http'):
+        url = 'https://' + url
+    return url, keyword, use_llm
+
+
+def _council_rule_based(url, soup, text, keyword):
+    """Rule-based agent outputs keyed by agent (cheap, deterministic, always succeed)."""
+    return {
+        'aeo':        council_aeo_agent(soup, text, keyword),
+        'seo':        council_seo_agent(url, soup, text, keyword),
+        'content':    council_content_agent(text, soup),
+        'competitor': council_competitor_agent(url, soup, text, keyword),
+        'geo':        council_geo_agent(soup, text, url),
+    }
+
+
+def _council_overall(agents_by_key):
+    return round(sum(agents_by_key[k]['score'] * w for k, w in COUNCIL_WEIGHTS.items()))
+
+
+def _council_summary(agents, keyword, url, overall, use_llm):
+    """Moderator synthesis (deadline-bounded) with the simple call_llm() fallback."""
+    council_summary = None
+    if use_llm:
+        try:
+            from council_agents import run_moderator_with_timeout
+            council_summary = run_moderator_with_timeout(agents, keyword, overall)
+        except Exception as e:
+            app.logger.warning("Moderator failed, falling back to simple LLM: %s", e)
+
+    # Fallback summary path if moderator couldn't run
+    if not council_summary:
+        all_recs = []
+        for a in agents:
+            all_recs.extend([(a['agent'], r) for r in a.get('top_recommendations', [])[:2]])
+        if all_recs:
+            recs_text = '\n'.join(f"- {agent}: {rec}" for agent, rec in all_recs)
+            prompt = f"""You are the moderator of an AI Council analyzing a webpage for "{keyword or url}". Five specialist agents have reviewed the page. Overall score: {overall}/100.
+
+Agent findings:
+{recs_text}
+
+As the council moderator, produce:
+1. A 2-sentence executive summary of the page's strengths and weaknesses
+2. The top 5 priority actions ranked by impact, resolving any conflicts between agents
+3. One bold strategic recommendation that would have the biggest single impact
+
+Be concise and actionable. Format as a numbered list."""
+            try:
+                council_summary = call_llm(prompt, timeout=15)
+            except Exception:
+                pass
+    return council_summary
+
+
 @app.route('/api/council/analyze', methods=['POST'])
 def council_analyze():
     """AI Council — 5 specialized agents from 4 different companies produce a unified action plan.
@@ -3924,92 +4070,39 @@ def council_analyze():
       Moderator  → Claude Sonnet 4       (Anthropic)
 
     Rule-based scoring is computed first and passed as a fallback so the Council
-    always returns a result, even if one or more LLM calls fail.
+    always returns a result, even if one or more LLM calls fail. The five agents
+    run concurrently under one deadline (COUNCIL_DEADLINE); any agent that has
+    not answered in time is reported with its rule-based result.
     """
     try:
         data = request.get_json(silent=True)
         if not data:
             return jsonify({'error': 'Invalid JSON'}), 400
-        url = (data.get('url') or '').strip()
-        keyword = (data.get('keyword') or '').strip()
-        use_llm = data.get('use_llm', True)  # Allow forcing rule-based for testing
+        url, keyword, use_llm = _council_request_args(data)
         if not url:
             return jsonify({'error': 'url is required'}), 400
-        if not url.startswith('http'):
-            url = 'https://' + url
 
         resp, soup, load_time = fetch_website(url)
         text = soup.get_text(separator=' ', strip=True)
 
-        # Step 1 — compute rule-based agent outputs (cheap, deterministic, always succeed)
-        rb_agents = [
-            council_aeo_agent(soup, text, keyword),
-            council_seo_agent(url, soup, text, keyword),
-            council_content_agent(text, soup),
-            council_competitor_agent(url, soup, text, keyword),
-            council_geo_agent(soup, text, url),
-        ]
+        # Step 1 — compute rule-based agent outputs
+        rb_agents = _council_rule_based(url, soup, text, keyword)
+        agents = [rb_agents[k] for k in COUNCIL_WEIGHTS]
+        AGENT_MODEL_LABELS = {}
 
-        # Step 2 — upgrade each agent via its assigned Bedrock model (with fallback)
+        # Step 2 — upgrade all agents concurrently via their assigned models (with fallback)
         if use_llm:
             try:
-                from council_agents import (
-                    run_aeo_agent, run_seo_agent, run_content_agent,
-                    run_competitor_agent, run_geo_agent, run_moderator,
-                    AGENT_MODEL_LABELS,
-                )
+                from council_agents import run_council_agents, AGENT_MODEL_LABELS
                 ctx = _build_council_context(url, soup, text, keyword)
-                agents = [
-                    run_aeo_agent(ctx, rb_agents[0]),
-                    run_seo_agent(ctx, rb_agents[1]),
-                    run_content_agent(ctx, rb_agents[2]),
-                    run_competitor_agent(ctx, rb_agents[3]),
-                    run_geo_agent(ctx, rb_agents[4]),
-                ]
+                agents = run_council_agents(ctx, rb_agents)
             except Exception as e:
                 app.logger.warning("Council LLM path failed, using rule-based: %s", e)
-                agents = rb_agents
-                run_moderator = None
-                AGENT_MODEL_LABELS = {}
-        else:
-            agents = rb_agents
-            run_moderator = None
-            AGENT_MODEL_LABELS = {}
-
-        # Weighted overall score: AEO 30%, SEO 25%, Content 20%, Competitor 15%, GEO 10%
-        weights = [0.30, 0.25, 0.20, 0.15, 0.10]
-        overall = round(sum(a['score'] * w for a, w in zip(agents, weights)))
-
-        # Step 3 — Moderator (Claude Sonnet 4) synthesizes the 5 reports
-        council_summary = None
-        if use_llm and run_moderator:
-            try:
-                council_summary = run_moderator(agents, keyword, overall)
-            except Exception as e:
-                app.logger.warning("Moderator failed, falling back to simple LLM: %s", e)
-
-        # Fallback summary path if moderator couldn't run
-        if not council_summary:
-            all_recs = []
-            for a in agents:
-                all_recs.extend([(a['agent'], r) for r in a.get('top_recommendations', [])[:2]])
-            if all_recs:
-                recs_text = '\n'.join(f"- {agent}: {rec}" for agent, rec in all_recs)
-                prompt = f"""You are the moderator of an AI Council analyzing a webpage for "{keyword or url}". Five specialist agents have reviewed the page. Overall score: {overall}/100.
-
-Agent findings:
-{recs_text}
 
-As the council moderator, produce:
-1. A 2-sentence executive summary of the page's strengths and weaknesses
-2. The top 5 priority actions ranked by impact, resolving any conflicts between agents
-3. One bold strategic recommendation that would have the biggest single impact
+        overall = _council_overall(dict(zip(COUNCIL_WEIGHTS, agents)))
 
-Be concise and actionable. Format as a numbered list."""
-                try:
-                    council_summary = call_llm(prompt, timeout=15)
-                except Exception:
-                    pass
+        # Step 3 — Moderator synthesizes the 5 reports
+        council_summary = _council_summary(agents, keyword, url, overall, use_llm)
 
         return jsonify({
             'status': 'success',
@@ -4028,6 +4121,74 @@ Be concise and actionable. Format as a numbered list."""
         return jsonify({'error': f'Council analysis failed: {str(e)}'}), 500
 
 
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@app.route('/api/council/analyze/stream', methods=['GET', 'POST'])
+def council_analyze_stream():
+    """AI Council as Server-Sent Events.
+
+    Same inputs as /api/council/analyze (JSON body, or query string for EventSource).
+    Emits one ``agent`` event per verdict as it arrives, then ``summary`` with the
+    overall score and moderator plan, then ``done``. Errors arrive as ``error``.
+    """
+    from flask import Response, stream_with_context
+
+    data = request.get_json(silent=True) or request.args.to_dict()
+    url, keyword, use_llm = _council_request_args(data)
+    if not url:
+        return jsonify({'error': 'url is required'}), 400
+
+    def generate():
+        t0 = time.time()
+        try:
+            resp, soup, load_time = fetch_website(url)
+            text = soup.get_text(separator=' ', strip=True)
+        except Exception as e:
+            yield _sse('error', {'error': f'fetch failed: {str(e)}'})
+            return
+
+        rb_agents = _council_rule_based(url, soup, text, keyword)
+        yield _sse('start', {'url': url, 'keyword': keyword or '(not specified)',
+                             'agents': list(COUNCIL_WEIGHTS), 'load_time': round(load_time, 2)})
+
+        by_key = {}
+        moderator_model = None
+        if use_llm:
+            try:
+                from council_agents import iter_council_agents, AGENT_MODEL_LABELS
+                moderator_model = AGENT_MODEL_LABELS.get('moderator')
+                ctx = _build_council_context(url, soup, text, keyword)
+                for ev in iter_council_agents(ctx, rb_agents):
+                    by_key[ev['key']] = ev['agent']
+                    yield _sse('agent', {'agent_key': ev['key'], 'agent': ev['agent'],
+                                         'elapsed': ev['elapsed'], 'timed_out': ev['timed_out']})
+            except Exception as e:
+                app.logger.warning("Council stream LLM path failed, using rule-based: %s", e)
+
+        for key in COUNCIL_WEIGHTS:
+            if key not in by_key:
+                by_key[key] = rb_agents[key]
+                yield _sse('agent', {'agent_key': key, 'agent': rb_agents[key],
+                                     'elapsed': round(time.time() - t0, 2), 'timed_out': False})
+
+        agents = [by_key[k] for k in COUNCIL_WEIGHTS]
+        overall = _council_overall(by_key)
+        council_summary = _council_summary(agents, keyword, url, overall, use_llm)
+        yield _sse('summary', {
+            'overall_score': overall,
+            'council_summary': council_summary,
+            'moderator_model': moderator_model,
+            'powered_by': 'Multi-LLM AI Council' if use_llm else 'Rule-based Council',
+            'elapsed': round(time.time() - t0, 2),
+        })
+        yield _sse('done', {'analyzed_at': datetime.utcnow().isoformat()})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 @app.route('/api/council/status', methods=['GET'])
 def council_status():
     """Report which LLM providers are configured for the council. No secrets leaked."""
@@ -4312,27 +4473,33 @@ def geo_probe_batch():
 
 
 @app.route('/api/geo-probe/history', methods=['GET'])
+@cached('geo-probes')
 def geo_probe_history():
     """Return probe history ΓÇö batch summaries + individual probes from RDS."""
     from geo_probe_service import get_history, get_stored_history
     brand = request.args.get('brand')
     ai_model = request.args.get('ai_model')
     limit = int(request.args.get('limit', 50))
+    errors = []
     try:
         batch = get_history()
     except Exception as e:
         batch = []
+        errors.append(f'batch history: {e}')
         app.logger.error("Failed to load batch history: %s", e)
     try:
         stored = get_stored_history(limit=limit, brand=brand, ai_model=ai_model)
     except Exception as e:
         stored = []
+        errors.append(f'stored history: {e}')
         app.logger.error("Failed to load stored history: %s", e)
+    # A backend failure is a 503, so @cached doesn't keep the partial result
     return jsonify({
         'batch_history': batch,
         'stored_results': stored,
-        'db_status': 'ok' if (batch or stored) else 'empty_or_unreachable',
-    })
+        'db_status': 'unreachable' if errors else ('ok' if (batch or stored) else 'empty'),
+        **({'errors': errors} if errors else {}),
+    }), 503 if errors else 200
 
 
 @app.route('/api/geo-probe/schedule', methods=['POST'])
@@ -4374,14 +4541,47 @@ def scheduler_register_brand():
 @app.route('/api/scheduler/status', methods=['GET'])
 def scheduler_status():
     """Check scheduler status and registered brands."""
-    from scheduler import get_monitored_brands, _scheduler_started
+    from scheduler import (get_monitored_brands, get_scheduler_status, SCRAPER_INTERVAL,
+                           GEO_PROBE_INTERVAL, SPORTS_SYNC_INTERVAL)
     return jsonify({
-        'scheduler_running': _scheduler_started,
+        **get_scheduler_status(),
         'monitored_brands': get_monitored_brands(),
-        'schedule': {'scraper': 'every 24h', 'geo_probes': 'every 6h'},
+        'schedule': {'scraper': f'every {SCRAPER_INTERVAL // 3600}h',
+                     'geo_probes': f'every {GEO_PROBE_INTERVAL // 3600}h',
+                     'sports_sync': f'every {SPORTS_SYNC_INTERVAL // 3600}h'},
     })
 
 
+@app.route('/api/db/pool-stats', methods=['GET'])
+def db_pool_stats():
+    """Shared Postgres pool usage and checkout waits for this worker."""
+    try:
+        from pg_pool import pool_stats
+        return jsonify({'pid': os.getpid(), **pool_stats()})
+    except ImportError as e:
+        return jsonify({'created': False, 'error': str(e)}), 503
+
+
+@app.route('/api/cache/response-stats', methods=['GET'])
+def response_cache_stats_endpoint():
+    """Response cache hits, misses, 304s and invalidations for this worker."""
+    return jsonify({'pid': os.getpid(), **response_cache_stats()})
+
+
+@app.route('/api/aws/client-stats', methods=['GET'])
+def aws_client_stats():
+    """Call counts, retries and latency per AWS service/operation for this worker."""
+    from aws_clients import client_stats
+    return jsonify({'pid': os.getpid(), 'services': client_stats()})
+
+
+@app.route('/api/blueprints/status', methods=['GET'])
+def blueprints_status():
+    """Which on-demand feature modules this worker has loaded, and how long each took."""
+    return jsonify({'pid': os.getpid(), 'lazy': lazy_blueprints.enabled,
+                    'modules': lazy_blueprints.status()})
+
+
 @app.route('/api/geo-probe/compare', methods=['POST'])
 def geo_probe_compare():
     """Compare brand visibility across ALL available AI providers simultaneously."""
@@ -4550,10 +4750,23 @@ def aeo_analyze():
 
 # ============== AEO VISIBILITY (LLM Mention Detection) ==============
 
+def _aeo_results_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'aeo_results.json')
+
+
+def _aeo_results_mtime():
+    """Cache key part for /api/aeo-results — the file is rewritten by services/aeo_engine.py."""
+    try:
+        return os.path.getmtime(_aeo_results_path())
+    except OSError:
+        return None
+
+
 @app.route('/api/aeo-results')
+@cached('aeo-results', vary=_aeo_results_mtime)
 def aeo_visibility_results():
     """Return AEO visibility data — LLM mention detection results + score."""
-    results_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'aeo_results.json')
+    results_path = _aeo_results_path()
     if not os.path.exists(results_path):
         return jsonify({'error': 'No AEO results yet. Run: python services/aeo_engine.py'}), 404
     try:
@@ -4970,6 +5183,7 @@ def _score_to_grade(score):
 
 
 @app.route('/api/geo-scanner/history', methods=['GET'])
+@cached('geo-scans')
 def geo_scanner_history():
     """GET /api/geo-scanner/history ΓÇö retrieve past GEO scanner scan results."""
     brand = request.args.get('brand', request.args.get('brand_name', ''))
@@ -4982,7 +5196,7 @@ def geo_scanner_history():
         scans = repo.get_scans(brand, limit=limit)
         return jsonify({'brand': brand, 'scans': scans, 'count': len(scans)})
     except Exception as e:
-        return jsonify({'brand': brand, 'scans': [], 'error': str(e)})
+        return jsonify({'brand': brand, 'scans': [], 'error': str(e)}), 503
 
 
 @app.route('/api/geo-scanner/agents', methods=['GET'])
@@ -5227,6 +5441,13 @@ def data_ai_visibility_trend():
         return jsonify({'brand': brand, 'trend': [], 'error': str(e)})
 
 
+@app.route('/api/data/probe-archive/stats', methods=['GET'])
+def data_probe_archive_stats():
+    """GET /api/data/probe-archive/stats — local columnar archive writes, syncs and query times."""
+    from probe_archive import archive_stats
+    return jsonify(archive_stats())
+
+
 @app.route('/api/data/ai-visibility', methods=['POST'])
 def data_ai_visibility():
     """POST /api/data/ai-visibility ΓÇö persist batch visibility results."""
@@ -5664,11 +5885,7 @@ def social_delete_post(post_id):
 
 
 # --- Growth plan Blueprint (isolated in growth/ directory) ---
-try:
-    from growth import growth_bp
-    app.register_blueprint(growth_bp)
-except Exception as e:
-    print(f"ΓÜá growth Blueprint: {e}")
+lazy_blueprints.add('growth Blueprint', ['/api/growth'], 'growth', 'growth_bp')
 
 # --- Backlink Analysis Module (Dev 3 - Troy) ---
 try:
@@ -5733,8 +5950,8 @@ def contact_form():
     if not name or not email or not message:
         return jsonify({'status': 'error', 'message': 'name, email, and message required'}), 400
     try:
-        import boto3
-        ses = boto3.client('ses', region_name='us-east-1')
+        from aws_clients import get_client
+        ses = get_client('ses', 'us-east-1')
         ses.send_email(
             Source='no-reply@ai1stseo.com',
             Destination={'ToAddresses': ['support@ai1stseo.com']},
@@ -5762,8 +5979,8 @@ def investor_inquiry():
     if not name or not email or not message:
         return jsonify({'status': 'error', 'message': 'name, email, and message required'}), 400
     try:
-        import boto3
-        ses = boto3.client('ses', region_name='us-east-1')
+        from aws_clients import get_client
+        ses = get_client('ses', 'us-east-1')
         subject = 'Investor Inquiry: {} ({})'.format(name, org or email)
         body = 'From: {} <{}>\nOrganization: {}\nInterest: {}\n\n{}'.format(
             name, email, org or 'N/A', interest, message)
@@ -5841,18 +6058,32 @@ def get_content_freshness():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
-try:
-    from social_publishing.api import register_blueprint as register_publish_bp
-    register_publish_bp(app)
-except Exception as e:
-    print(f"⚠ social_publishing Blueprint: {e}")
+lazy_blueprints.add('social_publishing Blueprint', ['/api/publish'], 'social_publishing.api',
+                    register='register_blueprint')
 
 # --- System activation (non-blocking) ---
 _queue_worker_ok = False
 _duplicate_detector_ok = False
 _publish_api_ok = "social_publish" in app.blueprints
+_publish_api_lazy = lazy_blueprints.pending('social_publishing Blueprint')
 _visitor_tracking_ok = "visitor_tracking" in app.blueprints
 
+# Lazily registered Blueprints would otherwise create their tables only on
+# the first request under their prefix, but the queue worker and pipeline
+# hooks write to them from the start. The worker creates its own tables
+# before polling (social_publishing.queue.ensure_tables); growth's are
+# created here in the background so boot and Lambda cold starts don't wait.
+def _init_growth_tables():
+    try:
+        from growth.growth_api import init_tables
+        init_tables()
+    except Exception as e:
+        print(f"⚠ growth table init: {e}")
+
+
+if not IS_LAMBDA:
+    _log_threading.Thread(target=_init_growth_tables, name='growth-table-init', daemon=True).start()
+
 try:
     from social_publishing.queue import start_worker
     start_worker()
@@ -5871,7 +6102,7 @@ except Exception as e:
 print("\n" + "=" * 48)
 print("  SYSTEM STATUS")
 print("=" * 48)
-print(f"  Publishing API:       {'ACTIVE' if _publish_api_ok else 'INACTIVE'}")
+print(f"  Publishing API:       {'ACTIVE' if _publish_api_ok else 'ON DEMAND' if _publish_api_lazy else 'INACTIVE'}")
 print(f"  Queue Worker:         {'ACTIVE' if _queue_worker_ok else 'INACTIVE'}")
 print(f"  Duplicate Detection:  {'ACTIVE' if _duplicate_detector_ok else 'INACTIVE'}")
 print(f"  Visitor Tracking:     {'ACTIVE' if _visitor_tracking_ok else 'INACTIVE'}")
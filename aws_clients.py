@@ -0,0 +1,154 @@
+"""
+aws_clients.py
+Process-wide registry of shared boto3 clients and resources.
+
+Creating a boto3 client costs endpoint resolution, a walk of the
+credential chain and a new urllib3 pool (10 connections by default);
+modules that did it per call, or kept one each, paid that over and over.
+get_client() / get_resource() hand out one lazily created instance per
+(service, region), built under a lock and re-created after fork, with:
+
+  - AWS_MAX_POOL_CONNECTIONS (default 50) connections per client
+  - TCP keep-alive
+  - adaptive retry mode (client-side rate limiting on throttles),
+    AWS_MAX_ATTEMPTS attempts (default 5)
+  - AWS_CONNECT_TIMEOUT / AWS_READ_TIMEOUT (default 5s / 60s)
+  - per-service call timing — client_stats() reports calls, errors,
+    retries and latency per service/operation
+
+Usage:
+    from aws_clients import get_client, get_resource
+    table = get_resource('dynamodb').Table(TABLE_NAME)
+    get_client('ses').send_email(...)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGION = os.environ.get('AWS_REGION', 'us-east-1')
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '50'))
+MAX_ATTEMPTS = int(os.environ.get('AWS_MAX_ATTEMPTS', '5'))
+CONNECT_TIMEOUT = float(os.environ.get('AWS_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.environ.get('AWS_READ_TIMEOUT', '60'))
+
+# Services whose calls legitimately run long (model inference)
+_READ_TIMEOUT_OVERRIDES = {'bedrock-runtime': 300.0}
+
+_lock = threading.Lock()
+_clients: Dict[Tuple, object] = {}
+_resources: Dict[Tuple, object] = {}
+_session = None
+_pid = None
+
+_stats: Dict[str, Dict] = {}
+_stats_lock = threading.Lock()
+
+
+def client_config(service: str) -> Config:
+    return Config(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        retries={'mode': 'adaptive', 'max_attempts': MAX_ATTEMPTS},
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=_READ_TIMEOUT_OVERRIDES.get(service, READ_TIMEOUT),
+    )
+
+
+def _check_fork():
+    """Drop everything inherited from a parent process (sockets must not be shared)."""
+    global _session, _pid
+    if _pid != os.getpid():
+        _clients.clear()
+        _resources.clear()
+        _session = boto3.session.Session()
+        _pid = os.getpid()
+
+
+# ── Call timing ─────────────────────────────────────────────────────────── #
+
+def _before_call(model=None, context=None, **kwargs):
+    if context is not None and model is not None:
+        context['_aws_clients'] = (time.perf_counter(), model.service_model.service_name, model.name)
+
+
+def _after_call(context=None, parsed=None, exception=None, **kwargs):
+    started = (context or {}).pop('_aws_clients', None)
+    if started is None:
+        return
+    t0, service, operation = started
+    elapsed = (time.perf_counter() - t0) * 1000
+    meta = parsed.get('ResponseMetadata', {}) if isinstance(parsed, dict) else {}
+    failed = exception is not None or meta.get('HTTPStatusCode', 200) >= 400
+    with _stats_lock:
+        for key in (service, f'{service}.{operation}'):
+            s = _stats.setdefault(key, {'calls': 0, 'errors': 0, 'retries': 0,
+                                        'total_ms': 0.0, 'max_ms': 0.0})
+            s['calls'] += 1
+            s['errors'] += int(failed)
+            s['retries'] += int(meta.get('RetryAttempts', 0))
+            s['total_ms'] += elapsed
+            s['max_ms'] = max(s['max_ms'], elapsed)
+
+
+def _instrument(client):
+    events = client.meta.events
+    events.register('before-call.*', _before_call)
+    events.register('after-call.*', _after_call)
+    events.register('after-call-error.*', _after_call)
+    return client
+
+
+# ── Registry ────────────────────────────────────────────────────────────── #
+
+def get_client(service: str, region: str = None):
+    """Shared low-level client for ``service`` in ``region`` (thread-safe)."""
+    key = (service, region or DEFAULT_REGION)
+    client = _clients.get(key) if _pid == os.getpid() else None
+    if client is None:
+        with _lock:
+            _check_fork()
+            client = _clients.get(key)
+            if client is None:
+                client = _instrument(_session.client(
+                    service, region_name=key[1], config=client_config(service)))
+                _clients[key] = client
+    return client
+
+
+def get_resource(service: str, region: str = None):
+    """Shared boto3 resource for ``service`` in ``region``.
+
+    Resources are shared the same way the module-level ``_ddb`` globals
+    always were; their underlying client is instrumented and tuned like
+    get_client()'s.
+    """
+    key = (service, region or DEFAULT_REGION)
+    resource = _resources.get(key) if _pid == os.getpid() else None
+    if resource is None:
+        with _lock:
+            _check_fork()
+            resource = _resources.get(key)
+            if resource is None:
+                resource = _session.resource(service, region_name=key[1],
+                                             config=client_config(service))
+                _instrument(resource.meta.client)
+                _resources[key] = resource
+    return resource
+
+
+def client_stats() -> Dict[str, Dict]:
+    """Per-service and per-operation call counts and latency since process start."""
+    with _stats_lock:
+        out = {}
+        for key, s in sorted(_stats.items()):
+            out[key] = {**s, 'total_ms': round(s['total_ms'], 1), 'max_ms': round(s['max_ms'], 1),
+                        'avg_ms': round(s['total_ms'] / s['calls'], 1) if s['calls'] else 0.0}
+        return out
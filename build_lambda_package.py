@@ -10,6 +10,7 @@ ROOT_FILES = [
     ("app.py", "app.py"),
     ("database.py", "database.py"),
     ("scheduler.py", "scheduler.py"),
+    ("job_scheduler.py", "job_scheduler.py"),
     ("bedrock_helper.py", "bedrock_helper.py"),
     ("openclaw_real_routes.py", "openclaw_real_routes.py"),
     ("openclaw_real.py", "openclaw_real.py"),
@@ -17,6 +18,13 @@ ROOT_FILES = [
     ("geo_probe_service.py", "geo_probe_service.py"),
     ("db_dynamo.py", "db_dynamo.py"),
     ("db.py", "db.py"),
+    ("pg_pool.py", "pg_pool.py"),
+    ("aws_clients.py", "aws_clients.py"),
+    ("lazy_blueprints.py", "lazy_blueprints.py"),
+    ("probe_archive.py", "probe_archive.py"),
+    ("report_renderer.py", "report_renderer.py"),
+    ("response_cache.py", "response_cache.py"),
+    ("fast_json.py", "fast_json.py"),
     ("ai_provider.py", "ai_provider.py"),
     ("ai_ranking_service.py", "ai_ranking_service.py"),
     ("ai_chatbot.py", "ai_chatbot.py"),
@@ -30,6 +38,8 @@ ROOT_FILES = [
     ("content_generator.py", "content_generator.py"),
     ("llm_service.py", "llm_service.py"),
     ("month1_api.py", "month1_api.py"),
+    ("site_crawler.py", "site_crawler.py"),
+    ("psie_engine.py", "psie_engine.py"),
 ]
 
 # HTML files to include at root (served by send_from_directory)
@@ -21,11 +21,14 @@ Every agent returns a uniform JSON dict. If any LLM call fails, the rule-based
 fallback from app.py is used so the Council never fully fails on the user.
 """
 
+import copy
 import json
 import logging
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
 
 import requests
 
@@ -67,6 +70,15 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash")
 GEMINI_TIMEOUT = int(os.environ.get("GEMINI_TIMEOUT", "30"))
 
+# Concurrent council execution — one deadline for all five agents. Once
+# COUNCIL_QUORUM agents have reported, stragglers get COUNCIL_GRACE more
+# seconds before their rule-based result is used and the moderator starts.
+COUNCIL_DEADLINE = float(os.environ.get("COUNCIL_DEADLINE", "25"))
+COUNCIL_QUORUM = int(os.environ.get("COUNCIL_QUORUM", "4"))
+COUNCIL_GRACE = float(os.environ.get("COUNCIL_GRACE", "3"))
+COUNCIL_MODERATOR_TIMEOUT = float(os.environ.get("COUNCIL_MODERATOR_TIMEOUT", "35"))
+COUNCIL_MAX_WORKERS = int(os.environ.get("COUNCIL_MAX_WORKERS", "16"))
+
 
 # ── Provider adapters ────────────────────────────────────────────────────── #
 
@@ -552,6 +564,108 @@ def run_moderator(agents: list, keyword: str, overall_score: int) -> str:
         return None
 
 
+# ── Concurrent council execution ─────────────────────────────────────────── #
+
+AGENT_ORDER = ("aeo", "seo", "content", "competitor", "geo")
+
+AGENT_RUNNERS = {
+    "aeo":        run_aeo_agent,
+    "seo":        run_seo_agent,
+    "content":    run_content_agent,
+    "competitor": run_competitor_agent,
+    "geo":        run_geo_agent,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool shared by every council request.
+
+    Late LLM calls cannot be cancelled mid-flight, so they finish on this pool
+    after the request has already answered with the rule-based result.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=COUNCIL_MAX_WORKERS, thread_name_prefix="council"
+                )
+    return _executor
+
+
+def iter_council_agents(ctx: dict, fallbacks: dict, deadline: float = None,
+                        quorum: int = None, grace: float = None):
+    """Run the five agents concurrently, yielding each result as it settles.
+
+    Yields dicts ``{"key", "agent", "elapsed", "timed_out"}``. Agents still
+    running when the deadline passes (or when the grace period after quorum
+    expires) are yielded with a copy of their rule-based fallback.
+    """
+    deadline = COUNCIL_DEADLINE if deadline is None else deadline
+    quorum = COUNCIL_QUORUM if quorum is None else quorum
+    grace = COUNCIL_GRACE if grace is None else grace
+
+    t0 = time.time()
+    hard_stop = t0 + deadline
+    pool = _get_executor()
+    # Each runner may stamp "model" onto its fallback, so hand it a private copy.
+    pending = {
+        pool.submit(AGENT_RUNNERS[key], ctx, copy.deepcopy(fallbacks[key])): key
+        for key in AGENT_ORDER
+    }
+    done_count = 0
+
+    while pending:
+        remaining = hard_stop - time.time()
+        if remaining <= 0:
+            break
+        done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = pending.pop(future)
+            try:
+                agent = future.result()
+            except Exception as e:
+                logger.warning("Council agent %s raised, using rule-based: %s", key, e)
+                agent = copy.deepcopy(fallbacks[key])
+                agent["model"] = AGENT_MODEL_LABELS[key] + " (fallback)"
+            done_count += 1
+            yield {"key": key, "agent": agent, "elapsed": round(time.time() - t0, 2), "timed_out": False}
+        if done_count >= quorum:
+            hard_stop = min(hard_stop, time.time() + grace)
+
+    for future, key in pending.items():
+        elapsed = round(time.time() - t0, 2)
+        logger.warning("Council agent %s not done after %.2fs, using rule-based", key, elapsed)
+        agent = copy.deepcopy(fallbacks[key])
+        agent["model"] = AGENT_MODEL_LABELS[key] + " (timeout)"
+        yield {"key": key, "agent": agent, "elapsed": elapsed, "timed_out": True}
+
+
+def run_council_agents(ctx: dict, fallbacks: dict, deadline: float = None,
+                       quorum: int = None, grace: float = None) -> list:
+    """Blocking wrapper around iter_council_agents — results in AGENT_ORDER."""
+    by_key = {
+        ev["key"]: ev["agent"]
+        for ev in iter_council_agents(ctx, fallbacks, deadline=deadline, quorum=quorum, grace=grace)
+    }
+    return [by_key[key] for key in AGENT_ORDER]
+
+
+def run_moderator_with_timeout(agents: list, keyword: str, overall_score: int,
+                               timeout: float = None) -> str:
+    """run_moderator bounded by COUNCIL_MODERATOR_TIMEOUT; returns None if it runs long."""
+    timeout = COUNCIL_MODERATOR_TIMEOUT if timeout is None else timeout
+    future = _get_executor().submit(run_moderator, agents, keyword, overall_score)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        logger.warning("Moderator exceeded %.1fs, skipping", timeout)
+        return None
+
+
 def get_council_status() -> dict:
     """Report which providers are configured, for /health or /status endpoints."""
     return {
@@ -564,4 +678,11 @@ def get_council_status() -> dict:
             key: {"label": AGENT_MODEL_LABELS[key], "provider": AGENT_PROVIDERS[key][0]}
             for key in AGENT_PROVIDERS
         },
+        "execution": {
+            "mode": "concurrent",
+            "deadline_seconds": COUNCIL_DEADLINE,
+            "quorum": COUNCIL_QUORUM,
+            "grace_seconds": COUNCIL_GRACE,
+            "moderator_timeout_seconds": COUNCIL_MODERATOR_TIMEOUT,
+        },
     }
@@ -17,67 +17,21 @@ import json
 import logging
 import os
 import uuid
-from contextlib import contextmanager
 from datetime import datetime, timezone
 
 import psycopg2
 import psycopg2.extras
-from psycopg2 import pool
 
-logger = logging.getLogger(__name__)
+# Connections come from the shared pool, also used by the directory and sports modules.
+from pg_pool import execute_prepared, get_conn
+from response_cache import invalidates
 
-_pool = None
+logger = logging.getLogger(__name__)
 
 # Default project_id — used until multi-tenancy auth is wired up
 DEFAULT_PROJECT_ID = os.environ.get("DEFAULT_PROJECT_ID", "00000000-0000-0000-0000-000000000001")
 
 
-def _get_pool():
-    global _pool
-    if _pool is None:
-        try:
-            _pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
-                host=os.environ.get("DB_HOST", "localhost"),
-                port=int(os.environ.get("DB_PORT", "5432")),
-                dbname=os.environ.get("DB_NAME", "ai1stseo"),
-                user=os.environ.get("DB_USER", "postgres"),
-                password=os.environ.get("DB_PASSWORD", ""),
-            )
-            logger.info("RDS pool created: %s/%s", os.environ.get("DB_HOST"), os.environ.get("DB_NAME"))
-        except Exception as e:
-            logger.error("Failed to create RDS pool: %s", e)
-            raise RuntimeError(f"Database connection failed: {e}")
-    return _pool
-
-
-@contextmanager
-def get_conn():
-    """Check out a connection from the pool, auto-commit/rollback."""
-    p = _get_pool()
-    conn = p.getconn()
-    try:
-        # Test if connection is still alive
-        try:
-            conn.cursor().execute("SELECT 1")
-        except Exception:
-            # Connection is stale — close and get a fresh one
-            try:
-                conn.close()
-            except Exception:
-                pass
-            p.putconn(conn, close=True)
-            conn = p.getconn()
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        p.putconn(conn)
-
-
 # ── Schema init (idempotent) ──────────────────────────────────────────────────
 
 def init_db():
@@ -200,6 +154,7 @@ def _safe_add_columns(cur, table, columns):
 
 # ── geo_probes CRUD ───────────────────────────────────────────────────────────
 
+@invalidates('geo-probes')
 def insert_probe(keyword: str, brand: str, ai_model: str, cited: bool,
                  citation_context: str = None, confidence: float = 0.0,
                  site_url: str = None, response_snippet: str = None,
@@ -210,16 +165,20 @@ def insert_probe(keyword: str, brand: str, ai_model: str, cited: bool,
     with get_conn() as conn:
         cur = conn.cursor()
         row_id = str(uuid.uuid4())
-        cur.execute("""
+        execute_prepared(cur, "insert_probe", """
             INSERT INTO geo_probes
                 (id, project_id, keyword, brand_name, ai_model, cited,
                  citation_context, confidence, url, response_snippet,
                  sentiment, ai_platform, query_text)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $5, $12)
         """, (row_id, pid, keyword, brand, ai_model, cited,
               citation_context, confidence, site_url, response_snippet,
-              sentiment, ai_model, query_text))
-        return row_id
+              sentiment, query_text))
+    from probe_archive import record
+    record('probes', [{'id': row_id, 'project_id': pid, 'brand_name': brand, 'keyword': keyword,
+                       'ai_model': ai_model, 'cited': cited, 'confidence': confidence,
+                       'sentiment': sentiment, 'probe_timestamp': datetime.utcnow().isoformat()}])
+    return row_id
 
 
 def get_probes(limit: int = 50, brand: str = None, ai_model: str = None,
@@ -228,17 +187,21 @@ def get_probes(limit: int = 50, brand: str = None, ai_model: str = None,
     pid = project_id or DEFAULT_PROJECT_ID
     with get_conn() as conn:
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        clauses = ["project_id = %s"]
+        # One prepared statement per filter combination, so each keeps an index-friendly plan
+        clauses = ["project_id = $1"]
         params = [pid]
         if brand:
-            clauses.append("brand_name = %s")
             params.append(brand)
+            clauses.append(f"brand_name = ${len(params)}")
         if ai_model:
-            clauses.append("ai_model = %s")
             params.append(ai_model)
-        where = "WHERE " + " AND ".join(clauses)
+            clauses.append(f"ai_model = ${len(params)}")
         params.append(limit)
-        cur.execute(f"SELECT * FROM geo_probes {where} ORDER BY probe_timestamp DESC LIMIT %s", params)
+        name = "get_probes" + ("_b" if brand else "") + ("_m" if ai_model else "")
+        execute_prepared(cur, name, f"""
+            SELECT * FROM geo_probes WHERE {" AND ".join(clauses)}
+            ORDER BY probe_timestamp DESC LIMIT ${len(params)}
+        """, params)
         rows = cur.fetchall()
         for r in rows:
             # Serialize for JSON
@@ -253,9 +216,35 @@ def get_probes(limit: int = 50, brand: str = None, ai_model: str = None,
         return rows
 
 
+def get_probes_since(brand: str, since: str = None, project_id: str = None) -> list[dict]:
+    """All probes for a brand with probe_timestamp >= since (ISO-8601), oldest first."""
+    pid = project_id or DEFAULT_PROJECT_ID
+    with get_conn() as conn:
+        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        clauses = ["project_id = %s", "brand_name = %s"]
+        params = [pid, brand]
+        if since:
+            clauses.append("probe_timestamp >= %s")
+            params.append(since)
+        cur.execute(f"SELECT * FROM geo_probes WHERE {' AND '.join(clauses)} ORDER BY probe_timestamp ASC",
+                    params)
+        rows = cur.fetchall()
+        for r in rows:
+            for k in ("id", "project_id"):
+                if r.get(k):
+                    r[k] = str(r[k])
+            if r.get("probe_timestamp"):
+                r["probe_timestamp"] = r["probe_timestamp"].isoformat()
+        return rows
+
+
 def get_probe_trend(brand: str, limit: int = 30, project_id: str = None) -> list[dict]:
-    """Daily aggregated visibility trend for a brand."""
+    """Daily aggregated visibility trend for a brand (from the probe archive when available)."""
     pid = project_id or DEFAULT_PROJECT_ID
+    from probe_archive import probe_trend
+    trend = probe_trend(brand, limit, lambda since: get_probes_since(brand, since, pid), pid)
+    if trend is not None:
+        return trend
     with get_conn() as conn:
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         cur.execute("""
@@ -283,6 +272,7 @@ def get_probe_trend(brand: str, limit: int = 30, project_id: str = None) -> list
 
 # ── ai_visibility_history CRUD ────────────────────────────────────────────────
 
+@invalidates('geo-probes')
 def insert_visibility_batch(brand: str, ai_model: str, keyword: str,
                             geo_score: float, cited_count: int,
                             total_prompts: int, batch_results: dict = None,
@@ -338,6 +328,7 @@ def get_visibility_history(limit: int = 20, brand: str = None,
 
 # ── content_briefs CRUD ───────────────────────────────────────────────────────
 
+@invalidates('content-briefs')
 def save_content_brief(keyword: str, content_type: str, brief_json: dict,
                        serp_competitors: list = None, keywords: list = None,
                        target_word_count: int = None, ai_generated: bool = True,
@@ -18,6 +18,8 @@ from decimal import Decimal
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from response_cache import invalidates
+
 logger = logging.getLogger(__name__)
 
 _dynamodb = None
@@ -68,6 +70,7 @@ def init_db():
 
 # ── content_briefs CRUD ───────────────────────────────────────────────────────
 
+@invalidates('content-briefs')
 def save_content_brief(keyword, content_type, brief_json,
                        serp_competitors=None, keywords=None,
                        target_word_count=None, ai_generated=True,
@@ -121,6 +124,7 @@ def get_content_brief_by_id(brief_id, project_id=None):
 
 # ── geo_probes CRUD ───────────────────────────────────────────────────────────
 
+@invalidates('geo-probes')
 def insert_probe(keyword, brand, ai_model, cited,
                  citation_context=None, confidence=0.0,
                  site_url=None, response_snippet=None,
@@ -145,9 +149,12 @@ def insert_probe(keyword, brand, ai_model, cited,
         'probe_timestamp': datetime.utcnow().isoformat(),
     }
     table.put_item(Item=_serialize(item))
+    from probe_archive import record
+    record('probes', [item])
     return row_id
 
 
+@invalidates('geo-probes')
 def insert_visibility_batch(brand, ai_model, keyword,
                             geo_score, cited_count,
                             total_prompts, batch_results=None,
@@ -166,6 +173,8 @@ def insert_visibility_batch(brand, ai_model, keyword,
         'batch_results': batch_results or {},
     }
     table.put_item(Item=_serialize(item))
+    from probe_archive import record
+    record('probes', [item])
     return row_id
 
 
@@ -196,6 +205,27 @@ def get_probes(limit: int = 50, brand: str = None, ai_model: str = None,
     return rows[:limit]
 
 
+def get_probes_since(brand: str, since: str = None, project_id: str = None) -> list:
+    """All probes for a brand with probe_timestamp >= since (ISO-8601), oldest first.
+
+    Queries the brand-index GSI, so the cost is proportional to the number of
+    matching probes rather than the size of the table.
+    """
+    table = _get_table(GEO_PROBES_TABLE)
+    key_cond = Key('brand_name').eq(brand)
+    if since:
+        key_cond = key_cond & Key('probe_timestamp').gte(since)
+    query_kwargs = {'IndexName': 'brand-index', 'KeyConditionExpression': key_cond}
+    rows = []
+    while True:
+        resp = table.query(**query_kwargs)
+        rows.extend(_deserialize(i) for i in resp.get('Items', []))
+        if 'LastEvaluatedKey' not in resp:
+            break
+        query_kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+    return rows
+
+
 def get_visibility_history(limit: int = 20, brand: str = None,
                            project_id: str = None) -> list:
     """Retrieve visibility batch results (rows that have batch_results)."""
@@ -217,7 +247,14 @@ def get_probe_trend(brand: str, limit: int = 30, project_id: str = None) -> list
     """Get daily probe trend for a brand (aggregated by date).
 
     Returns list of dicts: [{date, total, cited, geo_score}, ...]
+    Served from the local probe archive when available (full history);
+    otherwise aggregated from a capped scan.
     """
+    from probe_archive import probe_trend
+    trend = probe_trend(brand, limit, lambda since: get_probes_since(brand, since))
+    if trend is not None:
+        return trend
+
     table = _get_table(GEO_PROBES_TABLE)
     scan_kwargs = {
         'FilterExpression': Attr('brand_name').eq(brand),
@@ -21,9 +21,12 @@ from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
+from dynamo.batch_writes import batch_put
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -39,7 +42,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
@@ -170,9 +173,9 @@ class MultiBrandGeoScores:
         comparison.sort(key=lambda x: x.get('geo_score', 0), reverse=True)
         return comparison
 
-    def seed_brand_score(self, brand: str, week: str, data: Dict):
-        """Write a score entry for a brand (used for seeding demo data)."""
-        item = {
+    @staticmethod
+    def score_item(brand: str, week: str, data: Dict) -> Dict:
+        return {
             'brand': brand,
             'week': week,
             'geo_score': _dec(data.get('geo_score', 0)),
@@ -182,7 +185,10 @@ class MultiBrandGeoScores:
             'provider_scores': json.dumps(data.get('provider_scores', {})),
             'recorded_at': data.get('recorded_at', _now()),
         }
-        self._table.put_item(Item=item)
+
+    def seed_brand_score(self, brand: str, week: str, data: Dict):
+        """Write a score entry for a brand (used for seeding demo data)."""
+        self._table.put_item(Item=self.score_item(brand, week, data))
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -258,11 +264,10 @@ class MultiBrandKeywordPerformance:
         all_items.sort(key=lambda x: x.get('geo_score', 0), reverse=True)
         return all_items
 
-    def seed_keyword_performance(self, brand: str, keyword: str, week: str, data: Dict):
-        """Write a brand-specific keyword performance entry (for seeding)."""
-        composite_key = f'{brand}#{keyword}'
-        item = {
-            'keyword': composite_key,
+    @staticmethod
+    def keyword_item(brand: str, keyword: str, week: str, data: Dict) -> Dict:
+        return {
+            'keyword': f'{brand}#{keyword}',
             'week': week,
             'geo_score': _dec(data.get('geo_score', 0)),
             'visibility_score': _dec(data.get('visibility_score', 0)),
@@ -271,7 +276,10 @@ class MultiBrandKeywordPerformance:
             'priority_flag': data.get('priority_flag', False),
             'recorded_at': data.get('recorded_at', _now()),
         }
-        self._table.put_item(Item=item)
+
+    def seed_keyword_performance(self, brand: str, keyword: str, week: str, data: Dict):
+        """Write a brand-specific keyword performance entry (for seeding)."""
+        self._table.put_item(Item=self.keyword_item(brand, keyword, week, data))
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -341,9 +349,8 @@ def seed_benchmark_data(weeks_back: int = 8) -> Dict:
     import random
     random.seed(42)  # Reproducible demo data
 
-    geo_scores = MultiBrandGeoScores()
-    kw_perf = MultiBrandKeywordPerformance()
     registry = BenchmarkBrandRegistry()
+    geo_items, kw_items = [], []
 
     now = datetime.now(timezone.utc)
     summary = {'brands_seeded': [], 'weeks': weeks_back, 'geo_entries': 0, 'kw_entries': 0}
@@ -377,15 +384,14 @@ def seed_benchmark_data(weeks_back: int = 8) -> Dict:
             cited_count = int(geo * kw_count)
 
             # Seed GEO Score Tracker
-            geo_scores.seed_brand_score(brand, week_str, {
+            geo_items.append(MultiBrandGeoScores.score_item(brand, week_str, {
                 'geo_score': round(geo, 4),
                 'visibility_score': vis,
                 'keywords_probed': kw_count,
                 'keywords_cited': cited_count,
                 'provider_scores': prov_scores,
                 'recorded_at': recorded_at,
-            })
-            summary['geo_entries'] += 1
+            }))
 
             # Seed Keyword Performance for each keyword
             for keyword in BENCHMARK_KEYWORDS:
@@ -394,18 +400,22 @@ def seed_benchmark_data(weeks_back: int = 8) -> Dict:
                 kw_vis = min(100, max(0, int(vis * kw_mult + random.uniform(-5, 5))))
                 kw_conf = min(1.0, max(0.0, profile['confidence_base'] * kw_mult + random.uniform(-0.1, 0.1)))
 
-                kw_perf.seed_keyword_performance(brand, keyword, week_str, {
+                kw_items.append(MultiBrandKeywordPerformance.keyword_item(brand, keyword, week_str, {
                     'geo_score': round(kw_geo, 4),
                     'visibility_score': kw_vis,
                     'confidence': round(kw_conf, 3),
                     'trend': profile['trend_direction'],
                     'priority_flag': kw_geo < 0.3,
                     'recorded_at': recorded_at,
-                })
-                summary['kw_entries'] += 1
+                }))
 
         summary['brands_seeded'].append(brand)
 
+    geo_stats = batch_put(GEO_TRACKER_TABLE, geo_items, key_fields=('brand', 'week'))
+    kw_stats = batch_put(KW_PERF_TABLE, kw_items, key_fields=('keyword', 'week'), segments=4)
+    summary['geo_entries'] = geo_stats['items']
+    summary['kw_entries'] = kw_stats['items']
+    summary['write_cost'] = {'geo': geo_stats, 'keywords': kw_stats}
     summary['status'] = 'complete'
     summary['timestamp'] = _now()
     logger.info("Seeded benchmark data: %d geo entries, %d kw entries",
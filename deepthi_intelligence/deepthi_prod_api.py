@@ -14,6 +14,8 @@ Consolidates all Deepthi production-ready features:
 Does NOT modify any existing API files.
 """
 
+import json
+
 from flask import Blueprint, request, jsonify
 
 deepthi_prod_bp = Blueprint('deepthi_prod', __name__, url_prefix='/api/m3/deepthi')
@@ -158,7 +160,9 @@ def tenant_keywords(project_id):
 @deepthi_prod_bp.route('/probes/parallel', methods=['POST'])
 def parallel_probe():
     """
-    Dispatch a parallel probe job.
+    Dispatch a parallel probe job. Returns 202 with the job id as soon as the
+    batches are queued; follow progress at /probes/jobs/<job_id> or
+    /probes/jobs/<job_id>/stream.
     Body: {
       "brand": "AI1stSEO",
       "keywords": ["best seo tool", ...],
@@ -175,7 +179,11 @@ def parallel_probe():
     provider = data.get('provider', 'nova')
     project_id = data.get('project_id')
     result = dispatch_parallel_probe(brand, keywords, provider, project_id)
-    return jsonify(result), 201
+    if result['status'] == 'error':
+        return jsonify(result), 503
+    result['status_url'] = f"{deepthi_prod_bp.url_prefix}/probes/jobs/{result['job_id']}"
+    result['stream_url'] = f"{result['status_url']}/stream"
+    return jsonify(result), 202
 
 
 @deepthi_prod_bp.route('/probes/jobs', methods=['GET'])
@@ -196,6 +204,23 @@ def get_probe_job(job_id):
     return jsonify(job)
 
 
+@deepthi_prod_bp.route('/probes/jobs/<job_id>/stream', methods=['GET'])
+def stream_probe_job(job_id):
+    """
+    Probe job progress as Server-Sent Events: ``progress`` on every change,
+    then ``done`` with the final job record (or ``error`` / ``timeout``).
+    """
+    from flask import Response, stream_with_context
+    from deepthi_intelligence.parallel_probe_executor import iter_job_events
+
+    def generate():
+        for event, payload in iter_job_events(job_id):
+            yield f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 # =========================================================================
 # 4. GLOBAL BENCHMARK INTELLIGENCE
 # =========================================================================
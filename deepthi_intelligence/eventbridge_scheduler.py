@@ -23,9 +23,10 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -38,7 +39,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
@@ -111,12 +112,23 @@ class ScheduleLog:
 # -- Scheduled task: directory freshness (every 6 hours) --
 
 def run_directory_freshness(project_id: str = None) -> Dict:
-    """Check freshness of all tracked content pages."""
+    """Check freshness of all tracked content pages.
+
+    Sweeps every Citation Monitoring Register and directory URL with
+    conditional GETs first, then rebuilds the per-brand digests.
+    """
     started = _now()
     result = {'task': 'directory_freshness', 'started_at': started}
     try:
         from deepthi_intelligence.freshness_integration import FreshnessDigest
         from deepthi_intelligence.benchmark_brands import BenchmarkBrandRegistry
+        from deepthi_intelligence.freshness_sweep import run_freshness_sweep
+
+        try:
+            result['sweep'] = run_freshness_sweep()
+        except Exception as e:
+            logger.error("Freshness sweep failed: %s", e)
+            result['sweep'] = {'status': 'error', 'error': str(e)}
 
         digest = FreshnessDigest()
         brands = BenchmarkBrandRegistry().get_brand_names()
@@ -178,6 +190,7 @@ def run_full_geo_scoring(project_id: str = None) -> Dict:
                 brand_results[brand] = {
                     'status': tr.get('status', 'unknown'),
                     'probes_processed': tr.get('total_probes_processed', 0),
+                    'probes_aggregated': tr.get('total_probes_aggregated', 0),
                     'keywords_written': tr.get('keywords_written', 0),
                 }
             except Exception as e:
@@ -203,45 +216,21 @@ def run_competitor_matrix_update(project_id: str = None) -> Dict:
     result = {'task': 'competitor_matrix_update', 'started_at': started}
     try:
         from deepthi_intelligence.benchmark_brands import BenchmarkBrandRegistry
-        from probe_to_intelligence import _load_raw_probes, _aggregate_keyword_metrics
+        from probe_to_intelligence import update_probe_aggregates, competitor_matrix_entry
         from month3_systems.geo_brand_intelligence import CompetitorVisibilityMatrix
-        from collections import defaultdict
 
         brands = BenchmarkBrandRegistry().get_brand_names()
         matrix = CompetitorVisibilityMatrix()
         week = datetime.now(timezone.utc).strftime('%Y-W%W')
-        updated = 0
+        entries = {}
 
+        # Aggregates are incremental — this only reads probes newer than each brand's watermark.
+        # Folding here leaves the keywords pending for transform_probes_to_intelligence().
         for brand in brands:
-            probes = _load_raw_probes(brand=brand, limit=200)
-            if not probes:
-                continue
-            kw_metrics = _aggregate_keyword_metrics(probes)
-            total_cited = sum(1 for p in probes if p.get('cited'))
-            total = len(probes)
-            vis = round(total_cited / total * 100) if total else 0
-
-            prov_stats = defaultdict(lambda: {'cited': 0, 'total': 0})
-            for p in probes:
-                prov = p.get('ai_model', 'unknown')
-                prov_stats[prov]['total'] += 1
-                if p.get('cited'):
-                    prov_stats[prov]['cited'] += 1
-
-            top_kws = sorted(kw_metrics.values(),
-                             key=lambda x: x['geo_score'], reverse=True)[:5]
-
-            matrix.record(brand, week, {
-                'visibility_score': vis,
-                'keywords_cited': sum(1 for m in kw_metrics.values() if m['geo_score'] > 0),
-                'total_keywords': len(kw_metrics),
-                'provider_breakdown': {
-                    prov: round(d['cited'] / d['total'], 2) if d['total'] else 0
-                    for prov, d in prov_stats.items()
-                },
-                'top_keywords': [k['keyword'] for k in top_kws],
-            })
-            updated += 1
+            summary, _, _ = update_probe_aggregates(brand)
+            if summary['total']:
+                entries[brand] = competitor_matrix_entry(summary)
+        updated = matrix.bulk_record(week, entries)
 
         result['brands_updated'] = updated
         result['week'] = week
@@ -20,9 +20,10 @@ from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -35,7 +36,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
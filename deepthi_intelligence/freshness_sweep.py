@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+freshness_sweep.py
+Site-wide freshness sweeps with conditional GETs.
+
+FreshnessTracker.check_page_freshness() is fine for a single URL, but the
+scheduled freshness job needs to cover every page in the Citation Monitoring
+Register and the directory. This sweep engine:
+
+  1. Loads the last validators (ETag / Last-Modified) and signals for a chunk
+     of URLs with BatchGetItem from deepthi-freshness-validators
+  2. Sends If-None-Match / If-Modified-Since on a pooled session, many URLs
+     concurrently with a per-host concurrency cap and politeness delay
+  3. On 304 reuses the stored signals — no body download, no HTML parse
+  4. On 200 extracts signals through FreshnessTracker.extract_signals()
+  5. Batch-writes history rows (deepthi-freshness-signals, same shape as
+     record_check) and the refreshed validators
+
+Table: deepthi-freshness-validators
+PK: content_id (same id FreshnessTracker uses for history rows)
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from deepthi_intelligence.freshness_tracker import (
+    FreshnessTracker, _content_id, _deserialize, _get_ddb, _now, _dec, PREFIX,
+)
+from site_crawler import HostLimiter
+
+logger = logging.getLogger(__name__)
+
+VALIDATORS_TABLE = f'{PREFIX}deepthi-freshness-validators'
+
+USER_AGENT = 'Mozilla/5.0 (compatible; FreshnessBot/1.0)'
+DEFAULT_WORKERS = int(os.environ.get('FRESHNESS_SWEEP_WORKERS', '32'))
+DEFAULT_PER_HOST = int(os.environ.get('FRESHNESS_SWEEP_PER_HOST', '2'))
+DEFAULT_HOST_DELAY = float(os.environ.get('FRESHNESS_SWEEP_HOST_DELAY', '0.5'))
+CHUNK_SIZE = 500          # URLs per validator load / write cycle
+BATCH_GET_SIZE = 100      # DynamoDB BatchGetItem limit
+REQUEST_TIMEOUT = 10
+
+_SIGNAL_FIELDS = ('last_modified', 'etag', 'content_hash', 'schema_date_modified',
+                  'has_faq', 'faq_count')
+
+
+class FreshnessSweep:
+    """Concurrent conditional-GET freshness checks over many URLs."""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS,
+                 per_host: int = DEFAULT_PER_HOST,
+                 host_delay: float = DEFAULT_HOST_DELAY,
+                 record_unchanged: bool = True):
+        self.max_workers = max_workers
+        self.record_unchanged = record_unchanged
+        self.limiter = HostLimiter(per_host=per_host, delay=host_delay)
+        self.tracker = FreshnessTracker()
+        try:
+            self._validators = _get_ddb().Table(VALIDATORS_TABLE)
+            self._validators.load()
+            self._available = True
+        except Exception:
+            self._available = False
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    # ── URL sources ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def collect_urls(include_citations: bool = True, include_directory: bool = True,
+                     extra_urls: Iterable[str] = None) -> List[str]:
+        """Every URL the weekly sweep should cover, de-duplicated in first-seen order."""
+        urls = list(extra_urls or [])
+        if include_citations:
+            try:
+                from month3_systems.aeo_answer_intelligence import CitationMonitoringRegister
+                urls.extend(url for _, url in CitationMonitoringRegister().iter_urls())
+            except Exception as e:
+                logger.warning("Freshness sweep: citation register unavailable: %s", e)
+        if include_directory:
+            try:
+                from directory.directory_db import iter_source_urls
+                urls.extend(url for _, url in iter_source_urls())
+            except Exception as e:
+                logger.warning("Freshness sweep: directory unavailable: %s", e)
+        return list(dict.fromkeys(u.strip() for u in urls if u and u.startswith('http')))
+
+    # ── validators ────────────────────────────────────────────────────────
+
+    def _load_validators(self, urls: List[str]) -> Dict[str, Dict]:
+        """content_id → last validators/signals, via BatchGetItem (100 keys per call)."""
+        if not self._available:
+            return {}
+        out = {}
+        ddb = _get_ddb()
+        ids = list(dict.fromkeys(_content_id(u) for u in urls))
+        for i in range(0, len(ids), BATCH_GET_SIZE):
+            request = {VALIDATORS_TABLE: {'Keys': [{'content_id': cid} for cid in ids[i:i + BATCH_GET_SIZE]]}}
+            attempt = 0
+            while request and attempt < 5:
+                resp = ddb.batch_get_item(RequestItems=request)
+                for item in resp.get('Responses', {}).get(VALIDATORS_TABLE, []):
+                    out[item['content_id']] = _deserialize(item)
+                request = resp.get('UnprocessedKeys') or None
+                if request:
+                    attempt += 1
+                    time.sleep(min(2.0, 0.1 * (2 ** attempt)))
+        return out
+
+    # ── single conditional check ──────────────────────────────────────────
+
+    def _check(self, url: str, prev: Optional[Dict]) -> Dict:
+        result = {'url': url, 'checked_at': _now()}
+        headers = {}
+        if prev:
+            if prev.get('etag'):
+                headers['If-None-Match'] = prev['etag']
+            if prev.get('last_modified'):
+                headers['If-Modified-Since'] = prev['last_modified']
+
+        host = urlparse(url).netloc
+        self.limiter.acquire(host)
+        try:
+            resp = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
+            try:
+                if resp.status_code == 304 and prev:
+                    result.update({k: prev.get(k, '') for k in _SIGNAL_FIELDS})
+                    result['etag'] = resp.headers.get('ETag') or prev.get('etag', '')
+                    result['content_changed'] = False
+                    result['not_modified'] = True
+                else:
+                    resp.raise_for_status()
+                    result.update(FreshnessTracker.extract_signals(resp))
+                    result['content_changed'] = bool(prev) and prev.get('content_hash', '') != result['content_hash']
+                    result['not_modified'] = False
+            finally:
+                resp.close()
+            result['freshness_score'] = FreshnessTracker._compute_freshness_score(result)
+        except Exception as e:
+            result['error'] = str(e)[:300]
+            result['freshness_score'] = 0
+        finally:
+            self.limiter.release(host)
+        return result
+
+    # ── writes ────────────────────────────────────────────────────────────
+
+    def _write(self, results: List[Dict]):
+        """Batch-write history rows and validators for one chunk."""
+        ok = [r for r in results if not r.get('error')]
+        history = [r for r in ok if self.record_unchanged or not r.get('not_modified')]
+        with self.tracker._table.batch_writer() as batch:
+            for r in history:
+                batch.put_item(Item=self.tracker.build_item(r['url'], r))
+        if not self._available:
+            return
+        with self._validators.batch_writer(overwrite_by_pkeys=['content_id']) as batch:
+            for r in ok:
+                item = {
+                    'content_id': _content_id(r['url']),
+                    'url': r['url'],
+                    'freshness_score': _dec(r['freshness_score']),
+                    'checked_at': r['checked_at'],
+                }
+                for k in _SIGNAL_FIELDS:
+                    item[k] = r.get(k, '' if k not in ('has_faq', 'faq_count') else 0)
+                item['has_faq'] = bool(item['has_faq'])
+                batch.put_item(Item=item)
+
+    # ── sweep ─────────────────────────────────────────────────────────────
+
+    def run(self, urls: List[str] = None) -> Dict:
+        """Sweep ``urls`` (default: collect_urls()). Returns aggregate stats."""
+        t0 = time.time()
+        urls = list(dict.fromkeys(urls)) if urls is not None else self.collect_urls()
+        stats = {'urls': len(urls), 'checked': 0, 'not_modified': 0, 'changed': 0,
+                 'errors': 0, 'stale': 0, 'score_total': 0.0}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for start in range(0, len(urls), CHUNK_SIZE):
+                    chunk = urls[start:start + CHUNK_SIZE]
+                    validators = self._load_validators(chunk)
+                    results = list(pool.map(
+                        lambda u: self._check(u, validators.get(_content_id(u))), chunk))
+                    self._write(results)
+                    for r in results:
+                        if r.get('error'):
+                            stats['errors'] += 1
+                            continue
+                        stats['checked'] += 1
+                        stats['not_modified'] += int(r.get('not_modified', False))
+                        stats['changed'] += int(r.get('content_changed', False))
+                        stats['stale'] += int(r['freshness_score'] < 40)
+                        stats['score_total'] += r['freshness_score']
+                    logger.info("Freshness sweep: %d/%d urls, %d not modified",
+                                min(start + CHUNK_SIZE, len(urls)), len(urls), stats['not_modified'])
+        finally:
+            self.session.close()
+
+        score_total = stats.pop('score_total')
+        stats['avg_freshness_score'] = round(score_total / stats['checked'], 1) if stats['checked'] else 0
+        stats['duration_seconds'] = round(time.time() - t0, 1)
+        return stats
+
+
+def run_freshness_sweep(urls: List[str] = None, **kwargs) -> Dict:
+    """Convenience entry point for schedulers and API routes."""
+    return FreshnessSweep(**kwargs).run(urls)
@@ -21,9 +21,10 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -36,7 +37,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
@@ -96,6 +97,13 @@ class FreshnessTracker:
           - geo_score_at_check: current GEO score (for correlation)
           - notes: free text
         """
+        item = self.build_item(url, data)
+        self._table.put_item(Item=item)
+        logger.info("Freshness check recorded: url=%s score=%s", url, item['freshness_score'])
+        return item['check_ts']
+
+    def build_item(self, url: str, data: Dict) -> Dict:
+        """Table item for one check — shared by record_check and batched sweeps."""
         content_id = _content_id(url)
         check_ts = _now()
 
@@ -118,9 +126,9 @@ class FreshnessTracker:
             'content_changed': data.get('content_changed', False),
             'notes': data.get('notes', ''),
         }
-        self._table.put_item(Item=item)
-        logger.info("Freshness check recorded: url=%s score=%s", url, freshness_score)
-        return check_ts
+        if data.get('etag'):
+            item['etag'] = data['etag']
+        return item
 
     # ── check a page for freshness signals ────────────────────────────────
 
@@ -128,10 +136,11 @@ class FreshnessTracker:
         """
         Fetch a page and extract freshness signals.
         Optionally correlate with current GEO score for the brand.
+
+        For many URLs use freshness_sweep.FreshnessSweep, which sends
+        conditional GETs and writes results in batches.
         """
         import requests
-        from bs4 import BeautifulSoup
-        import hashlib as _hashlib
 
         result = {'url': url, 'checked_at': _now()}
 
@@ -139,22 +148,7 @@ class FreshnessTracker:
             headers = {"User-Agent": "Mozilla/5.0 (compatible; FreshnessBot/1.0)"}
             resp = requests.get(url, headers=headers, timeout=10)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
-
-            # HTTP Last-Modified
-            result['last_modified'] = resp.headers.get('Last-Modified', '')
-
-            # Content hash (main body text)
-            body_text = soup.get_text(separator=' ', strip=True)[:5000]
-            result['content_hash'] = _hashlib.md5(body_text.encode()).hexdigest()
-
-            # Schema dateModified
-            result['schema_date_modified'] = self._extract_schema_date(soup)
-
-            # FAQ detection
-            faq_items = self._detect_faq(soup)
-            result['has_faq'] = len(faq_items) > 0
-            result['faq_count'] = len(faq_items)
+            result.update(self.extract_signals(resp))
 
             # Check if content changed vs last check
             prev = self.get_latest(url)
@@ -180,6 +174,24 @@ class FreshnessTracker:
 
         return result
 
+    @classmethod
+    def extract_signals(cls, resp) -> Dict:
+        """Freshness signals from a fetched 200 response (validators, hash, schema, FAQ)."""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(resp.content, 'html.parser')
+
+        # Content hash (main body text)
+        body_text = soup.get_text(separator=' ', strip=True)[:5000]
+        faq_items = cls._detect_faq(soup)
+        return {
+            'last_modified': resp.headers.get('Last-Modified', ''),
+            'etag': resp.headers.get('ETag', ''),
+            'content_hash': hashlib.md5(body_text.encode()).hexdigest(),
+            'schema_date_modified': cls._extract_schema_date(soup),
+            'has_faq': len(faq_items) > 0,
+            'faq_count': len(faq_items),
+        }
+
     # ── read ──────────────────────────────────────────────────────────────
 
     def get_history(self, url: str, limit: int = 30) -> List[Dict]:
@@ -20,9 +20,10 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -36,7 +37,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
@@ -129,11 +130,32 @@ class IndustryBenchmarkTracker:
         }
         if self._available:
             self._table.put_item(Item=item)
+            from probe_archive import record
+            record('industry', [item])
         return week
 
+    def _since(self, category_id: str, since: Optional[str]) -> List[Dict]:
+        """Snapshots for ``category_id`` from the week of ``since`` on (archive sync)."""
+        cond = Key('category_id').eq(category_id)
+        if since:
+            since_week = datetime.fromisoformat(since[:19]).strftime('%Y-W%W')
+            cond = cond & Key('week').gte(since_week)
+        kwargs = {'KeyConditionExpression': cond}
+        items = []
+        while True:
+            resp = self._table.query(**kwargs)
+            items.extend(_deserialize(i) for i in resp.get('Items', []))
+            if 'LastEvaluatedKey' not in resp:
+                return items
+            kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
     def get_industry_trend(self, category_id: str, limit: int = 12) -> List[Dict]:
         if not self._available:
             return []
+        from probe_archive import industry_trend
+        archived = industry_trend(category_id, limit, lambda since: self._since(category_id, since))
+        if archived is not None:
+            return archived
         resp = self._table.query(
             KeyConditionExpression=Key('category_id').eq(category_id),
             ScanIndexForward=False, Limit=limit)
@@ -38,15 +38,18 @@ All endpoints under /api/m5/*
 import json
 import logging
 import os
+import threading
+import time
 import uuid
 from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 from flask import Blueprint, request, jsonify
@@ -69,7 +72,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 def _now(): return datetime.now(timezone.utc).isoformat()
@@ -1237,117 +1240,165 @@ def month5_status():
 # GEO INTELLIGENCE PDF REPORT
 # =========================================================================
 
-def _generate_geo_intelligence_pdf(brand: str, data: Dict) -> bytes:
-    """Generate a PDF report of the GEO Intelligence dashboard data."""
-    try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib import colors
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-        import io
-
-        buf = io.BytesIO()
-        doc = SimpleDocTemplate(buf, pagesize=letter)
-        styles = getSampleStyleSheet()
-        elements = []
-
-        # Title
-        elements.append(Paragraph(
-            f"GEO Intelligence Report — {brand}",
-            styles['Title']
-        ))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph(
-            f"Week: {data.get('week', _week())} · Generated: {_now()[:10]}",
-            styles['Normal']
-        ))
-        elements.append(Spacer(1, 16))
-
-        # Executive Summary
-        elements.append(Paragraph("Executive Summary", styles['Heading2']))
-        elements.append(Spacer(1, 6))
-        geo = data.get('geo_score_trend', {})
-        geo_pct = round((geo.get('current_score', 0)) * 100)
-        elements.append(Paragraph(
-            f"Overall GEO Score: <b>{geo_pct}%</b> · "
-            f"Probes Run: {geo.get('probe_count', 0)} · "
-            f"Avg Confidence: {round(geo.get('avg_confidence', 0) * 100)}% · "
-            f"Overall Health: {data.get('overall_health', 0)}%",
-            styles['Normal']
-        ))
-        elements.append(Spacer(1, 16))
-
-        # Competitive Position
-        comp = data.get('competitive_position', {})
-        ranking = comp.get('ranking', [])
-        if ranking:
-            elements.append(Paragraph("Competitive Position", styles['Heading2']))
-            elements.append(Spacer(1, 6))
-            header = ['Rank', 'Brand', 'GEO Score']
-            tdata = [header]
-            for i, r in enumerate(ranking[:5], 1):
-                tdata.append([str(i), r.get('brand', ''), f"{round(r.get('geo_score', 0) * 100)}%"])
-            t = Table(tdata, colWidths=[40, 200, 80])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a1a2e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-                ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f4f8')]),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ]))
-            elements.append(t)
-            elements.append(Spacer(1, 16))
-
-        # Technical Debt & E-E-A-T
-        debt = data.get('technical_debt', {})
-        eeat = data.get('eeat_progress', {})
-        elements.append(Paragraph("System Metrics", styles['Heading2']))
-        elements.append(Spacer(1, 6))
-        elements.append(Paragraph(
-            f"Technical Debt Resolution: <b>{debt.get('resolution_pct', 0)}%</b> "
-            f"({debt.get('critical_resolved', 0)}/{debt.get('critical_total', 0)} critical resolved)",
+REPORT_DATA_TTL = int(os.environ.get('EXEC_REPORT_TTL', '300'))
+_report_data: Dict[str, tuple] = {}
+_report_data_lock = threading.Lock()
+
+
+def _weekly_report_data(brand: str) -> Dict:
+    """Executive dashboard data for the PDF, reused for REPORT_DATA_TTL seconds.
+
+    generate_weekly_report() fans out to every Month 5 table; repeat PDF
+    downloads within the window reuse the gathered data (and so hit the
+    rendered-document cache) instead of re-running it.
+    """
+    key = f'{brand}#{_week()}'
+    now = time.monotonic()
+    with _report_data_lock:
+        hit = _report_data.get(key)
+        if hit and now - hit[0] < REPORT_DATA_TTL:
+            return hit[1]
+    data = ExecutiveDashboard().generate_weekly_report(brand)
+    with _report_data_lock:
+        _report_data[key] = (now, data)
+        for k in [k for k, (ts, _) in _report_data.items() if now - ts >= REPORT_DATA_TTL]:
+            del _report_data[k]
+    return data
+
+
+def _geo_intelligence_sections(brand: str, data: Dict) -> List:
+    """Report sections, each keyed only by the slice of ``data`` it shows."""
+    from report_renderer import Section
+    geo = data.get('geo_score_trend', {})
+    debt = data.get('technical_debt', {})
+    eeat = data.get('eeat_progress', {})
+    alerts = data.get('alerts', {})
+    ranking = data.get('competitive_position', {}).get('ranking', [])
+    return [
+        Section('geo-title', {'brand': brand, 'week': data.get('week', _week()),
+                              'date': _now()[:10]}, _build_geo_title),
+        Section('geo-summary', {
+            'score': geo.get('current_score', 0), 'probes': geo.get('probe_count', 0),
+            'confidence': geo.get('avg_confidence', 0), 'health': data.get('overall_health', 0),
+        }, _build_geo_summary),
+        Section('geo-competitive', [
+            {'brand': r.get('brand', ''), 'geo_score': r.get('geo_score', 0)} for r in ranking[:5]
+        ], _build_geo_competitive),
+        Section('geo-metrics', {
+            'resolution_pct': debt.get('resolution_pct', 0),
+            'critical_resolved': debt.get('critical_resolved', 0),
+            'critical_total': debt.get('critical_total', 0),
+            'closure_pct': eeat.get('closure_pct', 0),
+            'gaps_closed': eeat.get('gaps_closed', 0),
+            'total_gaps': eeat.get('total_gaps', 0),
+        }, _build_geo_metrics),
+        Section('geo-alerts', {k: alerts.get(k, 0) for k in ('total', 'critical', 'high')},
+                _build_geo_alerts),
+        Section('geo-footer', {}, _build_geo_footer),
+    ]
+
+
+def _build_geo_title(d, styles):
+    from reportlab.platypus import Paragraph, Spacer
+    return [
+        Paragraph(f"GEO Intelligence Report — {d['brand']}", styles['Title']),
+        Spacer(1, 8),
+        Paragraph(f"Week: {d['week']} · Generated: {d['date']}", styles['Normal']),
+        Spacer(1, 16),
+    ]
+
+
+def _build_geo_summary(d, styles):
+    from reportlab.platypus import Paragraph, Spacer
+    return [
+        Paragraph("Executive Summary", styles['Heading2']),
+        Spacer(1, 6),
+        Paragraph(
+            f"Overall GEO Score: <b>{round(d['score'] * 100)}%</b> · "
+            f"Probes Run: {d['probes']} · "
+            f"Avg Confidence: {round(d['confidence'] * 100)}% · "
+            f"Overall Health: {d['health']}%",
             styles['Normal']
-        ))
-        elements.append(Paragraph(
-            f"E-E-A-T Gap Closure: <b>{eeat.get('closure_pct', 0)}%</b> "
-            f"({eeat.get('gaps_closed', 0)}/{eeat.get('total_gaps', 0)} gaps closed)",
+        ),
+        Spacer(1, 16),
+    ]
+
+
+def _build_geo_competitive(ranking, styles):
+    if not ranking:
+        return []
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+    tdata = [['Rank', 'Brand', 'GEO Score']]
+    for i, r in enumerate(ranking, 1):
+        tdata.append([str(i), r['brand'], f"{round(r['geo_score'] * 100)}%"])
+    t = Table(tdata, colWidths=[40, 200, 80])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a1a2e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f4f8')]),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    return [Paragraph("Competitive Position", styles['Heading2']), Spacer(1, 6), t, Spacer(1, 16)]
+
+
+def _build_geo_metrics(d, styles):
+    from reportlab.platypus import Paragraph, Spacer
+    return [
+        Paragraph("System Metrics", styles['Heading2']),
+        Spacer(1, 6),
+        Paragraph(
+            f"Technical Debt Resolution: <b>{d['resolution_pct']}%</b> "
+            f"({d['critical_resolved']}/{d['critical_total']} critical resolved)",
             styles['Normal']
-        ))
-        elements.append(Spacer(1, 16))
-
-        # Alerts
-        alerts = data.get('alerts', {})
-        elements.append(Paragraph("Alert Summary", styles['Heading2']))
-        elements.append(Spacer(1, 6))
-        elements.append(Paragraph(
-            f"Total Alerts: {alerts.get('total', 0)} · "
-            f"Critical: {alerts.get('critical', 0)} · "
-            f"High: {alerts.get('high', 0)}",
+        ),
+        Paragraph(
+            f"E-E-A-T Gap Closure: <b>{d['closure_pct']}%</b> "
+            f"({d['gaps_closed']}/{d['total_gaps']} gaps closed)",
             styles['Normal']
-        ))
-        elements.append(Spacer(1, 20))
+        ),
+        Spacer(1, 16),
+    ]
+
+
+def _build_geo_alerts(d, styles):
+    from reportlab.platypus import Paragraph, Spacer
+    return [
+        Paragraph("Alert Summary", styles['Heading2']),
+        Spacer(1, 6),
+        Paragraph(f"Total Alerts: {d['total']} · Critical: {d['critical']} · High: {d['high']}",
+                  styles['Normal']),
+        Spacer(1, 20),
+    ]
 
-        # Footer
-        elements.append(Paragraph(
-            "Source: AI1stSEO GEO Intelligence Platform · ai1stseo.com",
-            styles['Normal']
-        ))
 
-        doc.build(elements)
-        return buf.getvalue()
+def _build_geo_footer(d, styles):
+    from reportlab.platypus import Paragraph
+    return [Paragraph("Source: AI1stSEO GEO Intelligence Platform · ai1stseo.com", styles['Normal'])]
 
+
+def _geo_intelligence_text(brand: str, data: Dict) -> bytes:
+    """Plain-text fallback when reportlab is not installed."""
+    content = f"GEO Intelligence Report — {brand}\n"
+    content += f"Week: {data.get('week', _week())}\n"
+    content += f"GEO Score: {round(data.get('geo_score_trend', {}).get('current_score', 0) * 100)}%\n"
+    content += f"Health: {data.get('overall_health', 0)}%\n"
+    return content.encode('utf-8')
+
+
+def _generate_geo_intelligence_pdf(brand: str, data: Dict) -> bytes:
+    """Generate a PDF report of the GEO Intelligence dashboard data."""
+    try:
+        from report_renderer import ReportRenderer
+        return ReportRenderer('geo-intel').render_bytes(_geo_intelligence_sections(brand, data))
     except ImportError:
-        # Fallback plain text
-        content = f"GEO Intelligence Report — {brand}\n"
-        content += f"Week: {data.get('week', _week())}\n"
-        content += f"GEO Score: {round(data.get('geo_score_trend', {}).get('current_score', 0) * 100)}%\n"
-        content += f"Health: {data.get('overall_health', 0)}%\n"
-        return content.encode('utf-8')
+        return _geo_intelligence_text(brand, data)
 
 
 @month5_bp.route('/executive-dashboard/pdf', methods=['GET'])
@@ -1356,13 +1407,17 @@ def executive_dashboard_pdf():
     from flask import Response
     brand = request.args.get('brand', PRIMARY)
     try:
-        data = ExecutiveDashboard().generate_weekly_report(brand)
-        pdf_bytes = _generate_geo_intelligence_pdf(brand, data)
+        data = _weekly_report_data(brand)
         filename = f"geo-intelligence-{brand}-{_week()}.pdf"
-        return Response(
-            pdf_bytes,
-            mimetype='application/pdf',
-            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
-        )
+        try:
+            from report_renderer import ReportRenderer, pdf_response
+            path = ReportRenderer('geo-intel').render(_geo_intelligence_sections(brand, data))
+            return pdf_response(path, filename)
+        except ImportError:
+            return Response(
+                _geo_intelligence_text(brand, data),
+                mimetype='application/pdf',
+                headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+            )
     except Exception as e:
         return jsonify({'error': f'PDF generation failed: {e}'}), 500
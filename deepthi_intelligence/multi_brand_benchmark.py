@@ -23,9 +23,10 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -41,7 +42,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
@@ -280,9 +281,29 @@ class BrandGEOHistory:
             'benchmark_id': data.get('benchmark_id', ''),
         }
         self._table.put_item(Item=item)
+        from probe_archive import record
+        record('brand_geo', [item])
         return ts
 
+    def _since(self, brand: str, since: Optional[str]) -> List[Dict]:
+        """All entries for ``brand`` after ``since`` (archive sync)."""
+        cond = Key('brand').eq(brand)
+        if since:
+            cond = cond & Key('timestamp').gt(since)
+        kwargs = {'KeyConditionExpression': cond}
+        items = []
+        while True:
+            resp = self._table.query(**kwargs)
+            items.extend(_deserialize(i) for i in resp.get('Items', []))
+            if 'LastEvaluatedKey' not in resp:
+                return items
+            kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
     def get_trend(self, brand: str, limit: int = 30) -> List[Dict]:
+        from probe_archive import brand_geo_trend
+        archived = brand_geo_trend(brand, limit, lambda since: self._since(brand, since))
+        if archived is not None:
+            return archived
         resp = self._table.query(
             KeyConditionExpression=Key('brand').eq(brand),
             ScanIndexForward=False, Limit=limit)
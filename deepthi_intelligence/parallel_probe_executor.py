@@ -5,9 +5,18 @@ Parallel Probe Execution via SQS for scalable global probing.
 
 Instead of probing keywords one-by-one, this module:
   1. Splits 200+ keywords into batches
-  2. Sends each batch to an SQS queue
-  3. Lambda workers process batches in parallel
-  4. Results are aggregated back into the intelligence tables
+  2. Sends the batches to a probe queue with send_message_batch (10 per call)
+  3. Workers process batches in parallel
+  4. Results are aggregated back into the job record; the worker that
+     finishes the last batch writes the job summary
+
+dispatch_parallel_probe() never runs probes inside the caller — it returns a
+job id as soon as the batches are queued. The queue is SQS when
+DEEPTHI_PROBE_QUEUE_URL is set (Lambda workers via sqs_worker_handler), and
+otherwise LocalProbeQueue: an in-process stand-in with the same
+send_message_batch interface that feeds a bounded worker pool. Both paths run
+the same process_probe_message(), so progress looks identical through
+ProbeJobManager.get_job() and iter_job_events() (the SSE stream).
 
 Cuts scan time from hours to minutes.
 
@@ -18,13 +27,17 @@ Calls existing geo_probe_batch() as the underlying probe mechanism.
 import json
 import logging
 import os
+import random
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from aws_clients import get_client, get_resource
 
 logger = logging.getLogger(__name__)
 
@@ -33,22 +46,32 @@ TABLE_PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 PROBE_QUEUE_URL = os.environ.get('DEEPTHI_PROBE_QUEUE_URL', '')
 PROBE_JOBS_TABLE = f'{TABLE_PREFIX}deepthi-probe-jobs'
 BATCH_SIZE = 20  # Keywords per SQS message (matches geo_probe_batch chunk size)
+SQS_BATCH_LIMIT = 10  # send_message_batch entry limit
+MAX_SEND_RETRIES = 3
+PROBE_WORKERS = int(os.environ.get('DEEPTHI_PROBE_WORKERS', '4'))
+MAX_QUEUED_BATCHES = int(os.environ.get('DEEPTHI_PROBE_MAX_QUEUED', '200'))
+SENT_HISTORY = 100  # recent message bodies LocalProbeQueue keeps for inspection
+LOCAL_JOB_LIMIT = 200  # jobs kept in the in-process progress registry
+IS_LAMBDA = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
+TERMINAL_STATUSES = ('complete', 'error')
 
 _ddb = None
 _sqs = None
+_local_queue = None
+_local_queue_lock = threading.Lock()
 
 
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 
 def _get_sqs():
     global _sqs
     if _sqs is None:
-        _sqs = boto3.client('sqs', region_name=REGION)
+        _sqs = get_client('sqs', REGION)
     return _sqs
 
 
@@ -72,14 +95,66 @@ def _deserialize(item):
     return d
 
 
+# -- In-process progress registry --
+#
+# Mirrors every job this process creates or works on, so get_job() still
+# answers when the jobs table is unavailable and the SSE stream can wake on
+# local progress instead of polling DynamoDB.
+
+_jobs: 'OrderedDict[str, Dict]' = OrderedDict()
+_jobs_cond = threading.Condition()
+
+
+def _local_put(job: Dict):
+    with _jobs_cond:
+        _jobs[job['job_id']] = dict(job, _version=0)
+        while len(_jobs) > LOCAL_JOB_LIMIT:
+            _jobs.popitem(last=False)
+        _jobs_cond.notify_all()
+
+
+def _local_update(job_id: str, incr: Dict = None, error: Dict = None, **fields) -> Optional[Dict]:
+    with _jobs_cond:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        for k, v in (incr or {}).items():
+            job[k] = job.get(k, 0) + v
+        if error:
+            job.setdefault('batch_errors', []).append(error)
+        job.update(fields)
+        job['_version'] += 1
+        _jobs_cond.notify_all()
+        return {k: v for k, v in job.items() if k != '_version'}
+
+
+def _local_get(job_id: str) -> Optional[Dict]:
+    with _jobs_cond:
+        job = _jobs.get(job_id)
+        return {k: v for k, v in job.items() if k != '_version'} if job else None
+
+
+def wait_for_update(job_id: str, version: int, timeout: float) -> int:
+    """Block until the local copy of ``job_id`` moves past ``version`` or ``timeout``.
+
+    Returns the current local version (-1 when the job is not tracked here,
+    e.g. an SQS job worked on by Lambda — callers then simply re-poll).
+    """
+    with _jobs_cond:
+        _jobs_cond.wait_for(
+            lambda: _jobs.get(job_id, {}).get('_version', -1) != version, timeout=timeout)
+        return _jobs.get(job_id, {}).get('_version', -1)
+
+
 class ProbeJobManager:
     """
     Manages parallel probe jobs. Each job tracks:
       - job_id: unique identifier
       - brand: target brand
       - total_keywords: how many keywords to probe
-      - batches_sent: how many SQS messages dispatched
-      - batches_complete: how many have returned results
+      - total_batches: how many batches were queued
+      - batches_complete / batches_failed: how many have finished
+      - cited_count / total_prompts: running totals across finished batches
       - status: pending / in_progress / complete / error
     """
 
@@ -103,26 +178,58 @@ class ProbeJobManager:
             'total_keywords': len(keywords),
             'total_batches': len(batches),
             'batches_complete': 0,
+            'batches_failed': 0,
+            'cited_count': 0,
+            'total_prompts': 0,
             'status': 'pending',
             'created_at': _now(),
             'results_summary': '{}',
         }
         if self._available:
             self._table.put_item(Item=job)
+        _local_put(job)
         return {'job_id': job_id, 'batches': batches, 'job': job}
 
-    def update_batch_complete(self, job_id: str, batch_result: Dict):
-        """Called when a batch worker completes. Increments counter."""
+    def update_batch_complete(self, job_id: str, batch_result: Dict) -> Optional[Dict]:
+        """Called when a batch worker completes. Increments counters.
+
+        Returns the job's counters after the update, so the caller can tell
+        whether it finished the last batch.
+        """
+        incr = {
+            'batches_complete': 1,
+            'cited_count': int(batch_result.get('cited_count', 0)),
+            'total_prompts': int(batch_result.get('total_prompts', 0)),
+        }
+        local = _local_update(job_id, incr=incr, status='in_progress')
         if not self._available:
-            return
-        self._table.update_item(
+            return local
+        resp = self._table.update_item(
             Key={'job_id': job_id},
-            UpdateExpression='SET batches_complete = batches_complete + :one, '
-                             '#s = :s',
-            ExpressionAttributeValues={':one': 1, ':s': 'in_progress'},
-            ExpressionAttributeNames={'#s': 'status'})
+            UpdateExpression='SET #s = :s ADD batches_complete :one, '
+                             'cited_count :c, total_prompts :p',
+            ExpressionAttributeValues={':one': 1, ':s': 'in_progress',
+                                       ':c': incr['cited_count'], ':p': incr['total_prompts']},
+            ExpressionAttributeNames={'#s': 'status'},
+            ReturnValues='ALL_NEW')
+        return _deserialize(resp.get('Attributes'))
+
+    def record_batch_error(self, job_id: str, batch_index: int, error: str) -> Optional[Dict]:
+        """A batch failed (probe error or could not be queued). Same return as update_batch_complete."""
+        entry = {'batch': batch_index, 'error': str(error)[:300]}
+        local = _local_update(job_id, incr={'batches_failed': 1}, error=entry)
+        if not self._available:
+            return local
+        resp = self._table.update_item(
+            Key={'job_id': job_id},
+            UpdateExpression='SET batch_errors = list_append(if_not_exists(batch_errors, :empty), :e) '
+                             'ADD batches_failed :one',
+            ExpressionAttributeValues={':one': 1, ':e': [entry], ':empty': []},
+            ReturnValues='ALL_NEW')
+        return _deserialize(resp.get('Attributes'))
 
     def mark_complete(self, job_id: str, summary: Dict):
+        _local_update(job_id, status='complete', results_summary=summary, completed_at=_now())
         if not self._available:
             return
         self._table.update_item(
@@ -136,6 +243,7 @@ class ProbeJobManager:
             ExpressionAttributeNames={'#s': 'status'})
 
     def mark_error(self, job_id: str, error: str):
+        _local_update(job_id, status='error', error_message=error)
         if not self._available:
             return
         self._table.update_item(
@@ -145,136 +253,277 @@ class ProbeJobManager:
             ExpressionAttributeNames={'#s': 'status'})
 
     def get_job(self, job_id: str) -> Optional[Dict]:
-        if not self._available:
+        item = None
+        if self._available:
+            resp = self._table.get_item(Key={'job_id': job_id})
+            item = _deserialize(resp.get('Item'))
+        if item is None:
+            item = _local_get(job_id)
+        if item is None:
             return None
-        resp = self._table.get_item(Key={'job_id': job_id})
-        item = _deserialize(resp.get('Item'))
-        if item and isinstance(item.get('results_summary'), str):
+        if isinstance(item.get('results_summary'), str):
             try:
                 item['results_summary'] = json.loads(item['results_summary'])
             except Exception:
                 pass
+        done = item.get('batches_complete', 0) + item.get('batches_failed', 0)
+        total = item.get('total_batches', 0)
+        item['progress'] = round(done / total * 100, 1) if total else 100.0
         return item
 
     def list_jobs(self, limit: int = 50) -> List[Dict]:
-        if not self._available:
-            return []
-        resp = self._table.scan(Limit=limit)
-        items = [_deserialize(i) for i in resp.get('Items', [])]
+        if self._available:
+            resp = self._table.scan(Limit=limit)
+            items = [_deserialize(i) for i in resp.get('Items', [])]
+        else:
+            with _jobs_cond:
+                items = [{k: v for k, v in j.items() if k != '_version'} for j in _jobs.values()]
         items.sort(key=lambda x: x.get('created_at', ''), reverse=True)
         return items[:limit]
 
 
-def dispatch_parallel_probe(brand: str, keywords: List[str],
-                            provider: str = 'nova',
-                            project_id: str = None) -> Dict:
-    """
-    Dispatch a parallel probe job.
+def _summarize(job: Dict) -> Dict:
+    cited = int(job.get('cited_count', 0))
+    prompts = int(job.get('total_prompts', 0))
+    return {
+        'geo_score': round(cited / prompts, 4) if prompts else 0,
+        'cited_count': cited,
+        'total_prompts': prompts,
+        'batches_complete': int(job.get('batches_complete', 0)),
+        'errors': [{'batch': int(e['batch']), 'error': e['error']} for e in job.get('batch_errors', [])],
+    }
 
-    If SQS queue is configured, sends batches to the queue for Lambda workers.
-    If no queue, falls back to synchronous execution using existing geo_probe_batch.
-    """
-    mgr = ProbeJobManager()
-    job_data = mgr.create_job(brand, keywords, provider, project_id)
-    job_id = job_data['job_id']
-    batches = job_data['batches']
 
-    if PROBE_QUEUE_URL:
-        # SQS mode: dispatch batches to queue
-        return _dispatch_to_sqs(job_id, brand, batches, provider, project_id)
+def _finish_if_done(mgr: ProbeJobManager, job_id: str, job: Optional[Dict]):
+    """Write the summary once the last batch is in.
+
+    Counters are updated atomically, so exactly one worker sees
+    complete + failed reach total_batches.
+    """
+    if not job:
+        return
+    done = job.get('batches_complete', 0) + job.get('batches_failed', 0)
+    if done != job.get('total_batches'):
+        return
+    if not job.get('batches_complete'):
+        mgr.mark_error(job_id, 'all batches failed')
     else:
-        # Fallback: synchronous execution with threading
-        return _execute_sync_parallel(job_id, brand, batches, provider, mgr)
+        mgr.mark_complete(job_id, _summarize(job))
 
 
-def _dispatch_to_sqs(job_id: str, brand: str, batches: List[List[str]],
-                     provider: str, project_id: str = None) -> Dict:
-    """Send keyword batches to SQS for parallel Lambda processing."""
-    sqs = _get_sqs()
-    sent = 0
-    for i, batch in enumerate(batches):
-        message = {
-            'job_id': job_id,
-            'brand': brand,
-            'keywords': batch,
-            'provider': provider,
-            'batch_index': i,
-            'project_id': project_id or '',
-        }
+# -- Probe queue --
+
+class LocalProbeQueue:
+    """
+    In-process stand-in for the SQS probe queue.
+
+    Accepts the same send_message_batch call as the boto3 SQS client and
+    hands each message to a bounded worker pool, where it is processed
+    exactly as the Lambda worker would process it. At most ``max_queued``
+    messages are accepted at a time; extra entries come back in ``Failed``
+    like a throttled SQS call. ``inline=True`` processes messages inside
+    send_message_batch (used on Lambda, where background threads freeze
+    once the response is returned, and handy in tests).
+    """
+
+    def __init__(self, process: Callable[[Dict], None] = None,
+                 max_workers: int = PROBE_WORKERS,
+                 max_queued: int = MAX_QUEUED_BATCHES,
+                 inline: bool = False):
+        self._process = process or process_probe_message
+        self._inline = inline
+        self._pool = None if inline else ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='probe-worker')
+        self._slots = threading.BoundedSemaphore(max_queued)
+        self._pending = 0
+        self._lock = threading.Condition()
+        self.sent = deque(maxlen=SENT_HISTORY)  # latest message bodies, in send order
+
+    def send_message_batch(self, QueueUrl: str = '', Entries: List[Dict] = None) -> Dict:
+        successful, failed = [], []
+        for entry in Entries or []:
+            if not self._slots.acquire(blocking=False):
+                failed.append({'Id': entry['Id'], 'SenderFault': False,
+                               'Code': 'QueueFull', 'Message': 'local probe queue is full'})
+                continue
+            body = json.loads(entry['MessageBody'])
+            with self._lock:
+                self._pending += 1
+                self.sent.append(body)
+            successful.append({'Id': entry['Id'], 'MessageId': str(uuid.uuid4())})
+            if self._inline:
+                self._run(body)
+            else:
+                self._pool.submit(self._run, body)
+        return {'Successful': successful, 'Failed': failed}
+
+    def _run(self, body: Dict):
         try:
-            sqs.send_message(
-                QueueUrl=PROBE_QUEUE_URL,
-                MessageBody=json.dumps(message),
-                MessageGroupId=job_id if '.fifo' in PROBE_QUEUE_URL else None,
-            )
-            sent += 1
+            self._process(body)
         except Exception as e:
-            logger.error("SQS send failed for batch %d: %s", i, e)
+            logger.error("Local probe worker error: %s", e)
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._pending -= 1
+                self._lock.notify_all()
 
-    return {
-        'job_id': job_id,
-        'mode': 'sqs_parallel',
-        'batches_sent': sent,
-        'total_batches': len(batches),
-        'total_keywords': sum(len(b) for b in batches),
-        'status': 'dispatched',
-    }
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
 
+    def drain(self, timeout: float = None) -> bool:
+        """Wait until every accepted message has been processed."""
+        with self._lock:
+            return self._lock.wait_for(lambda: self._pending == 0, timeout=timeout)
 
-def _execute_sync_parallel(job_id: str, brand: str,
-                           batches: List[List[str]], provider: str,
-                           mgr: ProbeJobManager) -> Dict:
-    """Fallback: run batches using ThreadPoolExecutor for local parallelism."""
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from geo_probe_service import geo_probe_batch
 
-    all_results = []
-    errors = []
+def _get_local_queue() -> LocalProbeQueue:
+    global _local_queue
+    with _local_queue_lock:
+        if _local_queue is None:
+            _local_queue = LocalProbeQueue(inline=IS_LAMBDA)
+        return _local_queue
+
 
-    def _run_batch(batch_keywords):
-        return geo_probe_batch(brand, batch_keywords, ai_model=provider)
+def _get_queue():
+    """(queue client, queue url, mode) for the configured probe queue."""
+    if PROBE_QUEUE_URL:
+        return _get_sqs(), PROBE_QUEUE_URL, 'sqs_parallel'
+    return _get_local_queue(), '', 'local_parallel'
+
+
+def _send_batches(queue, queue_url: str, messages: List[Dict],
+                  group_id: str = None) -> Tuple[List[int], Dict[int, str]]:
+    """send_message_batch in groups of 10, retrying failed entries.
 
-    max_workers = min(len(batches), 10)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_run_batch, b): i for i, b in enumerate(batches)}
-        for future in as_completed(futures):
-            batch_idx = futures[future]
+    Returns (sent batch indexes, {batch index: error} for those given up on).
+    """
+    sent, errors = [], {}
+    for start in range(0, len(messages), SQS_BATCH_LIMIT):
+        pending = {str(m['batch_index']): m for m in messages[start:start + SQS_BATCH_LIMIT]}
+        for attempt in range(MAX_SEND_RETRIES + 1):
+            entries = []
+            for entry_id, msg in pending.items():
+                entry = {'Id': entry_id, 'MessageBody': json.dumps(msg)}
+                if group_id:
+                    entry['MessageGroupId'] = group_id
+                    entry['MessageDeduplicationId'] = f"{group_id}-{entry_id}"
+                entries.append(entry)
             try:
-                result = future.result()
-                all_results.append(result)
-                mgr.update_batch_complete(job_id, result)
+                resp = queue.send_message_batch(QueueUrl=queue_url, Entries=entries)
             except Exception as e:
-                errors.append({'batch': batch_idx, 'error': str(e)})
-                logger.error("Batch %d failed: %s", batch_idx, e)
-
-    # Aggregate results
-    total_cited = sum(r.get('cited_count', 0) for r in all_results)
-    total_prompts = sum(r.get('total_prompts', 0) for r in all_results)
-    overall_geo = round(total_cited / total_prompts, 4) if total_prompts else 0
-
-    summary = {
-        'geo_score': overall_geo,
-        'cited_count': total_cited,
-        'total_prompts': total_prompts,
-        'batches_complete': len(all_results),
-        'errors': errors,
-    }
-    mgr.mark_complete(job_id, summary)
+                logger.error("Probe queue send failed (attempt %d): %s", attempt + 1, e)
+                resp = {'Failed': [{'Id': i, 'Message': str(e)} for i in pending]}
+            for ok in resp.get('Successful', []):
+                sent.append(pending.pop(ok['Id'])['batch_index'])
+            for fail in resp.get('Failed', []):
+                errors[int(fail['Id'])] = fail.get('Message') or fail.get('Code', 'send failed')
+            if not pending:
+                break
+            if attempt < MAX_SEND_RETRIES:
+                time.sleep(min(2.0, 0.1 * (2 ** attempt)) * random.uniform(0.5, 1.0))
+        for idx in sent:
+            errors.pop(idx, None)
+    return sent, errors
+
+
+def dispatch_parallel_probe(brand: str, keywords: List[str],
+                            provider: str = 'nova',
+                            project_id: str = None) -> Dict:
+    """
+    Dispatch a parallel probe job and return without waiting for it.
+
+    Batches go to the SQS queue when one is configured, otherwise to the
+    local worker pool. Follow progress with ProbeJobManager.get_job() or
+    iter_job_events().
+    """
+    mgr = ProbeJobManager()
+    job_data = mgr.create_job(brand, keywords, provider, project_id)
+    job_id = job_data['job_id']
+    batches = job_data['batches']
+
+    queue, queue_url, mode = _get_queue()
+    messages = [{
+        'job_id': job_id,
+        'brand': brand,
+        'keywords': batch,
+        'provider': provider,
+        'batch_index': i,
+        'project_id': project_id or '',
+    } for i, batch in enumerate(batches)]
+    group_id = job_id if '.fifo' in queue_url else None
+    sent, errors = _send_batches(queue, queue_url, messages, group_id)
+
+    for idx, err in sorted(errors.items()):
+        logger.error("Probe job %s: batch %d not queued: %s", job_id, idx, err)
+        _finish_if_done(mgr, job_id, mgr.record_batch_error(job_id, idx, f'not queued: {err}'))
 
     return {
         'job_id': job_id,
-        'mode': 'sync_parallel',
+        'mode': mode,
         'brand': brand,
-        'status': 'complete',
-        'geo_score': overall_geo,
-        'cited_count': total_cited,
-        'total_prompts': total_prompts,
-        'batches_complete': len(all_results),
+        'status': 'dispatched' if sent else 'error',
+        'batches_sent': len(sent),
         'total_batches': len(batches),
-        'errors': errors,
+        'total_keywords': sum(len(b) for b in batches),
     }
 
 
+def process_probe_message(body: Dict, mgr: ProbeJobManager = None):
+    """Probe one queued batch and fold the result into its job."""
+    from geo_probe_service import geo_probe_batch
+
+    mgr = mgr or ProbeJobManager()
+    job_id = body['job_id']
+    batch_index = body.get('batch_index', 0)
+    keywords = body['keywords']
+    try:
+        result = geo_probe_batch(body['brand'], keywords, ai_model=body.get('provider', 'nova'))
+    except Exception as e:
+        logger.error("Probe job %s: batch %d failed: %s", job_id, batch_index, e)
+        _finish_if_done(mgr, job_id, mgr.record_batch_error(job_id, batch_index, str(e)))
+        return
+    _finish_if_done(mgr, job_id, mgr.update_batch_complete(job_id, result))
+    logger.info("Probe worker: job=%s batch=%d keywords=%d geo=%.2f",
+                job_id, batch_index, len(keywords), result.get('geo_score', 0))
+
+
+def iter_job_events(job_id: str, poll_interval: float = 2.0,
+                    timeout: float = 900) -> Iterator[Tuple[str, Dict]]:
+    """(event, payload) pairs for a job's progress stream.
+
+    Emits ``progress`` whenever the counters or status change, then ``done``
+    with the final job record. Wakes immediately on progress made in this
+    process and re-reads the jobs table every ``poll_interval`` seconds for
+    batches finished elsewhere (SQS workers). ``error`` if the job is
+    unknown, ``timeout`` if it has not finished within ``timeout`` seconds.
+    """
+    mgr = ProbeJobManager()
+    deadline = time.time() + timeout
+    version = -1
+    last = None
+    while True:
+        job = mgr.get_job(job_id)
+        if not job:
+            yield 'error', {'error': 'job not found', 'job_id': job_id}
+            return
+        snapshot = (job.get('status'), job.get('batches_complete'), job.get('batches_failed'))
+        if snapshot != last:
+            last = snapshot
+            yield 'progress', {k: job.get(k) for k in (
+                'job_id', 'status', 'progress', 'batches_complete', 'batches_failed',
+                'total_batches', 'cited_count', 'total_prompts')}
+        if job.get('status') in TERMINAL_STATUSES:
+            yield 'done', job
+            return
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            yield 'timeout', {'job_id': job_id, 'progress': job.get('progress')}
+            return
+        version = wait_for_update(job_id, version, min(poll_interval, remaining))
+
+
 # -- SQS Lambda worker handler --
 
 def sqs_worker_handler(event, context):
@@ -282,26 +531,10 @@ def sqs_worker_handler(event, context):
     Lambda handler for SQS probe worker.
     Processes one batch of keywords and writes results back.
     """
-    from geo_probe_service import geo_probe_batch
-
     mgr = ProbeJobManager()
 
     for record in event.get('Records', []):
         try:
-            body = json.loads(record['body'])
-            job_id = body['job_id']
-            brand = body['brand']
-            keywords = body['keywords']
-            provider = body.get('provider', 'nova')
-
-            result = geo_probe_batch(brand, keywords, ai_model=provider)
-            mgr.update_batch_complete(job_id, result)
-
-            logger.info("SQS worker: job=%s batch=%d keywords=%d geo=%.2f",
-                        job_id, body.get('batch_index', 0),
-                        len(keywords), result.get('geo_score', 0))
+            process_probe_message(json.loads(record['body']), mgr)
         except Exception as e:
             logger.error("SQS worker error: %s", e)
-            job_id = json.loads(record.get('body', '{}')).get('job_id', '')
-            if job_id:
-                mgr.mark_error(job_id, str(e))
@@ -11,23 +11,50 @@ Returns:
   - avg_geo_score
   - top_citing_engine
   - last_updated
+
+The stats are not computed per request. The background scheduler's
+leader recomputes them every LIVE_STATS_REFRESH_SECONDS into one shared
+snapshot (deepthi-public-stats); each worker keeps an in-memory copy and
+re-reads the shared item at most every LOCAL_TTL seconds. A cold worker
+with no usable snapshot computes once — concurrent cold requests wait
+for that single computation instead of each running their own.
+
+Responses carry an ETag derived from the snapshot (identical on every
+worker) and Cache-Control with stale-while-revalidate, so browsers and
+the CDN revalidate with If-None-Match and get a 304.
 """
 
-from flask import Blueprint, jsonify
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import Blueprint, jsonify, request
+
+logger = logging.getLogger(__name__)
 
 public_stats_bp = Blueprint('public_stats', __name__, url_prefix='/api/public')
 
+REGION = os.environ.get('AWS_REGION', 'us-east-1')
+TABLE_PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
+STATS_TABLE = f'{TABLE_PREFIX}deepthi-public-stats'
+SNAPSHOT_ID = 'live-stats'
 
-@public_stats_bp.route('/live-stats', methods=['GET'])
-def live_stats():
-    """
-    Public endpoint — no auth required.
-    Returns live platform statistics for the main page.
-    """
-    import logging
-    from datetime import datetime, timezone
+REFRESH_INTERVAL = int(os.environ.get('LIVE_STATS_REFRESH_SECONDS', '120'))
+STALE_AFTER = REFRESH_INTERVAL * 3  # no leader refreshed it: recompute locally
+LOCAL_TTL = 15                      # seconds a worker trusts its in-memory copy
+CACHE_MAX_AGE = 60                  # browser / CDN freshness
+CACHE_SWR = 600                     # CDN may serve stale this long while revalidating
 
-    logger = logging.getLogger(__name__)
+_snapshot = None  # {'stats', 'etag', 'computed_at', 'checked_at'}
+_lock = threading.Lock()
+
+
+def compute_live_stats() -> dict:
+    """Compute the stats from the source tables (slow; never call per request)."""
     stats = {
         'total_brands_monitored': 0,
         'total_ai_probes_run': 0,
@@ -52,14 +79,11 @@ def live_stats():
 
     # 2. Total AI probes run — from geo-probes table
     try:
-        import os
         use_dynamo = not bool(os.environ.get("USE_RDS"))
         if use_dynamo:
-            import boto3
-            region = os.environ.get('AWS_REGION', 'us-east-1')
-            client = boto3.client('dynamodb', region_name=region)
-            prefix = os.environ.get('DYNAMO_TABLE_PREFIX', '')
-            table_name = f'{prefix}ai1stseo-geo-probes'
+            from aws_clients import get_client
+            client = get_client('dynamodb', REGION)
+            table_name = f'{TABLE_PREFIX}ai1stseo-geo-probes'
             try:
                 desc = client.describe_table(TableName=table_name)
                 stats['total_ai_probes_run'] = desc['Table'].get('ItemCount', 0)
@@ -111,4 +135,92 @@ def live_stats():
     except Exception as e:
         logger.debug("Top engine fallback: %s", e)
 
-    return jsonify(stats)
+    return stats
+
+
+# ── Shared snapshot ───────────────────────────────────────────────────────── #
+
+def _table():
+    from aws_clients import get_resource
+    return get_resource('dynamodb', REGION).Table(STATS_TABLE)
+
+
+def _read_shared():
+    try:
+        item = _table().get_item(Key={'stat_id': SNAPSHOT_ID}).get('Item')
+    except Exception as e:
+        logger.debug("Shared live-stats snapshot unavailable: %s", e)
+        return None
+    if not item or not item.get('payload'):
+        return None
+    return {'stats': json.loads(item['payload']), 'etag': item['etag'],
+            'computed_at': float(item['computed_at'])}
+
+
+def refresh_live_stats() -> dict:
+    """Recompute the stats and publish them as the shared snapshot (scheduler job)."""
+    global _snapshot
+    now = time.time()
+    stats = compute_live_stats()
+    payload = json.dumps(stats, sort_keys=True, default=str)
+    snap = {'stats': stats, 'etag': hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32],
+            'computed_at': now}
+    try:
+        _table().put_item(Item={'stat_id': SNAPSHOT_ID, 'payload': payload,
+                                'etag': snap['etag'], 'computed_at': str(now)})
+    except Exception as e:
+        logger.debug("Shared live-stats snapshot not written: %s", e)
+    _snapshot = {**snap, 'checked_at': time.time()}
+    return _snapshot
+
+
+def _load():
+    """Adopt the shared snapshot, or compute one if it is missing or abandoned."""
+    global _snapshot
+    now = time.time()
+    shared = _read_shared()
+    local = _snapshot
+    if shared and now - shared['computed_at'] <= STALE_AFTER and (
+            local is None or shared['computed_at'] >= local['computed_at']):
+        _snapshot = {**shared, 'checked_at': now}
+    elif local is not None and now - local['computed_at'] < REFRESH_INTERVAL:
+        _snapshot = {**local, 'checked_at': now}  # shared copy unavailable; ours is recent
+    else:
+        refresh_live_stats()
+
+
+def _reload_and_release():
+    try:
+        _load()
+    except Exception as e:
+        logger.warning("Live-stats reload failed: %s", e)
+    finally:
+        _lock.release()
+
+
+def get_snapshot() -> dict:
+    """Current snapshot; blocks only when this worker has none yet."""
+    snap = _snapshot
+    if snap is not None:
+        if time.time() - snap['checked_at'] >= LOCAL_TTL and _lock.acquire(blocking=False):
+            threading.Thread(target=_reload_and_release, daemon=True, name='live-stats').start()
+        return snap
+    with _lock:  # single flight: other cold requests wait here for the first one
+        if _snapshot is None:
+            _load()
+        return _snapshot
+
+
+@public_stats_bp.route('/live-stats', methods=['GET'])
+def live_stats():
+    """
+    Public endpoint — no auth required.
+    Returns live platform statistics for the main page.
+    """
+    snap = get_snapshot()
+    response = jsonify(snap['stats'])
+    response.set_etag(snap['etag'])
+    response.last_modified = datetime.fromtimestamp(int(snap['computed_at']), timezone.utc)
+    response.headers['Cache-Control'] = (
+        f'public, max-age={CACHE_MAX_AGE}, stale-while-revalidate={CACHE_SWR}')
+    return response.make_conditional(request)
@@ -7,9 +7,10 @@ Run: python -m deepthi_intelligence.tables
 Creates 4 new tables — does NOT touch any existing Month 3 or core tables.
 """
 
-import boto3
 import os
 
+from aws_clients import get_client, get_resource
+
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 
@@ -24,6 +25,8 @@ DEEPTHI_TABLES = {
     f'{PREFIX}deepthi-freshness-signals': {'pk': 'content_id', 'sk': 'check_ts'},
     # Benchmark brand registry (PK: brand)
     f'{PREFIX}deepthi-brand-registry': {'pk': 'brand'},
+    # Last ETag / Last-Modified and signals per URL for conditional sweeps (PK: content_id)
+    f'{PREFIX}deepthi-freshness-validators': {'pk': 'content_id'},
     # Daily freshness digest per brand (PK: brand, SK: date)
     f'{PREFIX}deepthi-freshness-digest': {'pk': 'brand', 'sk': 'date'},
     # Schedule execution log (PK: run_id)
@@ -44,12 +47,14 @@ DEEPTHI_TABLES = {
     f'{PREFIX}deepthi-auto-actions': {'pk': 'action_id'},
     # Month 4: External citation building log (PK: citation_id)
     f'{PREFIX}deepthi-external-citations': {'pk': 'citation_id'},
+    # Public live-stats snapshot for the main page (PK: stat_id)
+    f'{PREFIX}deepthi-public-stats': {'pk': 'stat_id'},
 }
 
 
 def create_deepthi_tables():
-    ddb = boto3.resource('dynamodb', region_name=REGION)
-    client = boto3.client('dynamodb', region_name=REGION)
+    ddb = get_resource('dynamodb', REGION)
+    client = get_client('dynamodb', REGION)
     existing = client.list_tables()['TableNames']
 
     created = 0
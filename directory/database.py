@@ -113,6 +113,48 @@ class DirectoryDatabase:
         conn.close()
         return lid
 
+    def add_listings(self, listings: List[Dict]) -> int:
+        """Upsert many scraped listings in one transaction.
+
+        Rows are keyed by slug. On conflict only the scraped columns are
+        refreshed (blank values keep what is stored), so AI content,
+        citations and scores on an existing row survive a re-scrape.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [(
+            d['name'], d.get('slug') or self._slugify(d['name']), d['category'],
+            json.dumps(d.get('subcategories', [])), d.get('address'),
+            d.get('city', 'Ottawa'), d.get('province', 'ON'), d.get('postal_code'),
+            d.get('phone'), d.get('website'), d.get('latitude'), d.get('longitude'),
+            d.get('rating'), d.get('review_count', 0), json.dumps(d.get('hours', {})),
+            d.get('source', 'manual'), d.get('scraped_at') or now,
+        ) for d in listings]
+        conn = self.get_connection()
+        try:
+            conn.executemany('''
+                INSERT INTO listings
+                (name, slug, category, subcategories, address, city, province,
+                 postal_code, phone, website, latitude, longitude, rating,
+                 review_count, hours_json, source, scraped_at)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                ON CONFLICT(slug) DO UPDATE SET
+                    address=COALESCE(NULLIF(excluded.address, ''), listings.address),
+                    postal_code=COALESCE(NULLIF(excluded.postal_code, ''), listings.postal_code),
+                    phone=COALESCE(NULLIF(excluded.phone, ''), listings.phone),
+                    website=COALESCE(NULLIF(excluded.website, ''), listings.website),
+                    latitude=COALESCE(excluded.latitude, listings.latitude),
+                    longitude=COALESCE(excluded.longitude, listings.longitude),
+                    rating=CASE WHEN excluded.rating > 0 THEN excluded.rating ELSE listings.rating END,
+                    review_count=MAX(COALESCE(excluded.review_count, 0), COALESCE(listings.review_count, 0)),
+                    source=excluded.source,
+                    scraped_at=excluded.scraped_at,
+                    updated_at=excluded.scraped_at
+            ''', rows)
+            conn.commit()
+        finally:
+            conn.close()
+        return len(rows)
+
     def get_listing(self, slug: str) -> Optional[Dict]:
         conn = self.get_connection()
         row = conn.execute('SELECT * FROM listings WHERE slug=?', (slug,)).fetchone()
@@ -27,6 +27,8 @@ Endpoints:
 import logging
 from flask import Blueprint, request, jsonify
 
+from response_cache import cached
+
 logger = logging.getLogger(__name__)
 
 dir_bp = Blueprint('dir_module', __name__, url_prefix='/api/dir')
@@ -43,6 +45,7 @@ def _ok(data, code=200):
 # ── Categories ────────────────────────────────────────────────────────────────
 
 @dir_bp.route('/categories', methods=['GET'])
+@cached('directory')
 def list_categories():
     """List all active directory categories."""
     try:
@@ -56,6 +59,7 @@ def list_categories():
 
 
 @dir_bp.route('/categories/<slug>', methods=['GET'])
+@cached('directory')
 def get_category(slug):
     """Get a single category by slug, with optional item preview."""
     try:
@@ -128,6 +132,7 @@ def delete_category_endpoint(slug):
 # ── Items ─────────────────────────────────────────────────────────────────────
 
 @dir_bp.route('/categories/<slug>/items', methods=['GET'])
+@cached('directory')
 def list_items(slug):
     """Get items for a category with filtering, sorting, and pagination.
 
@@ -166,6 +171,7 @@ def list_items(slug):
 
 
 @dir_bp.route('/categories/<slug>/items/<item_slug>', methods=['GET'])
+@cached('directory')
 def get_item(slug, item_slug):
     """Get a single item by category slug + item slug."""
     try:
@@ -250,6 +256,7 @@ def bulk_upsert_endpoint(slug):
 # ── Trending / Search / Tags / Stats ─────────────────────────────────────────
 
 @dir_bp.route('/trending', methods=['GET'])
+@cached('directory')
 def trending():
     """Get trending items across all categories (or scoped to one)."""
     try:
@@ -264,6 +271,7 @@ def trending():
 
 
 @dir_bp.route('/search', methods=['GET'])
+@cached('directory')
 def search():
     """Search items by name, description, or tag.
 
@@ -284,6 +292,7 @@ def search():
 
 
 @dir_bp.route('/tags', methods=['GET'])
+@cached('directory')
 def tags():
     """Get all distinct tags, optionally scoped to a category."""
     try:
@@ -297,6 +306,7 @@ def tags():
 
 
 @dir_bp.route('/stats', methods=['GET'])
+@cached('directory')
 def stats():
     """Overview stats: total categories, total items, trending count."""
     try:
@@ -324,109 +334,137 @@ def stats():
 
 # ── PDF Export ────────────────────────────────────────────────────────────────
 
+EXPORT_PAGE = 200          # rows fetched per database round trip
+EXPORT_MAX_ITEMS = 5000
+ROWS_PER_TABLE = 35        # one table per PDF page, so reportlab never splits a huge table
+_LEGACY_SORTS = {'trending_score': 'trending', 'created_at': 'newest'}
+
+
 @dir_bp.route('/categories/<slug>/items/pdf', methods=['GET'])
 def export_items_pdf(slug):
     """Download directory items for a category as a PDF report.
 
-    Query params: tag (optional), sort (optional: name, trending_score, created_at)
+    Query params: tag (optional), sort (optional: name, trending, newest, rating),
+    limit (default 100, max 5000). Rendered reports are cached by content, so
+    repeat downloads of unchanged data are served straight from the cache.
     """
     try:
-        from directory.directory_db import get_items, get_category_by_slug
+        from directory.directory_db import get_category_by_slug
         cat = get_category_by_slug(slug)
         if not cat:
             return _err('Category not found', 404)
 
         tag = request.args.get('tag')
-        sort = request.args.get('sort', 'trending_score')
-        items = get_items(slug, status='active', tag=tag, sort_by=sort, limit=100)
-        if not items:
+        sort = request.args.get('sort', 'trending')
+        sort = _LEGACY_SORTS.get(sort, sort)
+        try:
+            limit = int(request.args.get('limit', 100))
+        except ValueError:
+            return _err('limit must be an integer', 400)
+        limit = max(1, min(limit, EXPORT_MAX_ITEMS))
+        rows = list(_iter_export_rows(slug, tag, sort, limit))
+        if not rows:
             return _err('No items found', 404)
 
-        pdf_bytes = _generate_directory_pdf(cat, items)
-
-        from flask import Response
         filename = f"{slug}-directory-report.pdf"
-        return Response(
-            pdf_bytes,
-            mimetype='application/pdf',
-            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
-        )
+        try:
+            from report_renderer import ReportRenderer, pdf_response
+            path = ReportRenderer('directory').render(_directory_sections(cat, rows))
+            return pdf_response(path, filename)
+        except ImportError:
+            from flask import Response
+            return Response(
+                _directory_text(cat, rows),
+                mimetype='application/pdf',
+                headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+            )
     except Exception as e:
         logger.exception("export_items_pdf failed")
         return _err(f'PDF generation failed: {e}', 500)
 
 
-def _generate_directory_pdf(category, items):
-    """Generate a PDF report for directory items using reportlab."""
-    try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib import colors
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-        import io
-
-        buf = io.BytesIO()
-        doc = SimpleDocTemplate(buf, pagesize=letter)
-        styles = getSampleStyleSheet()
-        elements = []
-
-        cat_name = category.get('name', 'Directory')
-        elements.append(Paragraph(
-            f"{cat_name} — Directory Report",
-            styles['Title']
-        ))
-        elements.append(Spacer(1, 12))
-        elements.append(Paragraph(
-            f"Total items: {len(items)} · Generated by AI1stSEO Directory",
-            styles['Normal']
-        ))
-        if category.get('description'):
-            elements.append(Spacer(1, 8))
-            elements.append(Paragraph(category['description'][:300], styles['Normal']))
-        elements.append(Spacer(1, 20))
-
-        header = ['#', 'Name', 'Status', 'Tags', 'Trending']
-        data = [header]
-        for i, item in enumerate(items, 1):
+def _iter_export_rows(slug, tag, sort, limit):
+    """Active items as compact table rows, fetched EXPORT_PAGE at a time."""
+    from directory.directory_db import get_items
+    offset = 0
+    while offset < limit:
+        page = get_items(slug, status='active', tag=tag, sort_by=sort,
+                         limit=min(EXPORT_PAGE, limit - offset), offset=offset)['items']
+        for item in page:
             tags = ', '.join(item.get('tags', [])[:3]) if item.get('tags') else ''
-            data.append([
-                str(i),
+            yield [
                 str(item.get('name', ''))[:40],
                 item.get('status', ''),
                 tags[:30],
                 str(item.get('trending_score', 0)),
-            ])
-
-        t = Table(data, repeatRows=1, colWidths=[30, 200, 60, 120, 50])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a1a2e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (4, 0), (4, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f4f8')]),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        elements.append(t)
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph(
-            "Source: AI1stSEO Directory · ai1stseo.com",
-            styles['Normal']
-        ))
-
-        doc.build(elements)
-        return buf.getvalue()
-
-    except ImportError:
-        # Fallback: plain text PDF
-        import io
-        content = f"{category.get('name', 'Directory')} Report\n\n"
-        for i, item in enumerate(items, 1):
-            content += f"{i}. {item.get('name', '')} — {item.get('status', '')}\n"
-        return content.encode('utf-8')
+            ]
+        if len(page) < EXPORT_PAGE:
+            break
+        offset += len(page)
+
+
+def _directory_sections(category, rows):
+    """Report sections: header, one table per page of rows, footer."""
+    from report_renderer import Section
+    sections = [Section('dir-header', {
+        'name': category.get('name', 'Directory'),
+        'description': (category.get('description') or '')[:300],
+        'total': len(rows),
+    }, _build_directory_header)]
+    for start in range(0, len(rows), ROWS_PER_TABLE):
+        sections.append(Section('dir-table', {'start': start, 'rows': rows[start:start + ROWS_PER_TABLE]},
+                                _build_directory_table))
+    sections.append(Section('dir-footer', {}, _build_directory_footer))
+    return sections
+
+
+def _build_directory_header(data, styles):
+    from reportlab.platypus import Paragraph, Spacer
+    elements = [
+        Paragraph(f"{data['name']} — Directory Report", styles['Title']),
+        Spacer(1, 12),
+        Paragraph(f"Total items: {data['total']} · Generated by AI1stSEO Directory", styles['Normal']),
+    ]
+    if data['description']:
+        elements.append(Spacer(1, 8))
+        elements.append(Paragraph(data['description'], styles['Normal']))
+    elements.append(Spacer(1, 20))
+    return elements
+
+
+def _build_directory_table(data, styles):
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+    table_data = [['#', 'Name', 'Status', 'Tags', 'Trending']]
+    for i, row in enumerate(data['rows'], data['start'] + 1):
+        table_data.append([str(i)] + row)
+    t = Table(table_data, repeatRows=1, colWidths=[30, 200, 60, 120, 50])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a1a2e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        ('ALIGN', (4, 0), (4, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f4f8')]),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    return [t]
+
+
+def _build_directory_footer(data, styles):
+    from reportlab.platypus import Paragraph, Spacer
+    return [Spacer(1, 20), Paragraph("Source: AI1stSEO Directory · ai1stseo.com", styles['Normal'])]
+
+
+def _directory_text(category, rows):
+    """Plain-text fallback when reportlab is not installed."""
+    content = f"{category.get('name', 'Directory')} Report\n\n"
+    for i, row in enumerate(rows, 1):
+        content += f"{i}. {row[0]} — {row[1]}\n"
+    return content.encode('utf-8')
 
 
 # ── Blueprint registration ───────────────────────────────────────────────────
@@ -5,63 +5,21 @@ Supports categories like Sports, Tools, Brands, etc. with items that have
 structured fields: name, category, description, source_url, status, tags,
 trending score, ranking, and last_updated.
 
-Uses the same RDS connection pool from db.py — no new database required.
+Uses the shared RDS connection pool (pg_pool.py) — no new database required.
 """
 
 import json
 import logging
-import os
-from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import psycopg2
 import psycopg2.extras
 
-logger = logging.getLogger(__name__)
-
-# ── Connection ────────────────────────────────────────────────────────────────
-
-_pool = None
-
-
-def _get_pool():
-    global _pool
-    if _pool is None:
-        _pool = psycopg2.pool.ThreadedConnectionPool(
-            minconn=1,
-            maxconn=5,
-            host=os.environ.get("DB_HOST", "localhost"),
-            port=int(os.environ.get("DB_PORT", "5432")),
-            dbname=os.environ.get("DB_NAME", "ai1stseo"),
-            user=os.environ.get("DB_USER", "postgres"),
-            password=os.environ.get("DB_PASSWORD", ""),
-        )
-    return _pool
-
-
-@contextmanager
-def get_conn():
-    p = _get_pool()
-    conn = p.getconn()
-    try:
-        try:
-            conn.cursor().execute("SELECT 1")
-        except Exception:
-            try:
-                conn.close()
-            except Exception:
-                pass
-            p.putconn(conn, close=True)
-            conn = p.getconn()
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        p.putconn(conn)
+from pg_pool import execute_prepared, get_conn
+from response_cache import invalidates
 
+logger = logging.getLogger(__name__)
 
 # ── Schema init ───────────────────────────────────────────────────────────────
 
@@ -128,6 +86,7 @@ def init_directory_tables():
 
 # ── Category CRUD ─────────────────────────────────────────────────────────────
 
+@invalidates('directory')
 def create_category(name: str, slug: str, description: str = '',
                     icon: str = '', sort_order: int = 0,
                     meta_json: dict = None) -> Dict:
@@ -166,6 +125,7 @@ def get_category_by_slug(slug: str) -> Optional[Dict]:
         return _fmt_cat(row) if row else None
 
 
+@invalidates('directory')
 def update_category(slug: str, updates: Dict) -> Optional[Dict]:
     allowed = {'name', 'description', 'icon', 'sort_order', 'is_active', 'meta_json'}
     fields = {k: v for k, v in updates.items() if k in allowed}
@@ -185,6 +145,7 @@ def update_category(slug: str, updates: Dict) -> Optional[Dict]:
         return _fmt_cat(row) if row else None
 
 
+@invalidates('directory')
 def delete_category(slug: str) -> bool:
     with get_conn() as conn:
         cur = conn.cursor()
@@ -194,6 +155,7 @@ def delete_category(slug: str) -> bool:
 
 # ── Item CRUD ─────────────────────────────────────────────────────────────────
 
+@invalidates('directory')
 def create_item(category_slug: str, data: Dict) -> Optional[Dict]:
     cat = get_category_by_slug(category_slug)
     if not cat:
@@ -240,15 +202,15 @@ def get_items(category_slug: str, status: str = None, tag: str = None,
     if not cat:
         return {'items': [], 'total': 0, 'category': None}
 
-    where = ["di.category_id = %s"]
+    where = ["di.category_id = $1"]
     params: list = [cat['id']]
 
     if status:
-        where.append("di.status = %s")
         params.append(status)
+        where.append(f"di.status = ${len(params)}")
     if tag:
-        where.append("%s = ANY(di.tags)")
         params.append(tag)
+        where.append(f"${len(params)} = ANY(di.tags)")
 
     where_sql = " AND ".join(where)
 
@@ -263,19 +225,25 @@ def get_items(category_slug: str, status: str = None, tag: str = None,
     if sort_by in ('trending', 'rating', 'newest', 'updated') and order != 'asc':
         order_sql = 'DESC'
 
+    # Prepared per filter/sort combination (names stay within a few dozen)
+    variant = ("s" if status else "") + ("t" if tag else "")
+    sort_key = sort_col.split('.')[1]
+
     with get_conn() as conn:
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
         # Total count
-        cur.execute(f"SELECT COUNT(*) as cnt FROM directory_items di WHERE {where_sql}", params)
+        execute_prepared(cur, f"dir_items_count_{variant}",
+                         f"SELECT COUNT(*) as cnt FROM directory_items di WHERE {where_sql}", params)
         total = cur.fetchone()['cnt']
 
         # Items
-        cur.execute(f"""
+        n = len(params)
+        execute_prepared(cur, f"dir_items_{variant}_{sort_key}_{order_sql.lower()}", f"""
             SELECT di.* FROM directory_items di
             WHERE {where_sql}
             ORDER BY {sort_col} {order_sql}
-            LIMIT %s OFFSET %s
+            LIMIT ${n + 1} OFFSET ${n + 2}
         """, params + [limit, offset])
         items = [_fmt_item(r) for r in cur.fetchall()]
 
@@ -296,6 +264,7 @@ def get_item_by_slug(category_slug: str, item_slug: str) -> Optional[Dict]:
         return _fmt_item(row) if row else None
 
 
+@invalidates('directory')
 def update_item(category_slug: str, item_slug: str, updates: Dict) -> Optional[Dict]:
     cat = get_category_by_slug(category_slug)
     if not cat:
@@ -319,6 +288,7 @@ def update_item(category_slug: str, item_slug: str, updates: Dict) -> Optional[D
         return _fmt_item(row) if row else None
 
 
+@invalidates('directory')
 def delete_item(category_slug: str, item_slug: str) -> bool:
     cat = get_category_by_slug(category_slug)
     if not cat:
@@ -422,8 +392,28 @@ def get_all_tags(category_slug: str = None) -> List[str]:
         return [r[0] for r in cur.fetchall()]
 
 
+def iter_source_urls(batch_size: int = 1000, status: str = 'active'):
+    """Yield (item_id, source_url) for every item with a source URL, keyset-paginated by id."""
+    last_id = 0
+    while True:
+        with get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT id, source_url FROM directory_items
+                WHERE id > %s AND status = %s AND source_url <> ''
+                ORDER BY id LIMIT %s
+            """, (last_id, status, batch_size))
+            rows = cur.fetchall()
+        for row in rows:
+            yield row[0], row[1]
+        if len(rows) < batch_size:
+            break
+        last_id = rows[-1][0]
+
+
 # ── Bulk upsert (admin / API ingestion) ───────────────────────────────────────
 
+@invalidates('directory')
 def bulk_upsert_items(category_slug: str, items: List[Dict]) -> Dict:
     """Insert or update many items at once. Returns counts."""
     cat = get_category_by_slug(category_slug)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Entity resolution for scraped business listings.
+
+The same business usually comes back from several sources with slightly
+different names ("Smith Dental Clinic Inc." / "Smith Dental"), phone
+formats and address spellings. Exact-name dedupe keeps all of them, and each
+becomes its own directory row.
+
+resolve_entities() clusters listings that refer to the same business:
+
+  1. Blocking — only listings sharing a key are compared: phone number
+     (last 10 digits), postal code, and a normalized-name prefix. This keeps
+     comparisons near-linear instead of all-pairs.
+  2. Matching — within a block, fuzzy name similarity plus address
+     similarity, with conflicting phone numbers vetoing a match.
+  3. Merging — each cluster becomes one record: best non-empty fields,
+     max review count, review-weighted rating, all sources listed.
+
+Existing directory rows can be passed in so a re-scrape updates the row
+(same slug) instead of inserting a duplicate. New entities whose name slug
+is already taken — by a stored row they did not match, or by another entity
+in the batch — get a postal-code or street suffix so the upsert cannot
+overwrite a different business.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from rapidfuzz import fuzz
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+NAME_MATCH = 0.90        # name alone is enough (same name-prefix block)
+NAME_WITH_ADDRESS = 0.75  # name + address agreement (same postal block)
+NAME_WITH_PHONE = 0.55   # same phone number, names only loosely similar
+ADDRESS_MATCH = 0.80
+ADDRESS_CONFLICT = 0.50  # both addresses present and below this → different places
+MAX_BLOCK = 200          # oversized blocks (e.g. a call-centre number) are skipped
+
+_LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'ltd', 'limited', 'llc', 'llp', 'corp', 'corporation',
+    'co', 'company', 'the', 'and', 'of',
+}
+_STREET_ABBREV = {
+    'street': 'st', 'avenue': 'ave', 'road': 'rd', 'boulevard': 'blvd', 'drive': 'dr',
+    'crescent': 'cres', 'court': 'crt', 'place': 'pl', 'lane': 'ln', 'parkway': 'pkwy',
+    'highway': 'hwy', 'suite': 'ste', 'unit': 'ste', 'east': 'e', 'west': 'w',
+    'north': 'n', 'south': 's',
+}
+_RE_POSTAL = re.compile(r'\b([ABCEGHJ-NPRSTVXY]\d[ABCEGHJ-NPRSTV-Z])\s?(\d[ABCEGHJ-NPRSTV-Z]\d)\b', re.I)
+_RE_WORD = re.compile(r'[a-z0-9]+')
+_RE_SLUG = re.compile(r'[^a-z0-9]+')
+
+# Fields taken from the best source when merging (first non-empty wins,
+# sources ordered by how much they filled in).
+_MERGE_FIELDS = ('name', 'address', 'phone', 'postal_code', 'website', 'city',
+                 'province', 'latitude', 'longitude')
+
+
+# ── Normalization ───────────────────────────────────────────────────────── #
+
+def normalize_name(name: str) -> str:
+    words = _RE_WORD.findall((name or '').lower().replace('&', ' and '))
+    kept = [w for w in words if w not in _LEGAL_SUFFIXES]
+    return ' '.join(kept or words)
+
+
+def normalize_address(address: str) -> str:
+    words = _RE_WORD.findall((address or '').lower())
+    return ' '.join(_STREET_ABBREV.get(w, w) for w in words)
+
+
+def normalize_phone(phone: str) -> str:
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) >= 10 else ''
+
+
+def postal_code(listing: Dict) -> str:
+    for text in (listing.get('postal_code'), listing.get('address')):
+        m = _RE_POSTAL.search(text or '')
+        if m:
+            return (m.group(1) + m.group(2)).upper()
+    return ''
+
+
+def slugify(text: str) -> str:
+    """Same slug the directory backends derive from a listing name."""
+    return _RE_SLUG.sub('-', (text or '').lower()).strip('-')
+
+
+def similarity(a: str, b: str) -> float:
+    """0–1 fuzzy similarity, tolerant of word order and extra words."""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if HAS_RAPIDFUZZ:
+        return fuzz.token_set_ratio(a, b) / 100.0
+    ta, tb = set(a.split()), set(b.split())
+    inter = ta & tb
+    # token-set: one name fully contained in the other ("smith dental" / "smith dental clinic")
+    if inter and (inter == ta or inter == tb):
+        contained = 0.9 + 0.1 * len(inter) / max(len(ta), len(tb))
+    else:
+        contained = 0.0
+    seq = SequenceMatcher(None, ' '.join(sorted(ta)), ' '.join(sorted(tb))).ratio()
+    return max(contained, seq)
+
+
+def _prepare(listing: Dict) -> Dict:
+    name = normalize_name(listing.get('name', ''))
+    return {
+        'name': name,
+        'address': normalize_address(listing.get('address', '')),
+        'phone': normalize_phone(listing.get('phone', '')),
+        'postal': postal_code(listing),
+        'prefix': name.replace(' ', '')[:6],
+    }
+
+
+def _blocking_keys(p: Dict) -> List[str]:
+    keys = []
+    if p['phone']:
+        keys.append('p:' + p['phone'])
+    if p['postal']:
+        keys.append('z:' + p['postal'])
+    if p['prefix']:
+        keys.append('n:' + p['prefix'])
+    return keys
+
+
+def is_match(a: Dict, b: Dict) -> bool:
+    """Do two prepared listings describe the same business?"""
+    if a['phone'] and b['phone'] and a['phone'] != b['phone']:
+        return False
+    addr = similarity(a['address'], b['address']) if a['address'] and b['address'] else None
+    if addr is not None and addr < ADDRESS_CONFLICT:
+        return False
+    name = similarity(a['name'], b['name'])
+    if a['phone'] and a['phone'] == b['phone']:
+        return name >= NAME_WITH_PHONE
+    if (addr is not None and addr >= ADDRESS_MATCH) or (a['postal'] and a['postal'] == b['postal']):
+        return name >= NAME_WITH_ADDRESS
+    return name >= NAME_MATCH
+
+
+# ── Clustering ──────────────────────────────────────────────────────────── #
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # keep the lower index as root so existing rows (listed first) anchor clusters
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def cluster(listings: List[Dict]) -> List[List[int]]:
+    """Index clusters of ``listings`` that refer to the same business."""
+    prepared = [_prepare(l) for l in listings]
+    blocks: Dict[str, List[int]] = {}
+    for i, p in enumerate(prepared):
+        for key in _blocking_keys(p):
+            blocks.setdefault(key, []).append(i)
+
+    uf = _UnionFind(len(listings))
+    compared = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK:
+            continue
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                i, j = members[x], members[y]
+                if (i, j) in compared or uf.find(i) == uf.find(j):
+                    continue
+                compared.add((i, j))
+                if is_match(prepared[i], prepared[j]):
+                    uf.union(i, j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(listings)):
+        groups.setdefault(uf.find(i), []).append(i)
+    return list(groups.values())
+
+
+def merge(records: List[Dict], existing: Optional[Dict] = None) -> Dict:
+    """Collapse one cluster into a single listing (keeps ``existing``'s slug)."""
+    ranked = sorted(records, key=lambda r: sum(1 for f in _MERGE_FIELDS if r.get(f)), reverse=True)
+    fresh_first = ranked + ([existing] if existing else [])
+    merged = {}
+    for field in _MERGE_FIELDS:
+        # the stored name stays (it is what the slug was built from); everything else prefers fresh data
+        order = fresh_first[-1:] + fresh_first[:-1] if field == 'name' and existing else fresh_first
+        for r in order:
+            if r.get(field):
+                merged[field] = r[field]
+                break
+    merged['category'] = (existing or records[0]).get('category', records[0].get('category'))
+
+    rated = [(float(r.get('rating') or 0), int(r.get('review_count') or 0)) for r in records]
+    rated = [(rt, n) for rt, n in rated if rt > 0]
+    weight = sum(max(n, 1) for _, n in rated)
+    merged['rating'] = round(sum(rt * max(n, 1) for rt, n in rated) / weight, 2) if rated else \
+        float((existing or {}).get('rating') or 0)
+    merged['review_count'] = max([int(r.get('review_count') or 0) for r in records] +
+                                 [int((existing or {}).get('review_count') or 0)])
+
+    sources = []
+    for r in ([existing] if existing else []) + records:
+        for s in (r.get('source') or '').split(','):
+            if s and s not in sources:
+                sources.append(s)
+    merged['source'] = ','.join(sources)
+    if existing and existing.get('slug'):
+        merged['slug'] = existing['slug']
+    postal = postal_code(merged)
+    if postal and not merged.get('postal_code'):
+        merged['postal_code'] = postal[:3] + ' ' + postal[3:]
+    return merged
+
+
+def _slug_candidates(listing: Dict):
+    base = slugify(listing.get('name', ''))
+    yield base
+    postal = postal_code(listing)
+    if postal:
+        yield f"{base}-{postal.lower()}"
+    street = normalize_address(listing.get('address', '')).split()[:3]
+    if street:
+        yield f"{base}-{'-'.join(street)}"
+    n = 2
+    while True:
+        yield f"{base}-{n}"
+        n += 1
+
+
+def assign_slugs(entities: List[Dict], existing: List[Dict] = None,
+                 slug_taken: Optional[Callable[[str], bool]] = None) -> int:
+    """Give every entity without a slug one no other business owns.
+
+    Entities that already carry a slug (matched to an existing row) keep it.
+    The rest get their name slug, or a disambiguated one when that slug
+    belongs to an ``existing`` row, an earlier entity in the batch, or a
+    stored row ``slug_taken`` reports (rows outside ``existing``).
+    Returns how many slugs had to be disambiguated.
+    """
+    taken = {r['slug'] for r in existing or [] if r.get('slug')}
+    taken.update(e['slug'] for e in entities if e.get('slug'))
+    renamed = 0
+    for e in entities:
+        if e.get('slug'):
+            continue
+        for i, slug in enumerate(_slug_candidates(e)):
+            if slug in taken or (slug_taken and slug_taken(slug)):
+                continue
+            e['slug'] = slug
+            taken.add(slug)
+            renamed += i > 0
+            break
+    return renamed
+
+
+def resolve_entities(listings: List[Dict], existing: List[Dict] = None,
+                     slug_taken: Optional[Callable[[str], bool]] = None) -> Tuple[List[Dict], Dict]:
+    """Cluster and merge ``listings`` (one category), matching against ``existing`` rows.
+
+    Returns (merged listings to write, stats). Listings matched to an
+    existing row carry that row's slug, so the write updates it in place;
+    the rest get a slug no other business owns (see assign_slugs).
+    """
+    existing = existing or []
+    combined = list(existing) + list(listings)
+    n_existing = len(existing)
+    out = []
+    matched_existing = 0
+    for members in cluster(combined):
+        old = [combined[i] for i in members if i < n_existing]
+        new = [combined[i] for i in members if i >= n_existing]
+        if not new:
+            continue
+        anchor = old[0] if old else None
+        matched_existing += bool(anchor)
+        out.append(merge(new, anchor))
+    renamed = assign_slugs(out, existing, slug_taken)
+    return out, {
+        'input': len(listings),
+        'entities': len(out),
+        'duplicates_merged': len(listings) - len(out),
+        'matched_existing': matched_existing,
+        'slugs_disambiguated': renamed,
+    }
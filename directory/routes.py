@@ -191,14 +191,8 @@ def trigger_scrape():
     try:
         backend = _get_backend()
         from directory.scraper import BusinessScraper
-        scraper = BusinessScraper(db=backend if not USE_DYNAMO else None)
+        scraper = BusinessScraper(db=backend)
         result = scraper.scrape_all(categories=categories, city=city)
-
-        # If using DynamoDB, save scraped results
-        if USE_DYNAMO:
-            for listing in scraper.results:
-                backend.add_listing(listing)
-
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,15 +1,28 @@
 #!/usr/bin/env python3
 """Business scraping pipeline for AI Business Directory.
 Scrapes Ottawa businesses from Google Maps, Yelp, Yellow Pages, BBB, Canada411.
-Designed to run on homelab with Scrapy/Playwright."""
+Designed to run on homelab with Scrapy/Playwright.
+
+scrape_all() runs every category × source task concurrently:
+  - per-source rate limits (concurrency cap + spacing between requests)
+    instead of a blanket sleep after every task
+  - one pooled HTTP session, and a BrowserPool of long-lived headless
+    Chromium instances for Google Maps (a fresh context per task, not a
+    fresh browser)
+  - results are entity-resolved per category (directory.entity_resolution)
+    against each other and the rows already stored, then written with the
+    backend's batched add_listings()"""
 
 import os
 import re
 import json
+import queue
 import time
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
@@ -33,6 +46,123 @@ try:
 except ImportError:
     HAS_PLAYWRIGHT = False
 
+USER_AGENT = 'Mozilla/5.0 (compatible; AI1stSEO-DirectoryBot/1.0)'
+SCRAPE_WORKERS = int(os.environ.get('DIRECTORY_SCRAPE_WORKERS', '8'))
+BROWSER_POOL_SIZE = int(os.environ.get('DIRECTORY_BROWSER_POOL', '2'))
+WRITE_BATCH = 100
+EXISTING_LIMIT = 5000  # stored rows per category considered for matching
+
+# (max concurrent requests, min seconds between request starts) per source
+SOURCE_LIMITS = {
+    'google_maps': (BROWSER_POOL_SIZE, 3.0),
+    'yelp': (1, 2.0),
+    'yellow_pages': (2, 1.0),
+    'bbb': (2, 1.0),
+    'canada411': (2, 1.0),
+}
+
+
+class SourceLimiter:
+    """Caps concurrent requests per source and spaces request starts."""
+
+    def __init__(self, limits: Dict[str, tuple] = None):
+        self._limits = limits or SOURCE_LIMITS
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def _sem(self, source):
+        with self._lock:
+            sem = self._sems.get(source)
+            if sem is None:
+                sem = self._sems[source] = threading.BoundedSemaphore(self._limits.get(source, (1, 2.0))[0])
+            return sem
+
+    def acquire(self, source: str):
+        self._sem(source).acquire()
+        delay = self._limits.get(source, (1, 2.0))[1]
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(source, 0.0))
+            self._next_slot[source] = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+
+    def release(self, source: str):
+        self._sem(source).release()
+
+
+class BrowserPool:
+    """Long-lived headless Chromium instances shared across scrape tasks.
+
+    Playwright's sync API is bound to the thread that started it, so each
+    browser lives on its own worker thread. Tasks go to whichever worker is
+    free and get a fresh, isolated browser context; the browser itself is
+    launched once and reused (relaunched only if it crashed).
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = max(1, size)
+        self._tasks: 'queue.Queue' = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.launches = 0
+
+    def submit(self, fn: Callable) -> Future:
+        """Run ``fn(context)`` on a pooled browser; returns a Future."""
+        with self._lock:
+            if not self._threads:
+                for i in range(self.size):
+                    t = threading.Thread(target=self._worker, name=f'browser-{i}', daemon=True)
+                    t.start()
+                    self._threads.append(t)
+        future = Future()
+        self._tasks.put((fn, future))
+        return future
+
+    def run(self, fn: Callable):
+        return self.submit(fn).result()
+
+    def _worker(self):
+        pw = browser = None
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    break
+                fn, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if browser is None or not browser.is_connected():
+                        if pw is None:
+                            pw = sync_playwright().start()
+                        browser = pw.chromium.launch(headless=True)
+                        with self._lock:
+                            self.launches += 1
+                    context = browser.new_context(user_agent=USER_AGENT)
+                    try:
+                        future.set_result(fn(context))
+                    finally:
+                        context.close()
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            for closer in (browser and browser.close, pw and pw.stop):
+                if closer:
+                    try:
+                        closer()
+                    except Exception:
+                        pass
+
+    def close(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._tasks.put(None)
+        for t in threads:
+            t.join(timeout=30)
+
 
 class BusinessScraper:
     """Scrapes business data from multiple sources for Ottawa region."""
@@ -45,50 +175,142 @@ class BusinessScraper:
         'accountant', 'chiropractor', 'veterinarian', 'mechanic', 'realtor'
     ]
 
-    def __init__(self, db=None):
+    def __init__(self, db=None, max_workers: int = SCRAPE_WORKERS,
+                 limiter: SourceLimiter = None):
         self.db = db
         self.results = []
         self.errors = []
+        self.max_workers = max_workers
+        self.limiter = limiter or SourceLimiter()
+        self._browsers: Optional[BrowserPool] = None
+        self._browsers_lock = threading.Lock()
+        self._session = None
+        if HAS_REQUESTS:
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = USER_AGENT
+            adapter = requests.adapters.HTTPAdapter(pool_connections=len(self.SOURCES),
+                                                    pool_maxsize=max_workers)
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
 
     def scrape_all(self, categories: List[str] = None, city: str = 'Ottawa'):
         """Run full scrape pipeline across all sources and categories."""
+        t0 = time.time()
         cats = categories or self.CATEGORIES
-        total_found = 0
-        total_added = 0
+        scraped = {c: [] for c in cats}
+        found = {}
 
-        for category in cats:
-            logger.info(f"Scraping category: {category} in {city}")
-            for source in self.SOURCES:
-                try:
-                    listings = self._scrape_source(source, category, city)
-                    found = len(listings)
-                    added = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self._scrape_source, source, category, city): (category, source)
+                           for category in cats for source in self.SOURCES}
+                for future in as_completed(futures):
+                    category, source = futures[future]
+                    try:
+                        listings = future.result()
+                    except Exception as e:
+                        err = f"{source}/{category}: {str(e)}"
+                        self.errors.append(err)
+                        logger.error(f"  Error: {err}")
+                        self._log_scrape(source, category, 0, 0, str(e))
+                        continue
                     for listing in listings:
                         listing['category'] = category
                         listing['source'] = source
-                        if self.db:
-                            self.db.add_listing(listing)
-                            added += 1
-                        self.results.append(listing)
-                    total_found += found
-                    total_added += added
-                    if self.db:
-                        self.db.log_scrape(source, category, found, added)
-                    logger.info(f"  {source}: found {found}, added {added}")
-                except Exception as e:
-                    err = f"{source}/{category}: {str(e)}"
-                    self.errors.append(err)
-                    logger.error(f"  Error: {err}")
-                    if self.db:
-                        self.db.log_scrape(source, category, 0, 0, str(e))
-                # Rate limiting
-                time.sleep(2)
+                    scraped[category].extend(listings)
+                    found[(category, source)] = len(listings)
+                    logger.info(f"  {category}/{source}: found {len(listings)}")
+        finally:
+            if self._browsers:
+                self._browsers.close()
+                self._browsers = None
+
+        from directory.entity_resolution import resolve_entities
+        totals = {'found': 0, 'added': 0, 'new': 0, 'duplicates_merged': 0, 'matched_existing': 0}
+        for category in cats:
+            entities, stats = resolve_entities(scraped[category], existing=self._existing(category),
+                                               slug_taken=self._slug_taken)
+            now = datetime.utcnow().isoformat()
+            for e in entities:
+                e['scraped_at'] = now
+            added = self._write(entities)
+            self.results.extend(entities)
+
+            totals['found'] += stats['input']
+            totals['added'] += added
+            totals['new'] += stats['entities'] - stats['matched_existing']
+            totals['duplicates_merged'] += stats['duplicates_merged']
+            totals['matched_existing'] += stats['matched_existing']
+            for source in self.SOURCES:
+                if (category, source) in found:
+                    contributed = sum(1 for e in entities if source in e['source'].split(','))
+                    self._log_scrape(source, category, found[(category, source)],
+                                     contributed if added else 0)
+            logger.info(f"Scraping category: {category} in {city} — {stats['input']} found, "
+                        f"{stats['entities']} entities ({stats['duplicates_merged']} merged, "
+                        f"{stats['matched_existing']} already listed)")
+
+        totals['errors'] = self.errors
+        totals['duration_seconds'] = round(time.time() - t0, 1)
+        logger.info(f"Scrape complete: {totals['found']} found, {totals['added']} added, "
+                    f"{len(self.errors)} errors in {totals['duration_seconds']}s")
+        return totals
+
+    def _existing(self, category: str) -> List[Dict]:
+        """Stored rows in ``category`` that new listings may resolve to."""
+        if not self.db or not hasattr(self.db, 'get_listings_by_category'):
+            return []
+        try:
+            return self.db.get_listings_by_category(category, limit=EXISTING_LIMIT)
+        except Exception as e:
+            logger.warning(f"Could not load existing {category} listings: {e}")
+            return []
 
-        logger.info(f"Scrape complete: {total_found} found, {total_added} added, {len(self.errors)} errors")
-        return {'found': total_found, 'added': total_added, 'errors': self.errors}
+    def _slug_taken(self, slug: str) -> bool:
+        """Is ``slug`` owned by a stored row (any category, beyond EXISTING_LIMIT)?"""
+        if not self.db or not hasattr(self.db, 'get_listing'):
+            return False
+        try:
+            return self.db.get_listing(slug) is not None
+        except Exception as e:
+            logger.warning(f"Could not check slug {slug}: {e}")
+            return False
+
+    def _write(self, entities: List[Dict]) -> int:
+        """Batched upsert through the backend; falls back to add_listing per row."""
+        if not self.db or not entities:
+            return 0
+        written = 0
+        for i in range(0, len(entities), WRITE_BATCH):
+            chunk = entities[i:i + WRITE_BATCH]
+            try:
+                if hasattr(self.db, 'add_listings'):
+                    self.db.add_listings(chunk)
+                else:
+                    for listing in chunk:
+                        self.db.add_listing(listing)
+                written += len(chunk)
+            except Exception as e:
+                err = f"write/{chunk[0].get('category')}: {str(e)}"
+                self.errors.append(err)
+                logger.error(f"  Error: {err}")
+        return written
+
+    def _log_scrape(self, source, category, found, added, errors=''):
+        if self.db and hasattr(self.db, 'log_scrape'):
+            self.db.log_scrape(source, category, found, added, errors)
+
+    def _get(self, url: str, timeout: int = 15):
+        return self._session.get(url, timeout=timeout)
+
+    def _browser_pool(self) -> BrowserPool:
+        with self._browsers_lock:
+            if self._browsers is None:
+                self._browsers = BrowserPool()
+            return self._browsers
 
     def _scrape_source(self, source: str, category: str, city: str) -> List[Dict]:
-        """Route to the appropriate scraper."""
+        """Route to the appropriate scraper, within the source's rate limit."""
         scrapers = {
             'google_maps': self._scrape_google_maps,
             'yelp': self._scrape_yelp,
@@ -97,9 +319,13 @@ class BusinessScraper:
             'canada411': self._scrape_canada411,
         }
         fn = scrapers.get(source)
-        if fn:
+        if not fn:
+            return []
+        self.limiter.acquire(source)
+        try:
             return fn(category, city)
-        return []
+        finally:
+            self.limiter.release(source)
 
     def _scrape_google_maps(self, category: str, city: str) -> List[Dict]:
         """Scrape Google Maps results using Playwright (JS-rendered)."""
@@ -107,53 +333,53 @@ class BusinessScraper:
             logger.warning("Playwright not installed — skipping Google Maps. pip install playwright && playwright install")
             return []
 
-        results = []
         query = f"{category} in {city} Ontario"
         url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
 
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(url, timeout=30000)
-                page.wait_for_timeout(3000)
-
-                # Scroll to load more results
-                for _ in range(3):
-                    page.mouse.wheel(0, 1000)
-                    page.wait_for_timeout(1500)
-
-                # Extract business cards
-                cards = page.query_selector_all('[data-result-index]')
-                for card in cards[:10]:
-                    try:
-                        name_el = card.query_selector('.fontHeadlineSmall, .qBF1Pd')
-                        rating_el = card.query_selector('.MW4etd')
-                        reviews_el = card.query_selector('.UY7F9')
-                        addr_el = card.query_selector('.W4Efsd:last-child')
-
-                        name = name_el.inner_text() if name_el else None
-                        if not name:
-                            continue
-
-                        rating_text = rating_el.inner_text() if rating_el else '0'
-                        reviews_text = reviews_el.inner_text() if reviews_el else '(0)'
-                        review_count = int(re.sub(r'[^\d]', '', reviews_text) or 0)
-
-                        results.append({
-                            'name': name.strip(),
-                            'rating': float(rating_text),
-                            'review_count': review_count,
-                            'address': addr_el.inner_text().strip() if addr_el else '',
-                            'city': city,
-                        })
-                    except Exception:
+        def _extract(context):
+            results = []
+            page = context.new_page()
+            page.goto(url, timeout=30000)
+            page.wait_for_timeout(3000)
+
+            # Scroll to load more results
+            for _ in range(3):
+                page.mouse.wheel(0, 1000)
+                page.wait_for_timeout(1500)
+
+            # Extract business cards
+            cards = page.query_selector_all('[data-result-index]')
+            for card in cards[:10]:
+                try:
+                    name_el = card.query_selector('.fontHeadlineSmall, .qBF1Pd')
+                    rating_el = card.query_selector('.MW4etd')
+                    reviews_el = card.query_selector('.UY7F9')
+                    addr_el = card.query_selector('.W4Efsd:last-child')
+
+                    name = name_el.inner_text() if name_el else None
+                    if not name:
                         continue
-                browser.close()
+
+                    rating_text = rating_el.inner_text() if rating_el else '0'
+                    reviews_text = reviews_el.inner_text() if reviews_el else '(0)'
+                    review_count = int(re.sub(r'[^\d]', '', reviews_text) or 0)
+
+                    results.append({
+                        'name': name.strip(),
+                        'rating': float(rating_text),
+                        'review_count': review_count,
+                        'address': addr_el.inner_text().strip() if addr_el else '',
+                        'city': city,
+                    })
+                except Exception:
+                    continue
+            return results
+
+        try:
+            return self._browser_pool().run(_extract)
         except Exception as e:
             logger.error(f"Google Maps scrape error: {e}")
-
-        return results
+            return []
 
     def _scrape_yelp(self, category: str, city: str) -> List[Dict]:
         """Scrape Yelp search results."""
@@ -163,10 +389,9 @@ class BusinessScraper:
 
         results = []
         url = f"https://www.yelp.ca/search?find_desc={category}&find_loc={city}+ON"
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; AI1stSEO-DirectoryBot/1.0)'}
 
         try:
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self._get(url)
             soup = BeautifulSoup(resp.text, 'html.parser')
 
             for card in soup.select('[data-testid="serp-ia-card"]')[:10]:
@@ -199,10 +424,9 @@ class BusinessScraper:
 
         results = []
         url = f"https://www.yellowpages.ca/search/si/1/{category}/{city}+ON"
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; AI1stSEO-DirectoryBot/1.0)'}
 
         try:
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self._get(url)
             soup = BeautifulSoup(resp.text, 'html.parser')
 
             for card in soup.select('.listing__content')[:10]:
@@ -234,10 +458,9 @@ class BusinessScraper:
 
         results = []
         url = f"https://www.bbb.org/search?find_country=CAN&find_loc={city}%2C%20ON&find_text={category}"
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; AI1stSEO-DirectoryBot/1.0)'}
 
         try:
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self._get(url)
             soup = BeautifulSoup(resp.text, 'html.parser')
 
             for card in soup.select('.result-item, .search-result')[:10]:
@@ -263,10 +486,9 @@ class BusinessScraper:
 
         results = []
         url = f"https://www.canada411.ca/search/si/1/{category}/{city}+ON"
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; AI1stSEO-DirectoryBot/1.0)'}
 
         try:
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = self._get(url)
             soup = BeautifulSoup(resp.text, 'html.parser')
 
             for card in soup.select('.listing__content, .vcard')[:10]:
@@ -290,16 +512,10 @@ class BusinessScraper:
 
         return results
 
-    def deduplicate(self, listings: List[Dict]) -> List[Dict]:
-        """Remove duplicate businesses by normalized name."""
-        seen = set()
-        unique = []
-        for l in listings:
-            key = re.sub(r'[^a-z0-9]', '', l['name'].lower())
-            if key not in seen:
-                seen.add(key)
-                unique.append(l)
-        return unique
+    def deduplicate(self, listings: List[Dict], existing: List[Dict] = None) -> List[Dict]:
+        """Merge listings that describe the same business (see entity_resolution)."""
+        from directory.entity_resolution import resolve_entities
+        return resolve_entities(listings, existing=existing)[0]
 
 
 # --- CLI entry point ---
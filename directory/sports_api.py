@@ -34,6 +34,8 @@ Endpoints:
 import logging
 from flask import Blueprint, request, jsonify
 
+from response_cache import cached
+
 logger = logging.getLogger(__name__)
 
 sports_bp = Blueprint('sports_module', __name__, url_prefix='/api/sports')
@@ -51,6 +53,7 @@ def _ok(data, code=200):
 
 @sports_bp.route('/', methods=['GET'])
 @sports_bp.route('', methods=['GET'])
+@cached('sports')
 def list_sports():
     """List all sports categories."""
     try:
@@ -63,6 +66,7 @@ def list_sports():
 
 
 @sports_bp.route('/<slug>', methods=['GET'])
+@cached('sports')
 def get_sport(slug):
     """Get a single sport with summary stats."""
     try:
@@ -104,6 +108,7 @@ def create_sport_endpoint():
 # ── Matches ───────────────────────────────────────────────────────────────────
 
 @sports_bp.route('/<slug>/matches', methods=['GET'])
+@cached('sports')
 def list_matches(slug):
     """Get matches for a sport.
 
@@ -188,6 +193,7 @@ def update_match_endpoint(match_id):
 # ── Teams ─────────────────────────────────────────────────────────────────────
 
 @sports_bp.route('/<slug>/teams', methods=['GET'])
+@cached('sports')
 def list_teams(slug):
     """Get teams for a sport, optionally filtered by league."""
     try:
@@ -236,6 +242,7 @@ def bulk_create_teams_endpoint(slug):
 # ── Rankings ──────────────────────────────────────────────────────────────────
 
 @sports_bp.route('/<slug>/rankings', methods=['GET'])
+@cached('sports')
 def list_rankings(slug):
     """Get league standings/rankings.
 
@@ -289,6 +296,7 @@ def bulk_upsert_rankings_endpoint(slug):
 # ── News ──────────────────────────────────────────────────────────────────────
 
 @sports_bp.route('/news', methods=['GET'])
+@cached('sports')
 def global_news():
     """Get news across all sports."""
     try:
@@ -303,6 +311,7 @@ def global_news():
 
 
 @sports_bp.route('/<slug>/news', methods=['GET'])
+@cached('sports')
 def sport_news(slug):
     """Get news for a specific sport."""
     try:
@@ -351,6 +360,7 @@ def bulk_create_news_endpoint(slug):
 # ── Trending & Explore ────────────────────────────────────────────────────────
 
 @sports_bp.route('/trending', methods=['GET'])
+@cached('sports')
 def trending():
     """Get trending news items across all sports."""
     try:
@@ -364,6 +374,7 @@ def trending():
 
 
 @sports_bp.route('/explore', methods=['GET'])
+@cached('sports')
 def explore():
     """Get all sport categories for the 'Explore More' grid."""
     try:
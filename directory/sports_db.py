@@ -8,61 +8,21 @@ Tables:
   - sports_rankings     (league standings / rankings)
   - sports_news         (news/trending items per sport)
 
-Uses the same RDS pool pattern as the rest of the app.
+Uses the shared RDS pool (pg_pool.py) like the rest of the app.
 """
 
 import json
 import logging
-import os
-from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import psycopg2
 import psycopg2.extras
-from psycopg2 import pool
 
-logger = logging.getLogger(__name__)
-
-_pool = None
-
-
-def _get_pool():
-    global _pool
-    if _pool is None:
-        _pool = pool.ThreadedConnectionPool(
-            minconn=1, maxconn=5,
-            host=os.environ.get("DB_HOST", "localhost"),
-            port=int(os.environ.get("DB_PORT", "5432")),
-            dbname=os.environ.get("DB_NAME", "ai1stseo"),
-            user=os.environ.get("DB_USER", "postgres"),
-            password=os.environ.get("DB_PASSWORD", ""),
-        )
-    return _pool
-
-
-@contextmanager
-def get_conn():
-    p = _get_pool()
-    conn = p.getconn()
-    try:
-        try:
-            conn.cursor().execute("SELECT 1")
-        except Exception:
-            try:
-                conn.close()
-            except Exception:
-                pass
-            p.putconn(conn, close=True)
-            conn = p.getconn()
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        p.putconn(conn)
+from pg_pool import get_conn
+from response_cache import invalidates
 
+logger = logging.getLogger(__name__)
 
 # ── Schema ────────────────────────────────────────────────────────────────────
 
@@ -188,6 +148,7 @@ def init_sports_tables():
 
 # ── Sports CRUD ───────────────────────────────────────────────────────────────
 
+@invalidates('sports')
 def create_sport(name, slug, icon='', description='', sort_order=0, meta_json=None):
     with get_conn() as conn:
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -223,6 +184,7 @@ def get_sport_by_slug(slug):
 
 # ── Teams ─────────────────────────────────────────────────────────────────────
 
+@invalidates('sports')
 def create_team(sport_slug, data):
     sport = get_sport_by_slug(sport_slug)
     if not sport:
@@ -260,6 +222,7 @@ def get_teams(sport_slug, league=None, limit=50):
         return [_fmt(r) for r in cur.fetchall()]
 
 
+@invalidates('sports')
 def bulk_create_teams(sport_slug, teams_list):
     count = 0
     for t in teams_list:
@@ -270,6 +233,7 @@ def bulk_create_teams(sport_slug, teams_list):
 
 # ── Matches ───────────────────────────────────────────────────────────────────
 
+@invalidates('sports')
 def create_match(sport_slug, data):
     sport = get_sport_by_slug(sport_slug)
     if not sport:
@@ -337,6 +301,7 @@ def get_matches(sport_slug, status=None, league=None, limit=20, offset=0):
     return {'matches': matches, 'total': total}
 
 
+@invalidates('sports')
 def update_match(match_id, updates):
     allowed = {'home_score', 'away_score', 'status', 'venue', 'match_url', 'meta_json'}
     fields = {k: v for k, v in updates.items() if k in allowed}
@@ -356,6 +321,7 @@ def update_match(match_id, updates):
         return _fmt_match(row) if row else None
 
 
+@invalidates('sports')
 def bulk_create_matches(sport_slug, matches_list):
     created = 0
     for m in matches_list:
@@ -366,6 +332,7 @@ def bulk_create_matches(sport_slug, matches_list):
 
 # ── Rankings ──────────────────────────────────────────────────────────────────
 
+@invalidates('sports')
 def upsert_ranking(sport_slug, data):
     sport = get_sport_by_slug(sport_slug)
     if not sport:
@@ -408,6 +375,7 @@ def get_rankings(sport_slug, league, season='2025-26', limit=30):
         return [_fmt(r) for r in cur.fetchall()]
 
 
+@invalidates('sports')
 def bulk_upsert_rankings(sport_slug, rankings_list):
     count = 0
     for r in rankings_list:
@@ -418,6 +386,7 @@ def bulk_upsert_rankings(sport_slug, rankings_list):
 
 # ── News ──────────────────────────────────────────────────────────────────────
 
+@invalidates('sports')
 def create_news(sport_slug, data):
     sport = get_sport_by_slug(sport_slug)
     if not sport:
@@ -465,6 +434,7 @@ def get_news(sport_slug=None, trending_only=False, limit=20):
         return [_fmt(r) for r in cur.fetchall()]
 
 
+@invalidates('sports')
 def bulk_create_news(sport_slug, news_list):
     count = 0
     for n in news_list:
@@ -9,7 +9,6 @@ Only covers the methods used by Month 1 / AEO core endpoints:
 Everything else (benchmarks, api_logs, scheduler) stays on SQLite.
 """
 
-import boto3
 import json
 import os
 import uuid
@@ -19,6 +18,8 @@ from typing import Dict, List, Optional
 
 from boto3.dynamodb.conditions import Key
 
+from aws_clients import get_resource
+
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 TABLE_PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 TABLE_NAME = f'{TABLE_PREFIX}aeo-reports'
@@ -43,7 +44,7 @@ class AEORepository:
     """DynamoDB-backed repository matching the SEODatabase report interface."""
 
     def __init__(self):
-        self._ddb = boto3.resource('dynamodb', region_name=REGION)
+        self._ddb = get_resource('dynamodb', REGION)
         self._table = self._ddb.Table(TABLE_NAME)
 
     # ---- writes ----
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Batched DynamoDB writes for the intelligence registers.
+
+The Month 3 and Deepthi registers write weekly rows one put_item at a time,
+so a cadence run over a few thousand keywords is a few thousand sequential
+HTTP calls. batch_put() replaces those loops:
+
+  - BatchWriteItem in chunks of 25 (the API limit)
+  - duplicate keys inside a chunk collapse to the last item (BatchWriteItem
+    rejects a request that touches the same key twice)
+  - UnprocessedItems are retried with exponential backoff and jitter
+  - optional parallel segments, each on its own boto3 session
+  - write-cost metrics: requests, retries, consumed WCUs, elapsed time —
+    returned per call and accumulated per table (get_write_metrics())
+
+Usage:
+    from dynamo.batch_writes import batch_put
+    stats = batch_put(KW_PERF_TABLE, items, key_fields=('keyword', 'week'))
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Sequence
+
+import boto3
+
+from aws_clients import get_resource
+
+logger = logging.getLogger(__name__)
+
+REGION = os.environ.get('AWS_REGION', 'us-east-1')
+BATCH_SIZE = 25
+MAX_RETRIES = 8
+MAX_SEGMENTS = 8
+
+_metrics: Dict[str, Dict] = {}
+_metrics_lock = threading.Lock()
+_key_cache: Dict[str, tuple] = {}
+
+
+def _resource(session=None):
+    if session is None:
+        return get_resource('dynamodb', REGION)
+    return session.resource('dynamodb', region_name=REGION)
+
+
+def _key_fields(table_name: str) -> tuple:
+    """Key attribute names for a table (one DescribeTable per process)."""
+    if table_name not in _key_cache:
+        schema = _resource().Table(table_name).key_schema
+        _key_cache[table_name] = tuple(k['AttributeName'] for k in schema)
+    return _key_cache[table_name]
+
+
+def _dedupe(items: Iterable[Dict], key_fields: Sequence[str]) -> List[Dict]:
+    """Last write wins per primary key, first-seen order preserved."""
+    by_key = {}
+    for item in items:
+        by_key[tuple(item[k] for k in key_fields)] = item
+    return list(by_key.values())
+
+
+def _write_chunks(table_name: str, chunks: List[List[Dict]], session=None) -> Dict:
+    ddb = _resource(session)
+    stats = {'items': 0, 'requests': 0, 'retries': 0, 'consumed_wcu': 0.0, 'failed': 0}
+    for chunk in chunks:
+        request = {table_name: [{'PutRequest': {'Item': item}} for item in chunk]}
+        attempt = 0
+        while request:
+            resp = ddb.batch_write_item(RequestItems=request, ReturnConsumedCapacity='TOTAL')
+            stats['requests'] += 1
+            for cap in resp.get('ConsumedCapacity', []):
+                stats['consumed_wcu'] += float(cap.get('CapacityUnits', 0))
+            request = resp.get('UnprocessedItems') or None
+            if not request:
+                break
+            attempt += 1
+            if attempt > MAX_RETRIES:
+                left = len(request.get(table_name, []))
+                stats['failed'] += left
+                logger.error("Batch write to %s gave up on %d unprocessed items", table_name, left)
+                break
+            stats['retries'] += 1
+            time.sleep(min(5.0, 0.05 * (2 ** attempt)) * random.uniform(0.5, 1.0))
+        stats['items'] += len(chunk)
+    stats['items'] -= stats['failed']
+    return stats
+
+
+def batch_put(table_name: str, items: Iterable[Dict], key_fields: Sequence[str] = None,
+              segments: int = 1) -> Dict:
+    """Write ``items`` (already DynamoDB-typed) with BatchWriteItem.
+
+    ``key_fields`` names the primary key attributes, used to drop duplicate
+    keys; looked up from the table when omitted. ``segments`` > 1 writes
+    that many slices of the chunk list concurrently.
+
+    Returns {'items', 'requests', 'retries', 'consumed_wcu', 'failed', 'seconds'}.
+    """
+    t0 = time.time()
+    items = _dedupe(items, key_fields or _key_fields(table_name))
+    chunks = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+    segments = max(1, min(segments, MAX_SEGMENTS, len(chunks)))
+
+    if segments == 1:
+        stats = _write_chunks(table_name, chunks)
+    else:
+        slices = [chunks[i::segments] for i in range(segments)]
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            parts = list(pool.map(
+                lambda s: _write_chunks(table_name, s, session=boto3.session.Session()), slices))
+        stats = {k: sum(p[k] for p in parts) for k in parts[0]} if parts else \
+            {'items': 0, 'requests': 0, 'retries': 0, 'consumed_wcu': 0.0, 'failed': 0}
+
+    stats['consumed_wcu'] = round(stats['consumed_wcu'], 2)
+    stats['seconds'] = round(time.time() - t0, 3)
+    _record_metrics(table_name, stats)
+    if stats['items']:
+        logger.info("Batch write %s: %d items in %d requests (%d retries, %.1f WCU, %.2fs)",
+                    table_name, stats['items'], stats['requests'], stats['retries'],
+                    stats['consumed_wcu'], stats['seconds'])
+    return stats
+
+
+def _record_metrics(table_name: str, stats: Dict):
+    with _metrics_lock:
+        m = _metrics.setdefault(table_name, {'calls': 0, 'items': 0, 'requests': 0, 'retries': 0,
+                                             'consumed_wcu': 0.0, 'failed': 0, 'seconds': 0.0})
+        m['calls'] += 1
+        for k in ('items', 'requests', 'retries', 'consumed_wcu', 'failed', 'seconds'):
+            m[k] += stats[k]
+
+
+def get_write_metrics() -> Dict[str, Dict]:
+    """Cumulative batch-write cost per table since process start."""
+    with _metrics_lock:
+        return {t: {k: round(v, 3) if isinstance(v, float) else v for k, v in m.items()}
+                for t, m in _metrics.items()}
@@ -12,7 +12,6 @@ Only touches directory-* tables. Does NOT affect aeo-reports, geo-scans,
 or any other existing DynamoDB tables.
 """
 
-import boto3
 import json
 import os
 import re
@@ -23,6 +22,8 @@ from typing import Dict, List, Optional
 
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 TABLE_PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 LISTINGS_TABLE = f'{TABLE_PREFIX}directory-listings'
@@ -42,6 +43,15 @@ def _to_decimal(val):
     return Decimal(str(val))
 
 
+# Kept from the stored row when add_listings() refreshes a scraped listing
+_PRESERVED_FIELDS = (
+    'subcategories', 'price_range', 'hours_json', 'ai_summary', 'faq_json',
+    'schema_markup', 'comparison_tags', 'freshness_score', 'ai_score',
+    'citation_chatgpt', 'citation_gemini', 'citation_perplexity', 'citation_claude',
+    'ai_generated_at', 'created_at',
+)
+
+
 def _slugify(text: str) -> str:
     return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
 
@@ -50,7 +60,7 @@ class DirectoryRepository:
     """DynamoDB-backed repository for business directory listings."""
 
     def __init__(self):
-        self._ddb = boto3.resource('dynamodb', region_name=REGION)
+        self._ddb = get_resource('dynamodb', REGION)
         self._listings = self._ddb.Table(LISTINGS_TABLE)
         self._categories = self._ddb.Table(CATEGORIES_TABLE)
 
@@ -58,10 +68,43 @@ class DirectoryRepository:
 
     def add_listing(self, data: Dict) -> str:
         """Add or update a business listing. Returns slug."""
+        item = self._listing_item(data)
+        self._listings.put_item(Item=item)
+        return item['slug']
+
+    def add_listings(self, listings: List[Dict]) -> int:
+        """Upsert many scraped listings with BatchGetItem + BatchWriteItem.
+
+        Rows that already exist keep their AI content, citations, scores and
+        created_at; everything the scraper provides is refreshed.
+        """
+        items = {}
+        for data in listings:
+            item = self._listing_item(data)
+            items[(item['category'], item['slug'])] = item
+        keys = [{'category': c, 'slug': s} for c, s in items]
+
+        for i in range(0, len(keys), 100):
+            request = {LISTINGS_TABLE: {'Keys': keys[i:i + 100]}}
+            while request:
+                resp = self._ddb.batch_get_item(RequestItems=request)
+                for old in resp.get('Responses', {}).get(LISTINGS_TABLE, []):
+                    item = items[(old['category'], old['slug'])]
+                    for field in _PRESERVED_FIELDS:
+                        if field in old:
+                            item[field] = old[field]
+                request = resp.get('UnprocessedKeys') or None
+
+        with self._listings.batch_writer(overwrite_by_pkeys=['category', 'slug']) as batch:
+            for item in items.values():
+                batch.put_item(Item=item)
+        return len(items)
+
+    def _listing_item(self, data: Dict) -> Dict:
         slug = data.get('slug') or _slugify(data['name'])
         now = datetime.utcnow().isoformat() + 'Z'
 
-        item = {
+        return {
             'category': data['category'],
             'slug': slug,
             'name': data['name'],
@@ -95,9 +138,6 @@ class DirectoryRepository:
             'created_at': data.get('created_at', now),
         }
 
-        self._listings.put_item(Item=item)
-        return slug
-
     def update_ai_content(self, slug: str, category: str, ai_summary: str,
                           faq_json: str, schema_markup: str):
         """Update AI-generated content for a listing."""
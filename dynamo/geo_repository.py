@@ -5,7 +5,6 @@ GEO currently has no persistence (results are computed and returned).
 This adds optional persistence so scan history can be tracked over time.
 """
 
-import boto3
 import json
 import os
 from datetime import datetime
@@ -14,6 +13,9 @@ from typing import Dict, List, Optional
 
 from boto3.dynamodb.conditions import Key
 
+from aws_clients import get_resource
+from response_cache import invalidates
+
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 TABLE_PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 TABLE_NAME = f'{TABLE_PREFIX}geo-scans'
@@ -29,9 +31,10 @@ class GEORepository:
     """DynamoDB-backed persistence for GEO readiness scans."""
 
     def __init__(self):
-        self._ddb = boto3.resource('dynamodb', region_name=REGION)
+        self._ddb = get_resource('dynamodb', REGION)
         self._table = self._ddb.Table(TABLE_NAME)
 
+    @invalidates('geo-scans')
     def save_scan(self, keyword: str, result: Dict) -> str:
         """Persist a GEO scan result. Returns created_at timestamp as ID."""
         now = datetime.utcnow().isoformat() + 'Z'
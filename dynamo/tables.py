@@ -9,14 +9,16 @@ Tables created:
     geo-scans             — stores GEO readiness scans
     ai1stseo-geo-probes   — stores individual GEO probe results + visibility batches
     ai1stseo-content-briefs — stores content briefs
+    ai1stseo-scheduler-leases — background scheduler leader lease + job status
 
 Existing SQLite tables (reports, benchmarks, api_logs, scheduled_jobs, etc.)
 are NOT touched.
 """
 
-import boto3
 import os
 
+from aws_clients import get_client, get_resource
+
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 TABLE_PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 
@@ -24,14 +26,15 @@ AEO_REPORTS_TABLE = f'{TABLE_PREFIX}aeo-reports'
 GEO_SCANS_TABLE = f'{TABLE_PREFIX}geo-scans'
 GEO_PROBES_TABLE = 'ai1stseo-geo-probes'
 CONTENT_BRIEFS_TABLE = 'ai1stseo-content-briefs'
+SCHEDULER_LEASES_TABLE = 'ai1stseo-scheduler-leases'
 
 
 def get_dynamodb_resource():
-    return boto3.resource('dynamodb', region_name=REGION)
+    return get_resource('dynamodb', REGION)
 
 
 def get_dynamodb_client():
-    return boto3.client('dynamodb', region_name=REGION)
+    return get_client('dynamodb', REGION)
 
 
 def create_aeo_reports_table(ddb=None):
@@ -120,6 +123,11 @@ def create_all_tables():
     else:
         print(f'⏭️  Table already exists: {CONTENT_BRIEFS_TABLE}')
 
+    if SCHEDULER_LEASES_TABLE not in existing:
+        create_scheduler_leases_table(ddb)
+    else:
+        print(f'⏭️  Table already exists: {SCHEDULER_LEASES_TABLE}')
+
 
 def create_geo_probes_table(ddb=None):
     """Create ai1stseo-geo-probes table.
@@ -186,5 +194,26 @@ def create_content_briefs_table(ddb=None):
     return table
 
 
+def create_scheduler_leases_table(ddb=None):
+    """Create ai1stseo-scheduler-leases table.
+
+    PK: lease_name (S)  — 'bg-scheduler' lease row plus 'bg-scheduler#job#<name>' status rows
+    """
+    ddb = ddb or get_dynamodb_resource()
+    table = ddb.create_table(
+        TableName=SCHEDULER_LEASES_TABLE,
+        KeySchema=[
+            {'AttributeName': 'lease_name', 'KeyType': 'HASH'},
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'lease_name', 'AttributeType': 'S'},
+        ],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    table.wait_until_exists()
+    print(f'✅ Created table: {SCHEDULER_LEASES_TABLE}')
+    return table
+
+
 if __name__ == '__main__':
     create_all_tables()
@@ -0,0 +1,186 @@
+"""
+fast_json.py
+Response pipeline for large JSON payloads: encoding, field projection, compression.
+
+Batch probe results, scan histories, directory listings and SoV results
+(each carrying up to 60 raw model responses) used to go through the
+stdlib json module — with a Python ``default`` call for every Decimal,
+date and UUID — and out uncompressed. This module provides:
+
+  - FastJSONProvider: encodes with orjson, which handles datetime, date,
+    UUID, dataclasses and numpy arrays natively and sorts keys in Rust.
+    Only Decimal (and sets) reach the Python ``default`` hook. Anything
+    orjson rejects (e.g. ints beyond 64 bits) falls back to the stdlib.
+  - ?fields= projection on every jsonify() response:
+        ?fields=brand,stored_results.keyword   keep only these paths
+        ?fields=-response_snippet,-batch_results   drop these keys anywhere
+    Paths descend through lists; ``error`` and ``status`` are always kept.
+  - compress_response: an after_request hook that gzips (or brotli-encodes,
+    when the client accepts br and brotli is installed) JSON and text
+    responses of at least COMPRESS_MIN_BYTES.
+
+orjson and brotli are optional; without orjson the provider behaves like
+Flask's default one. json_benchmark.py compares the encoders and
+encodings on recorded payloads.
+"""
+
+import gzip
+import os
+from decimal import Decimal
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+COMPRESS_ENABLED = os.environ.get('RESPONSE_COMPRESSION', '1').lower() not in ('0', 'false', 'no')
+COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE_TYPES = {'application/json', 'text/plain', 'text/csv', 'text/html', 'application/javascript'}
+ALWAYS_KEPT = ('error', 'status')
+
+
+# ── Field projection ─────────────────────────────────────────────────────── #
+
+def parse_fields(spec: str) -> Tuple[Optional[Dict], frozenset]:
+    """``"a,b.c,-d"`` -> (include tree {'a': None, 'b': {'c': None}}, excluded {'d'})."""
+    include, exclude = {}, set()
+    for part in (p.strip() for p in (spec or '').split(',')):
+        if not part:
+            continue
+        if part.startswith('-'):
+            exclude.add(part[1:])
+            continue
+        node = include
+        keys = part.split('.')
+        for i, key in enumerate(keys):
+            if i == len(keys) - 1:
+                node[key] = None  # whole value
+            else:
+                child = node.get(key, {})
+                if child is None:
+                    break  # a shorter path already keeps the whole value
+                node = node.setdefault(key, child)
+    return include or None, frozenset(exclude)
+
+
+def project(obj: Any, include: Optional[Dict], exclude: frozenset = frozenset()) -> Any:
+    """Apply a parsed ?fields= spec to a JSON-like value."""
+    if isinstance(obj, list):
+        return [project(v, include, exclude) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for k, v in obj.items():
+        if k in exclude:
+            continue
+        if include is None:
+            out[k] = project(v, None, exclude) if exclude else v
+        elif k in include:
+            out[k] = project(v, include[k], exclude)
+        elif k in ALWAYS_KEPT:
+            out[k] = v
+    return out
+
+
+def _request_projection(obj: Any) -> Any:
+    if not has_request_context() or 'fields' not in request.args:
+        return obj
+    include, exclude = parse_fields(request.args.get('fields', ''))
+    if include is None and not exclude:
+        return obj
+    return project(obj, include, exclude)
+
+
+# ── Encoder ──────────────────────────────────────────────────────────────── #
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, with ?fields= projection on responses."""
+
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return float(o)
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        if isinstance(o, (set, frozenset)):
+            return list(o)
+        return DefaultJSONProvider.default(o)
+
+    def _options(self) -> int:
+        opts = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """UTF-8 encoded JSON for ``obj``."""
+        if HAS_ORJSON:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options())
+            except TypeError:
+                pass  # e.g. an int beyond 64 bits; the stdlib handles it
+        return super().dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if HAS_ORJSON and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = _request_projection(self._prepare_response_obj(args, kwargs))
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+# ── Compression ──────────────────────────────────────────────────────────── #
+
+def _encoding() -> Optional[str]:
+    accept = request.accept_encodings
+    if HAS_BROTLI and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook: compress large JSON/text bodies the client can decode."""
+    if (not COMPRESS_ENABLED
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = _encoding()
+    if encoding is None:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)  # bytes differ per encoding; If-None-Match still matches
+    return response
@@ -21,9 +21,10 @@ from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-import boto3
 from boto3.dynamodb.conditions import Key
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 TABLE_NAME = os.environ.get("GROWTH_ANALYTICS_TABLE", "ai1stseo-growth-analytics")
@@ -71,7 +72,7 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(TABLE_NAME)
+        _table = get_resource("dynamodb", AWS_REGION).Table(TABLE_NAME)
     return _table
 
 
@@ -113,7 +114,7 @@ def _check_rate_limit(session_id: str) -> bool:
 
 def init_analytics_table() -> None:
     """Create the DynamoDB analytics table if it doesn't exist. Idempotent."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(TABLE_NAME)
         table.load()
@@ -226,6 +227,8 @@ def track_event(
     try:
         _get_table().put_item(Item=item)
         logger.info("track_event: type=%s id=%s", normalized, event_id)
+        # No invalidate_kpis() here: events are too frequent for the dirty
+        # marker to mean anything; the KPI snapshots refresh on a timer.
         return {"success": True, "event_id": event_id, "created_at": now}
     except Exception as e:
         logger.error("track_event error: %s", e)
@@ -16,6 +16,10 @@ Scheduling strategy:
     - TikTok scripts: generated but not auto-scheduled
     - Email snippets: generated but not auto-scheduled
 
+Slots for the whole run are assigned in one pass from the schedule
+calendar index (growth.schedule_calendar), spilling into later days when
+the first ones are full, and the posts are written in one batch.
+
 Does NOT modify any existing modules.
 """
 
@@ -35,46 +39,6 @@ SCHEDULABLE_PLATFORMS = {"x", "linkedin"}
 GENERATE_ONLY_PLATFORMS = {"tiktok_script", "email_snippet", "x_thread"}
 
 
-def _next_available_slot(platform: str, base_date: datetime, existing_times: set) -> str:
-    """Find the next available time slot for a platform on a given date.
-
-    Returns "YYYY-MM-DD HH:MM" or None if all slots are taken.
-    """
-    slots = SCHEDULE_SLOTS.get(platform, ["12:00"])
-    date_str = base_date.strftime("%Y-%m-%d")
-
-    for slot in slots:
-        candidate = f"{date_str} {slot}"
-        if candidate not in existing_times:
-            return candidate
-
-    # All slots taken for this date — try next day
-    next_day = base_date + timedelta(days=1)
-    next_date_str = next_day.strftime("%Y-%m-%d")
-    for slot in slots:
-        candidate = f"{next_date_str} {slot}"
-        if candidate not in existing_times:
-            return candidate
-
-    return None
-
-
-def _get_existing_scheduled_times() -> set:
-    """Get all scheduled_datetime values from existing posts to avoid conflicts."""
-    try:
-        from growth.social_scheduler_dynamo import get_posts
-        result = get_posts()
-        if result.get("success"):
-            return {
-                p.get("scheduled_datetime", "")
-                for p in result.get("posts", [])
-                if p.get("status") in ("scheduled", "draft")
-            }
-    except Exception as e:
-        logger.warning("Could not fetch existing schedule: %s", e)
-    return set()
-
-
 def run_content_pipeline(
     limit: int = 5,
     dry_run: bool = False,
@@ -135,13 +99,12 @@ def run_content_pipeline(
     if schedule_start is None:
         schedule_start = datetime.now(timezone.utc) + timedelta(days=1)
 
-    existing_times = _get_existing_scheduled_times() if not dry_run else set()
-
     total_processed = 0
     total_generated = 0
-    total_scheduled = 0
     total_failed = 0
     results = []
+    to_schedule = []  # (result index, platform, post text)
+    summaries = {}    # content_id -> generated count
 
     for item in items:
         content_id = item.get("content_id", "unknown")
@@ -189,56 +152,34 @@ def run_content_pipeline(
             results.append({"content_id": content_id, "success": False, "error": pack.get("error")})
             continue
 
-        # Schedule social posts
-        scheduled_ids = []
+        # Collect social posts; slots are assigned for the whole run below
         for r in pack.get("results", []):
             if not r.get("success"):
                 continue
             total_generated += 1
             plat = r.get("platform", "")
+            if plat in SCHEDULABLE_PLATFORMS and not dry_run:
+                to_schedule.append((len(results), plat, r["output"]))
 
-            if plat not in SCHEDULABLE_PLATFORMS or dry_run:
-                continue
-
-            slot = _next_available_slot(plat, schedule_start, existing_times)
-            if not slot:
-                logger.warning("No available slot for %s", plat)
-                continue
-
-            try:
-                from growth.social_scheduler_dynamo import create_post
-                parts = slot.split(" ", 1)
-                sched_date = parts[0]
-                sched_time = parts[1] if len(parts) > 1 else "12:00"
-
-                post_result = create_post(
-                    content=r["output"],
-                    platforms=[plat],
-                    scheduled_date=sched_date,
-                    scheduled_time=sched_time,
-                    status="scheduled",
-                )
-                if post_result.get("success"):
-                    total_scheduled += 1
-                    existing_times.add(slot)
-                    scheduled_ids.append(post_result.get("id"))
-            except Exception as e:
-                logger.warning("Failed to schedule %s post: %s", plat, e)
-
-        # Mark processed
         total_processed += 1
-        summary = f"generated={pack.get('succeeded', 0)}, scheduled={len(scheduled_ids)}"
-        if not dry_run:
-            mark_content_status(content_id, "processed", summary)
-
+        summaries[content_id] = pack.get("succeeded", 0)
         results.append({
             "content_id": content_id,
             "success": True,
             "generated": pack.get("succeeded", 0),
-            "scheduled": len(scheduled_ids),
-            "scheduled_post_ids": scheduled_ids,
+            "scheduled": 0,
+            "scheduled_post_ids": [],
         })
 
+    total_scheduled = _schedule_batch(to_schedule, results, schedule_start) if to_schedule else 0
+
+    # Mark processed
+    if not dry_run:
+        for r in results:
+            if r.get("success"):
+                summary = f"generated={summaries[r['content_id']]}, scheduled={r['scheduled']}"
+                mark_content_status(r["content_id"], "processed", summary)
+
     return {
         "success": True,
         "dry_run": dry_run,
@@ -253,6 +194,46 @@ def run_content_pipeline(
     }
 
 
+def _schedule_batch(to_schedule: list, results: list, schedule_start: datetime) -> int:
+    """Allocate slots for every (result index, platform, text) at once and create the posts in one batch."""
+    from growth.schedule_calendar import ScheduleCalendar
+    from growth.social_scheduler_dynamo import create_posts
+
+    try:
+        calendar = ScheduleCalendar(SCHEDULE_SLOTS, start=schedule_start).load()
+        slots = calendar.allocate([plat for _, plat, _ in to_schedule])
+    except Exception as e:
+        logger.warning("Could not load schedule calendar: %s", e)
+        return 0
+
+    posts, owners = [], []
+    for (idx, plat, text), slot in zip(to_schedule, slots):
+        if not slot:
+            logger.warning("No available slot for %s", plat)
+            continue
+        sched_date, sched_time = slot.split(" ", 1)
+        posts.append({
+            "content": text,
+            "platforms": [plat],
+            "scheduled_date": sched_date,
+            "scheduled_time": sched_time,
+            "status": "scheduled",
+        })
+        owners.append(idx)
+
+    created = create_posts(posts, index_calendar=False)
+    if not created.get("success"):
+        calendar.discard()
+        logger.warning("Failed to schedule %d posts: %s", len(posts), created.get("error"))
+        return 0
+    calendar.commit()
+
+    for idx, post_id in zip(owners, created["ids"]):
+        results[idx]["scheduled"] += 1
+        results[idx]["scheduled_post_ids"].append(post_id)
+    return len(created["ids"])
+
+
 def import_json_to_pipeline(json_path: str = "social_media_posts.json") -> dict:
     """Import existing social_media_posts.json into the content source table.
 
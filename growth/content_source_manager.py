@@ -24,7 +24,7 @@ import os
 import uuid
 from datetime import datetime, timezone
 
-import boto3
+from aws_clients import get_resource
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +37,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(TABLE_NAME)
+        _table = get_resource("dynamodb", AWS_REGION).Table(TABLE_NAME)
     return _table
 
 
 def init_content_table() -> None:
     """Create the DynamoDB content sources table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(TABLE_NAME)
         table.load()
@@ -109,6 +109,12 @@ def add_content(
     try:
         _get_table().put_item(Item=item)
         logger.info("add_content: id=%s type=%s", content_id, source_type)
+
+        try:
+            from growth.growth_dashboard import invalidate_kpis
+            invalidate_kpis()
+        except Exception as kpi_err:
+            logger.warning("KPI invalidation failed (non-blocking): %s", kpi_err)
         return {"success": True, "content_id": content_id, "item": item}
     except Exception as e:
         logger.error("add_content error: %s", e)
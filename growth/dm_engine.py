@@ -20,7 +20,7 @@ import os
 import uuid
 from datetime import datetime, timezone
 
-import boto3
+from aws_clients import get_resource
 
 logger = logging.getLogger(__name__)
 
@@ -33,13 +33,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(DM_TABLE)
+        _table = get_resource("dynamodb", AWS_REGION).Table(DM_TABLE)
     return _table
 
 
 def init_dm_table() -> None:
     """Create the DM queue table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(DM_TABLE)
         table.load()
@@ -94,27 +94,62 @@ def _queue_dm(
     metadata: dict = None,
 ) -> dict:
     """Queue a DM for sending."""
-    dm_id = str(uuid.uuid4())[:12]
-    now = datetime.now(timezone.utc).isoformat()
+    item = _dm_item(recipient, platform, message, dm_type, metadata)
+    try:
+        _get_table().put_item(Item=item)
+        return {"success": True, "dm_id": item["dm_id"]}
+    except Exception as e:
+        logger.error("Failed to queue DM: %s", e)
+        return {"success": False, "error": str(e)}
 
+
+def _dm_item(recipient: str, platform: str, message: str, dm_type: str, metadata: dict = None) -> dict:
     item = {
-        "dm_id": dm_id,
+        "dm_id": str(uuid.uuid4())[:12],
         "recipient": recipient,
         "platform": platform,
         "message": message,
         "dm_type": dm_type,
         "status": "queued",
-        "created_at": now,
+        "created_at": datetime.now(timezone.utc).isoformat(),
     }
     if metadata:
         item["metadata"] = metadata
-
+    return item
+
+
+_BUILDERS = {
+    "welcome": lambda name, platform, topic: WELCOME_TEMPLATE.format(name=name, platform=platform),
+    "engagement": lambda name, platform, topic: ENGAGEMENT_TEMPLATE.format(name=name, topic=topic, platform=platform),
+    "nurture": lambda name, platform, topic: NURTURE_TEMPLATE.format(name=name, platform=platform),
+}
+
+
+def queue_dms(entries: list) -> dict:
+    """Queue many DMs with batched writes (25 items per request).
+
+    Each entry is a dict with user, dm_type (welcome | engagement | nurture),
+    and optional platform (default "x") and topic (engagement only).
+    """
+    items = []
+    for e in entries:
+        user, dm_type = e["user"], e["dm_type"]
+        platform = e.get("platform", "x")
+        topic = e.get("topic", "AI SEO")
+        name = user.split("@")[0] if "@" in user else user
+        message = _BUILDERS[dm_type](name, platform, topic)
+        items.append(_dm_item(user, platform, message, dm_type,
+                              {"topic": topic} if dm_type == "engagement" else None))
+    if not items:
+        return {"success": True, "queued": 0}
     try:
-        _get_table().put_item(Item=item)
-        return {"success": True, "dm_id": dm_id}
+        with _get_table().batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        return {"success": True, "queued": len(items)}
     except Exception as e:
-        logger.error("Failed to queue DM: %s", e)
-        return {"success": False, "error": str(e)}
+        logger.error("Failed to queue %d DMs: %s", len(items), e)
+        return {"success": False, "error": str(e), "queued": 0}
 
 
 def send_welcome_dm(user: str, platform: str = "x") -> dict:
@@ -8,7 +8,8 @@ Turns email into the primary retention + growth channel by:
     - Running trigger-based email sequences (signup, inactive, click)
     - Re-engaging dormant subscribers
 
-Sends via AWS SES (reuses email_platform_sync._get_ses()).
+Sends via AWS SES (reuses email_platform_sync._get_ses()); newsletters go
+through growth.newsletter_delivery for throttled, resumable bulk sends.
 Tracks all email events via analytics_tracker.
 
 Does NOT modify existing modules.
@@ -18,7 +19,7 @@ import logging
 import os
 from datetime import datetime, timedelta, timezone
 
-import boto3
+from aws_clients import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +34,7 @@ def _get_ses():
         from growth.email_platform_sync import _get_ses as _ses
         return _ses()
     except Exception:
-        return boto3.client("ses", region_name=AWS_REGION)
+        return get_client("ses", AWS_REGION)
 
 
 # ---------------------------------------------------------------------------
@@ -131,67 +132,44 @@ def _build_newsletter_html(sections: dict) -> tuple:
     return subject, html, text
 
 
-def send_weekly_newsletter() -> dict:
-    """Generate and send the weekly newsletter to all subscribers."""
-    content = generate_newsletter_content()
-    if not content.get("success"):
-        return {"success": False, "error": "Failed to generate newsletter content"}
+def send_weekly_newsletter(run_id: str = None) -> dict:
+    """Generate and send the weekly newsletter to all subscribers.
 
-    subject, html, text = _build_newsletter_html(content["sections"])
-
-    # Get all subscribers
-    try:
-        from growth.email_subscriber import list_subscribers
-        result = list_subscribers(page=1, per_page=10000)
-        if not result.get("success"):
-            return {"success": False, "error": "Failed to fetch subscribers"}
-        subscribers = result.get("subscribers", [])
-    except Exception as e:
-        return {"success": False, "error": str(e)}
-
-    if not subscribers:
-        return {"success": True, "sent": 0, "message": "No subscribers"}
-
-    ses = _get_ses()
-    sent = 0
-    failed = 0
-
-    for sub in subscribers:
-        email = sub.get("email")
-        if not email:
-            continue
-        try:
-            ses.send_email(
-                Source=SES_SENDER,
-                Destination={"ToAddresses": [email]},
-                Message={
-                    "Subject": {"Data": subject, "Charset": "UTF-8"},
-                    "Body": {
-                        "Html": {"Data": html, "Charset": "UTF-8"},
-                        "Text": {"Data": text, "Charset": "UTF-8"},
-                    },
-                },
-            )
-            sent += 1
-        except Exception as e:
-            logger.warning("Newsletter send failed for %s: %s", email, e)
-            failed += 1
+    Delivery is throttled to the SES send rate and checkpointed per page
+    (see growth.newsletter_delivery); calling again with the same run_id
+    (by default, this week's) resumes an interrupted send.
+    """
+    from growth.newsletter_delivery import deliver_newsletter, default_run_id, get_run
+
+    run_id = run_id or default_run_id()
+    existing = get_run(run_id).get("run")
+    if existing:
+        # Resuming — the run already stores the body it started with
+        subject = html = text = ""
+    else:
+        content = generate_newsletter_content()
+        if not content.get("success"):
+            return {"success": False, "error": "Failed to generate newsletter content"}
+        subject, html, text = _build_newsletter_html(content["sections"])
+
+    result = deliver_newsletter(subject, html, text, run_id=run_id)
+    if not result.get("success") or result.get("already_completed"):
+        return result
 
     # Track event
     try:
         from growth.analytics_tracker import track_event
         track_event(
             event_type="welcome_email_sent",
-            event_data={"newsletter": True, "sent": sent, "failed": failed},
+            event_data={"newsletter": True, "sent": result["sent"], "failed": result["failed"],
+                        "run_id": run_id, "status": result["status"]},
         )
     except Exception:
         pass
 
     return {
-        "success": True,
-        "sent": sent,
-        "failed": failed,
-        "total_subscribers": len(subscribers),
+        **result,
+        "total_subscribers": result["sent"] + result["failed"],
         "sent_at": datetime.now(timezone.utc).isoformat(),
     }
 
@@ -209,49 +187,43 @@ def segment_subscribers() -> dict:
         beginner    — subscribed within 30 days
         inactive    — subscribed > 30 days ago
     """
-    try:
-        from growth.email_subscriber import list_subscribers
-        result = list_subscribers(page=1, per_page=10000)
-        if not result.get("success"):
-            return {"success": False, "error": "Failed to fetch subscribers"}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    from growth.email_subscriber import iter_subscriber_pages
+    from growth.referral_engine import get_referral_counts
 
     now = datetime.now(timezone.utc)
     segments = {"power_user": [], "active": [], "beginner": [], "inactive": []}
 
-    # Check referral counts
-    referral_counts = {}
     try:
-        from growth.referral_engine import get_leaderboard
-        lb = get_leaderboard(limit=100)
-        if lb.get("success"):
-            for entry in lb.get("leaderboard", []):
-                referral_counts[entry["referrer_id"]] = entry.get("count", 0)
-    except Exception:
-        pass
-
-    for sub in result.get("subscribers", []):
-        email = sub.get("email", "")
-        subscribed_at = sub.get("subscribed_at", "")
-
-        # Parse subscription date
-        try:
-            sub_date = datetime.fromisoformat(subscribed_at.replace("Z", "+00:00"))
-        except (ValueError, TypeError):
-            sub_date = now - timedelta(days=60)
-
-        days_since = (now - sub_date).days
-
-        # Classify
-        if referral_counts.get(email, 0) >= 3:
-            segments["power_user"].append(email)
-        elif days_since <= 7:
-            segments["active"].append(email)
-        elif days_since <= 30:
-            segments["beginner"].append(email)
-        else:
-            segments["inactive"].append(email)
+        for page, _ in iter_subscriber_pages(page_size=500, fields=("email", "subscribed_at")):
+            # Referral counts for just this page's subscribers
+            try:
+                referral_counts = get_referral_counts([s.get("email", "") for s in page])
+            except Exception:
+                referral_counts = {}
+
+            for sub in page:
+                email = sub.get("email", "")
+                subscribed_at = sub.get("subscribed_at", "")
+
+                # Parse subscription date
+                try:
+                    sub_date = datetime.fromisoformat(subscribed_at.replace("Z", "+00:00"))
+                except (ValueError, TypeError, AttributeError):
+                    sub_date = now - timedelta(days=60)
+
+                days_since = (now - sub_date).days
+
+                # Classify
+                if referral_counts.get(email, 0) >= 3:
+                    segments["power_user"].append(email)
+                elif days_since <= 7:
+                    segments["active"].append(email)
+                elif days_since <= 30:
+                    segments["beginner"].append(email)
+                else:
+                    segments["inactive"].append(email)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
     return {
         "success": True,
@@ -317,7 +289,8 @@ def send_reengagement(emails: list = None) -> dict:
     """
     text = "Hey! AI search is evolving fast. Check your AI visibility at https://ai1stseo.com"
 
-    sent = sum(1 for e in emails if _send_email(e, subject, html, text))
+    from growth.newsletter_delivery import send_bulk
+    sent = send_bulk(emails, subject, html, text)["sent"]
 
     try:
         from growth.analytics_tracker import track_event
@@ -16,7 +16,7 @@ Environment variables:
 import logging
 import os
 
-import boto3
+from aws_clients import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ _ses_client = None
 def _get_ses():
     global _ses_client
     if _ses_client is None:
-        _ses_client = boto3.client("ses", region_name=AWS_REGION)
+        _ses_client = get_client("ses", AWS_REGION)
     return _ses_client
 
 
@@ -18,9 +18,10 @@ import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
 
-import boto3
 from boto3.dynamodb.conditions import Attr, Key
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -46,7 +47,7 @@ def _get_table():
     """Get the DynamoDB table resource (cached)."""
     global _dynamodb, _table
     if _table is None:
-        _dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        _dynamodb = get_resource("dynamodb", AWS_REGION)
         _table = _dynamodb.Table(TABLE_NAME)
     return _table
 
@@ -59,7 +60,7 @@ def init_subscriber_table() -> None:
     """Create the DynamoDB table if it doesn't exist. Idempotent."""
     global _dynamodb
     if _dynamodb is None:
-        _dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+        _dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = _dynamodb.Table(TABLE_NAME)
         table.load()
@@ -185,6 +186,12 @@ def add_subscriber(
         )
         logger.info("add_subscriber: success id=%s", subscriber_id)
 
+        try:
+            from growth.growth_dashboard import invalidate_kpis
+            invalidate_kpis()
+        except Exception as kpi_err:
+            logger.warning("KPI invalidation failed (non-blocking): %s", kpi_err)
+
         # Integration hook
         try:
             from growth.email_platform_sync import sync_subscriber_to_email_platform
@@ -308,6 +315,31 @@ def list_subscribers(
         return {"success": False, "error": f"Database error: {e}", "subscribers": []}
 
 
+def iter_subscriber_pages(page_size: int = 200, start_key=None, fields=("email",)):
+    """Yield ``(subscribers, last_key)`` one DynamoDB scan page at a time.
+
+    Unlike list_subscribers() this never holds the whole table in memory.
+    ``last_key`` is the cursor to pass back as ``start_key`` to continue
+    after that page; it is None on the final page.
+    """
+    table = _get_table()
+    names = {f"#f{i}": f for i, f in enumerate(fields)}
+    params = {
+        "Limit": page_size,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    last_key = start_key
+    while True:
+        if last_key:
+            params["ExclusiveStartKey"] = last_key
+        resp = table.scan(**params)
+        last_key = resp.get("LastEvaluatedKey")
+        yield resp.get("Items", []), last_key
+        if not last_key:
+            break
+
+
 def export_subscribers(
     fmt: str = "json",
     source=None,
@@ -7,8 +7,8 @@ Endpoints:
   GET  /api/growth/subscribers         — INTERNAL/ADMIN. Paginated list.
   GET  /api/growth/subscribers/export  — INTERNAL/ADMIN. CSV or JSON export.
 
-Table initialisation is lazy — runs once on first request via
-before_app_request, NOT from app.py.
+Tables are created by init_tables(), which app.py runs in a background
+thread at boot and the before_app_request hook retries until it succeeds.
 """
 
 import logging
@@ -35,7 +35,8 @@ def subscribers_ui():
 
 
 # ---------------------------------------------------------------------------
-# Lazy table initialisation (runs once, not in app.py)
+# Table initialisation — app.py calls init_tables() at boot, off the request
+# path; the hook retries on growth requests until it has succeeded
 # ---------------------------------------------------------------------------
 
 _table_initialized = False
@@ -43,9 +44,13 @@ _table_initialized = False
 
 @growth_bp.before_app_request
 def _ensure_table():
+    if not _table_initialized:
+        init_tables()
+
+
+def init_tables():
+    """Create the growth tables; retried until the subscriber table exists."""
     global _table_initialized
-    if _table_initialized:
-        return
     try:
         from growth.email_subscriber import init_subscriber_table
 
@@ -103,6 +108,34 @@ def _ensure_table():
     except Exception as e:
         logger.warning("referral table init deferred: %s", e)
 
+    try:
+        from growth.newsletter_delivery import init_newsletter_runs_table
+
+        init_newsletter_runs_table()
+    except Exception as e:
+        logger.warning("newsletter runs table init deferred: %s", e)
+
+    try:
+        from growth.lifecycle_engine import init_lifecycle_table
+
+        init_lifecycle_table()
+    except Exception as e:
+        logger.warning("lifecycle table init deferred: %s", e)
+
+    try:
+        from growth.schedule_calendar import init_calendar_table
+
+        init_calendar_table()
+    except Exception as e:
+        logger.warning("calendar table init deferred: %s", e)
+
+    try:
+        from growth.kpi_materializer import init_kpi_table
+
+        init_kpi_table()
+    except Exception as e:
+        logger.warning("KPI table init deferred: %s", e)
+
 
 # ---------------------------------------------------------------------------
 # Auth helper — late-import to avoid circular dependency
@@ -136,10 +169,11 @@ def _get_require_auth():
             if not token:
                 return jsonify({"status": "error", "message": "Authentication required"}), 401
             try:
-                import boto3, os
-                client = boto3.client(
+                import os
+                from aws_clients import get_client
+                client = get_client(
                     "cognito-idp",
-                    region_name=os.environ.get("COGNITO_REGION", os.environ.get("AWS_REGION", "us-east-1")),
+                    os.environ.get("COGNITO_REGION", os.environ.get("AWS_REGION", "us-east-1")),
                 )
                 result = client.get_user(AccessToken=token)
                 attrs = {a["Name"]: a["Value"] for a in result.get("UserAttributes", [])}
@@ -455,15 +489,17 @@ def dashboard():
     """Aggregated growth KPI dashboard.
 
     INTERNAL/ADMIN — requires Authorization: Bearer <cognito_token>.
-    Query params: days (int, default 7, clamped to 1-90).
+    Query params: days (int, default 7, clamped to 1-90),
+    fresh (bool, recompute instead of serving the cached snapshot).
     """
     try:
         days = int(request.args.get("days", 7))
     except (ValueError, TypeError):
         days = 7
+    fresh = request.args.get("fresh", "").lower() in ("1", "true", "yes")
 
     from growth.growth_dashboard import get_dashboard_kpis
-    result = get_dashboard_kpis(days=days)
+    result = get_dashboard_kpis(days=days, fresh=fresh)
     if result.get("success"):
         return jsonify(result), 200
     return jsonify(result), 500
@@ -1258,16 +1294,29 @@ def referral_leaderboard():
 @growth_bp.route("/email/newsletter", methods=["POST"])
 @require_auth
 def email_newsletter():
-    """POST /api/growth/email/newsletter — Send weekly newsletter."""
+    """POST /api/growth/email/newsletter — Send (or resume) the weekly newsletter.
+
+    Optional JSON body: {"run_id": "..."} — defaults to this week's run.
+    """
     from growth.email_automation_engine import send_weekly_newsletter
+    data = request.get_json(silent=True) or {}
     try:
-        result = send_weekly_newsletter()
+        result = send_weekly_newsletter(run_id=data.get("run_id"))
         return jsonify(result), 200 if result.get("success") else 500
     except Exception as e:
         logger.error("Newsletter failed: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@growth_bp.route("/email/newsletter/runs/<run_id>", methods=["GET"])
+@require_auth
+def email_newsletter_run(run_id):
+    """GET /api/growth/email/newsletter/runs/<run_id> — Delivery progress of a newsletter run."""
+    from growth.newsletter_delivery import get_run
+    result = get_run(run_id)
+    return jsonify(result), 200 if result.get("success") else 404
+
+
 @growth_bp.route("/email/newsletter/preview", methods=["GET"])
 @require_auth
 def email_newsletter_preview():
@@ -1306,10 +1355,14 @@ def email_reengage():
 @growth_bp.route("/lifecycle/run", methods=["POST"])
 @require_auth
 def lifecycle_run():
-    """POST /api/growth/lifecycle/run — Run lifecycle engine for all subscribers."""
+    """POST /api/growth/lifecycle/run — Run lifecycle engine for all subscribers.
+
+    Optional JSON body: {"record_only": true} — store states without triggering actions.
+    """
     from growth.lifecycle_engine import run_lifecycle_cycle
+    data = request.get_json(silent=True) or {}
     try:
-        result = run_lifecycle_cycle()
+        result = run_lifecycle_cycle(record_only=bool(data.get("record_only", False)))
         return jsonify(result), 200 if result.get("success") else 500
     except Exception as e:
         logger.error("Lifecycle run failed: %s", e)
@@ -3,20 +3,63 @@ growth/growth_dashboard.py
 Growth KPI Dashboard Aggregator.
 
 Collects metrics from analytics_tracker and email_subscriber into
-a single KPI summary. No new tables, no new dependencies.
+a single KPI summary. The summary is materialized per lookback window
+(growth/kpi_materializer.py) and served stale-while-revalidate, so a
+page load reads one snapshot instead of scanning the source tables.
 
 Integration points:
   - growth/analytics_tracker.get_summary(days)
-  - growth/email_subscriber.list_subscribers(page, per_page)
+  - growth/email_subscriber.iter_subscriber_pages(page_size, fields)
+  - growth/content_source_manager.list_content(limit)
 """
 
 import logging
+import os
 from datetime import datetime, timedelta, timezone
 
+from growth.kpi_materializer import KPIMaterializer
+
 logger = logging.getLogger(__name__)
 
+KPI_FRESH_SECONDS = int(os.environ.get("GROWTH_KPI_FRESH_SECONDS", "60"))
+KPI_MAX_AGE_SECONDS = int(os.environ.get("GROWTH_KPI_MAX_AGE_SECONDS", "3600"))
+KPI_REFRESH_SECONDS = int(os.environ.get("GROWTH_KPI_REFRESH_SECONDS", "300"))
+DEFAULT_WINDOWS = (1, 7, 30)
+
+
+def _clamp_days(days) -> int:
+    try:
+        return max(1, min(int(days), 90))
+    except (ValueError, TypeError):
+        return 7
+
 
-def get_dashboard_kpis(days: int = 7) -> dict:
+def get_dashboard_kpis(days: int = 7, fresh: bool = False) -> dict:
+    """Growth KPIs for the lookback window, from the materialized snapshot.
+
+    Args:
+        days: Lookback window in days. Clamped to [1, 90].
+        fresh: Recompute now instead of serving the snapshot.
+
+    Returns:
+        dict with success, all KPI fields, availability flags and a
+        ``freshness`` block (computed_at, age_seconds, stale, refreshing,
+        compute_ms, served_from).
+    """
+    return _materializer.get(_clamp_days(days), force=fresh)
+
+
+def invalidate_kpis() -> None:
+    """Mark KPI snapshots stale after a write to one of their sources."""
+    _materializer.mark_dirty()
+
+
+def refresh_kpis() -> None:
+    """Recompute every known window's snapshot (scheduled by scheduler.py)."""
+    _materializer.refresh_all()
+
+
+def compute_dashboard_kpis(days: int = 7) -> dict:
     """Aggregate growth KPIs from analytics and subscriber data sources.
 
     Args:
@@ -25,10 +68,7 @@ def get_dashboard_kpis(days: int = 7) -> dict:
     Returns:
         dict with success, all KPI fields, and availability flags.
     """
-    try:
-        days = max(1, min(int(days), 90))
-    except (ValueError, TypeError):
-        days = 7
+    days = _clamp_days(days)
 
     analytics_available = True
     subscribers_available = True
@@ -55,21 +95,13 @@ def get_dashboard_kpis(days: int = 7) -> dict:
         analytics_available = False
         logger.warning("Analytics source unavailable: %s", e)
 
-    # Fetch subscribers
+    # Fetch subscribers — one projected pass; list_subscribers caps at 100 rows
     try:
-        from growth.email_subscriber import list_subscribers
-        sub_result = list_subscribers(page=1, per_page=10000)
-        if sub_result.get("success"):
-            total_subscribers = sub_result.get("total", 0)
-            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-            subs = sub_result.get("subscribers", [])
-            new_subscribers = sum(
-                1 for s in subs
-                if s.get("subscribed_at", "") >= cutoff
-            )
-        else:
-            subscribers_available = False
-            logger.warning("Subscriber source returned failure: %s", sub_result.get("error"))
+        from growth.email_subscriber import iter_subscriber_pages
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        for subs, _ in iter_subscriber_pages(page_size=1000, fields=("subscribed_at",)):
+            total_subscribers += len(subs)
+            new_subscribers += sum(1 for s in subs if s.get("subscribed_at", "") >= cutoff)
     except Exception as e:
         subscribers_available = False
         logger.warning("Subscriber source unavailable: %s", e)
@@ -115,3 +147,10 @@ def _get_pipeline_stats() -> dict:
         }
     except Exception:
         return {"available": False}
+
+
+_materializer = KPIMaterializer(
+    "dashboard", compute_dashboard_kpis,
+    fresh_for=KPI_FRESH_SECONDS, max_age=KPI_MAX_AGE_SECONDS,
+    refresh_interval=KPI_REFRESH_SECONDS, windows=DEFAULT_WINDOWS,
+)
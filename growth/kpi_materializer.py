@@ -0,0 +1,229 @@
+"""
+growth/kpi_materializer.py
+Stale-while-revalidate KPI snapshots.
+
+The growth dashboard used to scan the analytics and subscriber tables on
+every page load. KPIMaterializer stores the computed KPIs per lookback
+window in DynamoDB and serves them from there:
+
+    - a snapshot younger than fresh_for is always returned as-is; past
+      that it is fresh until refresh_interval unless a write has landed
+      since it was computed
+    - a stale one is returned immediately while one background thread
+      recomputes it — fleet-wide, only the worker that wins a conditional
+      "refreshing" claim does the work, and the claim is held for
+      REFRESH_CLAIM seconds, so a window is recomputed at most that often
+    - only a missing snapshot, or one older than max_age, is computed
+      inline
+
+Low-volume writers (add_subscriber, add_content) call mark_dirty(), which
+records the time of the latest write (at most once per DIRTY_DEBOUNCE
+seconds per process). track_event does not: events arrive continuously,
+so the marker would always be newer than the snapshot. Event counts are
+picked up by the time-based refresh and by refresh_all(), which the
+background scheduler (scheduler.py) runs every refresh_interval seconds.
+
+Every response carries freshness metadata: computed_at, age_seconds,
+stale, refreshing, compute_ms and served_from.
+
+DynamoDB table: ai1stseo-growth-kpis (key: snapshot_id = <name>#<window>)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict
+
+from aws_clients import get_resource
+
+logger = logging.getLogger(__name__)
+
+KPI_TABLE = os.environ.get("GROWTH_KPI_TABLE", "ai1stseo-growth-kpis")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+DIRTY_DEBOUNCE = 15  # seconds between dirty-marker writes per process
+REFRESH_CLAIM = 120  # seconds one worker may hold a refresh before others retry
+
+_table = None
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        _table = get_resource("dynamodb", AWS_REGION).Table(KPI_TABLE)
+    return _table
+
+
+def init_kpi_table() -> None:
+    """Create the KPI snapshot table if it doesn't exist."""
+    dynamodb = get_resource("dynamodb", AWS_REGION)
+    try:
+        table = dynamodb.Table(KPI_TABLE)
+        table.load()
+    except dynamodb.meta.client.exceptions.ResourceNotFoundException:
+        dynamodb.create_table(
+            TableName=KPI_TABLE,
+            KeySchema=[{"AttributeName": "snapshot_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "snapshot_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info("KPI table %s created", KPI_TABLE)
+    except Exception as e:
+        logger.warning("KPI table init: %s", e)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class KPIMaterializer:
+    """Materialized snapshots of ``compute(window)``, served stale-while-revalidate."""
+
+    def __init__(self, name: str, compute: Callable[[int], Dict], fresh_for: int = 60,
+                 max_age: int = 3600, refresh_interval: int = 300, windows=()):
+        self.name = name
+        self.compute = compute
+        self.fresh_for = fresh_for
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self._refreshing = set()
+        self._windows = set(windows)
+        self._lock = threading.Lock()
+        self._last_dirty = 0.0
+
+    def _key(self, window) -> str:
+        return f"{self.name}#{window}"
+
+    # ── reads ──
+
+    def get(self, window: int, force: bool = False) -> Dict:
+        """Snapshot for ``window`` plus a ``freshness`` block."""
+        self._remember(window)
+        now = time.time()
+        snapshot, dirty_at = None, 0.0
+        if not force:
+            try:
+                snapshot, dirty_at = self._read(window)
+            except Exception as e:
+                logger.warning("KPI snapshot read failed: %s", e)
+
+        if snapshot is None or now - snapshot["computed_at"] > self.max_age:
+            return self._with_freshness(self._refresh(window), now, False, False, "computed")
+
+        age = now - snapshot["computed_at"]
+        stale = age > self.fresh_for and (dirty_at > snapshot["computed_at"] or age > self.refresh_interval)
+        refreshing = self._refresh_async(window) if stale else False
+        return self._with_freshness(snapshot, now, stale, refreshing, "snapshot")
+
+    def _read(self, window):
+        keys = [{"snapshot_id": self._key(window)}, {"snapshot_id": self._key("__dirty__")}]
+        resp = get_resource("dynamodb", AWS_REGION).batch_get_item(
+            RequestItems={KPI_TABLE: {"Keys": keys, "ConsistentRead": False}})
+        items = {i["snapshot_id"]: i for i in resp.get("Responses", {}).get(KPI_TABLE, [])}
+        dirty = items.get(self._key("__dirty__"))
+        item = items.get(self._key(window))
+        snapshot = None
+        if item and item.get("payload"):
+            snapshot = {
+                "data": json.loads(item["payload"]),
+                "computed_at": float(item["computed_at"]),
+                "compute_ms": float(item.get("compute_ms", 0)),
+            }
+        return snapshot, float(dirty["dirty_at"]) if dirty else 0.0
+
+    @staticmethod
+    def _with_freshness(snapshot: Dict, now: float, stale: bool, refreshing: bool, source: str) -> Dict:
+        return {
+            **snapshot["data"],
+            "freshness": {
+                "computed_at": _iso(snapshot["computed_at"]),
+                "age_seconds": round(max(0.0, now - snapshot["computed_at"]), 1),
+                "stale": stale,
+                "refreshing": refreshing,
+                "compute_ms": snapshot["compute_ms"],
+                "served_from": source,
+            },
+        }
+
+    # ── refresh ──
+
+    def _refresh(self, window) -> Dict:
+        """Compute and store ``window`` now (any refresh claim is left to expire)."""
+        t0 = time.time()
+        data = self.compute(window)
+        snapshot = {"data": data, "computed_at": t0, "compute_ms": round((time.time() - t0) * 1000, 1)}
+        if data.get("success"):
+            try:
+                _get_table().update_item(
+                    Key={"snapshot_id": self._key(window)},
+                    UpdateExpression="SET payload = :p, computed_at = :c, compute_ms = :m",
+                    ExpressionAttributeValues={
+                        ":p": json.dumps(data, default=str),
+                        ":c": str(t0),
+                        ":m": str(snapshot["compute_ms"]),
+                    },
+                )
+            except Exception as e:
+                logger.warning("KPI snapshot write failed: %s", e)
+        return snapshot
+
+    def _claim(self, window) -> bool:
+        now = int(time.time())
+        try:
+            _get_table().update_item(
+                Key={"snapshot_id": self._key(window)},
+                UpdateExpression="SET refreshing_until = :until",
+                ConditionExpression="attribute_not_exists(refreshing_until) OR refreshing_until < :now",
+                ExpressionAttributeValues={":until": now + REFRESH_CLAIM, ":now": now},
+            )
+            return True
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+            if code != "ConditionalCheckFailedException":
+                logger.warning("KPI refresh claim failed: %s", e)
+            return False
+
+    def _refresh_async(self, window) -> bool:
+        """Start a background refresh unless one is already running here or elsewhere."""
+        with self._lock:
+            if window in self._refreshing:
+                return True
+            self._refreshing.add(window)
+
+        def run():
+            try:
+                if self._claim(window):
+                    self._refresh(window)
+            except Exception as e:
+                logger.warning("KPI background refresh for %s failed: %s", window, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(window)
+
+        threading.Thread(target=run, daemon=True, name=f"kpi-{self.name}-{window}").start()
+        return True
+
+    def refresh_all(self):
+        """Recompute the default windows and every one this process has served (scheduled job)."""
+        for window in list(self._windows):
+            if self._claim(window):
+                self._refresh(window)
+
+    def _remember(self, window):
+        self._windows.add(window)
+
+    # ── writes ──
+
+    def mark_dirty(self):
+        """Note that source data changed; debounced to one write per DIRTY_DEBOUNCE seconds."""
+        now = time.time()
+        if now - self._last_dirty < DIRTY_DEBOUNCE:
+            return
+        self._last_dirty = now
+        try:
+            _get_table().put_item(Item={"snapshot_id": self._key("__dirty__"), "dirty_at": str(now)})
+        except Exception as e:
+            logger.warning("KPI dirty marker failed: %s", e)
@@ -17,14 +17,61 @@ Actions per state:
     inactive    → re-engagement email
     power_user  → referral leaderboard update + thank-you
 
+run_lifecycle_cycle() is set-based: each subscriber's last state is kept
+in the lifecycle states table, the whole subscriber list is classified
+column-wise (ISO timestamps compared against two cutoffs, no per-row date
+parsing), and actions fire only for subscribers whose state changed —
+as batched DM-queue writes, one bulk referral upsert and one throttled
+bulk re-engagement send. Unchanged subscribers cost one projected scan
+row and nothing else.
+
 Connects to: dm_engine, email_automation_engine, referral_engine
+
+DynamoDB table: ai1stseo-lifecycle-states
 """
 
 import logging
+import os
 from datetime import datetime, timedelta, timezone
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
+STATE_TABLE = os.environ.get("GROWTH_LIFECYCLE_TABLE", "ai1stseo-lifecycle-states")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+NEW_DAYS = 3
+ACTIVE_DAYS = 14
+POWER_USER_REFERRALS = 3
+
+_table = None
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        _table = get_resource("dynamodb", AWS_REGION).Table(STATE_TABLE)
+    return _table
+
+
+def init_lifecycle_table() -> None:
+    """Create the lifecycle states table if it doesn't exist."""
+    dynamodb = get_resource("dynamodb", AWS_REGION)
+    try:
+        table = dynamodb.Table(STATE_TABLE)
+        table.load()
+    except dynamodb.meta.client.exceptions.ResourceNotFoundException:
+        dynamodb.create_table(
+            TableName=STATE_TABLE,
+            KeySchema=[{"AttributeName": "email", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "email", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info("Lifecycle table %s created", STATE_TABLE)
+    except Exception as e:
+        logger.warning("Lifecycle table init: %s", e)
+
 
 def classify_user_state(subscriber: dict, referral_count: int = 0) -> str:
     """Classify a subscriber into a lifecycle state.
@@ -36,7 +83,7 @@ def classify_user_state(subscriber: dict, referral_count: int = 0) -> str:
     Returns:
         One of: "power_user", "new", "active", "inactive"
     """
-    if referral_count >= 3:
+    if referral_count >= POWER_USER_REFERRALS:
         return "power_user"
 
     now = datetime.now(timezone.utc)
@@ -49,23 +96,20 @@ def classify_user_state(subscriber: dict, referral_count: int = 0) -> str:
 
     days = (now - sub_date).days
 
-    if days <= 3:
+    if days <= NEW_DAYS:
         return "new"
-    if days <= 14:
+    if days <= ACTIVE_DAYS:
         return "active"
     return "inactive"
 
 
-def _get_referral_counts() -> dict:
-    """Fetch referral counts for all users."""
+def _get_referral_counts(emails: list) -> dict:
+    """Fetch referral counts for the given users (batched key lookups)."""
     try:
-        from growth.referral_engine import get_leaderboard
-        lb = get_leaderboard(limit=200)
-        if lb.get("success"):
-            return {e["referrer_id"]: e.get("count", 0) for e in lb.get("leaderboard", [])}
+        from growth.referral_engine import get_referral_counts
+        return get_referral_counts(emails)
     except Exception:
-        pass
-    return {}
+        return {}
 
 
 def trigger_actions(email: str, state: str) -> dict:
@@ -133,51 +177,146 @@ def trigger_actions(email: str, state: str) -> dict:
     return {"email": email, "state": state, "actions": actions}
 
 
-def run_lifecycle_cycle() -> dict:
-    """Run the full lifecycle engine for all subscribers.
+def _scan_columns(table, fields: tuple) -> dict:
+    """Scan ``fields`` of every item into parallel lists (one per field)."""
+    names = {f"#f{i}": f for i, f in enumerate(fields)}
+    params = {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+    cols = {f: [] for f in fields}
+    while True:
+        resp = table.scan(**params)
+        for item in resp.get("Items", []):
+            for f in fields:
+                cols[f].append(item.get(f, ""))
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return cols
+        params["ExclusiveStartKey"] = last_key
+
+
+def classify_states(emails: list, subscribed_at: list, referral_counts: dict, now: datetime = None) -> list:
+    """classify_user_state() for whole columns at once.
+
+    Instead of parsing every timestamp, compares the ISO strings against
+    the "new" and "active" cutoffs — UTC ISO-8601 sorts chronologically.
+    """
+    now = now or datetime.now(timezone.utc)
+    # days <= N  <=>  subscribed_at > now - (N + 1) days
+    new_cutoff = (now - timedelta(days=NEW_DAYS + 1)).isoformat()
+    active_cutoff = (now - timedelta(days=ACTIVE_DAYS + 1)).isoformat()
+    power = {e for e, c in referral_counts.items() if c >= POWER_USER_REFERRALS}
+    states = []
+    for email, ts in zip(emails, subscribed_at):
+        if email in power:
+            states.append("power_user")
+        elif not (isinstance(ts, str) and ts[:4].isdigit() and ts[4:5] == "-"):
+            states.append("inactive")
+        elif ts > new_cutoff:
+            states.append("new")
+        elif ts > active_cutoff:
+            states.append("active")
+        else:
+            states.append("inactive")
+    return states
+
+
+def _apply_transitions(entered: dict) -> dict:
+    """Fire the actions for subscribers that just entered each state, in bulk."""
+    action_counts = {}
+
+    def count(action, n):
+        if n:
+            action_counts[action] = action_counts.get(action, 0) + n
+
+    dms = (
+        [{"user": e, "dm_type": "welcome"} for e in entered["new"]]
+        + [{"user": e, "dm_type": "engagement", "topic": "AI SEO"} for e in entered["active"]]
+        + [{"user": e, "dm_type": "nurture", "platform": "linkedin"} for e in entered["active"]]
+        + [{"user": e, "dm_type": "engagement", "topic": "your referral impact"} for e in entered["power_user"]]
+    )
+    if dms:
+        try:
+            from growth.dm_engine import queue_dms
+            if queue_dms(dms).get("success"):
+                count("welcome_dm_queued", len(entered["new"]))
+                count("engagement_dm_queued", len(entered["active"]))
+                count("nurture_dm_queued", len(entered["active"]))
+                count("power_user_dm_queued", len(entered["power_user"]))
+        except Exception as e:
+            logger.warning("Lifecycle DM batch failed: %s", e)
+
+    if entered["new"]:
+        try:
+            from growth.referral_engine import ensure_referral_links
+            if ensure_referral_links(entered["new"]).get("success"):
+                count("referral_link_created", len(entered["new"]))
+        except Exception as e:
+            logger.warning("Lifecycle referral links failed: %s", e)
+
+    if entered["inactive"]:
+        try:
+            from growth.email_automation_engine import send_reengagement
+            count("reengagement_email_sent", send_reengagement(emails=entered["inactive"]).get("sent", 0))
+        except Exception as e:
+            logger.warning("Lifecycle re-engagement failed: %s", e)
+
+    return action_counts
+
+
+def run_lifecycle_cycle(record_only: bool = False) -> dict:
+    """Run the lifecycle engine over all subscribers, acting only on state changes.
 
-    Classifies each subscriber and triggers appropriate actions.
+    Args:
+        record_only: Store current states without triggering actions
+            (e.g. to baseline the states table on first deployment).
     """
-    # Get all subscribers
     try:
-        from growth.email_subscriber import list_subscribers
-        result = list_subscribers(page=1, per_page=10000)
-        if not result.get("success"):
-            return {"success": False, "error": "Failed to fetch subscribers"}
-        subscribers = result.get("subscribers", [])
+        from growth.email_subscriber import _get_table as _subscribers_table
+        subs = _scan_columns(_subscribers_table(), ("email", "subscribed_at"))
+        previous = _scan_columns(_get_table(), ("email", "state"))
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-    if not subscribers:
+    if not subs["email"]:
         return {"success": True, "processed": 0, "message": "No subscribers"}
 
-    referral_counts = _get_referral_counts()
+    states = classify_states(subs["email"], subs["subscribed_at"], _get_referral_counts(subs["email"]))
+    last = dict(zip(previous["email"], previous["state"]))
 
     state_counts = {"new": 0, "active": 0, "inactive": 0, "power_user": 0}
-    action_counts = {}
+    entered = {k: [] for k in state_counts}
     processed = 0
-
-    for sub in subscribers:
-        email = sub.get("email", "")
+    for email, state in zip(subs["email"], states):
         if not email:
             continue
+        processed += 1
+        state_counts[state] += 1
+        if last.get(email) != state:
+            entered[state].append(email)
 
-        ref_count = referral_counts.get(email, 0)
-        state = classify_user_state(sub, ref_count)
-        state_counts[state] = state_counts.get(state, 0) + 1
-
-        result = trigger_actions(email, state)
-        for action in result.get("actions", []):
-            action_counts[action] = action_counts.get(action, 0) + 1
+    changed = sum(len(v) for v in entered.values())
+    action_counts = {} if record_only else _apply_transitions(entered)
 
-        processed += 1
+    if changed:
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            with _get_table().batch_writer() as batch:
+                for state, emails in entered.items():
+                    for email in emails:
+                        batch.put_item(Item={
+                            "email": email, "state": state,
+                            "previous_state": last.get(email) or "none", "changed_at": now,
+                        })
+        except Exception as e:
+            logger.error("Lifecycle state write failed: %s", e)
+            return {"success": False, "error": f"State write failed: {e}", "actions": action_counts}
 
     # Track lifecycle run
     try:
         from growth.analytics_tracker import track_event
         track_event(
             event_type="auto_pipeline_run",
-            event_data={"lifecycle_run": True, "processed": processed, "states": state_counts},
+            event_data={"lifecycle_run": True, "processed": processed, "states": state_counts,
+                        "transitions": changed},
         )
     except Exception:
         pass
@@ -186,6 +325,9 @@ def run_lifecycle_cycle() -> dict:
         "success": True,
         "processed": processed,
         "states": state_counts,
+        "transitions": {k: len(v) for k, v in entered.items()},
+        "unchanged": processed - changed,
         "actions": action_counts,
+        "record_only": record_only,
         "run_at": datetime.now(timezone.utc).isoformat(),
     }
@@ -0,0 +1,326 @@
+"""
+growth/newsletter_delivery.py
+Newsletter Delivery — throttled, resumable bulk sends via AWS SES.
+
+send_weekly_newsletter() used to load every subscriber into memory and
+call ses.send_email once per recipient, serially, with no regard for the
+account's send rate and no way to pick up after a crash. This module:
+
+    - streams subscribers one scan page at a time (email_subscriber.iter_subscriber_pages)
+    - sends the already-rendered body on a thread pool, paced by a token
+      bucket sized to SES GetSendQuota MaxSendRate
+    - backs off and retries on SES throttling
+    - checkpoints the scan cursor and counters after every page in the
+      newsletter runs table, so a restarted run continues from the last
+      completed page
+
+Runs are keyed by run_id (weekly-<ISO week> by default). A run holds a
+lease while sending, so two workers can't deliver the same run at once,
+and a completed run is never re-sent. Delivery is at-least-once: a crash
+mid-page re-sends at most that page (DELIVERY_PAGE recipients).
+
+DynamoDB table: ai1stseo-newsletter-runs
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from aws_clients import get_resource
+
+logger = logging.getLogger(__name__)
+
+RUNS_TABLE = os.environ.get("GROWTH_NEWSLETTER_RUNS_TABLE", "ai1stseo-newsletter-runs")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+SES_SENDER = os.environ.get("SES_SENDER_EMAIL", "marketing@ai1stseo.com")
+
+DELIVERY_PAGE = 200       # recipients per scan page / checkpoint
+MAX_WORKERS = 32          # SES calls take ~50-100ms, so this covers ~300 sends/s
+DEFAULT_SEND_RATE = 14.0  # SES production default, used when GetSendQuota fails
+LEASE_SECONDS = 300
+SEND_RETRIES = 4
+# Lambda stops at 15 minutes; leave headroom to write the checkpoint.
+MAX_SECONDS = int(os.environ.get(
+    "NEWSLETTER_MAX_SECONDS", "780" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "0"))
+
+_THROTTLE_CODES = ("Throttling", "ThrottlingException", "MaxSendRateExceeded")
+
+_table = None
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        _table = get_resource("dynamodb", AWS_REGION).Table(RUNS_TABLE)
+    return _table
+
+
+def init_newsletter_runs_table() -> None:
+    """Create the newsletter runs table if it doesn't exist."""
+    dynamodb = get_resource("dynamodb", AWS_REGION)
+    try:
+        table = dynamodb.Table(RUNS_TABLE)
+        table.load()
+    except dynamodb.meta.client.exceptions.ResourceNotFoundException:
+        dynamodb.create_table(
+            TableName=RUNS_TABLE,
+            KeySchema=[{"AttributeName": "run_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "run_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info("Newsletter runs table %s created", RUNS_TABLE)
+    except Exception as e:
+        logger.warning("Newsletter runs table init: %s", e)
+
+
+def default_run_id() -> str:
+    """One run per ISO week, so re-triggering this week's send resumes it."""
+    year, week, _ = datetime.now(timezone.utc).isocalendar()
+    return f"weekly-{year}-W{week:02d}"
+
+
+# ---------------------------------------------------------------------------
+# Throttling
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Thread-safe token bucket: at most ``rate`` acquisitions per second."""
+
+    def __init__(self, rate: float):
+        self.rate = max(rate, 0.1)
+        self._tokens = min(self.rate, 1.0)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _send_quota(ses) -> dict:
+    """Max send rate and what's left of the 24h quota (-1 = unlimited)."""
+    try:
+        q = ses.get_send_quota()
+        max_24h = float(q.get("Max24HourSend", -1))
+        remaining = -1 if max_24h < 0 else max(0, int(max_24h - float(q.get("SentLast24Hours", 0))))
+        return {"max_send_rate": float(q.get("MaxSendRate") or DEFAULT_SEND_RATE), "remaining_24h": remaining}
+    except Exception as e:
+        logger.warning("SES GetSendQuota failed, assuming %s/s: %s", DEFAULT_SEND_RATE, e)
+        return {"max_send_rate": DEFAULT_SEND_RATE, "remaining_24h": -1}
+
+
+def _error_code(exc) -> str:
+    return getattr(exc, "response", {}).get("Error", {}).get("Code", "")
+
+
+def _send_one(ses, limiter: RateLimiter, email: str, message: dict) -> bool:
+    for attempt in range(SEND_RETRIES + 1):
+        limiter.acquire()
+        try:
+            ses.send_email(Source=SES_SENDER, Destination={"ToAddresses": [email]}, Message=message)
+            return True
+        except Exception as e:
+            if _error_code(e) in _THROTTLE_CODES and attempt < SEND_RETRIES:
+                time.sleep(min(2 ** attempt * 0.5, 8))
+                continue
+            logger.warning("Newsletter send failed for %s: %s", email, e)
+            return False
+    return False
+
+
+def send_bulk(emails: list, subject: str, html: str, text: str, ses=None) -> dict:
+    """Send one rendered email to a list of recipients, paced to the SES send rate.
+
+    For ad-hoc batches (re-engagement, lifecycle transitions) that don't
+    need a checkpointed run.
+    """
+    emails = [e for e in dict.fromkeys(emails) if e]
+    if not emails:
+        return {"sent": 0, "failed": 0}
+    if ses is None:
+        from growth.email_automation_engine import _get_ses
+        ses = _get_ses()
+    rate = _send_quota(ses)["max_send_rate"]
+    limiter = RateLimiter(rate)
+    message = {
+        "Subject": {"Data": subject, "Charset": "UTF-8"},
+        "Body": {
+            "Html": {"Data": html, "Charset": "UTF-8"},
+            "Text": {"Data": text, "Charset": "UTF-8"},
+        },
+    }
+    workers = max(1, min(MAX_WORKERS, int(rate), len(emails)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-email") as pool:
+        sent = sum(pool.map(lambda e: _send_one(ses, limiter, e, message), emails))
+    return {"sent": sent, "failed": len(emails) - sent}
+
+
+# ---------------------------------------------------------------------------
+# Run checkpoints
+# ---------------------------------------------------------------------------
+
+def get_run(run_id: str) -> dict:
+    """Checkpoint of a newsletter run (without the rendered body)."""
+    try:
+        item = _get_table().get_item(Key={"run_id": run_id}).get("Item")
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    if not item:
+        return {"success": False, "error": "Run not found"}
+    run = {k: v for k, v in item.items() if k not in ("html", "text", "cursor")}
+    for k in ("sent", "failed", "pages", "lease_until"):
+        if k in run:
+            run[k] = int(run[k])
+    return {"success": True, "run": run}
+
+
+def _claim(run_id: str, subject: str, html: str, text: str) -> dict:
+    """Create or take over ``run_id``; returns the stored run item, or None if leased elsewhere."""
+    table = _get_table()
+    now = time.time()
+    iso = datetime.now(timezone.utc).isoformat()
+    try:
+        # First claim stores the rendered body; resumes keep the original.
+        table.update_item(
+            Key={"run_id": run_id},
+            UpdateExpression=(
+                "SET #s = :running, lease_until = :lease, updated_at = :iso, "
+                "subject = if_not_exists(subject, :subj), html = if_not_exists(html, :html), "
+                "#t = if_not_exists(#t, :text), started_at = if_not_exists(started_at, :iso), "
+                "sent = if_not_exists(sent, :zero), failed = if_not_exists(failed, :zero), "
+                "pages = if_not_exists(pages, :zero)"
+            ),
+            ConditionExpression=(
+                "attribute_not_exists(run_id) OR "
+                "(#s <> :done AND (#s <> :running OR lease_until < :now))"
+            ),
+            ExpressionAttributeNames={"#s": "status", "#t": "text"},
+            ExpressionAttributeValues={
+                ":running": "running", ":done": "completed", ":lease": int(now + LEASE_SECONDS),
+                ":now": int(now), ":iso": iso, ":subj": subject, ":html": html, ":text": text, ":zero": 0,
+            },
+        )
+    except Exception as e:
+        if "ConditionalCheckFailed" in type(e).__name__ or "ConditionalCheckFailed" in _error_code(e):
+            return None
+        raise
+    return table.get_item(Key={"run_id": run_id}, ConsistentRead=True)["Item"]
+
+
+def _checkpoint(run_id: str, cursor, sent: int, failed: int, pages: int, status: str = "running"):
+    values = {
+        ":s": status, ":sent": sent, ":failed": failed, ":pages": pages,
+        ":lease": int(time.time() + LEASE_SECONDS), ":iso": datetime.now(timezone.utc).isoformat(),
+    }
+    update = "SET #s = :s, sent = :sent, failed = :failed, pages = :pages, lease_until = :lease, updated_at = :iso"
+    if cursor:
+        update += ", #c = :c"
+        values[":c"] = cursor
+    else:
+        update += " REMOVE #c"
+    if status == "completed":
+        update = update.replace("updated_at = :iso", "updated_at = :iso, completed_at = :iso")
+    _get_table().update_item(
+        Key={"run_id": run_id},
+        UpdateExpression=update,
+        ExpressionAttributeNames={"#s": "status", "#c": "cursor"},
+        ExpressionAttributeValues=values,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Delivery
+# ---------------------------------------------------------------------------
+
+def deliver_newsletter(subject: str, html: str, text: str, run_id: str = None,
+                       ses=None, max_seconds: int = MAX_SECONDS) -> dict:
+    """Send a rendered newsletter to every subscriber, resuming ``run_id`` if it was interrupted.
+
+    Stops early (status ``paused``) when ``max_seconds`` elapse or the SES
+    24h quota runs out; calling again with the same run_id continues.
+    """
+    from growth.email_subscriber import iter_subscriber_pages
+
+    run_id = run_id or default_run_id()
+    try:
+        run = _claim(run_id, subject, html, text)
+    except Exception as e:
+        return {"success": False, "error": f"Checkpoint store unavailable: {e}", "run_id": run_id}
+    if run is None:
+        state = get_run(run_id).get("run", {})
+        if state.get("status") == "completed":
+            return {"success": True, "run_id": run_id, "already_completed": True, **_summary(state)}
+        return {"success": False, "error": "Run is already in progress", "run_id": run_id}
+
+    if ses is None:
+        from growth.email_automation_engine import _get_ses
+        ses = _get_ses()
+    quota = _send_quota(ses)
+    limiter = RateLimiter(quota["max_send_rate"])
+    budget = quota["remaining_24h"]
+    workers = max(1, min(MAX_WORKERS, int(quota["max_send_rate"])))
+
+    message = {
+        "Subject": {"Data": run["subject"], "Charset": "UTF-8"},
+        "Body": {
+            "Html": {"Data": run["html"], "Charset": "UTF-8"},
+            "Text": {"Data": run["text"], "Charset": "UTF-8"},
+        },
+    }
+    cursor = run.get("cursor")
+    resumed = bool(cursor)
+    sent, failed, pages = int(run["sent"]), int(run["failed"]), int(run["pages"])
+    started = time.monotonic()
+    status = "completed"
+
+    logger.info("Newsletter run %s: %s at %.0f/s with %d workers",
+                run_id, "resuming" if resumed else "starting", limiter.rate, workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="newsletter") as pool:
+        for subscribers, next_cursor in iter_subscriber_pages(DELIVERY_PAGE, start_key=cursor):
+            emails = [s["email"] for s in subscribers if s.get("email")]
+            if 0 <= budget < len(emails):
+                status = "paused"
+                logger.warning("Newsletter run %s paused: SES 24h quota exhausted", run_id)
+                break
+            results = list(pool.map(lambda e: _send_one(ses, limiter, e, message), emails))
+            ok = sum(results)
+            sent += ok
+            failed += len(results) - ok
+            pages += 1
+            if budget >= 0:
+                budget -= len(emails)
+            cursor = next_cursor
+            _checkpoint(run_id, cursor, sent, failed, pages, "running" if cursor else "completed")
+            if cursor and max_seconds and time.monotonic() - started > max_seconds:
+                status = "paused"
+                break
+
+    if status == "paused":
+        _checkpoint(run_id, cursor, sent, failed, pages, "paused")
+
+    return {
+        "success": True,
+        "run_id": run_id,
+        "status": status,
+        "resumed": resumed,
+        "sent": sent,
+        "failed": failed,
+        "pages": pages,
+        "send_rate": limiter.rate,
+        "elapsed_s": round(time.monotonic() - started, 1),
+    }
+
+
+def _summary(run: dict) -> dict:
+    return {k: run.get(k) for k in ("status", "sent", "failed", "pages", "completed_at")}
@@ -15,23 +15,39 @@ Produces:
 
 Does NOT modify any existing modules. Read-only analysis layer.
 
+All analysis reads one snapshot of the scores table: a full paginated
+scan loaded into columns (NumPy arrays when available), from which every
+group-by, percentile and top-K is computed in a single pass. The snapshot
+is cached for ANALYTICS_TTL seconds and dropped whenever score_post()
+writes, so the dashboard costs at most one scan.
+
 Environment variables:
     GROWTH_SCORES_TABLE  — DynamoDB table (default: ai1stseo-content-scores)
     AWS_REGION           — AWS region (default: us-east-1)
+    PERF_ANALYTICS_TTL   — seconds to reuse the analytics snapshot (default: 60)
 """
 
 import logging
 import os
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from datetime import datetime, timezone
 from decimal import Decimal
 
-import boto3
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from aws_clients import get_resource
 
 logger = logging.getLogger(__name__)
 
 SCORES_TABLE = os.environ.get("GROWTH_SCORES_TABLE", "ai1stseo-content-scores")
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+ANALYTICS_TTL = int(os.environ.get("PERF_ANALYTICS_TTL", "60"))
+TOP_K = 50  # get_top_posts() limit ceiling
 
 _table = None
 
@@ -39,13 +55,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(SCORES_TABLE)
+        _table = get_resource("dynamodb", AWS_REGION).Table(SCORES_TABLE)
     return _table
 
 
 def init_scores_table() -> None:
     """Create the scores table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(SCORES_TABLE)
         table.load()
@@ -111,7 +127,7 @@ def score_post(post_id: str, metrics: dict) -> dict:
         "impressions": impressions,
         "engagements": engagements,
         "conversions": conversions,
-        "ctr": round(clicks / impressions, 4) if impressions > 0 else 0,
+        "ctr": Decimal(str(round(clicks / impressions, 4))) if impressions > 0 else 0,
         "platform": metrics.get("platform", ""),
         "content_type": metrics.get("content_type", ""),
         "scored_at": now,
@@ -119,20 +135,176 @@ def score_post(post_id: str, metrics: dict) -> dict:
 
     try:
         _get_table().put_item(Item=item)
+        invalidate_analytics()
         return {"success": True, "post_id": post_id, "score": score}
     except Exception as e:
         logger.error("score_post error: %s", e)
         return {"success": False, "error": f"Database error: {e}"}
 
 
+# ---------------------------------------------------------------------------
+# Analytics snapshot — one scan, one pass
+# ---------------------------------------------------------------------------
+
+_METRICS = ("clicks", "impressions", "engagements", "conversions")
+
+_analytics = None
+_analytics_at = 0.0
+_analytics_lock = threading.Lock()
+
+
+def invalidate_analytics() -> None:
+    """Drop the cached snapshot (called after every score write)."""
+    global _analytics
+    with _analytics_lock:
+        _analytics = None
+
+
+def _scan_all() -> list:
+    table = _get_table()
+    items = []
+    params = {}
+    while True:
+        resp = table.scan(**params)
+        items.extend(resp.get("Items", []))
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        params["ExclusiveStartKey"] = last_key
+
+
+def _group_stats(keys: list, score, metrics: dict) -> dict:
+    """Per-key count, score sum/min/max and metric sums."""
+    if HAS_NUMPY:
+        labels, inv = np.unique(np.asarray(keys, dtype=object), return_inverse=True)
+        n = len(labels)
+        count = np.bincount(inv, minlength=n)
+        total = np.bincount(inv, weights=score, minlength=n)
+        best = np.full(n, -np.inf)
+        worst = np.full(n, np.inf)
+        np.maximum.at(best, inv, score)
+        np.minimum.at(worst, inv, score)
+        sums = {m: np.bincount(inv, weights=v, minlength=n) for m, v in metrics.items()}
+        return {
+            str(label): {
+                "count": int(count[i]), "total_score": float(total[i]),
+                "best_score": float(best[i]), "worst_score": float(worst[i]),
+                **{m: int(sums[m][i]) for m in metrics},
+            }
+            for i, label in enumerate(labels)
+        }
+
+    groups = {}
+    for i, key in enumerate(keys):
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = {"count": 0, "total_score": 0.0, "best_score": score[i],
+                               "worst_score": score[i], **{m: 0 for m in metrics}}
+        g["count"] += 1
+        g["total_score"] += score[i]
+        g["best_score"] = max(g["best_score"], score[i])
+        g["worst_score"] = min(g["worst_score"], score[i])
+        for m, v in metrics.items():
+            g[m] += v[i]
+    return groups
+
+
+def _percentiles(score) -> dict:
+    if not len(score):
+        return {}
+    qs = (25, 50, 75, 90)
+    if HAS_NUMPY:
+        values = np.percentile(score, qs)
+    else:
+        ordered = sorted(score)
+
+        def pct(q):
+            k = (len(ordered) - 1) * q / 100
+            lo = int(k)
+            hi = min(lo + 1, len(ordered) - 1)
+            return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+        values = [pct(q) for q in qs]
+    return {f"p{q}": round(float(v), 2) for q, v in zip(qs, values)}
+
+
+def _top_indices(score, k: int) -> list:
+    if HAS_NUMPY:
+        if len(score) > k:
+            idx = np.argpartition(-score, k - 1)[:k]
+        else:
+            idx = np.arange(len(score))
+        return idx[np.argsort(-score[idx], kind="stable")].tolist()
+    return sorted(range(len(score)), key=lambda i: score[i], reverse=True)[:k]
+
+
+def _compute_analytics(items: list) -> dict:
+    """Top posts, platform and content-type rollups and score percentiles in one pass."""
+    score = [float(i.get("score", 0)) for i in items]
+    metrics = {m: [int(i.get(m, 0)) for i in items] for m in _METRICS}
+    if HAS_NUMPY:
+        score = np.asarray(score, dtype=float)
+        metrics = {m: np.asarray(v, dtype=float) for m, v in metrics.items()}
+
+    by_platform = _group_stats([str(i.get("platform", "unknown")) for i in items], score, metrics) if items else {}
+    by_type = _group_stats([str(i.get("content_type", "unknown")) for i in items], score, metrics) if items else {}
+
+    platforms = {
+        plat: {
+            "post_count": g["count"],
+            "avg_score": round(g["total_score"] / g["count"], 2) if g["count"] else 0,
+            "total_clicks": g["clicks"],
+            "total_engagements": g["engagements"],
+            "total_conversions": g["conversions"],
+            "ctr": round(g["clicks"] / g["impressions"], 4) if g["impressions"] > 0 else 0,
+        }
+        for plat, g in by_platform.items()
+    }
+    patterns = {
+        ct: {
+            "count": g["count"],
+            "avg_score": round(g["total_score"] / g["count"], 2) if g["count"] else 0,
+            "best_score": g["best_score"],
+            "worst_score": g["worst_score"],
+        }
+        for ct, g in by_type.items()
+    }
+    ranked_platforms = sorted(platforms.items(), key=lambda x: x[1]["avg_score"], reverse=True)
+    ranked_patterns = sorted(patterns.items(), key=lambda x: x[1]["avg_score"], reverse=True)
+
+    return {
+        "post_count": len(items),
+        "top_posts": _decimal_to_float([items[i] for i in _top_indices(score, TOP_K)]),
+        "platforms": dict(ranked_platforms),
+        "best_platform": ranked_platforms[0][0] if ranked_platforms else None,
+        "patterns": dict(ranked_patterns),
+        "best_content_type": ranked_patterns[0][0] if ranked_patterns else None,
+        "score_percentiles": _percentiles(score),
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def get_analytics(refresh: bool = False) -> dict:
+    """The cached analytics snapshot; rebuilt from one full scan when stale.
+
+    Raises on database errors — callers turn that into their error shape.
+    """
+    global _analytics, _analytics_at
+    with _analytics_lock:
+        if not refresh and _analytics is not None and time.monotonic() - _analytics_at < ANALYTICS_TTL:
+            return _analytics
+    items = _scan_all()
+    result = _compute_analytics(items)
+    with _analytics_lock:
+        _analytics = result
+        _analytics_at = time.monotonic()
+    return result
+
+
 def get_top_posts(limit: int = 10) -> dict:
     """Get top-performing posts by score."""
-    limit = max(1, min(limit, 50))
+    limit = max(1, min(limit, TOP_K))
     try:
-        resp = _get_table().scan()
-        items = resp.get("Items", [])
-        items.sort(key=lambda x: float(x.get("score", 0)), reverse=True)
-        top = _decimal_to_float(items[:limit])
+        top = get_analytics()["top_posts"][:limit]
         return {"success": True, "posts": top, "count": len(top)}
     except Exception as e:
         logger.error("get_top_posts error: %s", e)
@@ -143,94 +315,43 @@ def get_top_posts(limit: int = 10) -> dict:
 # Platform & Pattern Analysis
 # ---------------------------------------------------------------------------
 
-def analyze_platform_performance() -> dict:
+def analyze_platform_performance(analytics: dict = None) -> dict:
     """Analyze performance by platform.
 
     Returns engagement rate, avg score, and post count per platform.
     """
     try:
-        resp = _get_table().scan()
-        items = resp.get("Items", [])
+        analytics = analytics or get_analytics()
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-    if not items:
+    if not analytics["post_count"]:
         return {"success": True, "platforms": {}, "message": "No scored posts yet"}
 
-    platforms = defaultdict(lambda: {
-        "count": 0, "total_score": 0, "total_clicks": 0,
-        "total_impressions": 0, "total_engagements": 0, "total_conversions": 0,
-    })
-
-    for item in items:
-        plat = item.get("platform", "unknown")
-        p = platforms[plat]
-        p["count"] += 1
-        p["total_score"] += float(item.get("score", 0))
-        p["total_clicks"] += int(item.get("clicks", 0))
-        p["total_impressions"] += int(item.get("impressions", 0))
-        p["total_engagements"] += int(item.get("engagements", 0))
-        p["total_conversions"] += int(item.get("conversions", 0))
-
-    result = {}
-    for plat, p in platforms.items():
-        result[plat] = {
-            "post_count": p["count"],
-            "avg_score": round(p["total_score"] / p["count"], 2) if p["count"] else 0,
-            "total_clicks": p["total_clicks"],
-            "total_engagements": p["total_engagements"],
-            "total_conversions": p["total_conversions"],
-            "ctr": round(p["total_clicks"] / p["total_impressions"], 4) if p["total_impressions"] > 0 else 0,
-        }
-
-    # Rank platforms by avg score
-    ranked = sorted(result.items(), key=lambda x: x[1]["avg_score"], reverse=True)
     return {
         "success": True,
-        "platforms": dict(ranked),
-        "best_platform": ranked[0][0] if ranked else None,
+        "platforms": analytics["platforms"],
+        "best_platform": analytics["best_platform"],
     }
 
 
-def analyze_content_patterns() -> dict:
+def analyze_content_patterns(analytics: dict = None) -> dict:
     """Analyze which content types and patterns perform best.
 
     Groups by content_type and extracts winning patterns.
     """
     try:
-        resp = _get_table().scan()
-        items = resp.get("Items", [])
+        analytics = analytics or get_analytics()
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-    if not items:
+    if not analytics["post_count"]:
         return {"success": True, "patterns": {}, "message": "No scored posts yet"}
 
-    by_type = defaultdict(lambda: {"count": 0, "total_score": 0, "scores": []})
-
-    for item in items:
-        ct = item.get("content_type", "unknown")
-        score = float(item.get("score", 0))
-        by_type[ct]["count"] += 1
-        by_type[ct]["total_score"] += score
-        by_type[ct]["scores"].append(score)
-
-    patterns = {}
-    for ct, data in by_type.items():
-        avg = round(data["total_score"] / data["count"], 2) if data["count"] else 0
-        scores = sorted(data["scores"], reverse=True)
-        patterns[ct] = {
-            "count": data["count"],
-            "avg_score": avg,
-            "best_score": scores[0] if scores else 0,
-            "worst_score": scores[-1] if scores else 0,
-        }
-
-    ranked = sorted(patterns.items(), key=lambda x: x[1]["avg_score"], reverse=True)
     return {
         "success": True,
-        "patterns": dict(ranked),
-        "best_content_type": ranked[0][0] if ranked else None,
+        "patterns": analytics["patterns"],
+        "best_content_type": analytics["best_content_type"],
     }
 
 
@@ -238,7 +359,7 @@ def analyze_content_patterns() -> dict:
 # Optimization Signals — feeds back into the repurposer
 # ---------------------------------------------------------------------------
 
-def generate_optimization_signals() -> dict:
+def generate_optimization_signals(analytics: dict = None) -> dict:
     """Generate optimization signals based on all available performance data.
 
     Returns a structured set of recommendations that the pipeline
@@ -250,8 +371,8 @@ def generate_optimization_signals() -> dict:
         platform_weights: {"x": 0.4, "linkedin": 0.6} — allocation ratios
         generation_hints: list of text hints for the AI repurposer
     """
-    platform_data = analyze_platform_performance()
-    pattern_data = analyze_content_patterns()
+    platform_data = analyze_platform_performance(analytics)
+    pattern_data = analyze_content_patterns(analytics)
 
     signals = {
         "success": True,
@@ -331,10 +452,14 @@ def get_performance_dashboard(days: int = 30) -> dict:
     Combines top posts, platform rankings, content patterns, and optimization signals
     into a single response for the admin dashboard.
     """
-    top = get_top_posts(limit=10)
-    platforms = analyze_platform_performance()
-    patterns = analyze_content_patterns()
-    signals = generate_optimization_signals()
+    try:
+        analytics = get_analytics()
+    except Exception as e:
+        logger.error("performance dashboard error: %s", e)
+        return {"success": False, "error": f"Database error: {e}"}
+    platforms = analyze_platform_performance(analytics)
+    patterns = analyze_content_patterns(analytics)
+    signals = generate_optimization_signals(analytics)
 
     # Also pull publish event counts from analytics
     publish_stats = {"attempted": 0, "succeeded": 0, "failed": 0}
@@ -370,7 +495,9 @@ def get_performance_dashboard(days: int = 30) -> dict:
         "success": True,
         "days": days,
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "top_posts": top.get("posts", []),
+        "top_posts": analytics["top_posts"][:10],
+        "scored_posts": analytics["post_count"],
+        "score_percentiles": analytics["score_percentiles"],
         "platform_performance": platforms.get("platforms", {}),
         "best_platform": platforms.get("best_platform"),
         "content_patterns": patterns.get("patterns", {}),
@@ -12,6 +12,13 @@ Reward tiers:
     3 referrals  → SEO Starter Kit (lead magnet)
     10 referrals → Priority AI visibility report
     25 referrals → Featured in newsletter
+
+Besides one item per referrer, the table holds two kinds of index items:
+    code#<ref_code>  → referrer_id, so track_referral() is a key lookup
+    __leaderboard__  → the top LEADERBOARD_SIZE referrers, kept sorted and
+                       updated on every tracked referral (optimistic
+                       locking on a version number)
+Referral counts are atomic ADD counters.
 """
 
 import hashlib
@@ -20,7 +27,7 @@ import os
 import uuid
 from datetime import datetime, timezone
 
-import boto3
+from aws_clients import get_resource
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +36,10 @@ AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
 BASE_URL = "https://ai1stseo.com"
 
+LEADERBOARD_KEY = "__leaderboard__"
+LEADERBOARD_SIZE = 200
+CODE_PREFIX = "code#"
+
 REWARD_TIERS = [
     {"threshold": 3, "reward": "seo_starter_kit", "label": "SEO Starter Kit download"},
     {"threshold": 10, "reward": "priority_report", "label": "Priority AI visibility report"},
@@ -41,13 +52,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(REF_TABLE)
+        _table = get_resource("dynamodb", AWS_REGION).Table(REF_TABLE)
     return _table
 
 
 def init_referral_table() -> None:
     """Create the referrals table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(REF_TABLE)
         table.load()
@@ -91,6 +102,7 @@ def generate_referral_link(user_id: str) -> dict:
                 "rewards_earned": [],
                 "created_at": now,
             })
+            _get_table().put_item(Item=_code_item(ref_code, user_id))
     except Exception as e:
         logger.warning("Referral upsert failed: %s", e)
 
@@ -102,48 +114,118 @@ def generate_referral_link(user_id: str) -> dict:
     }
 
 
+def ensure_referral_links(user_ids: list) -> dict:
+    """Bulk generate_referral_link(): create referrer records that don't exist yet.
+
+    Existing records are looked up with BatchGetItem (100 keys per request)
+    and left untouched; missing ones are written with batched puts.
+    """
+    user_ids = list(dict.fromkeys(u for u in user_ids if u))
+    if not user_ids:
+        return {"success": True, "created": 0}
+    try:
+        dynamodb = get_resource("dynamodb", AWS_REGION)
+        existing = set()
+        for i in range(0, len(user_ids), 100):
+            request = {REF_TABLE: {
+                "Keys": [{"referrer_id": u} for u in user_ids[i:i + 100]],
+                "ProjectionExpression": "referrer_id",
+            }}
+            while request:
+                resp = dynamodb.batch_get_item(RequestItems=request)
+                existing.update(r["referrer_id"] for r in resp.get("Responses", {}).get(REF_TABLE, []))
+                request = resp.get("UnprocessedKeys") or None
+
+        now = datetime.now(timezone.utc).isoformat()
+        missing = [u for u in user_ids if u not in existing]
+        with _get_table().batch_writer() as batch:
+            for user_id in missing:
+                ref_code = hashlib.md5(user_id.encode()).hexdigest()[:8]
+                batch.put_item(Item={
+                    "referrer_id": user_id,
+                    "ref_code": ref_code,
+                    "referral_count": 0,
+                    "referrals": [],
+                    "rewards_earned": [],
+                    "created_at": now,
+                })
+                batch.put_item(Item=_code_item(ref_code, user_id))
+        return {"success": True, "created": len(missing)}
+    except Exception as e:
+        logger.warning("Bulk referral upsert failed: %s", e)
+        return {"success": False, "error": str(e), "created": 0}
+
+
+def _code_item(ref_code: str, user_id: str) -> dict:
+    return {"referrer_id": CODE_PREFIX + ref_code, "user_id": user_id}
+
+
+def _conditional_failed(exc) -> bool:
+    code = getattr(exc, "response", {}).get("Error", {}).get("Code", "")
+    return code == "ConditionalCheckFailedException" or "ConditionalCheckFailed" in type(exc).__name__
+
+
+def _find_referrer_id(ref_code: str):
+    """Resolve a ref_code via its code# index item.
+
+    Referrers created before the index existed are found with a scan
+    once, and their index item is written so the next lookup is direct.
+    """
+    item = _get_table().get_item(Key={"referrer_id": CODE_PREFIX + ref_code}).get("Item")
+    if item:
+        return item["user_id"]
+    params = {
+        "FilterExpression": "ref_code = :c",
+        "ExpressionAttributeValues": {":c": ref_code},
+        "ProjectionExpression": "referrer_id",
+    }
+    while True:
+        resp = _get_table().scan(**params)
+        for found in resp.get("Items", []):
+            _get_table().put_item(Item=_code_item(ref_code, found["referrer_id"]))
+            return found["referrer_id"]
+        if not resp.get("LastEvaluatedKey"):
+            return None
+        params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
 def track_referral(ref_code: str, new_user_email: str) -> dict:
     """Track a successful referral conversion.
 
-    Called when a new subscriber signs up with a ref= parameter.
+    Called when a new subscriber signs up with a ref= parameter. The count
+    is an atomic ADD guarded by a condition on the referrals list, so
+    concurrent sign-ups are neither lost nor double-counted.
     """
     if not ref_code or not new_user_email:
         return {"success": False, "error": "ref_code and new_user_email required"}
 
-    # Find referrer by ref_code
     try:
-        resp = _get_table().scan()
-        items = resp.get("Items", [])
-        referrer = None
-        for item in items:
-            if item.get("ref_code") == ref_code:
-                referrer = item
-                break
-
-        if not referrer:
+        referrer_id = _find_referrer_id(ref_code)
+        if not referrer_id:
             return {"success": False, "error": "Invalid referral code"}
 
-        referrer_id = referrer["referrer_id"]
-        current_referrals = referrer.get("referrals", [])
-
-        # Prevent duplicate tracking
-        if new_user_email in current_referrals:
-            return {"success": True, "duplicate": True, "referrer_id": referrer_id}
+        try:
+            updated = _get_table().update_item(
+                Key={"referrer_id": referrer_id},
+                UpdateExpression="ADD referral_count :one SET referrals = list_append(if_not_exists(referrals, :empty), :new)",
+                ConditionExpression="attribute_exists(referrer_id) AND NOT contains(referrals, :email)",
+                ExpressionAttributeValues={
+                    ":one": 1, ":empty": [], ":new": [new_user_email], ":email": new_user_email,
+                },
+                ReturnValues="ALL_NEW",
+            )["Attributes"]
+        except Exception as e:
+            if _conditional_failed(e):
+                # Prevent duplicate tracking
+                return {"success": True, "duplicate": True, "referrer_id": referrer_id}
+            raise
 
-        new_count = int(referrer.get("referral_count", 0)) + 1
-        current_referrals.append(new_user_email)
-
-        _get_table().update_item(
-            Key={"referrer_id": referrer_id},
-            UpdateExpression="SET referral_count = :c, referrals = :r",
-            ExpressionAttributeValues={
-                ":c": new_count,
-                ":r": current_referrals,
-            },
-        )
+        new_count = int(updated.get("referral_count", 0))
+        rewards = list(updated.get("rewards_earned", []))
 
         # Check reward thresholds
-        new_rewards = _check_rewards(referrer_id, new_count, referrer.get("rewards_earned", []))
+        new_rewards = _check_rewards(referrer_id, new_count, rewards)
+        _update_leaderboard(referrer_id, new_count, rewards)
 
         # Track analytics
         try:
@@ -222,22 +304,113 @@ def _next_reward(current_count: int) -> dict | None:
     return None
 
 
+# ---------------------------------------------------------------------------
+# Counts & leaderboard
+# ---------------------------------------------------------------------------
+
+def get_referral_counts(user_ids: list) -> dict:
+    """Referral counts for many users at once: {user_id: count} (BatchGetItem, 100 per request).
+
+    Users without a referrer record are omitted.
+    """
+    user_ids = list(dict.fromkeys(u for u in user_ids if u))
+    counts = {}
+    dynamodb = get_resource("dynamodb", AWS_REGION)
+    for i in range(0, len(user_ids), 100):
+        request = {REF_TABLE: {
+            "Keys": [{"referrer_id": u} for u in user_ids[i:i + 100]],
+            "ProjectionExpression": "referrer_id, referral_count",
+        }}
+        while request:
+            resp = dynamodb.batch_get_item(RequestItems=request)
+            for item in resp.get("Responses", {}).get(REF_TABLE, []):
+                counts[item["referrer_id"]] = int(item.get("referral_count", 0))
+            request = resp.get("UnprocessedKeys") or None
+    return counts
+
+
+def _leaderboard_entries(entries: list, referrer_id: str, count: int, rewards: list) -> list:
+    entries = [e for e in entries if e["referrer_id"] != referrer_id]
+    entries.append({"referrer_id": referrer_id, "count": count, "rewards": rewards})
+    entries.sort(key=lambda e: int(e["count"]), reverse=True)
+    return entries[:LEADERBOARD_SIZE]
+
+
+def _update_leaderboard(referrer_id: str, count: int, rewards: list, retries: int = 5) -> None:
+    """Fold a new count into the materialized top-K (compare-and-swap on version)."""
+    table = _get_table()
+    for _ in range(retries):
+        item = table.get_item(Key={"referrer_id": LEADERBOARD_KEY}, ConsistentRead=True).get("Item")
+        if item is None:
+            rebuild_leaderboard()
+            return
+        entries = item.get("entries", [])
+        floor = int(entries[-1]["count"]) if len(entries) >= LEADERBOARD_SIZE else -1
+        if count <= floor and not any(e["referrer_id"] == referrer_id for e in entries):
+            return
+        version = int(item.get("version", 0))
+        try:
+            table.put_item(
+                Item={
+                    "referrer_id": LEADERBOARD_KEY,
+                    "entries": _leaderboard_entries(entries, referrer_id, count, rewards),
+                    "version": version + 1,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                },
+                ConditionExpression="version = :v",
+                ExpressionAttributeValues={":v": version},
+            )
+            return
+        except Exception as e:
+            if not _conditional_failed(e):
+                logger.warning("Leaderboard update failed: %s", e)
+                return
+    logger.warning("Leaderboard update for %s gave up after %d conflicts", referrer_id, retries)
+
+
+def rebuild_leaderboard() -> list:
+    """Recompute the top-K item from a full scan (first use, or repair)."""
+    table = _get_table()
+    params = {
+        "ProjectionExpression": "referrer_id, referral_count, rewards_earned",
+    }
+    entries = []
+    while True:
+        resp = table.scan(**params)
+        for i in resp.get("Items", []):
+            rid = i["referrer_id"]
+            if rid == LEADERBOARD_KEY or rid.startswith(CODE_PREFIX):
+                continue
+            entries.append({"referrer_id": rid, "count": int(i.get("referral_count", 0)),
+                            "rewards": i.get("rewards_earned", [])})
+        if not resp.get("LastEvaluatedKey"):
+            break
+        params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    entries.sort(key=lambda e: e["count"], reverse=True)
+    entries = entries[:LEADERBOARD_SIZE]
+    table.put_item(Item={
+        "referrer_id": LEADERBOARD_KEY,
+        "entries": entries,
+        "version": 0,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    })
+    return entries
+
+
 def get_leaderboard(limit: int = 10) -> dict:
-    """Get top referrers."""
+    """Get top referrers (reads the materialized leaderboard item)."""
     try:
-        resp = _get_table().scan()
-        items = resp.get("Items", [])
-        items.sort(key=lambda x: int(x.get("referral_count", 0)), reverse=True)
-        top = items[:limit]
+        item = _get_table().get_item(Key={"referrer_id": LEADERBOARD_KEY}).get("Item")
+        entries = item.get("entries", []) if item else rebuild_leaderboard()
         return {
             "success": True,
             "leaderboard": [
                 {
-                    "referrer_id": i["referrer_id"],
-                    "count": int(i.get("referral_count", 0)),
-                    "rewards": i.get("rewards_earned", []),
+                    "referrer_id": e["referrer_id"],
+                    "count": int(e.get("count", 0)),
+                    "rewards": e.get("rewards", []),
                 }
-                for i in top
+                for e in entries[:limit]
             ],
         }
     except Exception as e:
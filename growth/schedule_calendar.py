@@ -0,0 +1,250 @@
+"""
+growth/schedule_calendar.py
+Scheduling calendar index — which time slots are taken, per platform and day.
+
+The content pipeline used to read every post to find taken slots, then
+looked for a free one today or tomorrow, item by item, giving up when
+both days were full. This index keeps, per day, a string set of taken
+"HH:MM" slots for each platform, so a run:
+
+    - loads the whole horizon with one BatchGetItem (ScheduleCalendar.load)
+    - assigns slots to a whole batch of posts in one pass, spilling into
+      later days instead of failing (ScheduleCalendar.allocate)
+    - writes back one atomic ADD per touched day (ScheduleCalendar.commit)
+
+social_scheduler_dynamo keeps the index in sync on create/update/delete.
+The first load after deployment rebuilds it from a single posts scan.
+
+DynamoDB table: ai1stseo-schedule-calendar (key: day = YYYY-MM-DD)
+"""
+
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from aws_clients import get_resource
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_TABLE = os.environ.get("GROWTH_CALENDAR_TABLE", "ai1stseo-schedule-calendar")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+DEFAULT_HORIZON_DAYS = 30
+MAX_HORIZON_DAYS = 365
+META_KEY = "__meta__"
+ACTIVE_STATUSES = ("scheduled", "draft")
+
+_table = None
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        _table = get_resource("dynamodb", AWS_REGION).Table(CALENDAR_TABLE)
+    return _table
+
+
+def init_calendar_table() -> None:
+    """Create the calendar table if it doesn't exist."""
+    dynamodb = get_resource("dynamodb", AWS_REGION)
+    try:
+        table = dynamodb.Table(CALENDAR_TABLE)
+        table.load()
+    except dynamodb.meta.client.exceptions.ResourceNotFoundException:
+        dynamodb.create_table(
+            TableName=CALENDAR_TABLE,
+            KeySchema=[{"AttributeName": "day", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "day", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info("Calendar table %s created", CALENDAR_TABLE)
+    except Exception as e:
+        logger.warning("Calendar table init: %s", e)
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+def post_slots(post: dict) -> list:
+    """(platform, day, "HH:MM") entries a post occupies; none unless scheduled/draft."""
+    if post.get("status") not in ACTIVE_STATUSES:
+        return []
+    day, _, hhmm = str(post.get("scheduled_datetime", "")).partition(" ")
+    if not day or not hhmm:
+        return []
+    platforms = [p.strip().lower() for p in str(post.get("platforms", "")).split(",") if p.strip()]
+    return [(p, day, hhmm[:5]) for p in platforms]
+
+
+def _apply(entries: list, op: str) -> None:
+    """ADD or DELETE slot entries, one update per touched day."""
+    by_day = defaultdict(lambda: defaultdict(set))
+    for platform, day, hhmm in entries:
+        by_day[day][platform].add(hhmm)
+    table = _get_table()
+    for day, platforms in by_day.items():
+        names, values, parts = {}, {}, []
+        for i, (platform, slots) in enumerate(platforms.items()):
+            names[f"#p{i}"] = platform
+            values[f":s{i}"] = slots
+            parts.append(f"#p{i} :s{i}")
+        table.update_item(
+            Key={"day": day},
+            UpdateExpression=f"{op} " + ", ".join(parts),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+
+
+def mark_taken(entries: list) -> None:
+    """Record (platform, day, "HH:MM") entries as taken. Failures are logged, not raised."""
+    if not entries:
+        return
+    try:
+        _apply(entries, "ADD")
+    except Exception as e:
+        logger.warning("Calendar mark failed: %s", e)
+
+
+def release(entries: list) -> None:
+    """Free (platform, day, "HH:MM") entries."""
+    if not entries:
+        return
+    try:
+        _apply(entries, "DELETE")
+    except Exception as e:
+        logger.warning("Calendar release failed: %s", e)
+
+
+def rebuild_calendar() -> int:
+    """Rebuild the index from one scan of the posts table. Returns slots indexed."""
+    from growth.social_scheduler_dynamo import get_posts
+
+    result = get_posts()
+    if not result.get("success"):
+        raise RuntimeError(result.get("error", "Failed to read posts"))
+    entries = [e for post in result.get("posts", []) for e in post_slots(post)]
+
+    table = _get_table()
+    by_day = defaultdict(lambda: defaultdict(set))
+    for platform, day, hhmm in entries:
+        by_day[day][platform].add(hhmm)
+    stale = []
+    params = {"ProjectionExpression": "#d", "ExpressionAttributeNames": {"#d": "day"}}
+    while True:
+        resp = table.scan(**params)
+        stale.extend(i["day"] for i in resp.get("Items", []) if i["day"] not in by_day)
+        if not resp.get("LastEvaluatedKey"):
+            break
+        params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    with table.batch_writer() as batch:
+        for day in stale:
+            if day != META_KEY:
+                batch.delete_item(Key={"day": day})
+        for day, platforms in by_day.items():
+            batch.put_item(Item={"day": day, **{p: s for p, s in platforms.items()}})
+        batch.put_item(Item={"day": META_KEY, "rebuilt_at": datetime.now(timezone.utc).isoformat()})
+    logger.info("Calendar rebuilt: %d slots over %d days", len(entries), len(by_day))
+    return len(entries)
+
+
+# ---------------------------------------------------------------------------
+# Batch allocation
+# ---------------------------------------------------------------------------
+
+class ScheduleCalendar:
+    """Taken-slot bitmaps per platform over a rolling horizon of days.
+
+    Usage:
+        cal = ScheduleCalendar(SCHEDULE_SLOTS, start=tomorrow)
+        cal.load()
+        slots = cal.allocate(["x", "x", "linkedin", ...])  # one pass
+        ...create the posts...
+        cal.commit()
+    """
+
+    def __init__(self, slots: dict, start: datetime, horizon_days: int = DEFAULT_HORIZON_DAYS,
+                 default_slots: list = None):
+        self.slots = {p: sorted(s) for p, s in slots.items()}
+        self.default_slots = default_slots or ["12:00"]
+        self.start = datetime(start.year, start.month, start.day)
+        self.horizon_days = horizon_days
+        self._taken = defaultdict(dict)   # platform -> day index -> bitmask
+        self._raw = {}                    # day -> {platform: set of HH:MM}
+        self._pending = []
+        self._loaded_days = 0
+
+    def _day(self, i: int) -> str:
+        return (self.start + timedelta(days=i)).strftime("%Y-%m-%d")
+
+    def _slots_for(self, platform: str) -> list:
+        return self.slots.get(platform, self.default_slots)
+
+    def load(self, days: int = None) -> "ScheduleCalendar":
+        """Read the horizon in BatchGetItem calls of 100 days (rebuilding the index on first use)."""
+        days = min(days or self.horizon_days, MAX_HORIZON_DAYS)
+        dynamodb = get_resource("dynamodb", AWS_REGION)
+        table = _get_table()
+        if self._loaded_days == 0 and not table.get_item(Key={"day": META_KEY}).get("Item"):
+            rebuild_calendar()
+        keys = [self._day(i) for i in range(self._loaded_days, days)]
+        for i in range(0, len(keys), 100):
+            request = {CALENDAR_TABLE: {"Keys": [{"day": d} for d in keys[i:i + 100]]}}
+            while request:
+                resp = dynamodb.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(CALENDAR_TABLE, []):
+                    day = item.pop("day")
+                    self._raw[day] = {p: set(v) for p, v in item.items() if isinstance(v, (set, frozenset))}
+                request = resp.get("UnprocessedKeys") or None
+        self._loaded_days = max(self._loaded_days, days)
+        return self
+
+    def _mask(self, platform: str, i: int) -> int:
+        masks = self._taken[platform]
+        if i not in masks:
+            taken = self._raw.get(self._day(i), {}).get(platform, set())
+            masks[i] = sum(1 << b for b, s in enumerate(self._slots_for(platform)) if s in taken)
+        return masks[i]
+
+    def allocate(self, platforms: list) -> list:
+        """Assign the earliest free slot to each requested platform, in order.
+
+        Returns "YYYY-MM-DD HH:MM" per request. Days past the loaded
+        horizon are loaded on demand, so crowded days spill forward
+        instead of failing; None only beyond MAX_HORIZON_DAYS.
+        """
+        cursor = {}  # platform -> first day index that may still have room
+        out = []
+        for platform in platforms:
+            slots = self._slots_for(platform)
+            full = (1 << len(slots)) - 1
+            i = cursor.get(platform, 0)
+            while True:
+                if i >= self._loaded_days:
+                    if self._loaded_days >= MAX_HORIZON_DAYS:
+                        out.append(None)
+                        break
+                    self.load(min(self._loaded_days * 2 or DEFAULT_HORIZON_DAYS, MAX_HORIZON_DAYS))
+                mask = self._mask(platform, i)
+                if mask != full:
+                    bit = (~mask & (mask + 1)).bit_length() - 1  # lowest free slot
+                    self._taken[platform][i] = mask | (1 << bit)
+                    day = self._day(i)
+                    self._pending.append((platform, day, slots[bit]))
+                    out.append(f"{day} {slots[bit]}")
+                    break
+                i += 1
+            cursor[platform] = i
+        return out
+
+    def discard(self) -> None:
+        """Forget allocations whose posts were not created."""
+        self._pending = []
+
+    def commit(self) -> int:
+        """Write the allocated slots back (one atomic ADD per touched day)."""
+        pending, self._pending = self._pending, []
+        mark_taken(pending)
+        return len(pending)
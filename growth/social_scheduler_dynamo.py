@@ -19,9 +19,10 @@ import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
 
-import boto3
 from boto3.dynamodb.conditions import Attr
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 TABLE_NAME = os.environ.get("GROWTH_SOCIAL_TABLE", "ai1stseo-social-posts")
@@ -33,13 +34,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(TABLE_NAME)
+        _table = get_resource("dynamodb", AWS_REGION).Table(TABLE_NAME)
     return _table
 
 
 def init_social_table() -> None:
     """Create the DynamoDB social posts table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(TABLE_NAME)
         table.load()
@@ -99,12 +100,56 @@ def create_post(
     try:
         _get_table().put_item(Item=item)
         logger.info("create_post: id=%s platforms=%s", post_id, item["platforms"])
+        _calendar("mark_taken", [item])
         return {"success": True, "status": "success", "id": post_id, "post": item}
     except Exception as e:
         logger.error("create_post error: %s", e)
         return {"success": False, "error": f"Database error: {e}"}
 
 
+def create_posts(posts: list, index_calendar: bool = True) -> dict:
+    """Create many scheduled posts with batched writes.
+
+    Each entry: {"content", "platforms", "scheduled_date", "scheduled_time",
+    optional "status"}. Pass index_calendar=False when the caller commits
+    the slots itself (ScheduleCalendar.commit).
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    items = []
+    for p in posts:
+        platforms = p["platforms"]
+        items.append({
+            "post_id": str(uuid.uuid4())[:12],
+            "content": p["content"].strip(),
+            "platforms": ", ".join(platforms) if isinstance(platforms, list) else str(platforms),
+            "scheduled_datetime": f"{p['scheduled_date']} {p['scheduled_time']}",
+            "status": p.get("status", "scheduled"),
+            "created_at": now,
+        })
+    if not items:
+        return {"success": True, "ids": [], "count": 0}
+    try:
+        with _get_table().batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        logger.info("create_posts: %d posts", len(items))
+        if index_calendar:
+            _calendar("mark_taken", items)
+        return {"success": True, "ids": [i["post_id"] for i in items], "count": len(items)}
+    except Exception as e:
+        logger.error("create_posts error: %s", e)
+        return {"success": False, "error": f"Database error: {e}", "ids": []}
+
+
+def _calendar(op: str, posts: list) -> None:
+    """Keep the schedule calendar index in step with post writes (best effort)."""
+    try:
+        from growth import schedule_calendar
+        getattr(schedule_calendar, op)([e for p in posts for e in schedule_calendar.post_slots(p)])
+    except Exception as e:
+        logger.warning("calendar %s failed: %s", op, e)
+
+
 def get_posts() -> dict:
     """Get all scheduled posts ordered by scheduled_datetime."""
     try:
@@ -157,6 +202,9 @@ def update_post(post_id: str, updates: dict) -> dict:
             ExpressionAttributeValues=expr_values,
         )
         logger.info("update_post: id=%s", post_id)
+        if {"scheduled_datetime", "status", "platforms"} & set(updates):
+            _calendar("release", [resp["Item"]])
+            _calendar("mark_taken", [{**resp["Item"], **updates}])
         return {"success": True, "status": "success"}
     except Exception as e:
         logger.error("update_post error: %s", e)
@@ -172,6 +220,7 @@ def delete_post(post_id: str) -> dict:
 
         _get_table().delete_item(Key={"post_id": post_id})
         logger.info("delete_post: id=%s", post_id)
+        _calendar("release", [resp["Item"]])
         return {"success": True, "status": "success"}
     except Exception as e:
         logger.error("delete_post error: %s", e)
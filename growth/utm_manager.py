@@ -19,9 +19,10 @@ import uuid
 from datetime import datetime, timezone
 from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
 
-import boto3
 from boto3.dynamodb.conditions import Key
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 TABLE_NAME = os.environ.get("GROWTH_UTM_TABLE", "ai1stseo-utm-campaigns")
@@ -33,13 +34,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(TABLE_NAME)
+        _table = get_resource("dynamodb", AWS_REGION).Table(TABLE_NAME)
     return _table
 
 
 def init_utm_table() -> None:
     """Create the DynamoDB UTM campaigns table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(TABLE_NAME)
         table.load()
@@ -0,0 +1,452 @@
+"""
+job_scheduler.py
+Leader-elected background job scheduler shared by every scheduled subsystem.
+
+Gunicorn runs several workers per instance and each one imports the app, so
+a naive scheduler thread fires every job once per worker. Here every worker
+starts the loop, but only the holder of the scheduler lease runs jobs:
+
+  - DynamoDB lease (ai1stseo-scheduler-leases) — conditional write on
+    lease_name, renewed every LEASE_TTL/3, so exactly one worker across
+    all instances is leader; a dead leader's lease expires after LEASE_TTL
+  - File lock (fcntl) when DynamoDB is unavailable — one leader per host
+
+Jobs are registered with an interval and a jitter fraction. Each job gets a
+random phase within ``jitter * interval`` and then runs on a fixed grid
+(phase + k * interval), so runs never drift and many per-brand jobs with
+the same interval are spread out instead of firing together. Due jobs run
+on a bounded worker pool; a job is never run concurrently with itself and
+missed slots are skipped rather than replayed.
+
+The leader publishes every run (DynamoDB item or a JSON file under
+SCHEDULER_STATE_DIR). A worker that becomes leader adopts each job's
+published schedule, so a failover or restart continues where the old
+leader stopped instead of running every job at once.
+"""
+
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+IS_LAMBDA = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
+LOCK_DIR = os.environ.get('SCHEDULER_STATE_DIR') or (
+    '/tmp' if IS_LAMBDA else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
+LEASE_TABLE = os.environ.get('SCHEDULER_LEASE_TABLE', 'ai1stseo-scheduler-leases')
+LEASE_NAME = 'bg-scheduler'
+LEASE_TTL = int(os.environ.get('SCHEDULER_LEASE_TTL', '90'))
+MAX_WORKERS = int(os.environ.get('SCHEDULER_MAX_WORKERS', '4'))
+STARTUP_DELAY = int(os.environ.get('SCHEDULER_STARTUP_DELAY', '60'))
+TICK = 5  # seconds between due-job checks
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if not ts:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+# ── Leader lease ──────────────────────────────────────────────────────────── #
+
+class LeaderLease:
+    """Leader election — DynamoDB conditional-write lease, file lock fallback."""
+
+    def __init__(self, name: str = LEASE_NAME, ttl: int = LEASE_TTL):
+        self.name = name
+        self.ttl = ttl
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.backend = None
+        self._table = None
+        self._lock_file = None
+        self._held = False
+        self._publish_lock = threading.Lock()
+        try:
+            from aws_clients import get_resource
+            table = get_resource('dynamodb', 'us-east-1').Table(LEASE_TABLE)
+            table.load()
+            self._table = table
+            self.backend = 'dynamodb'
+        except Exception as e:
+            logger.info("Scheduler lease table unavailable (%s), using local file lock", str(e)[:120])
+            self.backend = 'file' if HAS_FCNTL else 'none'
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    def acquire(self) -> bool:
+        """Acquire or renew the lease. Returns True while this process is leader."""
+        if self.backend == 'dynamodb':
+            self._held = self._acquire_dynamo()
+        elif self.backend == 'file':
+            self._held = self._held or self._acquire_file()
+        else:
+            # No coordination available — behave like the old per-process scheduler
+            self._held = True
+        return self._held
+
+    def _acquire_dynamo(self) -> bool:
+        now = time.time()
+        try:
+            self._table.put_item(
+                Item={
+                    'lease_name': self.name,
+                    'owner': self.owner,
+                    'expires_at': int(now + self.ttl),
+                    'renewed_at': _iso(now),
+                },
+                ConditionExpression='attribute_not_exists(lease_name) OR expires_at < :now OR #o = :me',
+                ExpressionAttributeNames={'#o': 'owner'},
+                ExpressionAttributeValues={':now': int(now), ':me': self.owner},
+            )
+            if not self._held:
+                logger.info("Scheduler lease acquired by %s", self.owner)
+            return True
+        except Exception as e:
+            if 'ConditionalCheckFailed' not in str(e):
+                logger.warning("Scheduler lease renew failed: %s", str(e)[:200])
+            if self._held:
+                logger.warning("Scheduler lease lost by %s", self.owner)
+            return False
+
+    def _acquire_file(self) -> bool:
+        try:
+            os.makedirs(LOCK_DIR, exist_ok=True)
+            fh = open(os.path.join(LOCK_DIR, f'.{self.name}.lock'), 'a')
+        except OSError as e:
+            logger.warning("Scheduler lock file unavailable: %s", e)
+            return False
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self._lock_file = fh  # held for the life of the process; the OS releases it on exit
+        logger.info("Scheduler file lock acquired by %s", self.owner)
+        return True
+
+    def release(self):
+        if self.backend == 'dynamodb' and self._held:
+            try:
+                self._table.delete_item(
+                    Key={'lease_name': self.name},
+                    ConditionExpression='#o = :me',
+                    ExpressionAttributeNames={'#o': 'owner'},
+                    ExpressionAttributeValues={':me': self.owner},
+                )
+            except Exception:
+                pass
+        if self._lock_file:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_file.close()
+            except Exception:
+                pass
+            self._lock_file = None
+        self._held = False
+
+    # ── published job status ──
+    # Only the leader runs jobs, so it publishes each run where every worker
+    # can read it — the status endpoint is served by whichever worker gets it.
+
+    def _status_path(self) -> str:
+        return os.path.join(LOCK_DIR, f'.{self.name}.jobs.json')
+
+    def publish(self, job: Dict):
+        try:
+            if self.backend == 'dynamodb':
+                item = {k: Decimal(str(v)) if isinstance(v, float) else v
+                        for k, v in job.items() if v is not None}
+                self._table.put_item(Item={**item, 'lease_name': f'{self.name}#job#{job["name"]}'})
+            elif self.backend == 'file':
+                with self._publish_lock:
+                    jobs = self.published()
+                    jobs[job['name']] = job
+                    tmp = self._status_path() + '.tmp'
+                    with open(tmp, 'w') as fh:
+                        json.dump(jobs, fh)
+                    os.replace(tmp, self._status_path())
+        except Exception as e:
+            logger.debug("Scheduler job status publish failed: %s", e)
+
+    def published(self) -> Dict[str, Dict]:
+        try:
+            if self.backend == 'dynamodb':
+                from boto3.dynamodb.conditions import Attr
+                prefix = f'{self.name}#job#'
+                items = self._table.scan(FilterExpression=Attr('lease_name').begins_with(prefix)).get('Items', [])
+                return {i['name']: {k: (int(v) if v % 1 == 0 else float(v)) if isinstance(v, Decimal) else v
+                                    for k, v in i.items() if k != 'lease_name'} for i in items}
+            if self.backend == 'file' and os.path.exists(self._status_path()):
+                with open(self._status_path()) as fh:
+                    return json.load(fh)
+        except Exception as e:
+            logger.debug("Scheduler job status read failed: %s", e)
+        return {}
+
+
+# ── Jobs ──────────────────────────────────────────────────────────────────── #
+
+class Job:
+    """A recurring job on a fixed, jittered grid."""
+
+    def __init__(self, name: str, fn: Callable, interval: float, jitter: float = 0.1,
+                 initial_delay: float = 0, group: str = None):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.group = group or name
+        phase = random.uniform(0, max(0.0, jitter) * interval)
+        self.anchor = time.time() + initial_delay + phase
+        self.next_run = self.anchor
+        self.running = False
+        self.last_run = None
+        self.last_duration = None
+        self.last_status = None
+        self.last_error = None
+        self.run_count = 0
+
+    def schedule_next(self, now: float):
+        """Next grid slot strictly after ``now`` — overruns skip slots instead of drifting."""
+        slots = int((now - self.anchor) // self.interval) + 1
+        self.next_run = self.anchor + max(1, slots) * self.interval
+
+    def adopt(self, rec: Dict, not_before: float = 0):
+        """Continue from the schedule another leader published for this job."""
+        try:
+            next_run = datetime.fromisoformat(rec['next_run']).timestamp() if rec.get('next_run') else None
+            last_run = datetime.fromisoformat(rec['last_run']).timestamp() if rec.get('last_run') else None
+        except (TypeError, ValueError):
+            return
+        if last_run and (self.last_run is None or last_run > self.last_run):
+            self.last_run = last_run
+            self.last_duration = rec.get('last_duration_seconds')
+            self.last_status = rec.get('last_status')
+            self.last_error = rec.get('last_error')
+            self.run_count = max(self.run_count, int(rec.get('run_count') or 0))
+        if next_run and not self.running:
+            # Re-anchor on the published grid. A slot the old leader missed is due now,
+            # but never earlier than ``not_before`` (this process's startup delay).
+            self.anchor = next_run
+            self.next_run = max(next_run, not_before)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'group': self.group,
+            'interval_seconds': self.interval,
+            'next_run': _iso(self.next_run),
+            'last_run': _iso(self.last_run),
+            'last_duration_seconds': self.last_duration,
+            'last_status': self.last_status,
+            'last_error': self.last_error,
+            'running': self.running,
+            'run_count': self.run_count,
+        }
+
+
+class JobScheduler:
+    """Runs registered jobs on a bounded pool, only while holding the leader lease."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, startup_delay: int = STARTUP_DELAY):
+        self.max_workers = max_workers
+        self.startup_delay = startup_delay
+        self._jobs: Dict[str, Job] = {}
+        self._published: Dict[str, Dict] = {}   # job records as of taking the lease, kept current
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = None
+        self.lease = None
+        self.started_at = None
+
+    # ── registration ──
+
+    def register(self, name: str, fn: Callable, interval: float, jitter: float = 0.1,
+                 initial_delay: float = None, group: str = None) -> Job:
+        """Add or replace a job. Re-registering keeps its schedule and history.
+
+        On the leader, a job registered after the lease was taken (e.g. the
+        per-brand jobs the sync jobs add) continues from its published
+        schedule too, instead of starting on a fresh random phase.
+        """
+        with self._lock:
+            existing = self._jobs.get(name)
+            if existing and existing.interval == interval:
+                existing.fn = fn
+                return existing
+            job = Job(name, fn, interval, jitter=jitter,
+                      initial_delay=self.startup_delay if initial_delay is None else initial_delay,
+                      group=group)
+            if self.lease is not None and self.lease.held and name in self._published:
+                job.adopt(self._published[name], self._not_before())
+            self._jobs[name] = job
+            return job
+
+    def unregister(self, name: str) -> bool:
+        with self._lock:
+            return self._jobs.pop(name, None) is not None
+
+    def unregister_group(self, group: str, keep: List[str] = ()) -> int:
+        """Remove every job in ``group`` except ``keep``; returns how many were removed."""
+        with self._lock:
+            stale = [n for n, j in self._jobs.items() if j.group == group and n not in keep]
+            for n in stale:
+                del self._jobs[n]
+            return len(stale)
+
+    def jobs(self, group: str = None) -> List[Job]:
+        with self._lock:
+            return [j for j in self._jobs.values() if group is None or j.group == group]
+
+    # ── lifecycle ──
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self.lease = LeaderLease()
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bg-job')
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._loop, daemon=True, name='bg-scheduler')
+            self._thread.start()
+        logger.info("Job scheduler started (lease backend: %s, workers: %d)",
+                    self.lease.backend, self.max_workers)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=TICK * 2)
+        if self._pool:
+            self._pool.shutdown(wait=False)
+        if self.lease:
+            self.lease.release()
+
+    def run_now(self, name: str) -> bool:
+        """Queue a job immediately (still subject to the leader lease)."""
+        with self._lock:
+            job = self._jobs.get(name)
+            if not job:
+                return False
+            job.next_run = time.time()
+        return True
+
+    # ── loop ──
+
+    def _loop(self):
+        last_renew = 0.0
+        while not self._stop.is_set():
+            now = time.time()
+            if now - last_renew >= self.lease.ttl / 3:
+                was_leader = self.lease.held
+                if self.lease.acquire() and not was_leader:
+                    self._adopt_published()
+                last_renew = now
+            if self.lease.held:
+                self._dispatch_due(now)
+            self._stop.wait(TICK)
+
+    def _adopt_published(self):
+        """On becoming leader, pick up each job's last run and next slot from the old leader."""
+        published = self.lease.published()
+        not_before = self._not_before()
+        with self._lock:
+            self._published = published
+            for job in self._jobs.values():
+                if job.name in published:
+                    job.adopt(published[job.name], not_before)
+        if published:
+            logger.info("Scheduler leader %s resumed %d published job schedules",
+                        self.lease.owner, len(published))
+
+    def _not_before(self) -> float:
+        return (self.started_at or time.time()) + self.startup_delay
+
+    def _dispatch_due(self, now: float):
+        with self._lock:
+            due = [j for j in self._jobs.values() if not j.running and j.next_run <= now]
+            for job in due:
+                job.running = True
+        for job in due:
+            self._pool.submit(self._run_job, job)
+
+    def _run_job(self, job: Job):
+        t0 = time.time()
+        try:
+            job.fn()
+            job.last_status = 'ok'
+            job.last_error = None
+        except Exception as e:
+            job.last_status = 'error'
+            job.last_error = str(e)[:300]
+            logger.error("Scheduled job %s failed: %s", job.name, str(e)[:300])
+        finally:
+            end = time.time()
+            job.last_run = t0
+            job.last_duration = round(end - t0, 2)
+            job.run_count += 1
+            job.schedule_next(end)
+            job.running = False
+            record = job.to_dict()
+            with self._lock:
+                self._published[job.name] = record
+            self.lease.publish(record)
+            logger.info("Scheduled job %s finished in %.1fs (next run %s)",
+                        job.name, job.last_duration, _iso(job.next_run))
+
+    # ── status ──
+
+    def status(self, group: str = None) -> Dict:
+        """Scheduler and job status. Non-leader workers report the leader's published runs."""
+        jobs = {j.name: j.to_dict() for j in self.jobs(group)}
+        if self.lease and not self.lease.held:
+            for name, rec in self.lease.published().items():
+                if name in jobs:
+                    jobs[name].update({k: rec.get(k) for k in (
+                        'next_run', 'last_run', 'last_duration_seconds', 'last_status',
+                        'last_error', 'run_count')})
+        return {
+            'running': self.running,
+            'leader': bool(self.lease and self.lease.held),
+            'lease_backend': self.lease.backend if self.lease else None,
+            'owner': self.lease.owner if self.lease else None,
+            'started_at': _iso(self.started_at),
+            'max_workers': self.max_workers,
+            'jobs': sorted(jobs.values(), key=lambda d: d['next_run'] or ''),
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Process-wide scheduler instance (started lazily by the subsystems that use it)."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = JobScheduler()
+    return _scheduler
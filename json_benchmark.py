@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+json_benchmark.py
+Serialization benchmark for the API response pipeline (fast_json.py).
+
+For every payload it reports:
+
+  - encode time with Flask's stdlib provider vs FastJSONProvider (orjson)
+  - body size raw, gzip and brotli (when installed), with compress time
+  - size after the dashboard projection ?fields=-response_snippet,...
+
+Payloads are the recorded responses in data/*.json plus any --payload
+files or directories, each re-typed the way they come out of the
+database (floats -> Decimal, ISO strings -> datetime, ids -> UUID), plus
+synthetic batch-probe and SoV payloads at production sizes:
+
+    python json_benchmark.py
+    python json_benchmark.py --payload /tmp/recorded --runs 50
+    python json_benchmark.py --json > bench.json
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import fast_json
+from fast_json import FastJSONProvider, compress, parse_fields, project
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD_FIELDS = '-response_snippet,-batch_results,-responses,-raw_response'
+
+
+class StdlibProvider(DefaultJSONProvider):
+    """The encoder app.py used before fast_json (stdlib json + Python default hook)."""
+
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return float(o)
+        if hasattr(o, 'isoformat'):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+def _typed(obj: Any, key: str = '') -> Any:
+    """Re-type a recorded payload the way database rows arrive."""
+    if isinstance(obj, dict):
+        return {k: _typed(v, k) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_typed(v, key) for v in obj]
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    if isinstance(obj, str) and len(obj) >= 19 and obj[4:5] == '-' and obj[10:11] == 'T':
+        try:
+            return datetime.fromisoformat(obj.replace('Z', '+00:00'))
+        except ValueError:
+            return obj
+    if isinstance(obj, str) and key.endswith('id') and len(obj) == 36:
+        try:
+            return uuid.UUID(obj)
+        except ValueError:
+            return obj
+    return obj
+
+
+def _batch_probe_payload(rows: int = 500) -> Dict:
+    rnd = random.Random(7)
+    now = datetime.now(timezone.utc)
+    return {
+        'batch_history': [{
+            'id': uuid.uuid4(), 'brand_name': 'AI1stSEO', 'keyword': f'keyword {i}',
+            'geo_score': Decimal(str(round(rnd.random(), 4))), 'cited_count': rnd.randint(0, 10),
+            'total_prompts': 10, 'created_at': now - timedelta(hours=i),
+            'batch_results': {'results': [{'keyword': f'kw {j}', 'cited': rnd.random() > .5,
+                                           'confidence': Decimal(str(round(rnd.random(), 3)))}
+                                          for j in range(10)]},
+        } for i in range(20)],
+        'stored_results': [{
+            'id': uuid.uuid4(), 'keyword': f'keyword {i % 50}', 'brand_name': 'AI1stSEO',
+            'ai_model': rnd.choice(['nova', 'claude', 'gpt-4o', 'gemini']), 'cited': rnd.random() > .5,
+            'confidence': Decimal(str(round(rnd.random(), 4))), 'sentiment': 'neutral',
+            'probe_timestamp': now - timedelta(minutes=i),
+            'response_snippet': ' '.join(rnd.choice(['seo', 'brand', 'ai', 'search', 'ranking', 'tools'])
+                                         for _ in range(160)),
+        } for i in range(rows)],
+        'db_status': 'ok',
+    }
+
+
+def _sov_payload(keywords: int = 10, prompts: int = 6) -> Dict:
+    rnd = random.Random(11)
+    return {
+        'sov_id': uuid.uuid4(), 'brand': 'AI1stSEO', 'competitors': ['Ahrefs', 'SEMrush', 'Moz'],
+        'sov_summary': {b: Decimal(str(round(rnd.random() * 100, 1))) for b in ('AI1stSEO', 'Ahrefs', 'SEMrush', 'Moz')},
+        'keyword_results': [{
+            'keyword': f'keyword {k}', 'total_prompts': prompts,
+            'mentions': {'AI1stSEO': rnd.randint(0, prompts), 'Ahrefs': rnd.randint(0, prompts)},
+            'responses': [{'prompt': f'best tool for keyword {k} #{p}', 'status': 'ok',
+                           'response': ' '.join(rnd.choice(['Ahrefs', 'Moz', 'is', 'the', 'best', 'tool'])
+                                                for _ in range(130))[:800]}
+                          for p in range(prompts)],
+        } for k in range(keywords)],
+        'timestamp': datetime.now(timezone.utc),
+    }
+
+
+def load_payloads(paths: List[str]) -> List[Tuple[str, Any]]:
+    files = sorted(glob.glob(os.path.join(ROOT, 'data', '*.json')))
+    for p in paths:
+        files.extend(sorted(glob.glob(os.path.join(p, '*.json'))) if os.path.isdir(p) else [p])
+    payloads = []
+    for f in files:
+        try:
+            with open(f, encoding='utf-8') as fh:
+                payloads.append((os.path.basename(f), _typed(json.load(fh))))
+        except (OSError, ValueError) as e:
+            print(f"skip {f}: {e}", file=sys.stderr)
+    payloads.append(('synthetic:geo-probe-history', _batch_probe_payload()))
+    payloads.append(('synthetic:sov-60-responses', _sov_payload()))
+    return payloads
+
+
+def _time(fn, runs: int) -> Tuple[float, Any]:
+    samples, out = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), out
+
+
+def bench(name: str, payload: Any, runs: int) -> Dict:
+    app = Flask(__name__)
+    stdlib, fast = StdlibProvider(app), FastJSONProvider(app)
+    std_ms, std_body = _time(lambda: stdlib.dumps(payload).encode('utf-8'), runs)
+    fast_ms, body = _time(lambda: fast.dumps_bytes(payload), runs)
+    if json.loads(std_body) != json.loads(body):
+        print(f"WARNING {name}: encoders disagree", file=sys.stderr)
+    row = {
+        'payload': name, 'bytes': len(body),
+        'stdlib_ms': round(std_ms, 3), 'fast_ms': round(fast_ms, 3),
+        'speedup': round(std_ms / fast_ms, 1) if fast_ms else None,
+    }
+    gz_ms, gz = _time(lambda: compress(body, 'gzip'), max(1, runs // 5))
+    row.update(gzip_bytes=len(gz), gzip_ms=round(gz_ms, 3))
+    if fast_json.HAS_BROTLI:
+        br_ms, br = _time(lambda: compress(body, 'br'), max(1, runs // 5))
+        row.update(br_bytes=len(br), br_ms=round(br_ms, 3))
+    include, exclude = parse_fields(DASHBOARD_FIELDS)
+    projected = fast.dumps_bytes(project(payload, include, exclude))
+    row['projected_bytes'] = len(projected)
+    row['projected_gzip_bytes'] = len(gzip.compress(projected, compresslevel=fast_json.GZIP_LEVEL))
+    return row
+
+
+def _print_report(rows: List[Dict]):
+    print(f"encoder: {'orjson' if fast_json.HAS_ORJSON else 'stdlib (orjson not installed)'}, "
+          f"brotli: {'yes' if fast_json.HAS_BROTLI else 'no'}")
+    print(f"{'payload':34} {'bytes':>9} {'stdlib ms':>10} {'fast ms':>8} {'x':>5} "
+          f"{'gzip':>8} {'br':>8} {'projected':>10} {'proj+gz':>8}")
+    for r in rows:
+        print(f"{r['payload'][:34]:34} {r['bytes']:>9} {r['stdlib_ms']:>10.3f} {r['fast_ms']:>8.3f} "
+              f"{r['speedup'] or 0:>5.1f} {r['gzip_bytes']:>8} {r.get('br_bytes', '-'):>8} "
+              f"{r['projected_bytes']:>10} {r['projected_gzip_bytes']:>8}")
+    total_std = sum(r['stdlib_ms'] for r in rows)
+    total_fast = sum(r['fast_ms'] for r in rows)
+    raw = sum(r['bytes'] for r in rows)
+    print(f"\ntotal encode {total_std:.2f}ms -> {total_fast:.2f}ms; "
+          f"bytes {raw} -> gzip {sum(r['gzip_bytes'] for r in rows)} "
+          f"-> projected+gzip {sum(r['projected_gzip_bytes'] for r in rows)}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--payload', action='append', default=[],
+                    help='extra recorded JSON file or directory (repeatable)')
+    ap.add_argument('--runs', type=int, default=20, help='encodes per payload (median is reported)')
+    ap.add_argument('--json', action='store_true')
+    args = ap.parse_args(argv)
+
+    rows = [bench(name, payload, args.runs) for name, payload in load_payloads(args.payload)]
+    if args.json:
+        print(json.dumps({'orjson': fast_json.HAS_ORJSON, 'brotli': fast_json.HAS_BROTLI,
+                          'rows': rows}, indent=2))
+    else:
+        _print_report(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+lazy_blueprints.py
+Deferred blueprint registration for app.py.
+
+Most feature modules (Month 3 systems, the Deepthi intelligence APIs,
+growth, social publishing, directory) are only hit by a fraction of
+requests, but importing them at boot pulls in their AI SDKs, boto3 table
+set-up and friends — on every gunicorn worker start and every Lambda cold
+start, even for /api/health.
+
+LazyBlueprints registers each module the first time a request arrives
+under one of its URL prefixes. The request that triggers the load is
+dispatched after registration, so it is served normally; modules that fail
+to import are reported once and their routes 404, as before.
+
+Usage (app.py):
+    lazy = LazyBlueprints(app)
+    lazy.add('growth', ['/api/growth'], 'growth', 'growth_bp')
+    lazy.add('directory', ['/api/directory'], 'directory.routes',
+             register='register_directory_routes')
+
+Set LAZY_BLUEPRINTS=0 to register everything at boot (local debugging,
+system_check.py). Flask refuses setup calls once it has served a request,
+so a late module is registered on a private staging app and its rules,
+views and hooks are copied across through the app's public registries
+(url_map, view_functions, before_request_funcs, ...). Registration takes
+a lock; blueprints that add Jinja filters or tests are not supported.
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+LAZY_ENABLED = os.environ.get('LAZY_BLUEPRINTS', '1').lower() not in ('0', 'false', 'no')
+
+
+class _Entry:
+    __slots__ = ('name', 'prefixes', 'module', 'attr', 'register', 'loaded', 'error', 'load_ms')
+
+    def __init__(self, name, prefixes, module, attr, register):
+        self.name = name
+        self.prefixes = [p.rstrip('/') for p in prefixes]
+        self.module = module
+        self.attr = attr
+        self.register = register
+        self.loaded = False
+        self.error: Optional[str] = None
+        self.load_ms: Optional[float] = None
+
+    def matches(self, path: str) -> bool:
+        for p in self.prefixes:
+            if path == p or path.startswith(p + '/'):
+                return True
+        return False
+
+
+class LazyBlueprints:
+    """Registers blueprints on the first request under their URL prefixes."""
+
+    def __init__(self, app, enabled: bool = LAZY_ENABLED):
+        self.app = app
+        self.enabled = enabled
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        if enabled:
+            app.wsgi_app = self._middleware(app.wsgi_app)
+
+    def add(self, name: str, prefixes: List[str], module: str, attr: str = None,
+            register: str = None):
+        """Declare a module whose blueprint is ``module.attr`` (or set up by ``module.register(app)``).
+
+        ``prefixes`` must cover every route the module adds — requests
+        outside them never trigger the import.
+        """
+        entry = _Entry(name, prefixes, module, attr, register)
+        self._entries[name] = entry
+        if not self.enabled:
+            self._load(entry)
+
+    def _load(self, entry: _Entry):
+        t0 = time.perf_counter()
+        try:
+            mod = importlib.import_module(entry.module)
+            target = Flask(self.app.import_name, static_folder=None) if self.enabled else self.app
+            if entry.register:
+                getattr(mod, entry.register)(target)
+            else:
+                target.register_blueprint(getattr(mod, entry.attr))
+            if target is not self.app:
+                _merge_into(self.app, target)
+        except Exception as e:
+            entry.error = str(e)
+            print(f"⚠ {entry.name}: {e}")
+        entry.loaded = True
+        entry.load_ms = round((time.perf_counter() - t0) * 1000, 1)
+        if not entry.error:
+            logger.info("Loaded %s on demand in %.0fms", entry.name, entry.load_ms)
+
+    def ensure_loaded(self, path: str):
+        """Import every pending module with a prefix matching ``path``."""
+        pending = [e for e in self._entries.values() if not e.loaded and e.matches(path)]
+        if not pending:
+            return
+        with self._lock:
+            for entry in pending:
+                if not entry.loaded:
+                    self._load(entry)
+
+    def load_all(self):
+        """Register everything still pending (e.g. to warm a worker)."""
+        with self._lock:
+            for entry in self._entries.values():
+                if not entry.loaded:
+                    self._load(entry)
+
+    def pending(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return bool(entry and not entry.loaded)
+
+    def status(self) -> Dict[str, Dict]:
+        return {
+            e.name: {'prefixes': e.prefixes, 'loaded': e.loaded and not e.error,
+                     'error': e.error, 'load_ms': e.load_ms}
+            for e in self._entries.values()
+        }
+
+    def _middleware(self, wsgi_app) -> Callable:
+        def lazy_wsgi_app(environ, start_response):
+            self.ensure_loaded(environ.get('PATH_INFO', ''))
+            return wsgi_app(environ, start_response)
+        return lazy_wsgi_app
+
+
+_HOOK_REGISTRIES = ('before_request_funcs', 'after_request_funcs', 'teardown_request_funcs',
+                    'url_value_preprocessors', 'url_default_functions',
+                    'template_context_processors')
+
+
+def _merge_into(app, staging):
+    """Copy what ``staging`` picked up from registration onto ``app``."""
+    for rule in staging.url_map.iter_rules():
+        app.url_map.add(rule.empty())
+    app.view_functions.update(staging.view_functions)
+    app.blueprints.update(staging.blueprints)
+    for name in _HOOK_REGISTRIES:
+        dest = getattr(app, name)
+        for scope, funcs in getattr(staging, name).items():
+            existing = dest.setdefault(scope, [])
+            existing.extend(f for f in funcs if f not in existing)
+    for scope, by_code in staging.error_handler_spec.items():
+        for code, handlers in by_code.items():
+            app.error_handler_spec[scope][code].update(handlers)
@@ -20,9 +20,12 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
+from dynamo.batch_writes import batch_put
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -40,7 +43,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 def _now():
@@ -69,9 +72,9 @@ class QuestionIntelligenceDB:
     def __init__(self):
         self._table = _get_ddb().Table(QUESTION_DB_TABLE)
 
-    def upsert_query(self, keyword: str, data: Dict) -> str:
+    def _item(self, keyword: str, data: Dict) -> Dict:
         now = _now()
-        item = {
+        return {
             'keyword': keyword,
             'updated_at': now,
             'geo_score': _dec(data.get('geo_score', 0)),
@@ -84,7 +87,9 @@ class QuestionIntelligenceDB:
             'trend': data.get('trend', 'stable'),
             'last_probed': data.get('last_probed', now),
         }
-        self._table.put_item(Item=item)
+
+    def upsert_query(self, keyword: str, data: Dict) -> str:
+        self._table.put_item(Item=self._item(keyword, data))
         return keyword
 
     def get_query(self, keyword: str) -> Optional[Dict]:
@@ -103,14 +108,9 @@ class QuestionIntelligenceDB:
         items.sort(key=lambda x: x.get('geo_score', 0))
         return items
 
-    def bulk_enrich(self, enrichments: List[Dict]) -> int:
-        count = 0
-        for e in enrichments:
-            kw = e.get('keyword')
-            if not kw: continue
-            self.upsert_query(kw, e)
-            count += 1
-        return count
+    def bulk_enrich(self, enrichments: List[Dict], segments: int = 1) -> int:
+        items = [self._item(e['keyword'], e) for e in enrichments if e.get('keyword')]
+        return batch_put(QUESTION_DB_TABLE, items, key_fields=('keyword',), segments=segments)['items']
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -123,9 +123,9 @@ class AnswerTemplateLibrary:
     def __init__(self):
         self._table = _get_ddb().Table(TEMPLATE_TABLE)
 
-    def save_template(self, format_type: str, data: Dict) -> str:
+    def _item(self, format_type: str, data: Dict) -> Dict:
         now = _now()
-        item = {
+        return {
             'format_type': format_type,
             'updated_at': now,
             'template_name': data.get('template_name', format_type),
@@ -136,7 +136,9 @@ class AnswerTemplateLibrary:
             'citation_success_rate': _dec(data.get('citation_success_rate', 0)),
             'usage_count': data.get('usage_count', 0),
         }
-        self._table.put_item(Item=item)
+
+    def save_template(self, format_type: str, data: Dict) -> str:
+        self._table.put_item(Item=self._item(format_type, data))
         return format_type
 
     def get_template(self, format_type: str) -> Optional[Dict]:
@@ -172,10 +174,8 @@ class AnswerTemplateLibrary:
              'description': 'Structured review with Review schema',
              'json_ld_schema': {'@type': 'Review', 'reviewRating': {'@type': 'Rating'}}},
         ]
-        for d in defaults:
-            ft = d.pop('format_type')
-            self.save_template(ft, d)
-        return len(defaults)
+        items = [self._item(d.pop('format_type'), d) for d in defaults]
+        return batch_put(TEMPLATE_TABLE, items, key_fields=('format_type',))['items']
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -309,6 +309,19 @@ class CitationMonitoringRegister:
                     except: pass
         return items
 
+    def iter_urls(self, page_size: int = 1000):
+        """Yield (page_id, url) for every registered page, following scan pagination."""
+        kwargs = {'ProjectionExpression': 'page_id, #u',
+                  'ExpressionAttributeNames': {'#u': 'url'}, 'Limit': page_size}
+        while True:
+            resp = self._table.scan(**kwargs)
+            for i in resp.get('Items', []):
+                if i.get('url'):
+                    yield i['page_id'], i['url']
+            if 'LastEvaluatedKey' not in resp:
+                break
+            kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+
     def get_pages_needing_check(self, max_weeks: int = 8) -> List[Dict]:
         all_pages = self.get_all()
         return [p for p in all_pages if p.get('weeks_monitored', 0) < max_weeks]
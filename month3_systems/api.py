@@ -251,7 +251,8 @@ def geo_weekly():
 @m3_bp.route('/transform', methods=['POST'])
 def transform_probes():
     """Bridge raw GEO probes → Month 3 intelligence tables.
-    Body: {"brand": "AI1stSEO", "competitors": ["Ahrefs", "Semrush"]}
+    Body: {"brand": "AI1stSEO", "competitors": ["Ahrefs", "Semrush"], "rebuild": false}
+    rebuild=true drops the brand's aggregates and replays the window's probes.
     """
     from probe_to_intelligence import transform_probes_to_intelligence
     data = request.get_json() or {}
@@ -259,7 +260,8 @@ def transform_probes():
     if not brand:
         return jsonify({'error': 'brand is required'}), 400
     competitors = [c.strip() for c in data.get('competitors', []) if c.strip()]
-    result = transform_probes_to_intelligence(brand, competitors=competitors or None)
+    result = transform_probes_to_intelligence(brand, competitors=competitors or None,
+                                              rebuild=bool(data.get('rebuild')))
     return jsonify(result)
 
 
@@ -413,3 +415,10 @@ def kpi_baseline():
         },
     }
     return jsonify(baseline)
+
+
+@m3_bp.route('/write-metrics', methods=['GET'])
+def write_metrics():
+    """Cumulative batch-write cost per table in this worker (items, requests, retries, WCU)."""
+    from dynamo.batch_writes import get_write_metrics
+    return jsonify({'tables': get_write_metrics()})
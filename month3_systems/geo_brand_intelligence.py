@@ -9,21 +9,29 @@ Five components:
   4. GEO Improvement Action Register — cause-effect evidence
   5. Provider Sensitivity Map — provider response patterns
 
+Plus the Probe Aggregate Store — running per-brand/per-keyword probe counts
+and watermarks behind the incremental probe → intelligence transform.
+
 All backed by DynamoDB.
 """
 
 import json
 import logging
 import os
+import time
 import uuid
+import zlib
 from collections import defaultdict
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
+from dynamo.batch_writes import batch_put
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -34,13 +42,14 @@ KW_PERF_TABLE = f'{TABLE_PREFIX}geo-keyword-performance'
 COMP_MATRIX_TABLE = f'{TABLE_PREFIX}geo-competitor-matrix'
 ACTION_REG_TABLE = f'{TABLE_PREFIX}geo-action-register'
 PROVIDER_MAP_TABLE = f'{TABLE_PREFIX}geo-provider-sensitivity'
+PROBE_AGG_TABLE = f'{TABLE_PREFIX}geo-probe-aggregates'
 
 _ddb = None
 
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 def _now():
@@ -72,11 +81,10 @@ class GEOScoreTracker:
     def __init__(self):
         self._table = _get_ddb().Table(GEO_TRACKER_TABLE)
 
-    def record_week(self, brand: str, data: Dict) -> str:
-        week = data.get('week', _week())
-        item = {
+    def _item(self, brand: str, data: Dict) -> Dict:
+        return {
             'brand': brand,
-            'week': week,
+            'week': data.get('week', _week()),
             'geo_score': _dec(data.get('geo_score', 0)),
             'visibility_score': _dec(data.get('visibility_score', 0)),
             'keywords_probed': data.get('keywords_probed', 0),
@@ -84,8 +92,16 @@ class GEOScoreTracker:
             'provider_scores': json.dumps(data.get('provider_scores', {})),
             'recorded_at': _now(),
         }
+
+    def record_week(self, brand: str, data: Dict) -> str:
+        item = self._item(brand, data)
         self._table.put_item(Item=item)
-        return week
+        return item['week']
+
+    def bulk_record_weeks(self, entries: List[Dict]) -> int:
+        """Batch-write many weekly rows; each entry carries its own 'brand'."""
+        items = [self._item(e['brand'], e) for e in entries if e.get('brand')]
+        return batch_put(GEO_TRACKER_TABLE, items, key_fields=('brand', 'week'))['items']
 
     def get_trend(self, brand: str, limit: int = 12) -> List[Dict]:
         resp = self._table.query(
@@ -113,8 +129,8 @@ class KeywordPerformanceRegister:
     def __init__(self):
         self._table = _get_ddb().Table(KW_PERF_TABLE)
 
-    def record(self, keyword: str, week: str, data: Dict):
-        item = {
+    def _item(self, keyword: str, week: str, data: Dict) -> Dict:
+        return {
             'keyword': keyword,
             'week': week,
             'geo_score': _dec(data.get('geo_score', 0)),
@@ -124,7 +140,9 @@ class KeywordPerformanceRegister:
             'priority_flag': data.get('priority_flag', False),
             'recorded_at': _now(),
         }
-        self._table.put_item(Item=item)
+
+    def record(self, keyword: str, week: str, data: Dict):
+        self._table.put_item(Item=self._item(keyword, week, data))
 
     def get_keyword_history(self, keyword: str, limit: int = 12) -> List[Dict]:
         resp = self._table.query(
@@ -140,14 +158,9 @@ class KeywordPerformanceRegister:
         items.sort(key=lambda x: x.get('geo_score', 0))
         return items
 
-    def bulk_record(self, week: str, records: List[Dict]) -> int:
-        count = 0
-        for r in records:
-            kw = r.get('keyword')
-            if not kw: continue
-            self.record(kw, week, r)
-            count += 1
-        return count
+    def bulk_record(self, week: str, records: List[Dict], segments: int = 1) -> int:
+        items = [self._item(r['keyword'], week, r) for r in records if r.get('keyword')]
+        return batch_put(KW_PERF_TABLE, items, key_fields=('keyword', 'week'), segments=segments)['items']
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -160,8 +173,8 @@ class CompetitorVisibilityMatrix:
     def __init__(self):
         self._table = _get_ddb().Table(COMP_MATRIX_TABLE)
 
-    def record(self, competitor: str, week: str, data: Dict):
-        item = {
+    def _item(self, competitor: str, week: str, data: Dict) -> Dict:
+        return {
             'competitor': competitor,
             'week': week,
             'visibility_score': _dec(data.get('visibility_score', 0)),
@@ -171,7 +184,14 @@ class CompetitorVisibilityMatrix:
             'top_keywords': json.dumps(data.get('top_keywords', [])),
             'recorded_at': _now(),
         }
-        self._table.put_item(Item=item)
+
+    def record(self, competitor: str, week: str, data: Dict):
+        self._table.put_item(Item=self._item(competitor, week, data))
+
+    def bulk_record(self, week: str, entries: Dict[str, Dict]) -> int:
+        """Batch-write one week's rows for many competitors ({competitor: data})."""
+        items = [self._item(comp, week, data) for comp, data in entries.items()]
+        return batch_put(COMP_MATRIX_TABLE, items, key_fields=('competitor', 'week'))['items']
 
     def get_matrix(self, week: str = None) -> List[Dict]:
         week = week or _week()
@@ -261,9 +281,9 @@ class ProviderSensitivityMap:
     def __init__(self):
         self._table = _get_ddb().Table(PROVIDER_MAP_TABLE)
 
-    def update_provider(self, provider: str, data: Dict):
+    def _item(self, provider: str, data: Dict) -> Dict:
         now = _now()
-        item = {
+        return {
             'provider': provider,
             'response_speed': data.get('response_speed', 'medium'),
             'volatility': data.get('volatility', 'low'),
@@ -273,7 +293,9 @@ class ProviderSensitivityMap:
             'notes': data.get('notes', ''),
             'updated_at': now,
         }
-        self._table.put_item(Item=item)
+
+    def update_provider(self, provider: str, data: Dict):
+        self._table.put_item(Item=self._item(provider, data))
 
     def get_map(self) -> List[Dict]:
         resp = self._table.scan()
@@ -298,10 +320,179 @@ class ProviderSensitivityMap:
             {'provider': 'ollama', 'response_speed': 'medium', 'volatility': 'low',
              'avg_days_to_reflect': 14, 'citation_rate': 0.20, 'best_for': 'baseline'},
         ]
-        for d in defaults:
-            p = d.pop('provider')
-            self.update_provider(p, d)
-        return len(defaults)
+        items = [self._item(d.pop('provider'), d) for d in defaults]
+        return batch_put(PROVIDER_MAP_TABLE, items, key_fields=('provider',))['items']
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 6. PROBE AGGREGATE STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ProbeAggregateStore:
+    """Probe aggregates per brand, folded in incrementally.
+
+    One row per (brand, keyword) whose ``weeks`` map holds raw counts per
+    week of the scoring window — cited, total, confidence_sum and
+    per-provider [total, cited] — plus a SUMMARY_KEY row per brand holding
+    the probe watermark, the brand's weekly buckets and their window totals.
+
+    The current metrics of every keyword, and the keywords still pending a
+    Month 3 write (with the metrics last written for them), are spread over
+    KEYWORD_SHARDS rows '#summary#NN' by keyword hash so no single item nears
+    DynamoDB's 400 KB limit (roughly 3,000 keywords fit per shard). A fold
+    rewrites only the shards of the keywords it touched.
+
+    Every summary and shard row carries a ``rev`` that each save bumps;
+    mark_published() clears pending keywords only on rows whose rev is
+    unchanged, so keywords folded in concurrently stay pending.
+    """
+
+    SUMMARY_KEY = '#summary'
+    SHARD_PREFIX = '#summary#'
+    KEYWORD_SHARDS = 16
+    JSON_FIELDS = ('providers', 'keywords', 'recent_ids', 'pending', 'weeks')
+    SHARDED_FIELDS = ('keywords', 'pending')
+
+    def __init__(self):
+        self._table = _get_ddb().Table(PROBE_AGG_TABLE)
+
+    def _load(self, item: Optional[Dict]) -> Optional[Dict]:
+        d = _deserialize(item)
+        if d:
+            for f in self.JSON_FIELDS:
+                if isinstance(d.get(f), str):
+                    try: d[f] = json.loads(d[f])
+                    except: pass
+        return d
+
+    def shard_key(self, keyword: str) -> str:
+        return f'{self.SHARD_PREFIX}{zlib.crc32(keyword.encode("utf-8")) % self.KEYWORD_SHARDS:02d}'
+
+    def _shard_keys(self) -> List[str]:
+        return [f'{self.SHARD_PREFIX}{i:02d}' for i in range(self.KEYWORD_SHARDS)]
+
+    def load_summary(self, brand: str) -> Optional[Dict]:
+        """Summary row with the keyword shards merged back into 'keywords' and 'pending'.
+
+        Shard revisions are kept under '_revs' for save() and mark_published().
+        """
+        items = self.get_keywords(brand, [self.SUMMARY_KEY] + self._shard_keys())
+        summary = items.get(self.SUMMARY_KEY)
+        if not summary:
+            return None
+        # Rows written before sharding carry the whole keyword map; rewrite every shard once
+        summary['_reshard'] = 'keywords' in summary
+        for f in self.SHARDED_FIELDS:
+            summary[f] = summary.get(f) or {}
+        summary['_revs'] = {}
+        for key in self._shard_keys():
+            shard = items.get(key)
+            if shard:
+                summary['keywords'].update(shard.get('keywords') or {})
+                summary['pending'].update(shard.get('pending') or {})
+                summary['_revs'][key] = shard.get('rev', 0)
+        return summary
+
+    def get_keywords(self, brand: str, keywords) -> Dict[str, Dict]:
+        """Aggregate rows for ``keywords`` via BatchGetItem (100 keys per call)."""
+        keywords = list(keywords)
+        out = {}
+        ddb = _get_ddb()
+        for i in range(0, len(keywords), 100):
+            request = {PROBE_AGG_TABLE: {'Keys': [{'brand': brand, 'keyword': kw}
+                                                  for kw in keywords[i:i + 100]]}}
+            attempt = 0
+            while request and attempt < 5:
+                resp = ddb.batch_get_item(RequestItems=request)
+                for item in resp.get('Responses', {}).get(PROBE_AGG_TABLE, []):
+                    row = self._load(item)
+                    out[row['keyword']] = row
+                request = resp.get('UnprocessedKeys') or None
+                if request:
+                    attempt += 1
+                    time.sleep(min(2.0, 0.1 * (2 ** attempt)))
+        return out
+
+    def save(self, brand: str, summary: Dict, keyword_rows: List[Dict], touched=None):
+        """Write the keyword rows, the summary row and the shards of ``touched`` (all when None)."""
+        now = _now()
+        revs = summary.setdefault('_revs', {})
+        if touched is None or summary.get('_reshard'):
+            shard_keys = set(self._shard_keys())
+        else:
+            shard_keys = {self.shard_key(kw) for kw in touched}
+        shards = {key: {f: {} for f in self.SHARDED_FIELDS} for key in shard_keys}
+        for f in self.SHARDED_FIELDS:
+            for kw, v in (summary.get(f) or {}).items():
+                shard = shards.get(self.shard_key(kw))
+                if shard is not None:
+                    shard[f][kw] = v
+
+        with self._table.batch_writer(overwrite_by_pkeys=['brand', 'keyword']) as batch:
+            for row in keyword_rows:
+                batch.put_item(Item={
+                    'brand': brand,
+                    'keyword': row['keyword'],
+                    'weeks': json.dumps(row['weeks']),
+                    'updated_at': now,
+                })
+            for key, shard in shards.items():
+                revs[key] = revs.get(key, 0) + 1
+                batch.put_item(Item={'brand': brand, 'keyword': key, 'rev': revs[key], 'updated_at': now,
+                                     **{f: json.dumps(v) for f, v in shard.items()}})
+            summary['rev'] = summary.get('rev', 0) + 1
+            item = {'brand': brand, 'keyword': self.SUMMARY_KEY, 'updated_at': now}
+            for k, v in summary.items():
+                if k in ('brand', 'keyword', 'updated_at') or k in self.SHARDED_FIELDS \
+                        or k.startswith('_') or v is None:
+                    continue
+                item[k] = json.dumps(v) if k in self.JSON_FIELDS else v
+            batch.put_item(Item=item)
+        summary['_reshard'] = False
+
+    def _conditional_update(self, brand: str, key: str, rev: int, expression: str, values: Dict) -> bool:
+        try:
+            self._table.update_item(
+                Key={'brand': brand, 'keyword': key},
+                UpdateExpression=expression,
+                ConditionExpression='rev = :rev',
+                ExpressionAttributeValues={**values, ':rev': rev})
+            return True
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            return False
+
+    def mark_published(self, brand: str, summary: Dict, week: str) -> bool:
+        """Record that ``summary``'s pending keywords and ``week`` reached the Month 3 tables.
+
+        Rows another fold rewrote since ``summary`` was saved are left alone,
+        so their keywords are written again on the next run. Returns False
+        if anything was left pending that way.
+        """
+        complete = True
+        revs = summary.get('_revs', {})
+        for key in sorted({self.shard_key(kw) for kw in summary.get('pending') or {}}):
+            complete &= self._conditional_update(brand, key, revs.get(key, 0),
+                                                 'SET pending = :empty', {':empty': '{}'})
+        complete &= self._conditional_update(brand, self.SUMMARY_KEY, summary.get('rev', 0),
+                                             'SET last_week = :w', {':w': week})
+        return complete
+
+    def reset(self, brand: str) -> int:
+        """Drop every aggregate row for a brand (used before a full rebuild)."""
+        keys, kwargs = [], {'KeyConditionExpression': Key('brand').eq(brand),
+                            'ProjectionExpression': 'brand, keyword'}
+        while True:
+            resp = self._table.query(**kwargs)
+            keys.extend(resp.get('Items', []))
+            if 'LastEvaluatedKey' not in resp:
+                break
+            kwargs['ExclusiveStartKey'] = resp['LastEvaluatedKey']
+        with self._table.batch_writer() as batch:
+            for k in keys:
+                batch.delete_item(Key={'brand': k['brand'], 'keyword': k['keyword']})
+        return len(keys)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
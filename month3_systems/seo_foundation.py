@@ -19,9 +19,12 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 
+from aws_clients import get_resource
+
+from dynamo.batch_writes import batch_put
+
 logger = logging.getLogger(__name__)
 
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -37,7 +40,7 @@ _ddb = None
 def _get_ddb():
     global _ddb
     if _ddb is None:
-        _ddb = boto3.resource('dynamodb', region_name=REGION)
+        _ddb = get_resource('dynamodb', REGION)
     return _ddb
 
 def _now():
@@ -66,11 +69,10 @@ class TechnicalDebtRegister:
     def __init__(self):
         self._table = _get_ddb().Table(TECH_DEBT_TABLE)
 
-    def add_issue(self, data: Dict) -> str:
-        issue_id = str(uuid.uuid4())[:8]
+    def _item(self, data: Dict) -> Dict:
         now = _now()
-        item = {
-            'issue_id': issue_id,
+        return {
+            'issue_id': str(uuid.uuid4())[:8],
             'description': data.get('description', ''),
             'source_check': data.get('source_check', ''),
             'category': data.get('category', 'technical'),
@@ -83,8 +85,11 @@ class TechnicalDebtRegister:
             'created_at': now,
             'updated_at': now,
         }
+
+    def add_issue(self, data: Dict) -> str:
+        item = self._item(data)
         self._table.put_item(Item=item)
-        return issue_id
+        return item['issue_id']
 
     def resolve_issue(self, issue_id: str):
         self._table.update_item(
@@ -113,19 +118,18 @@ class TechnicalDebtRegister:
         }
 
     def seed_from_audit(self, audit_results: List[Dict]) -> int:
-        count = 0
-        for check in audit_results:
-            if check.get('status') == 'fail':
-                self.add_issue({
-                    'description': check.get('name', ''),
-                    'source_check': check.get('check_id', ''),
-                    'category': check.get('category', 'technical'),
-                    'ai_visibility_impact': check.get('impact', 'medium'),
-                    'url': check.get('url', ''),
-                    'priority': check.get('priority', 5),
-                })
-                count += 1
-        return count
+        items = [
+            self._item({
+                'description': check.get('name', ''),
+                'source_check': check.get('check_id', ''),
+                'category': check.get('category', 'technical'),
+                'ai_visibility_impact': check.get('impact', 'medium'),
+                'url': check.get('url', ''),
+                'priority': check.get('priority', 5),
+            })
+            for check in audit_results if check.get('status') == 'fail'
+        ]
+        return batch_put(TECH_DEBT_TABLE, items, key_fields=('issue_id',))['items']
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
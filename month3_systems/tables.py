@@ -3,12 +3,13 @@
 
 Run: python -m month3_systems.tables
 
-Creates 14 tables across the 3 systems.
+Creates 15 tables across the 3 systems.
 """
 
-import boto3
 import os
 
+from aws_clients import get_client, get_resource
+
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 PREFIX = os.environ.get('DYNAMO_TABLE_PREFIX', '')
 
@@ -25,6 +26,7 @@ TABLES = {
     f'{PREFIX}geo-competitor-matrix': {'pk': 'competitor', 'sk': 'week'},
     f'{PREFIX}geo-action-register': {'pk': 'action_id'},
     f'{PREFIX}geo-provider-sensitivity': {'pk': 'provider'},
+    f'{PREFIX}geo-probe-aggregates': {'pk': 'brand', 'sk': 'keyword'},
     # 3.3 SEO Foundation
     f'{PREFIX}seo-technical-debt': {'pk': 'issue_id'},
     f'{PREFIX}seo-eeat-pipeline': {'pk': 'gap_id'},
@@ -34,8 +36,8 @@ TABLES = {
 
 
 def create_all_month3_tables():
-    ddb = boto3.resource('dynamodb', region_name=REGION)
-    client = boto3.client('dynamodb', region_name=REGION)
+    ddb = get_resource('dynamodb', REGION)
+    client = get_client('dynamodb', REGION)
     existing = client.list_tables()['TableNames']
 
     created = 0
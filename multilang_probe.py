@@ -4,10 +4,21 @@ Feature 3: Multi-Language GEO Probing
 
 Extends GEO probing to support multiple languages.
 Translates prompts, fires probes per language, and returns per-language visibility.
+
+Translations come from a translation memory instead of one LLM call per
+language per probe. The fixed probe template is translated once per
+language (with a {KEYWORD} placeholder) and each keyword once per
+language; both are kept in a local SQLite file for TRANSLATION_TTL_DAYS.
+All misses of a scan go out as a single multi-language request, so a
+ten-language scan costs at most one translation call, and none once the
+keyword has been seen. The LLM budget goes to the probes themselves.
 """
 
 import json
 import logging
+import os
+import sqlite3
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
@@ -18,6 +29,19 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_PROJECT_ID = "00000000-0000-0000-0000-000000000001"
 
+IS_LAMBDA = os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
+TRANSLATION_DB = os.environ.get("TRANSLATION_MEMORY_PATH") or os.path.join(
+    "/tmp" if IS_LAMBDA else os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"),
+    "translation_memory.db")
+TRANSLATION_TTL = int(os.environ.get("TRANSLATION_TTL_DAYS", "30")) * 86400
+
+PLACEHOLDER = "{KEYWORD}"
+PROBE_TEMPLATE = (
+    "I'm researching '{KEYWORD}'. What are the best options available? "
+    "Please provide specific brand and product recommendations."
+)
+FALLBACK_TEMPLATE = "I'm researching '{KEYWORD}'. What are the best options? Recommend specific brands."
+
 LANGUAGE_NAMES = {
     "en": "English", "es": "Spanish", "fr": "French", "de": "German",
     "pt": "Portuguese", "it": "Italian", "nl": "Dutch", "ja": "Japanese",
@@ -38,36 +62,174 @@ def init_multilang_columns():
         logger.info("geo_probes.language column verified")
 
 
-def _translate_prompt(keyword, brand_name, language):
-    """Translate the probe prompt to the target language using LLM."""
-    if language == "en":
-        return (
-            f"I'm researching '{keyword}'. What are the best options available? "
-            f"Please provide specific brand and product recommendations."
-        )
+class TranslationMemory:
+    """Translated text per (kind, source, language) in a local SQLite file, with TTL.
+
+    ``kind`` is "template" or "keyword". Shared by the workers on a host;
+    on Lambda it lives in /tmp and is rebuilt per container.
+    """
+
+    def __init__(self, path=TRANSLATION_DB, ttl=TRANSLATION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._ready = False
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        except OSError as e:
+            logger.warning("Translation memory directory not created: %s", e)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS translations (
+                        kind TEXT NOT NULL, source TEXT NOT NULL, language TEXT NOT NULL,
+                        text TEXT NOT NULL, created_at REAL NOT NULL,
+                        PRIMARY KEY (kind, source, language))
+                """)
+                conn.commit()
+                self._ready = True
+        return conn
+
+    def get_many(self, kind, source, languages):
+        """{language: text} for the unexpired entries among ``languages``."""
+        if not languages:
+            return {}
+        marks = ",".join("?" * len(languages))
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    f"SELECT language, text FROM translations WHERE kind = ? AND source = ? "
+                    f"AND created_at > ? AND language IN ({marks})",
+                    [kind, source, time.time() - self.ttl] + list(languages)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Translation memory read failed: %s", e)
+            return {}
+        return dict(rows)
+
+    def put_many(self, kind, source, texts):
+        if not texts:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translations (kind, source, language, text, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(kind, source, lang, text, now) for lang, text in texts.items()])
+                conn.execute("DELETE FROM translations WHERE created_at <= ?", (now - self.ttl,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Translation memory write failed: %s", e)
+
+
+_memory = TranslationMemory()
+
+
+def _parse_batch(text, languages):
+    """Pull {language: {"template", "keyword"}} out of the model's JSON answer."""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return {}
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    out = {}
+    for lang in languages:
+        entry = data.get(lang)
+        if not isinstance(entry, dict):
+            continue
+        template = str(entry.get("template") or "").strip().strip('"')
+        keyword = str(entry.get("keyword") or "").strip().strip('"').strip("'")
+        out[lang] = {
+            # a template is only usable if the placeholder survived intact
+            "template": template if template.count(PLACEHOLDER) == 1 else None,
+            "keyword": keyword or None,
+        }
+    return out
+
+
+def _translate_batch(keyword, languages):
+    """One LLM call translating the template and keyword into every language."""
     from ai_provider import generate
-    lang_name = LANGUAGE_NAMES.get(language, language)
-    translate_prompt = (
-        f"Translate the following search query into {lang_name}. "
-        f"Return ONLY the translated text, nothing else:\n\n"
-        f"\"I'm researching '{keyword}'. What are the best options available? "
-        f"Please provide specific brand and product recommendations.\""
+    names = ", ".join(f"{LANGUAGE_NAMES.get(l, l)} ({l})" for l in languages)
+    prompt = (
+        f"Translate two texts into each of these languages: {names}.\n"
+        f"1. template: \"{PROBE_TEMPLATE}\"\n"
+        f"   Keep the token {PLACEHOLDER} exactly as written, untranslated.\n"
+        f"2. keyword: \"{keyword}\"\n"
+        f"Return ONLY a JSON object mapping each language code to "
+        f"{{\"template\": \"...\", \"keyword\": \"...\"}}, nothing else."
     )
     try:
-        translated = generate(translate_prompt, provider="nova")
-        return translated.strip().strip('"').strip("'")
+        return _parse_batch(generate(prompt, provider="nova"), languages)
     except Exception as e:
-        logger.warning("Translation to %s failed: %s", language, e)
-        # Fallback to English
-        return f"I'm researching '{keyword}'. What are the best options? Recommend specific brands."
+        logger.warning("Batch translation to %s failed: %s", ",".join(languages), e)
+        return {}
+
+
+def _keyword_key(keyword):
+    """Translation memory key for ``keyword``: case and spacing don't matter."""
+    return " ".join(keyword.split()).casefold()
+
+
+def _translate_prompts(keyword, languages):
+    """Probe prompt per language, from the translation memory where possible.
+
+    Cached templates and keywords are reused; every miss goes into one
+    batched translation request. A language whose translation still fails
+    gets the English fallback prompt (and is retried on the next scan).
+    """
+    foreign = [l for l in dict.fromkeys(languages) if l != "en"]
+    keyword_key = _keyword_key(keyword)
+    templates = _memory.get_many("template", PROBE_TEMPLATE, foreign)
+    keywords = _memory.get_many("keyword", keyword_key, foreign)
+    missing = [l for l in foreign if l not in templates or l not in keywords]
+
+    if missing:
+        translated = _translate_batch(keyword, missing)
+        new_templates = {l: t["template"] for l, t in translated.items() if t["template"] and l not in templates}
+        new_keywords = {l: t["keyword"] for l, t in translated.items() if t["keyword"] and l not in keywords}
+        _memory.put_many("template", PROBE_TEMPLATE, new_templates)
+        _memory.put_many("keyword", keyword_key, new_keywords)
+        templates.update(new_templates)
+        keywords.update(new_keywords)
+        logger.info("Translation memory: %d/%d languages translated in one batch",
+                    len([l for l in missing if l in templates and l in keywords]), len(missing))
+
+    prompts = {}
+    for lang in languages:
+        if lang == "en":
+            prompts[lang] = PROBE_TEMPLATE.replace(PLACEHOLDER, keyword)
+        elif lang in templates and lang in keywords:
+            prompts[lang] = templates[lang].replace(PLACEHOLDER, keywords[lang])
+        else:
+            logger.warning("No translation to %s; probing in English", lang)
+            prompts[lang] = FALLBACK_TEMPLATE.replace(PLACEHOLDER, keyword)
+    return prompts
+
+
+def _translate_prompt(keyword, brand_name, language):
+    """Translate the probe prompt to the target language (via the translation memory)."""
+    return _translate_prompts(keyword, [language])[language]
 
 
-def _probe_single_language(brand_name, keyword, language, provider):
+def _probe_single_language(brand_name, keyword, language, provider, prompt=None):
     """Run a single GEO probe in a specific language."""
     from geo_probe_service import _detect_citation
     from ai_provider import generate
 
-    prompt = _translate_prompt(keyword, brand_name, language)
+    if prompt is None:
+        prompt = _translate_prompt(keyword, brand_name, language)
     try:
         response = generate(prompt, provider=provider)
         cited, context, confidence = _detect_citation(response, brand_name)
@@ -110,11 +272,12 @@ def probe_multilang(brand_name, keyword, languages=None, provider="nova", projec
     pid = project_id or DEFAULT_PROJECT_ID
     t0 = time.time()
 
-    # Probe all languages concurrently
+    # Translate every language up front (one batched call at most), then probe concurrently
+    prompts = _translate_prompts(keyword, languages)
     results = []
     with ThreadPoolExecutor(max_workers=min(len(languages), 4)) as pool:
         futures = {
-            pool.submit(_probe_single_language, brand_name, keyword, lang, provider): lang
+            pool.submit(_probe_single_language, brand_name, keyword, lang, provider, prompts[lang]): lang
             for lang in languages
         }
         for future in as_completed(futures):
@@ -0,0 +1,237 @@
+"""
+pg_pool.py
+Shared RDS PostgreSQL connection pool.
+
+db.py, directory/directory_db.py and directory/sports_db.py all talk to the
+same database; they check connections out of this one pool instead of each
+keeping its own. Compared with the per-module pools it replaces:
+
+  - No SELECT 1 on every checkout. A connection is only pinged when it has
+    sat idle longer than PG_POOL_IDLE_CHECK seconds, and is recycled after
+    PG_POOL_MAX_AGE seconds. Connections that die mid-request are discarded
+    on return instead of going back into the pool.
+  - Sized per gunicorn worker: PG_POOL_MAX, or PG_CONNECTION_BUDGET split
+    across WEB_CONCURRENCY workers (2 on Lambda, which serves one request
+    at a time).
+  - Checkouts wait up to PG_POOL_TIMEOUT seconds for a free connection
+    instead of failing immediately when the pool is exhausted.
+  - execute_prepared() keeps server-side prepared statements per
+    connection for the hot queries.
+  - pool_stats() reports size, usage and checkout waits.
+
+Environment variables: DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+(same as db.py) plus the PG_POOL_* / PG_CONNECTION_BUDGET settings above.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import pool
+
+logger = logging.getLogger(__name__)
+
+IS_LAMBDA = os.environ.get("AWS_LAMBDA_FUNCTION_NAME") is not None
+WEB_CONCURRENCY = max(1, int(os.environ.get("WEB_CONCURRENCY", "4")))
+CONNECTION_BUDGET = int(os.environ.get("PG_CONNECTION_BUDGET", "40"))
+POOL_MIN = int(os.environ.get("PG_POOL_MIN", "1"))
+POOL_MAX = int(os.environ.get("PG_POOL_MAX", "0")) or (
+    2 if IS_LAMBDA else max(2, CONNECTION_BUDGET // WEB_CONCURRENCY))
+POOL_TIMEOUT = float(os.environ.get("PG_POOL_TIMEOUT", "10"))
+IDLE_CHECK = float(os.environ.get("PG_POOL_IDLE_CHECK", "30"))
+MAX_AGE = float(os.environ.get("PG_POOL_MAX_AGE", "1800"))
+
+_DISCONNECT_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class PoolTimeout(RuntimeError):
+    """No connection became free within PG_POOL_TIMEOUT seconds."""
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its age and prepared statements."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.prepared = set()
+
+
+class PgPool:
+    """ThreadedConnectionPool with blocking checkout, idle-age validation and stats."""
+
+    def __init__(self, minconn: int = POOL_MIN, maxconn: int = POOL_MAX,
+                 timeout: float = POOL_TIMEOUT, **dsn):
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._pool = pool.ThreadedConnectionPool(
+            minconn, maxconn, connection_factory=_PooledConnection, **dsn)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0, "waits": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+            "timeouts": 0, "in_use": 0, "peak_in_use": 0, "validations": 0,
+            "discarded": 0, "prepares": 0, "prepared_executions": 0,
+        }
+
+    def _bump(self, **deltas):
+        with self._lock:
+            for k, v in deltas.items():
+                self._stats[k] += v
+
+    def _discard(self, conn):
+        self._bump(discarded=1)
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception:
+            pass
+
+    def _checkout(self) -> _PooledConnection:
+        for _ in range(self.maxconn + 1):
+            conn = self._pool.getconn()
+            now = time.monotonic()
+            if conn.closed or now - conn.created_at > MAX_AGE:
+                self._discard(conn)
+                continue
+            if now - conn.last_used > IDLE_CHECK:
+                self._bump(validations=1)
+                try:
+                    conn.cursor().execute("SELECT 1")
+                except Exception:
+                    self._discard(conn)
+                    continue
+            return conn
+        raise PoolTimeout("Could not obtain a live database connection")
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection, auto-commit/rollback."""
+        t0 = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            self._bump(timeouts=1)
+            raise PoolTimeout(f"No database connection free after {self.timeout:.0f}s "
+                              f"(pool size {self.maxconn})")
+        waited = (time.monotonic() - t0) * 1000
+        with self._lock:
+            s = self._stats
+            s["checkouts"] += 1
+            s["in_use"] += 1
+            s["peak_in_use"] = max(s["peak_in_use"], s["in_use"])
+            if waited >= 1:
+                s["waits"] += 1
+                s["wait_ms_total"] += waited
+                s["wait_ms_max"] = max(s["wait_ms_max"], waited)
+
+        conn = None
+        broken = False
+        try:
+            conn = self._checkout()
+            yield conn
+            conn.commit()
+        except Exception as e:
+            broken = isinstance(e, _DISCONNECT_ERRORS)
+            if conn is not None and not conn.closed:
+                try:
+                    conn.rollback()
+                except Exception:
+                    broken = True
+                # A PREPARE inside the failed transaction may or may not survive it;
+                # forget them all so the next use re-checks.
+                conn.prepared.clear()
+            raise
+        finally:
+            if conn is not None:
+                if broken or conn.closed:
+                    self._discard(conn)
+                else:
+                    conn.last_used = time.monotonic()
+                    self._pool.putconn(conn)
+            self._bump(in_use=-1)
+            self._slots.release()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            s = dict(self._stats)
+        s["size"] = len(self._pool._used) + len(self._pool._pool)
+        s["idle"] = len(self._pool._pool)
+        s["max"] = self.maxconn
+        s["wait_ms_avg"] = round(s["wait_ms_total"] / s["waits"], 2) if s["waits"] else 0.0
+        s["wait_ms_total"] = round(s["wait_ms_total"], 2)
+        s["wait_ms_max"] = round(s["wait_ms_max"], 2)
+        return s
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_shared: Optional[PgPool] = None
+_shared_lock = threading.Lock()
+_shared_pid = None
+
+
+def get_pool() -> PgPool:
+    """The process-wide pool (re-created after fork, e.g. gunicorn preload)."""
+    global _shared, _shared_pid
+    pid = os.getpid()
+    if _shared is None or _shared_pid != pid:
+        with _shared_lock:
+            if _shared is None or _shared_pid != pid:
+                try:
+                    _shared = PgPool(
+                        host=os.environ.get("DB_HOST", "localhost"),
+                        port=int(os.environ.get("DB_PORT", "5432")),
+                        dbname=os.environ.get("DB_NAME", "ai1stseo"),
+                        user=os.environ.get("DB_USER", "postgres"),
+                        password=os.environ.get("DB_PASSWORD", ""),
+                    )
+                    _shared_pid = pid
+                    logger.info("RDS pool created: %s/%s (max %d)", os.environ.get("DB_HOST"),
+                                os.environ.get("DB_NAME"), _shared.maxconn)
+                except Exception as e:
+                    logger.error("Failed to create RDS pool: %s", e)
+                    raise RuntimeError(f"Database connection failed: {e}")
+    return _shared
+
+
+@contextmanager
+def get_conn():
+    """Check out a connection from the shared pool, auto-commit/rollback."""
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def execute_prepared(cur, name: str, sql: str, params: Sequence = ()):
+    """Run ``sql`` as the server-side prepared statement ``name``.
+
+    ``sql`` uses $1..$n placeholders. The statement is PREPAREd the first
+    time this connection sees ``name``; later calls just EXECUTE it, so the
+    server skips parse and planning. Callers must use a distinct ``name``
+    for each distinct ``sql``.
+    """
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+        if cur.fetchone() is None:
+            cur.execute(f"PREPARE {name} AS {sql}")
+            if _shared is not None:
+                _shared._bump(prepares=1)
+        conn.prepared.add(name)
+    if params:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", list(params))
+    else:
+        cur.execute(f"EXECUTE {name}")
+    if _shared is not None:
+        _shared._bump(prepared_executions=1)
+
+
+def pool_stats() -> Dict:
+    """Usage and wait statistics for this process's pool."""
+    if _shared is None or _shared_pid != os.getpid():
+        return {"created": False, "max": POOL_MAX}
+    return {"created": True, **_shared.stats()}
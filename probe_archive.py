@@ -0,0 +1,432 @@
+"""
+probe_archive.py
+Append-only columnar archive of probe history with an embedded query engine.
+
+Trend endpoints (/api/data/ai-visibility/trend, /api/geo-probe/trend,
+BrandGEOHistory.get_trend, IndustryBenchmarkTracker.get_industry_trend)
+used to rebuild history on every call by pulling raw rows out of DynamoDB
+or RDS and aggregating them in Python, capped at a few hundred rows to stay
+inside request timeouts. This module keeps a local Parquet copy of that
+history and answers the trend queries with DuckDB:
+
+  <PROBE_ARCHIVE_DIR>/<dataset>/p=<brand>/w=<YYYY-Www>/part-*.parquet
+
+  - Fed from the write paths (db/db_dynamo insert_probe, BrandGEOHistory.record,
+    IndustryBenchmarkTracker.record_industry_snapshot). Rows are buffered
+    and flushed as small Parquet parts; a week's parts are compacted into
+    one file once there are more than COMPACT_FILES of them.
+  - Kept in step with the source of record: before a query, a partition
+    not synced in the last SYNC_INTERVAL seconds pulls rows newer than its
+    watermark (the first query for a brand backfills its full history).
+    Probes written by other workers or instances are therefore picked up
+    too. Rows are deduplicated on each dataset's key at query time.
+  - A query only opens the files of one brand (and, with ``since``, only
+    the weeks it needs).
+  - Probes from db.py carry their project_id and are partitioned by
+    (project, brand), so a tenant's trend never includes another tenant's
+    rows; db_dynamo has no projects and partitions by brand alone.
+
+duckdb is optional. Without it — or with PROBE_ARCHIVE=0 — every
+function here returns None and the callers use their original code path.
+On Lambda the archive lives in /tmp and is rebuilt per container.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+logger = logging.getLogger(__name__)
+
+IS_LAMBDA = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
+ARCHIVE_DIR = os.environ.get('PROBE_ARCHIVE_DIR') or (
+    '/tmp/probe_archive' if IS_LAMBDA
+    else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'probe_archive'))
+ENABLED = HAS_DUCKDB and os.environ.get('PROBE_ARCHIVE', '1').lower() not in ('0', 'false', 'no')
+FLUSH_ROWS = int(os.environ.get('PROBE_ARCHIVE_FLUSH_ROWS', '500'))
+FLUSH_SECONDS = float(os.environ.get('PROBE_ARCHIVE_FLUSH_SECONDS', '30'))
+SYNC_INTERVAL = float(os.environ.get('PROBE_ARCHIVE_SYNC_INTERVAL', '60'))
+COMPACT_FILES = 16
+
+
+class Dataset:
+    """One archived table: its columns, partition column, timestamp and dedupe key."""
+
+    def __init__(self, name: str, columns: Dict[str, str], partition: str, ts: str, key: tuple,
+                 scope: str = None):
+        self.name = name
+        self.columns = columns          # column -> DuckDB type
+        self.partition = partition
+        self.scope = scope              # optional column that further splits partitions
+        self.ts = ts
+        self.key = key
+
+    def partition_value(self, row: Dict) -> str:
+        return partition_key(row[self.partition], row.get(self.scope) if self.scope else None)
+
+    def normalize(self, row: Dict) -> Optional[Dict]:
+        out = {}
+        for col, typ in self.columns.items():
+            v = row.get(col)
+            if v is None or v == '':
+                out[col] = None if typ != 'VARCHAR' else (v or '')
+            elif typ == 'BOOLEAN':
+                out[col] = bool(v)
+            elif typ == 'DOUBLE':
+                out[col] = float(v)
+            elif typ == 'BIGINT':
+                out[col] = int(v)
+            elif isinstance(v, (dict, list)):
+                out[col] = json.dumps(v, default=str)
+            else:
+                out[col] = str(v) if not isinstance(v, datetime) else v.isoformat()
+        if not out[self.partition] or not out[self.ts]:
+            return None
+        return out
+
+
+DATASETS = {
+    'probes': Dataset('probes', {
+        'id': 'VARCHAR', 'project_id': 'VARCHAR', 'brand_name': 'VARCHAR', 'keyword': 'VARCHAR',
+        'ai_model': 'VARCHAR', 'cited': 'BOOLEAN', 'confidence': 'DOUBLE', 'sentiment': 'VARCHAR',
+        'probe_timestamp': 'VARCHAR',
+    }, partition='brand_name', ts='probe_timestamp', key=('id',), scope='project_id'),
+    'brand_geo': Dataset('brand_geo', {
+        'brand': 'VARCHAR', 'timestamp': 'VARCHAR', 'geo_score': 'DOUBLE',
+        'visibility_score': 'DOUBLE', 'confidence': 'DOUBLE', 'provider': 'VARCHAR',
+        'keywords_probed': 'BIGINT', 'keywords_cited': 'BIGINT', 'provider_scores': 'VARCHAR',
+        'benchmark_id': 'VARCHAR',
+    }, partition='brand', ts='timestamp', key=('timestamp',)),
+    'industry': Dataset('industry', {
+        'category_id': 'VARCHAR', 'week': 'VARCHAR', 'category_name': 'VARCHAR',
+        'brand_scores': 'VARCHAR', 'top_brand': 'VARCHAR', 'brands_tracked': 'BIGINT',
+        'recorded_at': 'VARCHAR',
+    }, partition='category_id', ts='recorded_at', key=('week',)),
+}
+
+
+def partition_key(value: str, scope: Optional[str] = None) -> str:
+    """Partition value for ``value`` within ``scope`` (e.g. a brand within a project)."""
+    return f'{scope}\x1f{value}' if scope else value
+
+
+def _week_of(ts: str) -> str:
+    try:
+        return datetime.fromisoformat(ts[:19]).strftime('%Y-W%W')
+    except ValueError:
+        return 'unknown'
+
+
+def _sql_str(s: str) -> str:
+    return "'" + s.replace("'", "''") + "'"
+
+
+class ProbeArchive:
+    """Parquet files per (dataset, partition, week), queried with DuckDB."""
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = root
+        self._lock = threading.RLock()
+        self._buffers: Dict[tuple, List[Dict]] = {}
+        self._buffered_at: Dict[tuple, float] = {}
+        self._synced_at: Dict[tuple, float] = {}
+        self._sync_locks: Dict[tuple, threading.Lock] = {}
+        self._db = duckdb.connect() if HAS_DUCKDB else None
+        self._stats = {'rows_appended': 0, 'files_written': 0, 'compactions': 0,
+                       'syncs': 0, 'rows_synced': 0, 'queries': 0, 'query_ms_total': 0.0}
+
+    # ── Layout ────────────────────────────────────────────────────────── #
+
+    def _partition_dir(self, dataset: str, pval: str) -> str:
+        return os.path.join(self.root, dataset, 'p=' + quote(pval, safe=''))
+
+    def _files(self, dataset: str, pval: str, since: str = None) -> List[str]:
+        base = self._partition_dir(dataset, pval)
+        if not os.path.isdir(base):
+            return []
+        first_week = _week_of(since) if since else ''
+        files = []
+        for week_dir in sorted(os.listdir(base)):
+            if not week_dir.startswith('w=') or week_dir[2:] < first_week:
+                continue
+            path = os.path.join(base, week_dir)
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.parquet'))
+        return files
+
+    # ── Writes ────────────────────────────────────────────────────────── #
+
+    def append(self, dataset: str, rows: Iterable[Dict]):
+        """Buffer ``rows`` for ``dataset``; flushed by size, age, before a query and at exit."""
+        ds = DATASETS[dataset]
+        due = []
+        with self._lock:
+            now = time.monotonic()
+            for row in rows:
+                r = ds.normalize(row)
+                if r is None:
+                    continue
+                bk = (dataset, ds.partition_value(r))
+                self._buffers.setdefault(bk, []).append(r)
+                self._buffered_at.setdefault(bk, now)
+                self._stats['rows_appended'] += 1
+            for bk, buf in self._buffers.items():
+                if buf and (len(buf) >= FLUSH_ROWS or now - self._buffered_at[bk] >= FLUSH_SECONDS):
+                    due.append(bk)
+            for bk in due:
+                self._flush(bk)
+
+    def _flush(self, bk: tuple):
+        rows = self._buffers.pop(bk, None)
+        self._buffered_at.pop(bk, None)
+        if not rows:
+            return
+        dataset, pval = bk
+        ds = DATASETS[dataset]
+        by_week: Dict[str, List[Dict]] = {}
+        for r in rows:
+            by_week.setdefault(_week_of(r[ds.ts]), []).append(r)
+        for week, week_rows in by_week.items():
+            path = os.path.join(self._partition_dir(dataset, pval), 'w=' + week)
+            os.makedirs(path, exist_ok=True)
+            self._write_parquet(ds, week_rows, path)
+            self._maybe_compact(ds, path)
+
+    def _write_parquet(self, ds: Dataset, rows: List[Dict], directory: str):
+        cols = list(ds.columns)
+        name = f'part-{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet'
+        tmp = os.path.join(directory, '.' + name)
+        con = self._db.cursor()
+        try:
+            con.execute('CREATE TEMP TABLE buf (' +
+                        ', '.join(f'"{c}" {ds.columns[c]}' for c in cols) + ')')
+            con.executemany(f'INSERT INTO buf VALUES ({", ".join("?" * len(cols))})',
+                            [[r[c] for c in cols] for r in rows])
+            con.execute(f"COPY buf TO {_sql_str(tmp)} (FORMAT PARQUET, COMPRESSION ZSTD)")
+        finally:
+            con.close()
+        os.replace(tmp, os.path.join(directory, name))
+        self._stats['files_written'] += 1
+
+    def _maybe_compact(self, ds: Dataset, directory: str):
+        """Merge a week's part files into one (duplicates are harmless: queries dedupe)."""
+        parts = sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                       if f.startswith('part-') and f.endswith('.parquet'))
+        if len(parts) <= COMPACT_FILES:
+            return
+        name = f'part-{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet'
+        tmp = os.path.join(directory, '.' + name)
+        con = self._db.cursor()
+        try:
+            con.execute(f"COPY (SELECT * FROM read_parquet([{', '.join(map(_sql_str, parts))}], hive_partitioning = false)) "
+                        f"TO {_sql_str(tmp)} (FORMAT PARQUET, COMPRESSION ZSTD)")
+        except Exception as e:
+            logger.warning("Probe archive compaction of %s skipped: %s", directory, e)
+            return
+        finally:
+            con.close()
+        os.replace(tmp, os.path.join(directory, name))
+        for p in parts:
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        self._stats['compactions'] += 1
+
+    def flush_all(self):
+        with self._lock:
+            for bk in list(self._buffers):
+                self._flush(bk)
+
+    # ── Sync with the source of record ────────────────────────────────── #
+
+    def _watermark_path(self, dataset: str, pval: str) -> str:
+        return os.path.join(self._partition_dir(dataset, pval), '_watermark')
+
+    def sync(self, dataset: str, pval: str, fetch_since: Callable[[Optional[str]], List[Dict]]):
+        """Append source rows newer than the partition's watermark (at most every SYNC_INTERVAL).
+
+        The fetch runs under a per-partition lock, so concurrent queries on
+        a cold partition wait for one backfill instead of each running it.
+        """
+        bk = (dataset, pval)
+        if time.monotonic() - self._synced_at.get(bk, -SYNC_INTERVAL) < SYNC_INTERVAL:
+            return
+        with self._lock:
+            sync_lock = self._sync_locks.setdefault(bk, threading.Lock())
+        with sync_lock:
+            now = time.monotonic()
+            if now - self._synced_at.get(bk, -SYNC_INTERVAL) < SYNC_INTERVAL:
+                return
+            ds = DATASETS[dataset]
+            wm_path = self._watermark_path(dataset, pval)
+            try:
+                with open(wm_path) as f:
+                    watermark = f.read().strip() or None
+            except OSError:
+                watermark = None
+
+            rows = fetch_since(watermark)
+            fresh = [r for r in rows if r.get(ds.ts) and (watermark is None or str(r[ds.ts]) > watermark)]
+            with self._lock:
+                self._synced_at[bk] = now
+                self._stats['syncs'] += 1
+                if not fresh:
+                    return
+                self.append(dataset, fresh)
+                self._flush(bk)
+                self._stats['rows_synced'] += len(fresh)
+                newest = max(str(r[ds.ts]) for r in fresh)
+                os.makedirs(os.path.dirname(wm_path), exist_ok=True)
+                tmp = f'{wm_path}.{os.getpid()}'
+                with open(tmp, 'w') as f:
+                    f.write(newest)
+                os.replace(tmp, wm_path)
+
+    # ── Queries ───────────────────────────────────────────────────────── #
+
+    def query(self, dataset: str, pval: str, sql: str, params: list = (), since: str = None) -> List[Dict]:
+        """Run ``sql`` with ``{rows}`` bound to the partition's deduplicated rows."""
+        ds = DATASETS[dataset]
+        with self._lock:
+            self._flush((dataset, pval))
+        files = self._files(dataset, pval, since)
+        if not files:
+            return []
+        key = ', '.join(f'"{k}"' for k in ds.key)
+        rows_sql = (f"(SELECT * FROM read_parquet([{', '.join(map(_sql_str, files))}], hive_partitioning = false) "
+                    f"QUALIFY row_number() OVER (PARTITION BY {key} ORDER BY \"{ds.ts}\" DESC) = 1)")
+        t0 = time.perf_counter()
+        con = self._db.cursor()
+        try:
+            cur = con.execute(sql.format(rows=rows_sql), list(params))
+            names = [d[0] for d in cur.description]
+            out = [dict(zip(names, r)) for r in cur.fetchall()]
+        finally:
+            con.close()
+        with self._lock:
+            self._stats['queries'] += 1
+            self._stats['query_ms_total'] += (time.perf_counter() - t0) * 1000
+        return out
+
+    def stats(self) -> Dict:
+        with self._lock:
+            s = dict(self._stats)
+            s['buffered_rows'] = sum(len(b) for b in self._buffers.values())
+        s['query_ms_avg'] = round(s['query_ms_total'] / s['queries'], 2) if s['queries'] else 0.0
+        s['query_ms_total'] = round(s['query_ms_total'], 1)
+        s['root'] = self.root
+        return s
+
+
+_archive: Optional[ProbeArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[ProbeArchive]:
+    """The process-wide archive, or None when disabled."""
+    global _archive
+    if not ENABLED:
+        return None
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = ProbeArchive()
+                atexit.register(_archive.flush_all)
+    return _archive
+
+
+def record(dataset: str, rows: Iterable[Dict]):
+    """Feed rows from a write path. Never raises — the archive is a derived copy."""
+    archive = get_archive()
+    if archive is None:
+        return
+    try:
+        archive.append(dataset, rows)
+    except Exception as e:
+        logger.warning("Probe archive append to %s failed: %s", dataset, e)
+
+
+def _run(dataset: str, pval: str, fetch_since, sql: str, params: list, since: str = None):
+    archive = get_archive()
+    if archive is None or not pval:
+        return None
+    try:
+        archive.sync(dataset, pval, fetch_since)
+        return archive.query(dataset, pval, sql, params, since)
+    except Exception as e:
+        logger.warning("Probe archive query on %s/%s failed, using source: %s", dataset, pval, e)
+        return None
+
+
+# ── Trend queries (same shapes as the functions they back) ───────────────── #
+
+def probe_trend(brand: str, limit: int, fetch_since: Callable,
+                project_id: str = None) -> Optional[List[Dict]]:
+    """Daily {date, total, cited, geo_score, providers} for ``brand`` (within ``project_id``), newest first."""
+    if not brand:
+        return None
+    rows = _run('probes', partition_key(brand, project_id), fetch_since, """
+        SELECT CASE WHEN length(probe_timestamp) >= 10 THEN substr(probe_timestamp, 1, 10)
+                    ELSE 'unknown' END AS date,
+               count(*) AS total,
+               count(*) FILTER (WHERE cited) AS cited,
+               round(count(*) FILTER (WHERE cited) / count(*), 2) AS geo_score,
+               list(DISTINCT ai_model ORDER BY ai_model) AS providers
+        FROM {rows}
+        GROUP BY 1 ORDER BY 1 DESC LIMIT ?
+    """, [int(limit)])
+    if rows is None:
+        return None
+    for r in rows:
+        r['geo_score'] = float(r['geo_score'] or 0)
+        r['providers'] = [p for p in (r['providers'] or []) if p]
+    return rows
+
+
+def brand_geo_trend(brand: str, limit: int, fetch_since: Callable) -> Optional[List[Dict]]:
+    """BrandGEOHistory entries for ``brand``, newest first."""
+    rows = _run('brand_geo', brand, fetch_since,
+                'SELECT * FROM {rows} ORDER BY "timestamp" DESC LIMIT ?', [int(limit)])
+    if rows is None:
+        return None
+    for r in rows:
+        r['brand'] = brand
+        try:
+            r['provider_scores'] = json.loads(r['provider_scores'] or '{}')
+        except ValueError:
+            pass
+    return rows
+
+
+def industry_trend(category_id: str, limit: int, fetch_since: Callable) -> Optional[List[Dict]]:
+    """Weekly industry snapshots for ``category_id``, newest week first."""
+    rows = _run('industry', category_id, fetch_since,
+                'SELECT * FROM {rows} ORDER BY week DESC LIMIT ?', [int(limit)])
+    if rows is None:
+        return None
+    for r in rows:
+        r['category_id'] = category_id
+        try:
+            r['brand_scores'] = json.loads(r['brand_scores'] or '{}')
+        except ValueError:
+            pass
+    return rows
+
+
+def archive_stats() -> Dict:
+    archive = _archive if ENABLED else None
+    if archive is None:
+        return {'enabled': ENABLED, 'duckdb': HAS_DUCKDB}
+    return {'enabled': True, **archive.stats()}
@@ -7,6 +7,28 @@ Writes to:   geo-score-tracker, geo-keyword-performance, geo-competitor-matrix
 
 Flow: GEO scan → raw probe storage → THIS MODULE → Month 3 tables → dashboard
 
+Incremental: per-keyword and per-brand probe counts, bucketed by week, and a
+per-brand probe watermark are persisted in geo-probe-aggregates
+(ProbeAggregateStore). Each fold reads only probes newer than the watermark
+(minus a small overlap for late writes, de-duplicated by probe id) and adds
+them to their week's bucket. Work is proportional to new probes, not probe
+history.
+
+Other jobs (the competitor matrix) fold through the same aggregates, so the
+watermark is not what decides which Month 3 rows to write. Every fold also
+marks the keywords it touched as pending. transform_probes_to_intelligence()
+writes the pending keywords — plus a carry-forward of every keyword on the
+first run of a new week — and clears them only after the writes succeed.
+A failed or interrupted write leaves them pending for the next run.
+
+Metrics cover a rolling window of the last PROBE_WINDOW_WEEKS weeks
+(default 4, the current week included), so recent probes move the weekly
+score the way the original "latest 500 probes" did. When the window moves
+on, buckets that fell out are dropped and every keyword is re-scored from
+the remaining ones; keywords with no probes left in the window drop out.
+Use rebuild=True (POST /api/m3/transform with "rebuild": true) to restart the
+aggregates from the probes currently stored.
+
 Can be triggered:
   - Manually via POST /api/m3/transform
   - Automatically by the scheduler after each GEO probe cycle
@@ -14,227 +36,338 @@ Can be triggered:
 
 import logging
 import os
-from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
+# Re-read this far behind the watermark so probes written slightly out of order aren't missed
+WATERMARK_OVERLAP = timedelta(minutes=5)
+WINDOW_WEEKS = max(1, int(os.environ.get('PROBE_WINDOW_WEEKS', '4')))
+
 
 def _week():
     return datetime.now(timezone.utc).strftime('%Y-W%W')
 
 
-def _load_raw_probes(brand: str = None, limit: int = 500) -> list:
-    """Load raw probe results from ai1stseo-geo-probes."""
+def _load_new_probes(brand: str, since: str = None) -> list:
+    """Probes for ``brand`` at or after ``since``, oldest first."""
     use_dynamo = not bool(os.environ.get("USE_RDS"))
     if use_dynamo:
-        from db_dynamo import get_probes
+        from db_dynamo import get_probes_since
     else:
-        from db import get_probes
-    return get_probes(limit=limit, brand=brand)
+        from db import get_probes_since
+    return get_probes_since(brand, since=since)
+
+
+def _week_start(dt: datetime) -> str:
+    """Bucket key: the Monday of ``dt``'s week (unlike %W, never split at New Year)."""
+    return (dt - timedelta(days=dt.weekday())).strftime('%Y-%m-%d')
+
+
+def _window_weeks() -> list:
+    """Bucket keys inside the scoring window, newest first."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return [_week_start(now - timedelta(weeks=i)) for i in range(WINDOW_WEEKS)]
+
+
+def _bucket() -> dict:
+    return {'total': 0, 'cited': 0, 'confidence_sum': 0.0, 'providers': {}}
+
+
+def _add_probe(bucket: dict, prov: str, cited: bool, confidence: float):
+    bucket['total'] += 1
+    bucket['cited'] += int(cited)
+    bucket['confidence_sum'] += confidence
+    stats = bucket['providers'].setdefault(prov, [0, 0])
+    stats[0] += 1
+    stats[1] += int(cited)
+
+
+def _merge(buckets) -> dict:
+    """Sum of weekly buckets."""
+    out = _bucket()
+    for b in buckets:
+        out['total'] += b['total']
+        out['cited'] += b['cited']
+        out['confidence_sum'] += b['confidence_sum']
+        for prov, (total, cited) in b['providers'].items():
+            stats = out['providers'].setdefault(prov, [0, 0])
+            stats[0] += total
+            stats[1] += cited
+    return out
+
 
+def _parse_ts(ts: str) -> datetime:
+    """ISO timestamp → naive UTC datetime (Dynamo rows are naive, RDS rows carry an offset)."""
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
 
-def transform_probes_to_intelligence(brand: str, competitors: list = None) -> dict:
+
+def _provider(p: dict) -> str:
+    return p.get('ai_model', p.get('ai_platform', 'unknown'))
+
+
+def _keyword_metrics(counts: dict) -> dict:
+    """geo_score / visibility / confidence from a keyword's counts over the window."""
+    providers = counts['providers']
+    cited_providers = [prov for prov, (_, cited) in providers.items() if cited]
+    total = counts['total']
+    return {
+        'geo_score': round(counts['cited'] / total, 2) if total else 0,
+        'visibility_score': round(len(cited_providers) / len(providers) * 100) if providers else 0,
+        'confidence': round(counts['confidence_sum'] / total, 2) if total else 0,
+        'total_probes': total,
+    }
+
+
+def update_probe_aggregates(brand: str, rebuild: bool = False) -> tuple:
+    """Fold probes newer than the brand's watermark into its weekly buckets.
+
+    Returns (summary, changed, new_probe_count) where ``changed`` maps each
+    keyword re-scored by this fold to its previous metrics (None if new).
+    Re-scored keywords — those with new probes, and every keyword when the
+    window has moved on — are also added to ``summary['pending']`` (keeping
+    the metrics last written to Month 3 for ones already pending) until
+    transform_probes_to_intelligence() publishes them.
+    ``rebuild=True`` drops the stored aggregates and replays the window's probes.
     """
-    Main bridge function. Reads raw probes, aggregates, writes to Month 3 tables.
+    from month3_systems.geo_brand_intelligence import ProbeAggregateStore
+    store = ProbeAggregateStore()
+    window = _window_weeks()
+
+    summary = None
+    if not rebuild:
+        summary = store.load_summary(brand)
+    if rebuild or (summary and 'weeks' not in summary):
+        # Aggregates from before the weekly buckets can't be split by week: start over
+        store.reset(brand)
+        summary = None
+    summary = summary or {
+        'brand': brand, 'watermark': None, 'recent_ids': [], 'weeks': {}, 'window': None,
+        'total': 0, 'cited': 0, 'providers': {}, 'keywords': {}, 'pending': {}, 'last_week': None,
+    }
+
+    if summary.get('watermark'):
+        since = (_parse_ts(summary['watermark']) - WATERMARK_OVERLAP).isoformat()
+    else:
+        since = window[-1]  # nothing older than the window is ever scored
+    seen = {pid for pid, _ in summary.get('recent_ids', [])}
+    probes = [p for p in _load_new_probes(brand, since) if str(p.get('id')) not in seen]
+    rolled = summary.get('window') != window[0]
+    if not probes and not rolled:
+        return summary, {}, 0
+
+    touched = {p.get('keyword', '') for p in probes} - {'', '__monitor__'}
+    if rolled:
+        touched |= set(summary['keywords'])
+    rows = store.get_keywords(brand, touched)
+
+    in_window = set(window)
+    for p in probes:
+        ts = p.get('probe_timestamp')
+        week = _week_start(_parse_ts(ts)) if ts else window[0]
+        if week not in in_window:
+            continue
+        prov = _provider(p)
+        cited = bool(p.get('cited'))
+        confidence = float(p.get('confidence', 0))
+        _add_probe(summary['weeks'].setdefault(week, _bucket()), prov, cited, confidence)
+
+        kw = p.get('keyword', '')
+        if kw not in touched:
+            continue
+        row = rows.setdefault(kw, {'keyword': kw, 'weeks': {}})
+        _add_probe(row['weeks'].setdefault(week, _bucket()), prov, cited, confidence)
+
+    summary['weeks'] = {w: b for w, b in summary['weeks'].items() if w in in_window}
+    totals = _merge(summary['weeks'].values())
+    summary.update(total=totals['total'], cited=totals['cited'],
+                   providers=totals['providers'], window=window[0])
+
+    changed = {}
+    for kw in touched:
+        row = rows.get(kw)
+        if row is not None:
+            row['weeks'] = {w: b for w, b in (row.get('weeks') or {}).items() if w in in_window}
+        counts = _merge(row['weeks'].values()) if row else None
+        if not counts or not counts['total']:
+            summary['keywords'].pop(kw, None)
+            summary['pending'].pop(kw, None)
+            continue
+        changed[kw] = summary['keywords'].get(kw)
+        summary['pending'].setdefault(kw, changed[kw])
+        summary['keywords'][kw] = _keyword_metrics(counts)
+
+    # Advance the watermark; remember ids inside the overlap window to skip them next time
+    stamped = [(str(p.get('id')), p.get('probe_timestamp', '')) for p in probes if p.get('probe_timestamp')]
+    if stamped:
+        watermark = max(_parse_ts(ts) for _, ts in stamped)
+        cutoff = watermark - WATERMARK_OVERLAP
+        recent = [(pid, ts) for pid, ts in summary.get('recent_ids', []) + stamped
+                  if _parse_ts(ts) >= cutoff]
+        summary['watermark'] = watermark.isoformat()
+        summary['recent_ids'] = [list(r) for r in dict(recent).items()]
+
+    store.save(brand, summary, list(rows.values()), touched)
+    return summary, changed, len(probes)
+
+
+def transform_probes_to_intelligence(brand: str, competitors: list = None,
+                                     rebuild: bool = False) -> dict:
+    """
+    Main bridge function. Folds new raw probes into the weekly aggregates,
+    then writes the Month 3 tables.
 
     Returns summary of what was written.
     """
     week = _week()
     results = {'week': week, 'brand': brand, 'status': 'complete'}
 
-    # 1. Load all raw probes for this brand
-    probes = _load_raw_probes(brand=brand, limit=500)
-    if not probes:
+    # 1. Fold probes newer than the watermark into the weekly buckets
+    summary, _, new_count = update_probe_aggregates(brand, rebuild=rebuild)
+    if not summary['total']:
         results['status'] = 'no_data'
         results['message'] = f'No probe data found for brand: {brand}'
         return results
 
-    # 2. Aggregate keyword-level metrics
-    kw_metrics = _aggregate_keyword_metrics(probes)
-
-    # 3. Write to Keyword Performance Register
-    kw_count = _write_keyword_performance(week, kw_metrics)
-    results['keywords_written'] = kw_count
-
-    # 4. Compute and write overall GEO Score Tracker
-    _write_geo_score_tracker(brand, week, probes, kw_metrics)
-    results['geo_tracker_updated'] = True
+    # 2. No pending keywords and this week's rows already written — no Month 3 writes needed
+    pending = summary.get('pending') or {}
+    new_week = summary.get('last_week') != week
+    if not pending and not new_week:
+        results['status'] = 'up_to_date'
+    else:
+        # 3. Write to Keyword Performance Register (pending keywords, or all on a new week)
+        # and the overall GEO Score Tracker; pending is cleared only once both succeed
+        keywords = summary['keywords'] if new_week else \
+            {kw: summary['keywords'][kw] for kw in pending if kw in summary['keywords']}
+        try:
+            results['keywords_written'] = _write_keyword_performance(week, keywords, pending)
+            _write_geo_score_tracker(brand, week, summary)
+            results['geo_tracker_updated'] = True
+        except Exception as e:
+            logger.error("Month 3 writes for %s failed, %d keywords stay pending: %s",
+                         brand, len(pending), e)
+            results['status'] = 'error'
+            results['error'] = str(e)[:300]
+        else:
+            from month3_systems.geo_brand_intelligence import ProbeAggregateStore
+            if not ProbeAggregateStore().mark_published(brand, summary, week):
+                logger.info("Aggregates for %s changed during the transform; "
+                            "the new keywords are written on the next run", brand)
+        results['keywords_pending'] = len(pending)
 
     # 5. Process competitors if provided
     if competitors:
         comp_count = _process_competitors(competitors, week)
         results['competitors_written'] = comp_count
 
-    results['total_probes_processed'] = len(probes)
+    results['total_probes_processed'] = new_count
+    results['total_probes_aggregated'] = summary['total']
+    results['watermark'] = summary.get('watermark')
     results['timestamp'] = datetime.now(timezone.utc).isoformat()
     return results
 
 
-def _aggregate_keyword_metrics(probes: list) -> dict:
-    """
-    Aggregate raw probes into per-keyword metrics.
+def _compute_trend(current_geo: float, previous: dict = None) -> str:
+    """Compare current geo_score to the last recorded one to determine trend."""
+    if previous:
+        prev = float(previous.get('geo_score', 0))
+        if current_geo > prev + 0.05:
+            return 'up'
+        elif current_geo < prev - 0.05:
+            return 'down'
+    return 'stable'
 
-    Returns: {keyword: {geo_score, visibility_score, confidence, cited_count, total, providers}}
-    """
-    kw_data = defaultdict(lambda: {
-        'cited': 0, 'total': 0, 'confidence_sum': 0.0,
-        'providers': set(), 'providers_cited': set(),
-    })
 
-    for p in probes:
-        kw = p.get('keyword', '')
-        if not kw or kw == '__monitor__':
-            continue
-        entry = kw_data[kw]
-        entry['total'] += 1
-        provider = p.get('ai_model', p.get('ai_platform', 'unknown'))
-        entry['providers'].add(provider)
-        if p.get('cited'):
-            entry['cited'] += 1
-            entry['providers_cited'].add(provider)
-        entry['confidence_sum'] += float(p.get('confidence', 0))
-
-    # Compute scores
-    metrics = {}
-    for kw, d in kw_data.items():
-        geo_score = round(d['cited'] / d['total'], 2) if d['total'] else 0
-        vis_score = round(len(d['providers_cited']) / len(d['providers']) * 100) if d['providers'] else 0
-        avg_conf = round(d['confidence_sum'] / d['total'], 2) if d['total'] else 0
-        metrics[kw] = {
+def _write_keyword_performance(week: str, kw_metrics: dict, previous: dict = None) -> int:
+    """Write keyword metrics to geo-keyword-performance table.
+
+    ``previous`` maps keywords to their last recorded metrics (from the
+    aggregate summary) so trends need no per-keyword history lookups.
+    Raises if any record could not be written, so the caller keeps them pending.
+    """
+    from month3_systems.geo_brand_intelligence import KeywordPerformanceRegister
+    previous = previous or {}
+    kpr = KeywordPerformanceRegister()
+    records = []
+    for kw, m in kw_metrics.items():
+        trend = _compute_trend(m['geo_score'], previous.get(kw))
+        priority = m['geo_score'] < 0.3 and m['total_probes'] >= 2
+        records.append({
             'keyword': kw,
-            'geo_score': geo_score,
-            'visibility_score': vis_score,
-            'confidence': avg_conf,
-            'cited_count': d['cited'],
-            'total_probes': d['total'],
-            'providers_queried': list(d['providers']),
-            'providers_cited': list(d['providers_cited']),
-        }
+            'geo_score': m['geo_score'],
+            'visibility_score': m['visibility_score'],
+            'confidence': m['confidence'],
+            'trend': trend,
+            'priority_flag': priority,
+        })
+    count = kpr.bulk_record(week, records)
+    if count < len(records):
+        raise RuntimeError(f'{len(records) - count} of {len(records)} keyword records not written')
+    logger.info("Wrote %d keyword records to performance register (week %s)", count, week)
+    return count
 
-    return metrics
 
+def _provider_scores(summary: dict) -> dict:
+    return {prov: round(cited / total, 2) if total else 0
+            for prov, (total, cited) in summary['providers'].items()}
 
-def _compute_trend(keyword: str, current_geo: float) -> str:
-    """Compare current geo_score to previous week to determine trend."""
-    try:
-        from month3_systems.geo_brand_intelligence import KeywordPerformanceRegister
-        kpr = KeywordPerformanceRegister()
-        history = kpr.get_keyword_history(keyword, limit=1)
-        if history:
-            prev = float(history[0].get('geo_score', 0))
-            if current_geo > prev + 0.05:
-                return 'up'
-            elif current_geo < prev - 0.05:
-                return 'down'
-        return 'stable'
-    except Exception:
-        return 'stable'
-
-
-def _write_keyword_performance(week: str, kw_metrics: dict) -> int:
-    """Write aggregated keyword metrics to geo-keyword-performance table."""
-    try:
-        from month3_systems.geo_brand_intelligence import KeywordPerformanceRegister
-        kpr = KeywordPerformanceRegister()
-        records = []
-        for kw, m in kw_metrics.items():
-            trend = _compute_trend(kw, m['geo_score'])
-            priority = m['geo_score'] < 0.3 and m['total_probes'] >= 2
-            records.append({
-                'keyword': kw,
-                'geo_score': m['geo_score'],
-                'visibility_score': m['visibility_score'],
-                'confidence': m['confidence'],
-                'trend': trend,
-                'priority_flag': priority,
-            })
-        count = kpr.bulk_record(week, records)
-        logger.info("Wrote %d keyword records to performance register (week %s)", count, week)
-        return count
-    except Exception as e:
-        logger.error("Failed to write keyword performance: %s", e)
-        return 0
 
+def _write_geo_score_tracker(brand: str, week: str, summary: dict):
+    """Compute overall GEO score from the brand's window and write to geo-score-tracker."""
+    from month3_systems.geo_brand_intelligence import GEOScoreTracker
 
-def _write_geo_score_tracker(brand: str, week: str, probes: list, kw_metrics: dict):
-    """Compute overall GEO score and write to geo-score-tracker table."""
-    try:
-        from month3_systems.geo_brand_intelligence import GEOScoreTracker
-
-        total_cited = sum(1 for p in probes if p.get('cited'))
-        total_probes = len(probes)
-        overall_geo = round(total_cited / total_probes, 2) if total_probes else 0
-
-        # Visibility: average across keywords
-        vis_scores = [m['visibility_score'] for m in kw_metrics.values()]
-        avg_vis = round(sum(vis_scores) / len(vis_scores)) if vis_scores else 0
-
-        # Per-provider breakdown
-        provider_stats = defaultdict(lambda: {'cited': 0, 'total': 0})
-        for p in probes:
-            prov = p.get('ai_model', p.get('ai_platform', 'unknown'))
-            provider_stats[prov]['total'] += 1
-            if p.get('cited'):
-                provider_stats[prov]['cited'] += 1
-        provider_scores = {
-            prov: round(d['cited'] / d['total'], 2) if d['total'] else 0
-            for prov, d in provider_stats.items()
-        }
-
-        tracker = GEOScoreTracker()
-        tracker.record_week(brand, {
-            'week': week,
-            'geo_score': overall_geo,
-            'visibility_score': avg_vis,
-            'keywords_probed': len(kw_metrics),
-            'keywords_cited': sum(1 for m in kw_metrics.values() if m['geo_score'] > 0),
-            'provider_scores': provider_scores,
-        })
-        logger.info("GEO Score Tracker updated: brand=%s week=%s geo=%.2f vis=%d",
-                     brand, week, overall_geo, avg_vis)
-    except Exception as e:
-        logger.error("Failed to write GEO score tracker: %s", e)
+    kw_metrics = summary['keywords']
+    total_probes = summary['total']
+    overall_geo = round(summary['cited'] / total_probes, 2) if total_probes else 0
+
+    # Visibility: average across keywords
+    vis_scores = [m['visibility_score'] for m in kw_metrics.values()]
+    avg_vis = round(sum(vis_scores) / len(vis_scores)) if vis_scores else 0
+
+    tracker = GEOScoreTracker()
+    tracker.record_week(brand, {
+        'week': week,
+        'geo_score': overall_geo,
+        'visibility_score': avg_vis,
+        'keywords_probed': len(kw_metrics),
+        'keywords_cited': sum(1 for m in kw_metrics.values() if m['geo_score'] > 0),
+        'provider_scores': _provider_scores(summary),
+    })
+    logger.info("GEO Score Tracker updated: brand=%s week=%s geo=%.2f vis=%d",
+                 brand, week, overall_geo, avg_vis)
+
+
+def competitor_matrix_entry(summary: dict) -> dict:
+    """Competitor Visibility Matrix row for a brand, from its aggregates."""
+    kw_metrics = summary['keywords']
+    total = summary['total']
+    top_kws = sorted(kw_metrics.items(), key=lambda kv: kv[1]['geo_score'], reverse=True)[:5]
+    return {
+        'visibility_score': round(summary['cited'] / total * 100) if total else 0,
+        'keywords_cited': sum(1 for m in kw_metrics.values() if m['geo_score'] > 0),
+        'total_keywords': len(kw_metrics),
+        'provider_breakdown': _provider_scores(summary),
+        'top_keywords': [kw for kw, _ in top_kws],
+    }
 
 
 def _process_competitors(competitors: list, week: str) -> int:
-    """Load probe data for competitors and write to competitor matrix."""
+    """Fold new competitor probes into their aggregates and write the competitor matrix."""
     count = 0
     try:
         from month3_systems.geo_brand_intelligence import CompetitorVisibilityMatrix
         matrix = CompetitorVisibilityMatrix()
 
+        entries = {}
         for comp in competitors:
-            probes = _load_raw_probes(brand=comp, limit=200)
-            if not probes:
-                continue
-            kw_metrics = _aggregate_keyword_metrics(probes)
-            total_cited = sum(1 for p in probes if p.get('cited'))
-            total = len(probes)
-            vis = round(total_cited / total * 100) if total else 0
-
-            # Provider breakdown
-            prov_stats = defaultdict(lambda: {'cited': 0, 'total': 0})
-            for p in probes:
-                prov = p.get('ai_model', 'unknown')
-                prov_stats[prov]['total'] += 1
-                if p.get('cited'):
-                    prov_stats[prov]['cited'] += 1
-
-            top_kws = sorted(kw_metrics.values(), key=lambda x: x['geo_score'], reverse=True)[:5]
-
-            matrix.record(comp, week, {
-                'visibility_score': vis,
-                'keywords_cited': sum(1 for m in kw_metrics.values() if m['geo_score'] > 0),
-                'total_keywords': len(kw_metrics),
-                'provider_breakdown': {
-                    prov: round(d['cited'] / d['total'], 2) if d['total'] else 0
-                    for prov, d in prov_stats.items()
-                },
-                'top_keywords': [k['keyword'] for k in top_kws],
-            })
-            count += 1
-            logger.info("Competitor matrix updated: %s week=%s vis=%d", comp, week, vis)
+            summary, _, _ = update_probe_aggregates(comp)
+            if summary['total']:
+                entries[comp] = competitor_matrix_entry(summary)
+        count = matrix.bulk_record(week, entries)
+        logger.info("Competitor matrix updated: %d competitors week=%s", count, week)
     except Exception as e:
         logger.error("Failed to process competitors: %s", e)
     return count
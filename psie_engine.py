@@ -0,0 +1,328 @@
+"""
+psie_engine.py
+Predictive SERP Intelligence Engine (PSIE) — feature extraction and scoring.
+
+Scoring is split into two stages so many keywords can be ranked against many
+pages without re-parsing anything:
+
+  1. extract_page_features()  — keyword-independent work (DOM walks, regex
+     passes, link classification). Done once per page and cached by
+     host + content hash, so the same HTML is never analysed twice. The
+     cached features carry no URL; it is attached per call.
+  2. keyword_signals() / score_matrix() — the four keyword-dependent signals
+     (substring matches and keyword density) are still computed in Python
+     for every (page, keyword) pair. The eight static signals are broadcast
+     into the (pages × keywords × signals) tensor, and the composite score,
+     predicted position and confidence run as one NumPy operation over it.
+
+psie_analyze_page() in app.py uses the same code path for single predictions,
+so /api/psie/predict and /api/psie/batch always agree.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+from urllib.parse import urlparse, urljoin
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+SIGNAL_ORDER = (
+    'title_keyword_match', 'meta_keyword_match', 'h1_keyword_match',
+    'content_depth', 'heading_structure', 'schema_richness',
+    'faq_density', 'answer_formatting', 'eeat_signals',
+    'internal_linking', 'keyword_density', 'external_authority',
+)
+
+SIGNAL_WEIGHTS = {
+    'title_keyword_match': 12, 'meta_keyword_match': 8, 'h1_keyword_match': 10,
+    'content_depth': 12, 'heading_structure': 8, 'schema_richness': 10,
+    'faq_density': 8, 'answer_formatting': 8, 'eeat_signals': 10,
+    'internal_linking': 5, 'keyword_density': 5, 'external_authority': 4,
+}
+
+# Keyword-independent signals, filled in by extract_page_features()
+STATIC_SIGNALS = (
+    'content_depth', 'heading_structure', 'schema_richness', 'faq_density',
+    'answer_formatting', 'eeat_signals', 'internal_linking', 'external_authority',
+)
+# Keyword-dependent signals, computed per (page, keyword) by _dynamic_signals()
+DYNAMIC_SIGNALS = ('title_keyword_match', 'meta_keyword_match', 'h1_keyword_match', 'keyword_density')
+
+FEATURE_CACHE_SIZE = 512
+
+_RE_SCHEMA_TYPE = re.compile(r'"@type"\s*:\s*"(\w+)"')
+_RE_DEFINITION = re.compile(r'\b(is a|refers to|is defined as|means that)\b')
+_RE_AUTHOR = re.compile(r'(author|written by|posted by|dr\.|phd)')
+_RE_DATE = re.compile(r'(202[4-6]|updated|as of|last modified)')
+_RE_CITATION = re.compile(r'(according to|source:|study|research shows|data from)')
+
+
+# ── Feature cache ────────────────────────────────────────────────────────── #
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def page_key(url: str, html: bytes) -> str:
+    """Cache key — link classification depends on the host, so it is part of the key."""
+    host = urlparse(url).netloc.lower()
+    return hashlib.sha256(host.encode() + b'\0' + (html or b'')).hexdigest()
+
+
+def cached_features(url: str, html: bytes):
+    """Previously extracted features for this exact page body, or None.
+
+    Two pages of one host can share a body, so the entry is URL-free and
+    ``url`` is set on the returned copy.
+    """
+    key = page_key(url, html)
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is None:
+            return None
+        _cache.move_to_end(key)
+        _cache_stats['hits'] += 1
+    return {**hit, 'url': url}
+
+
+def cache_stats() -> Dict:
+    with _cache_lock:
+        return {**_cache_stats, 'size': len(_cache), 'capacity': FEATURE_CACHE_SIZE}
+
+
+# ── Stage 1: keyword-independent features ────────────────────────────────── #
+
+def extract_page_features(url, soup, text, html: bytes = None) -> Dict:
+    """Everything PSIE needs from a page that does not depend on the keyword.
+
+    When ``html`` (the raw response body) is given the result is cached by
+    content hash.
+    """
+    key = None
+    if html is not None:
+        hit = cached_features(url, html)
+        if hit is not None:
+            return hit
+        key = page_key(url, html)
+
+    parsed = urlparse(url)
+    text_lower = text.lower()
+
+    title = soup.find('title')
+    title_text = (title.string.strip() if title and title.string else '').lower()
+    meta = soup.find('meta', attrs={'name': 'description'})
+    desc = (meta.get('content', '').strip().lower() if meta else '')
+    h1_text = ' '.join(h.get_text().lower() for h in soup.find_all('h1'))
+
+    word_count = len(text.split())
+    h2_count = len(soup.find_all('h2'))
+    h3_count = len(soup.find_all('h3'))
+
+    json_ld = soup.find_all('script', {'type': 'application/ld+json'})
+    schema_text = ' '.join(s.string or '' for s in json_ld).lower()
+    schema_types = len(_RE_SCHEMA_TYPE.findall(schema_text))
+
+    questions = text.count('?')
+    has_faq_schema = 'faqpage' in schema_text
+    has_definitions = bool(_RE_DEFINITION.search(text_lower))
+    list_count = len(soup.find_all(['ul', 'ol']))
+    table_count = len(soup.find_all('table'))
+    has_author = bool(_RE_AUTHOR.search(text_lower))
+    has_date = bool(_RE_DATE.search(text_lower))
+    has_citations = bool(_RE_CITATION.search(text_lower))
+
+    all_links = soup.find_all('a', href=True)
+    internal = sum(1 for l in all_links if parsed.netloc in urljoin(url, l.get('href', '')))
+    external = sum(1 for l in all_links
+                   if l.get('href', '').startswith('http') and parsed.netloc not in l.get('href', ''))
+
+    static = {
+        'content_depth': min(1.0, word_count / 2000),
+        'heading_structure': min(1.0, (h2_count * 0.15 + h3_count * 0.1)),
+        'schema_richness': min(1.0, schema_types * 0.25),
+        'faq_density': min(1.0, (questions * 0.1) + (0.3 if has_faq_schema else 0.0)),
+        'answer_formatting': min(1.0, (0.3 if has_definitions else 0.0) + list_count * 0.08 + table_count * 0.15),
+        'eeat_signals': (0.35 if has_author else 0.0) + (0.35 if has_date else 0.0) + (0.3 if has_citations else 0.0),
+        'internal_linking': min(1.0, internal * 0.1),
+        'external_authority': min(1.0, external * 0.15),
+    }
+
+    features = {
+        'title_text': title_text,
+        'desc': desc,
+        'h1_text': h1_text,
+        'text_lower': text_lower,
+        'word_count': word_count,
+        'static': static,
+    }
+
+    if key:
+        with _cache_lock:
+            _cache_stats['misses'] += 1
+            _cache[key] = features
+            _cache.move_to_end(key)
+            while len(_cache) > FEATURE_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return {**features, 'url': url}
+
+
+# ── Stage 2: keyword-dependent signals and scoring ───────────────────────── #
+
+def _match(haystack: str, kw_lower: str, words: List[str]) -> float:
+    if kw_lower in haystack:
+        return 1.0
+    return 0.5 if any(w in haystack for w in words) else 0.0
+
+
+def _dynamic_signals(features: Dict, kw_lower: str, words: List[str]) -> tuple:
+    """The four keyword-dependent signals, in DYNAMIC_SIGNALS order."""
+    kw_density = features['text_lower'].count(kw_lower) / max(features['word_count'], 1) * 100
+    return (
+        _match(features['title_text'], kw_lower, words),
+        _match(features['desc'], kw_lower, words),
+        _match(features['h1_text'], kw_lower, words),
+        1.0 if 0.5 <= kw_density <= 2.5 else (0.5 if kw_density < 0.5 else 0.3),
+    )
+
+
+def keyword_signals(features: Dict, keyword: str) -> Dict:
+    """Full 12-signal dict for one page/keyword pair, in SIGNAL_ORDER."""
+    kw_lower = keyword.lower()
+    dynamic = dict(zip(DYNAMIC_SIGNALS, _dynamic_signals(features, kw_lower, kw_lower.split())))
+    return {name: dynamic[name] if name in dynamic else features['static'][name] for name in SIGNAL_ORDER}
+
+
+def _predict_position(composite: float) -> int:
+    # Inverse of composite — higher score = lower position number = better rank
+    if composite >= 85: predicted_position = max(1, round(11 - composite / 10))
+    elif composite >= 70: predicted_position = round(15 - composite / 8)
+    elif composite >= 50: predicted_position = round(30 - composite / 5)
+    elif composite >= 30: predicted_position = round(50 - composite / 3)
+    else: predicted_position = round(80 - composite / 2)
+    return max(1, min(100, predicted_position))
+
+
+def score_signals(signals: Dict) -> Dict:
+    """Composite, predicted position and confidence for a single signal dict."""
+    composite = sum(signals[k] * SIGNAL_WEIGHTS[k] for k in signals) / sum(SIGNAL_WEIGHTS.values()) * 100
+
+    # Confidence based on signal consistency
+    signal_values = list(signals.values())
+    avg_signal = sum(signal_values) / len(signal_values)
+    variance = sum((s - avg_signal) ** 2 for s in signal_values) / len(signal_values)
+    confidence = max(30, min(95, round(85 - variance * 100)))
+
+    return {
+        'composite_score': round(composite, 1),
+        'predicted_position': _predict_position(composite),
+        'confidence': confidence,
+    }
+
+
+def score_matrix(signal_tensor):
+    """Vectorised score_signals over an (..., 12) array of signals in SIGNAL_ORDER.
+
+    Returns (composite, predicted_position, confidence) arrays shaped like the
+    leading dimensions of the input.
+    """
+    weights = np.array([SIGNAL_WEIGHTS[k] for k in SIGNAL_ORDER], dtype=float)
+    composite = signal_tensor @ weights / weights.sum() * 100
+
+    position = np.select(
+        [composite >= 85, composite >= 70, composite >= 50, composite >= 30],
+        [np.maximum(1, np.round(11 - composite / 10)),
+         np.round(15 - composite / 8),
+         np.round(30 - composite / 5),
+         np.round(50 - composite / 3)],
+        default=np.round(80 - composite / 2),
+    )
+    position = np.clip(position, 1, 100).astype(int)
+
+    variance = signal_tensor.var(axis=-1)
+    confidence = np.clip(np.round(85 - variance * 100), 30, 95).astype(int)
+    return composite, position, confidence
+
+
+def analyze(features: Dict, keyword: str) -> Dict:
+    """Single page/keyword prediction — the /api/psie/predict payload."""
+    signals = keyword_signals(features, keyword)
+    return {
+        'signals': {k: round(v, 3) for k, v in signals.items()},
+        **score_signals(signals),
+        'word_count': features['word_count'],
+    }
+
+
+def _signal_tensor(pages: List[Dict], keywords: List[str]):
+    """(pages × keywords × 12) signals. Static signals are broadcast; only the
+    four keyword-dependent ones are computed per pair."""
+    tensor = np.empty((len(pages), len(keywords), len(SIGNAL_ORDER)))
+    static_idx = [SIGNAL_ORDER.index(k) for k in STATIC_SIGNALS]
+    dynamic_idx = [SIGNAL_ORDER.index(k) for k in DYNAMIC_SIGNALS]
+    static = np.array([[p['static'][k] for k in STATIC_SIGNALS] for p in pages], dtype=float)
+    tensor[:, :, static_idx] = static[:, None, :]
+    prepared = [(kw.lower(), kw.lower().split()) for kw in keywords]
+    tensor[:, :, dynamic_idx] = np.array(
+        [[_dynamic_signals(p, kw_lower, words) for kw_lower, words in prepared] for p in pages],
+        dtype=float)
+    return tensor
+
+
+def batch_predict(pages: List[Dict], keywords: List[str], include_signals: bool = False) -> Dict:
+    """Score every page against every keyword.
+
+    ``pages`` is a list of extract_page_features() results. Returns per-pair
+    rows plus, for each keyword, the best-ranked page.
+    """
+    n_pages, n_kw = len(pages), len(keywords)
+    if not n_pages or not n_kw:
+        return {'results': [], 'best_by_keyword': {}}
+
+    if HAS_NUMPY:
+        tensor = _signal_tensor(pages, keywords)
+        composite, position, confidence = score_matrix(tensor)
+        composite = np.round(composite, 1).tolist()
+        position = position.tolist()
+        confidence = confidence.tolist()
+        if include_signals:
+            grid = [[dict(zip(SIGNAL_ORDER, tensor[i, j].tolist())) for j in range(n_kw)]
+                    for i in range(n_pages)]
+    else:
+        grid = [[keyword_signals(p, kw) for kw in keywords] for p in pages]
+        scored = [[score_signals(sig) for sig in row] for row in grid]
+        composite = [[s['composite_score'] for s in row] for row in scored]
+        position = [[s['predicted_position'] for s in row] for row in scored]
+        confidence = [[s['confidence'] for s in row] for row in scored]
+
+    results = []
+    best_by_keyword = {}
+    for j, kw in enumerate(keywords):
+        best = None
+        for i, page in enumerate(pages):
+            row = {
+                'url': page['url'],
+                'keyword': kw,
+                'composite_score': composite[i][j],
+                'predicted_position': position[i][j],
+                'confidence': confidence[i][j],
+            }
+            if include_signals:
+                row['signals'] = {k: round(v, 3) for k, v in grid[i][j].items()}
+            results.append(row)
+            if best is None or (row['predicted_position'], -row['composite_score']) < \
+                    (best['predicted_position'], -best['composite_score']):
+                best = row
+        best_by_keyword[kw] = {
+            'url': best['url'],
+            'predicted_position': best['predicted_position'],
+            'composite_score': best['composite_score'],
+        }
+    return {'results': results, 'best_by_keyword': best_by_keyword}
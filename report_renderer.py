@@ -0,0 +1,190 @@
+"""
+report_renderer.py
+Cached, section-by-section PDF rendering for downloadable reports.
+
+The directory export and the GEO intelligence / executive PDF used to
+rebuild the whole document from scratch on every download. ReportRenderer
+splits a report into Sections, each built from its own slice of input
+data, and caches whole documents keyed by a hash of every section's
+input: a repeat download of unchanged data is served from
+REPORT_CACHE_DIR without touching reportlab. The directory is shared by
+all workers on the host.
+
+Flowables are built fresh for every render. They carry per-build layout
+state, so sharing them between concurrent builds is unsafe, and layout —
+not construction — is where a render spends its time.
+
+Documents are written to a file and served with pdf_response(), which
+streams the file in chunks, so large exports never sit in a BytesIO that
+is then copied into the response.
+
+Usage:
+    renderer = ReportRenderer('geo-intel')
+    sections = [Section('title', {'brand': b}, build_title), ...]
+    path = renderer.render(sections)
+    return pdf_response(path, 'report.pdf')
+
+reportlab is optional; render() raises ImportError without it and callers
+keep their plain-text fallback.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate
+    HAS_REPORTLAB = True
+except ImportError:
+    HAS_REPORTLAB = False
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get('REPORT_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'ai1stseo-report-cache')
+CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_MB', '256')) * 1024 * 1024
+STREAM_CHUNK = 64 * 1024
+
+
+def fingerprint(data: Any) -> str:
+    """Stable hash of JSON-like ``data`` (dict order does not matter)."""
+    raw = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class Section:
+    """One part of a report, built from its own slice of input data.
+
+    ``build(data, styles)`` returns a list of platypus flowables. It must
+    depend only on ``data`` — that is what the document cache key is made of.
+    """
+
+    def __init__(self, name: str, data: Any, build: Callable[[Any, Any], List]):
+        self.name = name
+        self.data = data
+        self.build = build
+        self.key = f'{name}:{fingerprint(data)}'
+
+
+_styles = None
+_stats = {'documents_cached': 0, 'documents_rendered': 0,
+          'sections_built': 0, 'render_ms_total': 0.0}
+_stats_lock = threading.Lock()
+
+
+def _bump(**deltas):
+    with _stats_lock:
+        for k, v in deltas.items():
+            _stats[k] += v
+
+
+def _get_styles():
+    global _styles
+    if _styles is None:
+        _styles = getSampleStyleSheet()
+    return _styles
+
+
+class ReportRenderer:
+    """Renders a list of Sections to a cached PDF file."""
+
+    def __init__(self, kind: str, cache_dir: str = CACHE_DIR, pagesize=None, **doc_kwargs):
+        self.kind = kind
+        self.cache_dir = cache_dir
+        self.pagesize = pagesize
+        self.doc_kwargs = doc_kwargs
+
+    def document_key(self, sections: List[Section]) -> str:
+        return fingerprint([self.kind] + [s.key for s in sections])
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{self.kind}-{key[:32]}.pdf')
+
+    def render(self, sections: List[Section]) -> str:
+        """Path of the PDF for ``sections`` — from cache, or rendered now."""
+        if not HAS_REPORTLAB:
+            raise ImportError('reportlab is not installed')
+        path = self.path_for(self.document_key(sections))
+        if os.path.exists(path):
+            _bump(documents_cached=1)
+            try:
+                os.utime(path)  # LRU eviction goes by mtime
+            except OSError:
+                pass
+            return path
+
+        t0 = time.perf_counter()
+        styles = _get_styles()
+        flowables = []
+        for s in sections:
+            flowables.extend(s.build(s.data, styles))
+        _bump(sections_built=len(sections))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        doc = SimpleDocTemplate(tmp, pagesize=self.pagesize or letter, **self.doc_kwargs)
+        doc.build(flowables)
+        os.replace(tmp, path)
+        _bump(documents_rendered=1, render_ms_total=(time.perf_counter() - t0) * 1000)
+        _evict(self.cache_dir)
+        return path
+
+    def render_bytes(self, sections: List[Section]) -> bytes:
+        with open(self.render(sections), 'rb') as f:
+            return f.read()
+
+
+def _evict(cache_dir: str):
+    """Drop least recently used documents once the cache exceeds CACHE_MAX_BYTES."""
+    try:
+        entries = [e for e in os.scandir(cache_dir) if e.name.endswith('.pdf')]
+    except OSError:
+        return
+    total = sum(e.stat().st_size for e in entries)
+    if total <= CACHE_MAX_BYTES:
+        return
+    for e in sorted(entries, key=lambda e: e.stat().st_mtime):
+        try:
+            size = e.stat().st_size
+            os.remove(e.path)
+            total -= size
+        except OSError:
+            continue
+        if total <= CACHE_MAX_BYTES * 0.8:
+            break
+
+
+def stream(f, chunk_size: int = STREAM_CHUNK) -> Iterator[bytes]:
+    """Yield open file ``f`` in chunks, closing it at the end."""
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def pdf_response(path: str, filename: str):
+    """Streamed attachment response for a rendered report."""
+    from flask import Response
+    f = open(path, 'rb')  # opened now, so a concurrent eviction can't pull it mid-response
+    return Response(
+        stream(f),
+        mimetype='application/pdf',
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Content-Length': str(os.fstat(f.fileno()).st_size),
+        },
+    )
+
+
+def renderer_stats() -> Dict:
+    with _stats_lock:
+        s = dict(_stats)
+    s['render_ms_total'] = round(s['render_ms_total'], 1)
+    return s
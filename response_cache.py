@@ -0,0 +1,248 @@
+"""
+response_cache.py
+Tenant-aware cache for read-heavy GET endpoints, invalidated by the writers.
+
+Dashboards poll endpoints such as /api/geo-probe/history, /api/dir/* and
+/api/sports/* constantly, and each poll used to re-run the same queries.
+Decorating a view with @cached('namespace') stores its 200 response keyed
+by namespace + path + query string + project id (X-Project-Id header or
+project_id arg), so tenants never see each other's entries.
+
+  - In-process LRU (RESPONSE_CACHE_MAX_ENTRIES) with a per-view TTL.
+  - Optional shared backend: with REDIS_URL (or RESPONSE_CACHE_REDIS_URL)
+    set and redis installed, entries and invalidations are shared by every
+    worker and instance. Redis errors fall back to the local LRU.
+  - Write-through invalidation: writers (insert_probe, create_item,
+    bulk_upsert_items, ...) call invalidate('namespace'), which bumps the
+    namespace's generation. The generation is part of every key, so all
+    of that namespace's entries stop matching at once. Without Redis the
+    generations are per process: under the Procfile's gunicorn (4 workers)
+    a write invalidates only the worker that handled it, and the other
+    three keep serving their entries until the TTL runs out. Set REDIS_URL
+    wherever more than one process serves these endpoints.
+  - Only 200 responses are stored, so views report backend failures with
+    a non-200 status rather than a 200 with empty data.
+  - Every response gets an ETag and Cache-Control: private, no-cache, so
+    polling clients revalidate with If-None-Match and get a 304.
+
+RESPONSE_CACHE=0 disables caching; views then run on every request.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Optional
+
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get('RESPONSE_CACHE', '1').lower() not in ('0', 'false', 'no')
+REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL') or os.environ.get('REDIS_URL', '')
+MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+MAX_BODY_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BODY_KB', '2048')) * 1024
+DEFAULT_TTL = 30
+KEY_PREFIX = 'rc:'
+
+_entries: 'OrderedDict[str, Dict]' = OrderedDict()
+_generations = defaultdict(int)
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'shared_hits': 0, 'not_modified': 0,
+          'invalidations': 0, 'shared_errors': 0}
+_redis = None
+
+
+def _bump(**deltas):
+    with _lock:
+        for k, v in deltas.items():
+            _stats[k] += v
+
+
+def _shared():
+    """Redis client, or None when no shared backend is configured."""
+    global _redis
+    if not (HAS_REDIS and REDIS_URL):
+        return None
+    if _redis is None:
+        _redis = redis.from_url(REDIS_URL, socket_timeout=0.25, socket_connect_timeout=0.25)
+    return _redis
+
+
+def project_id() -> str:
+    """Tenant the current request belongs to ('' when unscoped)."""
+    from flask import request
+    return request.headers.get('X-Project-Id') or request.args.get('project_id') or ''
+
+
+# ── Generations (invalidation) ───────────────────────────────────────────── #
+
+def _generation(namespace: str) -> str:
+    local = _generations[namespace]
+    r = _shared()
+    if r is None:
+        return str(local)
+    try:
+        return f'{local}.{int(r.get(f"{KEY_PREFIX}gen:{namespace}") or 0)}'
+    except Exception as e:
+        _bump(shared_errors=1)
+        logger.debug("Response cache generation read failed: %s", e)
+        return f'{local}.x'
+
+
+def invalidate(*namespaces: str):
+    """Drop every cached response of ``namespaces``. Never raises — writers call it."""
+    with _lock:
+        for ns in namespaces:
+            _generations[ns] += 1
+        _stats['invalidations'] += len(namespaces)
+    r = _shared()
+    if r is None:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        for ns in namespaces:
+            pipe.incr(f'{KEY_PREFIX}gen:{ns}')
+        pipe.execute()
+    except Exception as e:
+        _bump(shared_errors=1)
+        logger.warning("Response cache shared invalidation failed: %s", e)
+
+
+def invalidates(*namespaces: str):
+    """Decorator for write functions: invalidate ``namespaces`` once the write returns.
+
+    Runs after the function's own transaction has committed, so a reader
+    can't re-cache the old data in between; also runs if it raised, since
+    part of the write may have landed.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                invalidate(*namespaces)
+        return wrapper
+    return decorator
+
+
+# ── Entries ──────────────────────────────────────────────────────────────── #
+
+def _get(key: str) -> Optional[Dict]:
+    now = time.time()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            if entry['expires'] > now:
+                _entries.move_to_end(key)
+                return entry
+            del _entries[key]
+    r = _shared()
+    if r is None:
+        return None
+    try:
+        raw = r.get(KEY_PREFIX + key)
+    except Exception as e:
+        _bump(shared_errors=1)
+        logger.debug("Response cache shared read failed: %s", e)
+        return None
+    if not raw:
+        return None
+    head, _, body = raw.partition(b'\n')
+    entry = {**json.loads(head), 'body': body}
+    _put_local(key, entry)
+    _bump(shared_hits=1)
+    return entry
+
+
+def _put_local(key: str, entry: Dict):
+    with _lock:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def _put(key: str, entry: Dict, ttl: int):
+    _put_local(key, entry)
+    r = _shared()
+    if r is None:
+        return
+    head = json.dumps({k: v for k, v in entry.items() if k != 'body'}).encode('utf-8')
+    try:
+        r.set(KEY_PREFIX + key, head + b'\n' + entry['body'], ex=ttl)
+    except Exception as e:
+        _bump(shared_errors=1)
+        logger.debug("Response cache shared write failed: %s", e)
+
+
+def _request_key(namespace: str, extra) -> str:
+    from flask import request
+    args = sorted((k, v) for k, vs in request.args.lists() for v in vs)
+    raw = json.dumps([namespace, _generation(namespace), request.path, args,
+                      project_id(), extra], default=str, separators=(',', ':'))
+    return f'{namespace}:{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]}'
+
+
+# ── Decorator ────────────────────────────────────────────────────────────── #
+
+def cached(namespace: str, ttl: int = DEFAULT_TTL, vary: Callable = None):
+    """Cache a GET view's 200 responses under ``namespace``.
+
+    ``vary`` is an optional zero-argument callable whose result joins the
+    key — e.g. the mtime of a file the view reads, for data written by
+    another program that can't call invalidate().
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import Response, make_response, request
+            if not ENABLED or request.method != 'GET':
+                return view(*args, **kwargs)
+            key = _request_key(namespace, vary() if vary else None)
+            entry = _get(key)
+            if entry is not None:
+                _bump(hits=1)
+                state = 'HIT'
+            else:
+                rv = make_response(view(*args, **kwargs))
+                if rv.status_code != 200 or rv.is_streamed:
+                    return rv
+                body = rv.get_data()
+                if len(body) > MAX_BODY_BYTES:
+                    return rv
+                entry = {'body': body, 'mimetype': rv.mimetype,
+                         'etag': hashlib.sha256(body).hexdigest()[:32],
+                         'expires': time.time() + ttl}
+                _put(key, entry, ttl)
+                _bump(misses=1)
+                state = 'MISS'
+            resp = Response(entry['body'], status=200, mimetype=entry['mimetype'])
+            resp.set_etag(entry['etag'])
+            resp.headers['Cache-Control'] = 'private, no-cache'
+            resp.headers['Vary'] = 'X-Project-Id'
+            resp.headers['X-Cache'] = state
+            resp = resp.make_conditional(request)
+            if resp.status_code == 304:
+                _bump(not_modified=1)
+            return resp
+        return wrapper
+    return decorator
+
+
+def response_cache_stats() -> Dict:
+    with _lock:
+        s = dict(_stats)
+        s['entries'] = len(_entries)
+    s['shared_backend'] = 'redis' if _shared() is not None else None
+    s['enabled'] = ENABLED
+    return s
@@ -1,25 +1,39 @@
 """
 scheduler.py
 Background scheduler — runs scraper + GEO monitoring probes on a timer.
-Starts as a daemon thread inside the Flask app so it runs continuously on App Runner.
+Jobs run on the shared leader-elected JobScheduler (job_scheduler.py), so
+only one gunicorn worker runs them even though every worker starts it.
 
 Schedules:
-  - Business directory scraper: every 24 hours
-  - GEO brand monitoring probes: every 6 hours (for registered brands)
+  - Business directory scraper: every SCRAPER_INTERVAL_HOURS (12h)
+  - GEO brand monitoring probes: every GEO_PROBE_INTERVAL_HOURS (3h), one
+    job per registered brand, phases spread across the interval
+  - Sports sync: every SPORTS_SYNC_INTERVAL_HOURS (2h)
+  - Public live-stats snapshot: every LIVE_STATS_REFRESH_SECONDS (120s)
+  - Growth dashboard KPI snapshots: every GROWTH_KPI_REFRESH_SECONDS (300s)
 
 Monitored brands are persisted to DynamoDB so they survive restarts
 and are shared across all gunicorn workers.
 """
 
-import json
+import functools
 import logging
 import os
 import threading
-import time
 from datetime import datetime, timezone
 
+from job_scheduler import get_job_scheduler
+
 logger = logging.getLogger(__name__)
 
+# Configurable via environment variables
+SCRAPER_INTERVAL = int(os.environ.get('SCRAPER_INTERVAL_HOURS', 12)) * 3600
+GEO_PROBE_INTERVAL = int(os.environ.get('GEO_PROBE_INTERVAL_HOURS', 3)) * 3600
+SPORTS_SYNC_INTERVAL = int(os.environ.get('SPORTS_SYNC_INTERVAL_HOURS', 2)) * 3600
+BRAND_SYNC_INTERVAL = 600  # pick up newly registered / unregistered brands
+LIVE_STATS_INTERVAL = int(os.environ.get('LIVE_STATS_REFRESH_SECONDS', 120))
+KPI_REFRESH_INTERVAL = int(os.environ.get('GROWTH_KPI_REFRESH_SECONDS', 300))
+
 _scheduler_started = False
 _lock = threading.Lock()
 
@@ -32,8 +46,8 @@ MONITOR_PREFIX = 'MONITOR#'
 def _get_dynamo_table():
     """Get the DynamoDB table for monitored brands."""
     try:
-        import boto3
-        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        from aws_clients import get_resource
+        dynamodb = get_resource('dynamodb', 'us-east-1')
         return dynamodb.Table(MONITOR_TABLE)
     except Exception as e:
         logger.warning("DynamoDB monitor table unavailable: %s", e)
@@ -158,95 +172,90 @@ def _run_sports_sync():
         logger.error("Scheduled sports sync failed: %s", e)
 
 
-def _run_geo_probes():
-    """Run GEO probes for all registered brands, then transform to Month 3 tables."""
-    brands = get_monitored_brands()
-    if not brands:
-        logger.info("No brands registered for monitoring, skipping GEO probes")
-        return
-
-    logger.info("Running GEO probes for %d registered brands", len(brands))
-    try:
-        from geo_probe_service import geo_probe_batch
-        for entry in brands:
-            try:
-                brand = entry.get("brand", "")
-                keywords = entry.get("keywords", [])
-                provider = entry.get("provider", "nova")
-                if not brand or not keywords:
-                    continue
-                result = geo_probe_batch(brand, keywords, ai_model=provider)
-                score = result.get("geo_score", 0)
-                cited = result.get("cited_count", 0)
-                total = result.get("total_prompts", 0)
-                logger.info("GEO probe [%s]: score=%.2f cited=%d/%d",
-                            brand, score, cited, total)
-            except Exception as e:
-                logger.error("GEO probe failed for %s: %s", entry.get("brand"), e)
-    except Exception as e:
-        logger.error("Scheduled GEO probes failed: %s", e)
+def _run_geo_probe_for_brand(brand: str, keywords: list, provider: str = "nova"):
+    """Run GEO probes for one brand, then transform to Month 3 tables."""
+    from geo_probe_service import geo_probe_batch
+    result = geo_probe_batch(brand, keywords, ai_model=provider)
+    logger.info("GEO probe [%s]: score=%.2f cited=%d/%d", brand,
+                result.get("geo_score", 0), result.get("cited_count", 0),
+                result.get("total_prompts", 0))
 
     # Transform raw probes → Month 3 intelligence tables
     try:
         from probe_to_intelligence import transform_probes_to_intelligence
-        for entry in brands:
-            brand = entry.get("brand", "")
-            if brand:
-                result = transform_probes_to_intelligence(brand)
-                logger.info("Probe→Intelligence transform [%s]: %s", brand, result.get("status"))
+        result = transform_probes_to_intelligence(brand)
+        logger.info("Probe→Intelligence transform [%s]: %s", brand, result.get("status"))
     except Exception as e:
-        logger.error("Probe→Intelligence transform failed: %s", e)
+        logger.error("Probe→Intelligence transform failed for %s: %s", brand, e)
 
 
-def _scheduler_loop():
-    """Main scheduler loop — runs forever in a background thread."""
-    # Configurable via environment variables — increased frequency for more data points
-    SCRAPER_INTERVAL = int(os.environ.get('SCRAPER_INTERVAL_HOURS', 12)) * 3600
-    GEO_PROBE_INTERVAL = int(os.environ.get('GEO_PROBE_INTERVAL_HOURS', 3)) * 3600
-    SPORTS_SYNC_INTERVAL = int(os.environ.get('SPORTS_SYNC_INTERVAL_HOURS', 2)) * 3600
+def _run_live_stats_refresh():
+    """Recompute the main page's public live-stats snapshot."""
+    try:
+        from deepthi_intelligence.public_stats_api import refresh_live_stats
+        refresh_live_stats()
+    except Exception as e:
+        logger.error("Live-stats refresh failed: %s", e)
 
-    last_scrape = 0
-    last_geo = 0
-    last_sports = 0
 
-    # Wait 60s after startup before first run to let the app fully initialize
-    time.sleep(60)
-    logger.info(
-        "Scheduler started — scraper every %dh, GEO probes every %dh, sports sync every %dh",
-        SCRAPER_INTERVAL // 3600, GEO_PROBE_INTERVAL // 3600, SPORTS_SYNC_INTERVAL // 3600
-    )
+def _run_kpi_refresh():
+    """Recompute the growth dashboard's KPI snapshots."""
+    try:
+        from growth.growth_dashboard import refresh_kpis
+        refresh_kpis()
+    except Exception as e:
+        logger.error("KPI refresh failed: %s", e)
 
-    while True:
-        now = time.time()
-        try:
-            if now - last_scrape >= SCRAPER_INTERVAL:
-                logger.info("Running scheduled scraper...")
-                _run_scraper()
-                last_scrape = now
-
-            if now - last_geo >= GEO_PROBE_INTERVAL:
-                logger.info("Running scheduled GEO probes...")
-                _run_geo_probes()
-                last_geo = now
-
-            if now - last_sports >= SPORTS_SYNC_INTERVAL:
-                logger.info("Running scheduled sports sync...")
-                _run_sports_sync()
-                last_sports = now
-        except Exception as e:
-            logger.error("Scheduler loop error: %s", e)
 
-        # Sleep 2 minutes between checks (reduced from 5 for faster response)
-        time.sleep(120)
+def _sync_brand_jobs():
+    """Reconcile one GEO probe job per registered brand.
+
+    Each brand job gets a random phase across the whole probe interval, so a
+    large brand list is spread out instead of probing every brand at once.
+    """
+    brands = get_monitored_brands()
+    scheduler = get_job_scheduler()
+    names = []
+    for entry in brands:
+        brand = entry.get("brand", "")
+        keywords = entry.get("keywords", [])
+        if not brand or not keywords:
+            continue
+        name = f"geo-probe:{brand}"
+        names.append(name)
+        scheduler.register(
+            name,
+            functools.partial(_run_geo_probe_for_brand, brand, keywords, entry.get("provider", "nova")),
+            GEO_PROBE_INTERVAL, jitter=1.0, initial_delay=0, group="geo-probe",
+        )
+    removed = scheduler.unregister_group("geo-probe", keep=names)
+    logger.info("GEO probe jobs synced: %d brands, %d removed", len(names), removed)
 
 
 def start_scheduler():
-    """Start the background scheduler thread (idempotent)."""
+    """Register the background jobs and start the shared scheduler (idempotent).
+
+    Every gunicorn worker calls this; only the worker holding the scheduler
+    lease actually runs jobs.
+    """
     global _scheduler_started
     with _lock:
         if _scheduler_started:
             return
         _scheduler_started = True
-    t = threading.Thread(target=_scheduler_loop, daemon=True, name="bg-scheduler")
-    t.start()
-    logger.info("Background scheduler thread started")
+    scheduler = get_job_scheduler()
+    scheduler.register("directory-scraper", _run_scraper, SCRAPER_INTERVAL)
+    scheduler.register("sports-sync", _run_sports_sync, SPORTS_SYNC_INTERVAL)
+    scheduler.register("geo-probe-sync", _sync_brand_jobs, BRAND_SYNC_INTERVAL)
+    scheduler.register("live-stats", _run_live_stats_refresh, LIVE_STATS_INTERVAL, initial_delay=0)
+    scheduler.register("kpi-dashboard", _run_kpi_refresh, KPI_REFRESH_INTERVAL, jitter=0.2)
+    scheduler.start()
+    logger.info(
+        "Background scheduler started — scraper every %dh, GEO probes every %dh, sports sync every %dh",
+        SCRAPER_INTERVAL // 3600, GEO_PROBE_INTERVAL // 3600, SPORTS_SYNC_INTERVAL // 3600
+    )
+
+
+def get_scheduler_status():
+    """Scheduler, lease and per-job status (next run, last duration, last error)."""
+    return {"scheduler_running": _scheduler_started, **get_job_scheduler().status()}
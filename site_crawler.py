@@ -0,0 +1,800 @@
+"""
+site_crawler.py
+Bulk site crawl mode for the SEO analyzer.
+
+Runs the same category analyzers as /api/analyze over a whole site:
+  1. Frontier seeded from robots.txt Sitemap: lines and /sitemap.xml
+     (sitemap indexes are followed), plus the start URL
+  2. Concurrent fetching with a per-host concurrency cap and politeness delay
+  3. URL canonicalisation + dedupe (fragments, tracking params, default ports,
+     rel=canonical) so every page is audited once
+  4. Incremental re-audit — a page whose content hash matches the last crawl
+     reuses its stored summary and outlinks instead of being re-analysed
+  5. Site-level aggregates and a job/progress API backed by SQLite, so any
+     gunicorn worker on the host can report on a job started by another
+
+Site-wide resources the analyzers request for every page (robots.txt,
+sitemap.xml, llms.txt) are fetched once per job through SharedFetchCache.
+
+The audit function itself is injected by app.py so this module does not
+import the Flask app.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse, urlunparse, urljoin, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+IS_LAMBDA = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
+DB_DIR = '/tmp' if IS_LAMBDA else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+CRAWL_DB_PATH = os.environ.get('CRAWL_DB_PATH', os.path.join(DB_DIR, 'site_crawls.db'))
+
+USER_AGENT = 'Mozilla/5.0 (compatible; AI1stSEO-Crawler/1.0; +https://ai1stseo.com)'
+MAX_PAGES_LIMIT = int(os.environ.get('CRAWL_MAX_PAGES_LIMIT', '10000'))
+DEFAULT_MAX_PAGES = 500
+DEFAULT_WORKERS = int(os.environ.get('CRAWL_WORKERS', '8'))
+DEFAULT_PER_HOST = int(os.environ.get('CRAWL_PER_HOST', '4'))
+DEFAULT_DELAY = float(os.environ.get('CRAWL_DELAY', '0.2'))
+MIN_DELAY, MAX_DELAY = 0.1, 10.0  # politeness delay bounds for caller-supplied values
+MAX_WORKERS_LIMIT, MAX_PER_HOST_LIMIT = 16, 8
+MAX_CONCURRENT_CRAWLS = int(os.environ.get('CRAWL_MAX_CONCURRENT', '4'))  # running jobs per worker
+PAGE_FLUSH_EVERY = 25
+SITEMAP_MAX_DEPTH = 3
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', '_ga', 'yclid'}
+SKIP_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.pdf', '.zip', '.gz',
+    '.mp4', '.mp3', '.mov', '.avi', '.css', '.js', '.json', '.xml', '.txt', '.woff',
+    '.woff2', '.ttf', '.eot', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+)
+
+
+# ── URL canonicalisation ─────────────────────────────────────────────────── #
+
+def canonicalize_url(url: str, base: str = None) -> Optional[str]:
+    """Normalise a URL for dedupe. Returns None for non-HTTP or asset URLs."""
+    if not url:
+        return None
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return None
+
+    host = parsed.hostname.lower() if parsed.hostname else ''
+    port = parsed.port
+    if port and not ((parsed.scheme == 'http' and port == 80) or (parsed.scheme == 'https' and port == 443)):
+        host = f'{host}:{port}'
+
+    path = re.sub(r'/{2,}', '/', parsed.path or '/')
+    if path.lower().endswith(SKIP_EXTENSIONS):
+        return None
+
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+    return urlunparse((parsed.scheme.lower(), host, path, '', urlencode(query), ''))
+
+
+def site_key(url: str) -> str:
+    """Host used to scope a crawl and its stored page state (www. is ignored)."""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body or b'').hexdigest()
+
+
+# ── Shared per-job fetch cache ───────────────────────────────────────────── #
+
+_local = threading.local()
+
+
+class SharedFetchCache:
+    """Memoises site-wide GETs (robots.txt, sitemap.xml, llms.txt) for one job.
+
+    Concurrent callers for the same URL wait on the first fetch instead of
+    issuing their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, object] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str, fetcher: Callable[[], object]):
+        with self._lock:
+            if url in self._entries:
+                self.hits += 1
+                return self._entries[url]
+            event = self._events.get(url)
+            owner = event is None
+            if owner:
+                event = self._events[url] = threading.Event()
+                self.misses += 1
+        if not owner:
+            event.wait(timeout=30)
+            with self._lock:
+                self.hits += 1
+                return self._entries.get(url)
+        try:
+            value = fetcher()
+        except Exception:
+            value = None
+        with self._lock:
+            self._entries[url] = value
+        event.set()
+        return value
+
+
+def active_fetch_cache() -> Optional[SharedFetchCache]:
+    """The SharedFetchCache bound to the current crawl worker thread, if any."""
+    return getattr(_local, 'cache', None)
+
+
+# ── Per-host politeness ──────────────────────────────────────────────────── #
+
+class HostLimiter:
+    """Caps concurrent requests per host and spaces request starts by ``delay``."""
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST, delay: float = DEFAULT_DELAY):
+        self.per_host = max(1, per_host)
+        self.delay = max(0.0, delay)
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def _sem(self, host):
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def acquire(self, host: str):
+        self._sem(host).acquire()
+        if self.delay:
+            with self._lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot.get(host, 0.0))
+                self._next_slot[host] = slot + self.delay
+            if slot > now:
+                time.sleep(slot - now)
+
+    def release(self, host: str):
+        self._sem(host).release()
+
+
+# ── Persistence ──────────────────────────────────────────────────────────── #
+
+class CrawlStore:
+    """SQLite store for crawl jobs and per-page content hashes."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or CRAWL_DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._write_lock = threading.Lock()
+        self.init_database()
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        conn = self.get_connection()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    site TEXT NOT NULL,
+                    start_url TEXT NOT NULL,
+                    project_id TEXT,
+                    status TEXT NOT NULL,
+                    options_json TEXT,
+                    pages_discovered INTEGER DEFAULT 0,
+                    pages_audited INTEGER DEFAULT 0,
+                    pages_skipped INTEGER DEFAULT 0,
+                    pages_failed INTEGER DEFAULT 0,
+                    aggregates_json TEXT,
+                    error TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    completed_at TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_pages (
+                    site TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    content_hash TEXT,
+                    status_code INTEGER,
+                    summary_json TEXT,
+                    links_json TEXT,
+                    last_job_id TEXT,
+                    audited_at TEXT,
+                    checked_at TEXT,
+                    PRIMARY KEY (site, url)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_crawl_pages_job ON crawl_pages(last_job_id)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create_job(self, job_id, site, start_url, options, project_id=None):
+        now = datetime.utcnow().isoformat()
+        with self._write_lock:
+            conn = self.get_connection()
+            try:
+                conn.execute(
+                    'INSERT INTO crawl_jobs (job_id, site, start_url, project_id, status, options_json, '
+                    'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (job_id, site, start_url, project_id or '', 'pending', json.dumps(options), now, now))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def update_job(self, job_id, **fields):
+        if not fields:
+            return
+        fields['updated_at'] = datetime.utcnow().isoformat()
+        for key in ('aggregates', 'options'):
+            if key in fields:
+                fields[f'{key}_json'] = json.dumps(fields.pop(key), default=str)
+        cols = ', '.join(f'{k} = ?' for k in fields)
+        with self._write_lock:
+            conn = self.get_connection()
+            try:
+                conn.execute(f'UPDATE crawl_jobs SET {cols} WHERE job_id = ?', (*fields.values(), job_id))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_job(self, job_id) -> Optional[Dict]:
+        conn = self.get_connection()
+        try:
+            row = conn.execute('SELECT * FROM crawl_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        job = dict(row)
+        for key in ('options', 'aggregates'):
+            raw = job.pop(f'{key}_json', None)
+            job[key] = json.loads(raw) if raw else {}
+        return job
+
+    def list_jobs(self, site=None, limit=20, project_id=None) -> List[Dict]:
+        clauses, params = [], []
+        if site:
+            clauses.append('site = ?')
+            params.append(site)
+        if project_id is not None:
+            clauses.append('project_id = ?')
+            params.append(project_id)
+        where = f'WHERE {" AND ".join(clauses)} ' if clauses else ''
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(f'SELECT job_id FROM crawl_jobs {where}ORDER BY created_at DESC LIMIT ?',
+                                params + [limit]).fetchall()
+        finally:
+            conn.close()
+        return [self.get_job(r['job_id']) for r in rows]
+
+    def load_page_hashes(self, site) -> Dict[str, Dict]:
+        """Previous content hash, summary and links for every known page of a site."""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                'SELECT url, content_hash, summary_json, links_json, audited_at FROM crawl_pages WHERE site = ?',
+                (site,)).fetchall()
+        finally:
+            conn.close()
+        return {r['url']: dict(r) for r in rows}
+
+    def save_pages(self, site, job_id, pages: List[Dict]):
+        """Batch-upsert page rows in a single transaction."""
+        if not pages:
+            return
+        now = datetime.utcnow().isoformat()
+        rows = [
+            (site, p['url'], p.get('content_hash'), p.get('status_code'),
+             json.dumps(p.get('summary') or {}, default=str), json.dumps(p.get('links') or []),
+             job_id, p.get('audited_at') or now, now)
+            for p in pages
+        ]
+        with self._write_lock:
+            conn = self.get_connection()
+            try:
+                conn.executemany('''
+                    INSERT INTO crawl_pages (site, url, content_hash, status_code, summary_json, links_json,
+                                             last_job_id, audited_at, checked_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(site, url) DO UPDATE SET
+                        content_hash = excluded.content_hash,
+                        status_code = excluded.status_code,
+                        summary_json = excluded.summary_json,
+                        links_json = excluded.links_json,
+                        last_job_id = excluded.last_job_id,
+                        audited_at = excluded.audited_at,
+                        checked_at = excluded.checked_at
+                ''', rows)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_job_pages(self, job_id, limit=100, offset=0, order='score') -> List[Dict]:
+        order_sql = {
+            'score': "json_extract(summary_json, '$.overallScore') ASC",
+            'url': 'url ASC',
+        }.get(order, 'url ASC')
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(
+                f'SELECT url, content_hash, status_code, summary_json, audited_at, checked_at '
+                f'FROM crawl_pages WHERE last_job_id = ? ORDER BY {order_sql} LIMIT ? OFFSET ?',
+                (job_id, limit, offset)).fetchall()
+        finally:
+            conn.close()
+        out = []
+        for r in rows:
+            d = dict(r)
+            d['summary'] = json.loads(d.pop('summary_json') or '{}')
+            out.append(d)
+        return out
+
+
+# ── Sitemap / robots seeding ─────────────────────────────────────────────── #
+
+def _strip_ns(tag):
+    return tag.split('}', 1)[-1]
+
+
+def parse_sitemap(xml_bytes: bytes):
+    """Return (page_urls, child_sitemap_urls) from a sitemap or sitemap index."""
+    pages, children = [], []
+    try:
+        root = ET.fromstring(xml_bytes)
+    except ET.ParseError:
+        return pages, children
+    kind = _strip_ns(root.tag)
+    for node in root:
+        loc = next((c.text for c in node if _strip_ns(c.tag) == 'loc' and c.text), None)
+        if not loc:
+            continue
+        (children if kind == 'sitemapindex' else pages).append(loc.strip())
+    return pages, children
+
+
+def _summarize_audit(result: Dict) -> Dict:
+    """Compact per-page record kept for incremental re-audits and aggregates."""
+    failed = []
+    for cat_key, cat in (result.get('categories') or {}).items():
+        for check in cat.get('checks', []):
+            if check.get('status') == 'fail':
+                failed.append(f"{cat_key}:{check.get('name')}")
+    return {
+        'overallScore': result.get('overallScore', 0),
+        'totalChecks': result.get('totalChecks', 0),
+        'totalPassed': result.get('totalPassed', 0),
+        'categoryScores': {k: v.get('score', 0) for k, v in (result.get('categories') or {}).items()},
+        'failedChecks': failed,
+        'title': result.get('title', ''),
+    }
+
+
+# ── Crawl engine ─────────────────────────────────────────────────────────── #
+
+class SiteCrawler:
+    """One crawl job. ``audit_fn(url, soup, response, load_time)`` returns the
+    same dict shape as /api/analyze (categories → score/checks, overallScore).
+    """
+
+    def __init__(self, job_id: str, start_url: str, audit_fn: Callable, store: CrawlStore,
+                 max_pages: int = DEFAULT_MAX_PAGES, max_workers: int = DEFAULT_WORKERS,
+                 per_host: int = DEFAULT_PER_HOST, delay: float = DEFAULT_DELAY,
+                 force: bool = False, use_sitemap: bool = True, respect_robots: bool = True):
+        self.job_id = job_id
+        self.start_url = canonicalize_url(start_url)
+        self.site = site_key(self.start_url)
+        self.audit_fn = audit_fn
+        self.store = store
+        self.max_pages = max(1, min(int(max_pages), MAX_PAGES_LIMIT))
+        self.max_workers = max(1, int(max_workers))
+        self.force = force
+        self.use_sitemap = use_sitemap
+        self.respect_robots = respect_robots
+
+        self.limiter = HostLimiter(per_host=per_host, delay=delay)
+        self.fetch_cache = SharedFetchCache()
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.frontier = deque()
+        self.seen = set()
+        self.robots = None
+        self.previous = {}
+        self.cancelled = threading.Event()
+
+        self._lock = threading.Lock()
+        self._pending_writes: List[Dict] = []
+        self.counts = Counter()
+
+    # -- fetching --
+
+    def _get(self, url, timeout=15):
+        host = urlparse(url).netloc
+        self.limiter.acquire(host)
+        try:
+            return self.session.get(url, timeout=timeout, allow_redirects=True)
+        finally:
+            self.limiter.release(host)
+
+    def _shared_get(self, url, timeout=5):
+        return self.fetch_cache.get(url, lambda: self._get(url, timeout=timeout))
+
+    def _in_scope(self, url):
+        return site_key(url) == self.site
+
+    def _allowed(self, url):
+        if not self.respect_robots or self.robots is None:
+            return True
+        try:
+            return self.robots.can_fetch(USER_AGENT, url)
+        except Exception:
+            return True
+
+    def _enqueue(self, url):
+        if not url or not self._in_scope(url) or not self._allowed(url):
+            return
+        with self._lock:
+            if url in self.seen or len(self.seen) >= self.max_pages:
+                return
+            self.seen.add(url)
+            self.frontier.append(url)
+
+    def _seed(self):
+        parsed = urlparse(self.start_url)
+        origin = f'{parsed.scheme}://{parsed.netloc}'
+        sitemap_urls = [f'{origin}/sitemap.xml']
+
+        robots_resp = self._shared_get(f'{origin}/robots.txt')
+        if robots_resp is not None and robots_resp.status_code == 200:
+            self.robots = RobotFileParser()
+            self.robots.parse(robots_resp.text.splitlines())
+            for line in robots_resp.text.splitlines():
+                if line.lower().startswith('sitemap:'):
+                    sitemap_urls.insert(0, line.split(':', 1)[1].strip())
+
+        self._enqueue(self.start_url)
+        if not self.use_sitemap:
+            return
+
+        queue = deque((u, 0) for u in dict.fromkeys(sitemap_urls))
+        visited = set()
+        while queue and len(self.seen) < self.max_pages:
+            sm_url, depth = queue.popleft()
+            if sm_url in visited or depth > SITEMAP_MAX_DEPTH:
+                continue
+            visited.add(sm_url)
+            resp = self._shared_get(sm_url, timeout=15)
+            if resp is None or resp.status_code != 200:
+                continue
+            pages, children = parse_sitemap(resp.content)
+            for child in children:
+                queue.append((child, depth + 1))
+            for page in pages:
+                self._enqueue(canonicalize_url(page))
+
+    # -- per page --
+
+    def _process(self, url):
+        _local.cache = self.fetch_cache
+        try:
+            t0 = time.time()
+            try:
+                resp = self._get(url)
+            except requests.RequestException as e:
+                return {'url': url, 'error': str(e)[:300]}
+            load_time = time.time() - t0
+
+            ctype = resp.headers.get('Content-Type', '')
+            if resp.status_code >= 400 or 'html' not in ctype.lower():
+                return {'url': url, 'status_code': resp.status_code, 'content_hash': None,
+                        'summary': {'error': f'HTTP {resp.status_code}' if resp.status_code >= 400 else f'non-HTML ({ctype[:60]})'},
+                        'links': [], 'outcome': 'failed' if resp.status_code >= 400 else 'skipped'}
+
+            final_url = canonicalize_url(resp.url) or url
+            if final_url != url:
+                # Audit the redirect target under its own URL so it is counted once
+                self._enqueue(final_url)
+                return {'url': url, 'status_code': resp.status_code, 'content_hash': None,
+                        'summary': {'redirected_to': final_url}, 'links': [], 'outcome': 'skipped'}
+
+            digest = content_hash(resp.content)
+            prev = self.previous.get(url)
+            if prev and prev.get('content_hash') == digest and not self.force:
+                links = json.loads(prev.get('links_json') or '[]')
+                for link in links:
+                    self._enqueue(link)
+                return {'url': url, 'status_code': resp.status_code, 'content_hash': digest,
+                        'summary': json.loads(prev.get('summary_json') or '{}'),
+                        'links': links, 'outcome': 'unchanged', 'audited_at': prev.get('audited_at')}
+
+            soup = BeautifulSoup(resp.content, 'html.parser')
+
+            canonical_tag = soup.find('link', attrs={'rel': 'canonical'})
+            canonical = canonicalize_url(canonical_tag.get('href'), base=url) if canonical_tag else None
+            if canonical and canonical != url and self._in_scope(canonical):
+                self._enqueue(canonical)
+                # Stored as its only link so an unchanged re-crawl still enqueues the target
+                return {'url': url, 'status_code': resp.status_code, 'content_hash': digest,
+                        'summary': {'canonical': canonical}, 'links': [canonical], 'outcome': 'skipped'}
+
+            links = []
+            for a in soup.find_all('a', href=True):
+                link = canonicalize_url(a['href'], base=url)
+                if link and self._in_scope(link):
+                    links.append(link)
+            links = list(dict.fromkeys(links))
+            for link in links:
+                self._enqueue(link)
+
+            result = self.audit_fn(url, soup, resp, load_time)
+            summary = _summarize_audit(result)
+            if not summary['title']:
+                title_tag = soup.find('title')
+                summary['title'] = title_tag.get_text(strip=True)[:200] if title_tag else ''
+            return {'url': url, 'status_code': resp.status_code, 'content_hash': digest,
+                    'summary': summary, 'links': links, 'outcome': 'audited'}
+        except Exception as e:
+            logger.warning("Crawl %s: page %s failed: %s", self.job_id, url, e)
+            return {'url': url, 'error': str(e)[:300]}
+        finally:
+            _local.cache = None
+
+    def _record(self, page):
+        outcome = page.get('outcome') or 'failed'
+        if page.get('error'):
+            page.setdefault('summary', {'error': page['error']})
+        with self._lock:
+            self.counts[outcome] += 1
+            self._pending_writes.append(page)
+            flush = len(self._pending_writes) >= PAGE_FLUSH_EVERY
+            batch = self._pending_writes if flush else None
+            if flush:
+                self._pending_writes = []
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch=None):
+        if batch is None:
+            with self._lock:
+                batch, self._pending_writes = self._pending_writes, []
+        self.store.save_pages(self.site, self.job_id, batch)
+        self.store.update_job(
+            self.job_id,
+            pages_discovered=len(self.seen),
+            pages_audited=self.counts['audited'],
+            pages_skipped=self.counts['unchanged'] + self.counts['skipped'],
+            pages_failed=self.counts['failed'],
+        )
+
+    # -- aggregates --
+
+    def aggregates(self) -> Dict:
+        pages = []
+        offset = 0
+        while True:
+            chunk = self.store.get_job_pages(self.job_id, limit=1000, offset=offset, order='url')
+            pages.extend(chunk)
+            if len(chunk) < 1000:
+                break
+            offset += 1000
+
+        scored = [p for p in pages if isinstance(p['summary'].get('overallScore'), (int, float))]
+        scores = sorted(p['summary']['overallScore'] for p in scored)
+        cat_totals, cat_counts = Counter(), Counter()
+        failed_checks = Counter()
+        for p in scored:
+            for cat, sc in p['summary'].get('categoryScores', {}).items():
+                cat_totals[cat] += sc
+                cat_counts[cat] += 1
+            failed_checks.update(p['summary'].get('failedChecks', []))
+
+        by_hash, by_title = {}, {}
+        for p in scored:
+            if p.get('content_hash'):
+                by_hash.setdefault(p['content_hash'], []).append(p['url'])
+            title = p['summary'].get('title')
+            if title:
+                by_title.setdefault(title, []).append(p['url'])
+
+        return {
+            'pages_scored': len(scored),
+            'average_score': round(sum(scores) / len(scores), 1) if scores else 0,
+            'median_score': scores[len(scores) // 2] if scores else 0,
+            'category_averages': {c: round(cat_totals[c] / cat_counts[c], 1) for c in cat_totals},
+            'status_codes': dict(Counter(str(p.get('status_code')) for p in pages)),
+            'top_failed_checks': [{'check': c, 'pages': n} for c, n in failed_checks.most_common(20)],
+            'weakest_pages': [{'url': p['url'], 'score': p['summary']['overallScore']}
+                              for p in sorted(scored, key=lambda x: x['summary']['overallScore'])[:10]],
+            'duplicate_content': [urls for urls in by_hash.values() if len(urls) > 1][:20],
+            'duplicate_titles': [{'title': t, 'urls': u} for t, u in by_title.items() if len(u) > 1][:20],
+            'shared_fetch_cache': {'hits': self.fetch_cache.hits, 'misses': self.fetch_cache.misses},
+        }
+
+    # -- main loop --
+
+    def run(self):
+        started = time.time()
+        self.store.update_job(self.job_id, status='running')
+        try:
+            self.previous = {} if self.force else self.store.load_page_hashes(self.site)
+            self._seed()
+            inflight = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f'crawl-{self.job_id}') as pool:
+                while not self.cancelled.is_set():
+                    while self.frontier and len(inflight) < self.max_workers * 2:
+                        url = self.frontier.popleft()
+                        inflight[pool.submit(self._process, url)] = url
+                    if not inflight:
+                        break
+                    done, _ = wait(list(inflight), timeout=5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        inflight.pop(future)
+                        self._record(future.result())
+                for future in inflight:
+                    future.cancel()
+            self._flush()
+            status = 'cancelled' if self.cancelled.is_set() else 'complete'
+            aggregates = self.aggregates()
+            aggregates['duration_seconds'] = round(time.time() - started, 1)
+            self.store.update_job(self.job_id, status=status, aggregates=aggregates,
+                                  completed_at=datetime.utcnow().isoformat())
+            logger.info("Crawl %s %s: %d audited, %d unchanged, %d failed in %.1fs",
+                        self.job_id, status, self.counts['audited'], self.counts['unchanged'],
+                        self.counts['failed'], time.time() - started)
+        except Exception as e:
+            logger.exception("Crawl %s failed", self.job_id)
+            self._flush()
+            self.store.update_job(self.job_id, status='error', error=str(e)[:500],
+                                  completed_at=datetime.utcnow().isoformat())
+        finally:
+            self.session.close()
+            with _jobs_lock:
+                _running.pop(self.job_id, None)
+
+
+# ── Job API ──────────────────────────────────────────────────────────────── #
+
+_store = None
+_store_lock = threading.Lock()
+_running: Dict[str, Optional[SiteCrawler]] = {}
+_jobs_lock = threading.Lock()
+
+
+def get_store() -> CrawlStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CrawlStore()
+    return _store
+
+
+class CrawlCapacityError(RuntimeError):
+    """Raised when this worker already runs MAX_CONCURRENT_CRAWLS jobs."""
+
+
+def start_crawl(start_url: str, audit_fn: Callable, max_pages: int = DEFAULT_MAX_PAGES,
+                max_workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                delay: float = DEFAULT_DELAY, force: bool = False, use_sitemap: bool = True,
+                respect_robots: bool = True, project_id: str = None) -> Dict:
+    """Create a crawl job and run it on a background thread. Returns the job record.
+
+    Caller-supplied limits are clamped (page count, concurrency, politeness
+    delay). Raises ValueError for a bad URL and CrawlCapacityError when this
+    worker is already running MAX_CONCURRENT_CRAWLS jobs.
+    """
+    if not start_url.startswith('http'):
+        start_url = 'https://' + start_url
+    canonical = canonicalize_url(start_url)
+    if not canonical:
+        raise ValueError(f'Not a crawlable URL: {start_url}')
+
+    job_id = uuid.uuid4().hex[:12]
+    options = {'max_pages': max(1, min(int(max_pages), MAX_PAGES_LIMIT)),
+               'max_workers': max(1, min(int(max_workers), MAX_WORKERS_LIMIT)),
+               'per_host': max(1, min(int(per_host), MAX_PER_HOST_LIMIT)),
+               'delay': max(MIN_DELAY, min(float(delay), MAX_DELAY)), 'force': force,
+               'use_sitemap': use_sitemap, 'respect_robots': respect_robots}
+    store = get_store()
+    with _jobs_lock:
+        if len(_running) >= MAX_CONCURRENT_CRAWLS:
+            raise CrawlCapacityError(f'{len(_running)} crawls already running; try again later')
+        _running[job_id] = None  # reserve the slot before the job exists
+    try:
+        store.create_job(job_id, site_key(canonical), canonical, options, project_id=project_id)
+        crawler = SiteCrawler(job_id, canonical, audit_fn, store, **options)
+    except Exception:
+        with _jobs_lock:
+            _running.pop(job_id, None)
+        raise
+    with _jobs_lock:
+        _running[job_id] = crawler
+    threading.Thread(target=crawler.run, name=f'crawl-{job_id}', daemon=True).start()
+    return store.get_job(job_id)
+
+
+def _owned(job: Optional[Dict], project_id: Optional[str]) -> bool:
+    """``job`` exists and belongs to ``project_id`` (None = any project, for internal callers)."""
+    return bool(job) and (project_id is None or (job.get('project_id') or '') == project_id)
+
+
+def get_crawl(job_id: str, project_id: str = None) -> Optional[Dict]:
+    """Job record with live progress (counts are flushed every PAGE_FLUSH_EVERY pages)."""
+    job = get_store().get_job(job_id)
+    if not _owned(job, project_id):
+        return None
+    crawler = _running.get(job_id)
+    if crawler is not None:
+        job['pages_discovered'] = len(crawler.seen)
+        job['pages_queued'] = len(crawler.frontier)
+        job['pages_audited'] = crawler.counts['audited']
+        job['pages_skipped'] = crawler.counts['unchanged'] + crawler.counts['skipped']
+        job['pages_failed'] = crawler.counts['failed']
+    done = job['pages_audited'] + job['pages_skipped'] + job['pages_failed']
+    job['progress_pct'] = round(100 * done / job['pages_discovered'], 1) if job['pages_discovered'] else 0
+    return job
+
+
+def get_crawl_pages(job_id: str, limit: int = 100, offset: int = 0, order: str = 'score',
+                    project_id: str = None) -> Optional[List[Dict]]:
+    """Page summaries for a job; None if the job doesn't exist or belongs to another project."""
+    store = get_store()
+    if not _owned(store.get_job(job_id), project_id):
+        return None
+    return store.get_job_pages(job_id, limit=min(limit, 1000), offset=offset, order=order)
+
+
+def list_crawls(site: str = None, limit: int = 20, project_id: str = None) -> List[Dict]:
+    return get_store().list_jobs(site=site_key(site) if site else None, limit=limit,
+                                 project_id=project_id)
+
+
+def cancel_crawl(job_id: str, project_id: str = None) -> bool:
+    """Stop a running job on this worker. Returns False if it is not running here."""
+    crawler = _running.get(job_id)
+    if crawler is None or not _owned(get_store().get_job(job_id), project_id):
+        return False
+    crawler.cancelled.set()
+    return True
@@ -62,11 +62,11 @@ def _get_require_auth():
             if not token:
                 return jsonify({"status": "error", "message": "Authentication required"}), 401
             try:
-                import boto3
                 import os
-                client = boto3.client(
+                from aws_clients import get_client
+                client = get_client(
                     "cognito-idp",
-                    region_name=os.environ.get("COGNITO_REGION", os.environ.get("AWS_REGION", "us-east-1")),
+                    os.environ.get("COGNITO_REGION", os.environ.get("AWS_REGION", "us-east-1")),
                 )
                 result = client.get_user(AccessToken=token)
                 attrs = {a["Name"]: a["Value"] for a in result.get("UserAttributes", [])}
@@ -94,29 +94,13 @@ require_auth = _lazy_auth
 
 # ---------------------------------------------------------------------------
 # Lazy table init — runs once on first request to this Blueprint
+# (the queue worker does the same before it starts polling)
 # ---------------------------------------------------------------------------
 
-_tables_initialized = False
-
-
 @publish_bp.before_app_request
 def _ensure_tables():
-    global _tables_initialized
-    if _tables_initialized:
-        return
-    _tables_initialized = True
-
-    try:
-        from social_publishing.queue import init_queue_table
-        init_queue_table()
-    except Exception as e:
-        logger.warning("publish queue table init deferred: %s", e)
-
-    try:
-        from social_publishing.post_logger import init_post_log_table
-        init_post_log_table()
-    except Exception as e:
-        logger.warning("post log table init deferred: %s", e)
+    from social_publishing.queue import ensure_tables
+    ensure_tables()
 
 
 # ---------------------------------------------------------------------------
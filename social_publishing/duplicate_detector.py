@@ -33,10 +33,11 @@ import logging
 import os
 from datetime import datetime, timedelta, timezone
 
-import boto3
 from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 TABLE_NAME = os.environ.get("DUPLICATE_HASH_TABLE", "social-content-hashes")
@@ -50,7 +51,7 @@ def _get_table():
     """Lazy singleton for the DynamoDB table resource."""
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(TABLE_NAME)
+        _table = get_resource("dynamodb", AWS_REGION).Table(TABLE_NAME)
     return _table
 
 
@@ -69,7 +70,7 @@ def init_hash_table() -> None:
     (one row per publish attempt), and the SK enables time-range queries
     for the duplicate window check.
     """
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(TABLE_NAME)
         table.load()
@@ -15,9 +15,10 @@ import os
 import uuid
 from datetime import datetime, timezone
 
-import boto3
 from botocore.exceptions import ClientError
 
+from aws_clients import get_resource
+
 from social_publishing.config import AWS_REGION, SOCIAL_POST_LOG_TABLE
 
 logger = logging.getLogger(__name__)
@@ -28,13 +29,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(SOCIAL_POST_LOG_TABLE)
+        _table = get_resource("dynamodb", AWS_REGION).Table(SOCIAL_POST_LOG_TABLE)
     return _table
 
 
 def init_post_log_table() -> None:
     """Create the DynamoDB post log table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(SOCIAL_POST_LOG_TABLE)
         table.load()
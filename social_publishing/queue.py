@@ -25,9 +25,10 @@ import time
 import uuid
 from datetime import datetime, timezone
 
-import boto3
 from botocore.exceptions import ClientError
 
+from aws_clients import get_resource
+
 logger = logging.getLogger(__name__)
 
 TABLE_NAME = os.environ.get("PUBLISH_QUEUE_TABLE", "social-publish-queue")
@@ -48,13 +49,13 @@ _table = None
 def _get_table():
     global _table
     if _table is None:
-        _table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(TABLE_NAME)
+        _table = get_resource("dynamodb", AWS_REGION).Table(TABLE_NAME)
     return _table
 
 
 def init_queue_table() -> None:
     """Create the DynamoDB queue table if it doesn't exist."""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = get_resource("dynamodb", AWS_REGION)
     try:
         table = dynamodb.Table(TABLE_NAME)
         table.load()
@@ -87,6 +88,37 @@ def init_queue_table() -> None:
         logger.warning("Queue table init: %s", e)
 
 
+_tables_initialized = False
+_tables_lock = threading.Lock()
+
+
+def ensure_tables() -> None:
+    """Create the queue and post-log tables once per process.
+
+    Called by the /api/publish hook and by the worker before it polls, so
+    the worker never writes to a table that the (lazily registered)
+    Blueprint has not created yet.
+    """
+    global _tables_initialized
+    if _tables_initialized:
+        return
+    with _tables_lock:
+        if _tables_initialized:
+            return
+        _tables_initialized = True
+
+        try:
+            init_queue_table()
+        except Exception as e:
+            logger.warning("publish queue table init deferred: %s", e)
+
+        try:
+            from social_publishing.post_logger import init_post_log_table
+            init_post_log_table()
+        except Exception as e:
+            logger.warning("post log table init deferred: %s", e)
+
+
 # ---------------------------------------------------------------------------
 # Enqueue
 # ---------------------------------------------------------------------------
@@ -230,6 +262,7 @@ def _process_item(item: dict) -> dict:
 def _worker_loop():
     """Background worker that processes queue items."""
     logger.info("Publish queue worker started")
+    ensure_tables()
 
     while not _shutdown.is_set():
         try:
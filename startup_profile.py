@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+startup_profile.py
+Import-time profile and boot-time budget for the Flask app.
+
+Runs ``import app`` in fresh interpreters under ``python -X importtime``
+and reports:
+
+  - boot time (median of --runs), i.e. what each gunicorn worker start and
+    each Lambda cold start pays before the first request
+  - the slowest modules by cumulative import time
+  - self time rolled up per top-level package
+  - which heavy SDKs (anthropic, openai, groq, ...) were imported at boot
+
+Exits 1 when the median boot time exceeds the budget, or a --forbid module
+was imported at boot, so it can gate a deploy:
+
+    python startup_profile.py                      # fail above 3000ms
+    python startup_profile.py --budget-ms 0        # report only
+    python startup_profile.py --forbid anthropic openai groq
+    python startup_profile.py --json > startup.json
+
+The budget defaults to STARTUP_BUDGET_MS, else 3000ms (well inside Lambda's
+10s init phase); pass --budget-ms 0 to report only. Boot includes
+app.py's module-level work (DynamoDB init, scheduler start), so measure
+with the same AWS environment the deploy target has.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BUDGET_MS = 3000
+
+# Modules that should only load on the requests that need them
+HEAVY_MODULES = [
+    'anthropic', 'openai', 'groq', 'google.generativeai', 'moviepy', 'numpy',
+    'playwright', 'psycopg2', 'requests_oauthlib', 'lxml',
+]
+
+_RE_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+_MARKER = '__startup_ms__='
+
+_CHILD = (
+    "import sys, time\n"
+    "t0 = time.perf_counter()\n"
+    "import {module}\n"
+    "sys.stderr.write('\\n{marker}%.1f\\n' % ((time.perf_counter() - t0) * 1000))\n"
+    "sys.stderr.flush()\n"
+    "import os; os._exit(0)\n"  # don't wait on background threads started at import
+)
+
+
+def run_once(module: str = 'app', timeout: float = 300) -> Dict:
+    """One cold import of ``module``; returns boot ms and the importtime rows."""
+    code = _CHILD.format(module=module, marker=_MARKER)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, timeout=timeout,
+    )
+    boot_ms = None
+    rows = []
+    for line in proc.stderr.splitlines():
+        if line.startswith(_MARKER):
+            boot_ms = float(line[len(_MARKER):])
+            continue
+        m = _RE_LINE.match(line)
+        if m:
+            rows.append({
+                'module': m.group(4),
+                'self_us': int(m.group(1)),
+                'cumulative_us': int(m.group(2)),
+                'depth': len(m.group(3)) // 2,
+            })
+    if boot_ms is None:
+        tail = '\n'.join(l for l in proc.stderr.splitlines() if not _RE_LINE.match(l))[-2000:]
+        raise RuntimeError(f"import {module} failed (exit {proc.returncode}):\n{tail}")
+    return {'boot_ms': boot_ms, 'rows': rows}
+
+
+def summarize(rows: List[Dict], top: int = 25, watch: List[str] = HEAVY_MODULES) -> Dict:
+    """Slowest modules, per-package self time and which ``watch`` modules were imported."""
+    by_package: Dict[str, int] = {}
+    for r in rows:
+        pkg = r['module'].split('.')[0]
+        by_package[pkg] = by_package.get(pkg, 0) + r['self_us']
+    imported = {r['module'] for r in rows}
+    slowest = sorted(rows, key=lambda r: r['cumulative_us'], reverse=True)
+    return {
+        'modules_imported': len(rows),
+        'slowest': [{'module': r['module'], 'cumulative_ms': round(r['cumulative_us'] / 1000, 1),
+                     'self_ms': round(r['self_us'] / 1000, 1)} for r in slowest[:top]],
+        'packages': [{'package': p, 'self_ms': round(us / 1000, 1)}
+                     for p, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]],
+        'heavy_at_boot': [m for m in watch if m in imported],
+    }
+
+
+def profile(module: str = 'app', runs: int = 3, top: int = 25,
+            watch: List[str] = HEAVY_MODULES) -> Dict:
+    samples = [run_once(module) for _ in range(max(1, runs))]
+    boot = [s['boot_ms'] for s in samples]
+    # The importtime breakdown of the median run is representative
+    median_run = sorted(samples, key=lambda s: s['boot_ms'])[len(samples) // 2]
+    return {
+        'module': module,
+        'runs': len(samples),
+        'boot_ms': {'median': round(statistics.median(boot), 1),
+                    'min': round(min(boot), 1), 'max': round(max(boot), 1)},
+        **summarize(median_run['rows'], top, watch),
+    }
+
+
+def _print_report(report: Dict):
+    b = report['boot_ms']
+    print(f"import {report['module']}: median {b['median']:.0f}ms "
+          f"(min {b['min']:.0f}, max {b['max']:.0f}, {report['runs']} runs, "
+          f"{report['modules_imported']} modules)")
+    print("\nSlowest imports (cumulative):")
+    for r in report['slowest']:
+        print(f"  {r['cumulative_ms']:8.1f}ms  {r['self_ms']:7.1f}ms self  {r['module']}")
+    print("\nSelf time by package:")
+    for p in report['packages']:
+        print(f"  {p['self_ms']:8.1f}ms  {p['package']}")
+    heavy = report['heavy_at_boot']
+    print(f"\nHeavy modules at boot: {', '.join(heavy) if heavy else 'none'}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    ap.add_argument('--module', default='app')
+    ap.add_argument('--runs', type=int, default=3)
+    ap.add_argument('--top', type=int, default=25)
+    ap.add_argument('--budget-ms', type=float, default=float(os.environ.get('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    ap.add_argument('--forbid', nargs='*', default=[],
+                    help='modules that must not be imported at boot')
+    ap.add_argument('--json', action='store_true')
+    args = ap.parse_args(argv)
+
+    watch = HEAVY_MODULES + [m for m in args.forbid if m not in HEAVY_MODULES]
+    report = profile(args.module, args.runs, args.top, watch)
+    failures = []
+    if args.budget_ms and report['boot_ms']['median'] > args.budget_ms:
+        failures.append(f"boot {report['boot_ms']['median']:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+    for m in args.forbid:
+        if m in report['heavy_at_boot']:
+            failures.append(f"{m} imported at boot")
+    report['budget_ms'] = args.budget_ms or None
+    report['failures'] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+        print()
+        for f in failures:
+            print(f"FAIL: {f}")
+        if not failures:
+            print("OK" + (f" (budget {args.budget_ms:.0f}ms)" if args.budget_ms else ""))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())